@@ -27,9 +27,6 @@ from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.utils.error_handling import ErrorHandling
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.common.utils.miscellaneous.constants import DAYS_PER_YEAR_AVG
-from qf_lib.common.utils.ratios.omega_ratio import omega_ratio
-from qf_lib.common.utils.ratios.sharpe_ratio import sharpe_ratio
-from qf_lib.common.utils.ratios.sorino_ratio import sorino_ratio
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.dataframe.simple_returns_dataframe import SimpleReturnsDataFrame
@@ -55,6 +52,8 @@ from qf_lib.settings import Settings
 
 from qf_lib.analysis.backtests_overfitting.minimum_backtest_length import minBTL
 from qf_lib.analysis.backtests_overfitting.overfitting_analysis import OverfittingAnalysis
+from qf_lib.analysis.backtests_overfitting.ranking_functions import SharpeRatioRankingFunction, \
+    SortinoRatioRankingFunction, OmegaRatioRankingFunction, TotalReturnRankingFunction
 
 
 @ErrorHandling.class_error_logging()
@@ -76,10 +75,10 @@ class BacktestOverfittingSheet(AbstractDocument):
         super().__init__(settings, pdf_exporter, title)
 
         self.ranking_functions = {
-            "Sharpe Ratio": lambda series: sharpe_ratio(series, Frequency.DAILY),
-            "Sortino Ratio": lambda series: sorino_ratio(series, Frequency.DAILY),
-            "Omega Ratio": omega_ratio,
-            "Total return": lambda series: series.to_prices().total_cumulative_return()
+            "Sharpe Ratio": SharpeRatioRankingFunction(Frequency.DAILY),
+            "Sortino Ratio": SortinoRatioRankingFunction(Frequency.DAILY),
+            "Omega Ratio": OmegaRatioRankingFunction(),
+            "Total return": TotalReturnRankingFunction()
         }
 
         self.overfitting_analysis = {}  # type: Dict[str, OverfittingAnalysis]
@@ -91,7 +90,7 @@ class BacktestOverfittingSheet(AbstractDocument):
 
     def setup_overfitting_analysis(self, top_dir_path: Optional[str] = None,
                                    strategies_returns: Optional[SimpleReturnsDataFrame] = None,
-                                   num_of_slices: int = 8):
+                                   num_of_slices: int = 8, n_jobs: int = 1):
         """
         Performs the overfitting analysis given either the path to the top directory, which contains the Timeseries
         excel files (in its subdirectories) generated by the backtest monitor, or the data frame containing the
@@ -107,6 +106,8 @@ class BacktestOverfittingSheet(AbstractDocument):
             should contain the simple returns of each of variants of the strategy / each of strategies.
         num_of_slices: int
             number of slices used in the overfitting analysis
+        n_jobs: int
+            number of processes used to evaluate the combinations of slices
         """
         if (top_dir_path is None) == (strategies_returns is None):
             raise ValueError("In order to complete the analysis you need to either provide the path to the top "
@@ -119,7 +120,8 @@ class BacktestOverfittingSheet(AbstractDocument):
         for function_name, ranking_function in self.ranking_functions.items():
             self.overfitting_analysis[function_name] = OverfittingAnalysis(strategies_returns,
                                                                            ranking_function=ranking_function,
-                                                                           num_of_slices=num_of_slices)
+                                                                           num_of_slices=num_of_slices,
+                                                                           n_jobs=n_jobs)
 
         self.number_of_strategies = strategies_returns.num_of_columns
         backtest_start_date = strategies_returns.index[0]
@@ -427,8 +429,8 @@ class BacktestOverfittingSheet(AbstractDocument):
             ecdf = ECDF(oos_qualities.values)
             best_qualities = QFSeries(data=ecdf.y, index=ecdf.x)
 
-            all_oos_qualities = [oos_ranking["quality"].median() for oos_ranking in oa.oos_ranking]
-            ecdf = ECDF(all_oos_qualities)
+            all_oos_qualities = oa.get_oos_median_qualities()
+            ecdf = ECDF(all_oos_qualities.values)
             qualities = QFSeries(data=ecdf.y, index=ecdf.x)
 
             # Adjust the end of the lines
@@ -455,8 +457,7 @@ class BacktestOverfittingSheet(AbstractDocument):
 
     def _get_is_oos_fit_chart(self, oa: OverfittingAnalysis, top_strategies_to_plot: int = 4) -> Chart:
         # Find top best OOS / IS performing strategies
-        mean_quality_for_each_strategy_in_oos = pd.concat(
-            [oos_qualities["quality"] for oos_qualities in oa.oos_ranking], axis=1).mean(axis=1)
+        mean_quality_for_each_strategy_in_oos = oa.get_mean_oos_qualities()
         top_strategies_names = mean_quality_for_each_strategy_in_oos.nlargest(top_strategies_to_plot).index
 
         chart = LineChart()
@@ -465,17 +466,14 @@ class BacktestOverfittingSheet(AbstractDocument):
         def func(x, a, b, c):
             return a * np.exp(-b * x) + c
 
-        min_is_performance = min([i["quality"].min() for i in oa.is_ranking])
-        max_is_performance = max([i["quality"].max() for i in oa.is_ranking])
+        min_is_performance, max_is_performance = oa.get_is_qualities_range()
         x_range = np.linspace(min_is_performance, max_is_performance, 1000)
 
         for ind, strategy in enumerate(top_strategies_names):
             try:
-                is_vs_oos = sorted([(is_qualities.loc[strategy, "quality"], oos_qualities.loc[strategy, "quality"])
-                                    for is_qualities, oos_qualities in zip(oa.is_ranking, oa.oos_ranking)],
-                                   key=lambda i: i[0])
+                is_vs_oos = oa.get_is_oos_qualities(strategy).sort_values("IS")
 
-                popt, _ = curve_fit(func, [i[0] for i in is_vs_oos], [i[1] for i in is_vs_oos], maxfev=5000)
+                popt, _ = curve_fit(func, is_vs_oos["IS"].values, is_vs_oos["OOS"].values, maxfev=5000)
                 data_points = QFSeries(index=x_range, data=[func(x, *popt) for x in x_range])
                 data_element = DataElementDecorator(data_points)
                 chart.add_decorator(data_element)
@@ -0,0 +1,228 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import itertools
+from typing import Sequence, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from pandas import DatetimeIndex
+from scipy.special import comb
+
+from qf_lib.analysis.backtests_overfitting.ranking_functions import RankingFunction, period_length_in_years
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dataframe.simple_returns_dataframe import SimpleReturnsDataFrame
+from qf_lib.containers.series.qf_series import QFSeries
+
+
+class CSCVEngine:
+    """
+    Combinatorially Symmetric Cross-Validation engine used by the OverfittingAnalysis. Instead of building the
+    In-Sample and Out-Of-Sample data frames for each combination of slices, the additive statistics of the ranking
+    function (see: RankingFunction) are computed once for each slice and each strategy. The qualities of all
+    strategies for a combination are then obtained by summing up the statistics of its slices, which is done with
+    matrix operations for the whole chunk of combinations at once.
+
+    The combinations are processed in chunks of chunk_size combinations (optionally in n_jobs processes) and only
+    the results for the best In-Sample strategy of each combination (and a few aggregates) are kept, so the memory
+    usage does not depend on the number of combinations times the number of strategies.
+
+    Parameters
+    ----------
+    multiple_returns_timeseries: SimpleReturnsDataFrame
+        simple returns of the strategies (columns)
+    ranking_function: RankingFunction
+        quality measure used to rank the strategies
+    num_of_slices: int
+        number of slices the returns are split into (the rows not aligned to num_of_slices are dropped)
+    chunk_size: int
+        number of combinations processed at once
+    n_jobs: int
+        number of processes used to process the chunks of combinations
+    """
+
+    def __init__(self, multiple_returns_timeseries: SimpleReturnsDataFrame, ranking_function: RankingFunction,
+                 num_of_slices: int, chunk_size: int = 1000, n_jobs: int = 1):
+        assert num_of_slices % 2 == 0, "Number of slices should be an even number"
+
+        self.ranking_function = ranking_function
+        self.num_of_slices = num_of_slices
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+        self.strategies_names = multiple_returns_timeseries.columns
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        # Drop all rows not aligned to num_of_slices
+        size_of_slices = multiple_returns_timeseries.num_of_rows // num_of_slices
+        if size_of_slices == 0:
+            raise ValueError("Too few rows in the data frame.")
+        rows_to_keep = size_of_slices * num_of_slices
+
+        returns = multiple_returns_timeseries.values[:rows_to_keep].astype(float)
+        returns = returns.reshape(num_of_slices, size_of_slices, returns.shape[1])
+
+        # In-Sample and Out-Of-Sample sets are indexed by the first half of the dates
+        self.dates = DatetimeIndex(multiple_returns_timeseries.index[:rows_to_keep // 2])
+        self.statistics = ranking_function.calculate_statistics(returns)
+        self.log_returns_sums = np.log1p(returns).sum(axis=1)
+
+        self.num_of_combinations = comb(num_of_slices, num_of_slices // 2, exact=True)
+
+    def calculate_best_strategies(self) -> Tuple[QFDataFrame, QFSeries, Tuple[float, float]]:
+        """
+        Finds the best In-Sample strategy for each combination of slices and evaluates it Out-Of-Sample.
+
+        Returns
+        -------
+        best_strategies: QFDataFrame
+            data frame indexed by the numbers of combinations, with columns: "strategy" (name of the best IS
+            strategy), "IS quality", "OOS quality", "OOS rank" (rank of the strategy OOS, the worst strategy has
+            rank 1), "OOS return" (annualised OOS return of the strategy) and "OOS median quality" (median of
+            qualities of all strategies OOS)
+        mean_oos_qualities: QFSeries
+            mean OOS quality of each strategy over all the combinations
+        is_qualities_range: Tuple[float, float]
+            minimum and maximum IS quality over all strategies and combinations
+        """
+        years = period_length_in_years(self.dates, Frequency.DAILY)
+        chunks_results = self._run(_evaluate_best_strategies, years)
+
+        best_strategies_indices, is_qualities, oos_qualities, oos_ranks, oos_returns, oos_medians = \
+            (np.concatenate(values) for values in zip(*(chunk_result[:6] for chunk_result in chunks_results)))
+        oos_qualities_sum = sum(chunk_result[6] for chunk_result in chunks_results)
+        is_qualities_range = (min(chunk_result[7] for chunk_result in chunks_results),
+                              max(chunk_result[8] for chunk_result in chunks_results))
+
+        best_strategies = QFDataFrame(data={
+            "strategy": self.strategies_names[best_strategies_indices].values,
+            "IS quality": is_qualities,
+            "OOS quality": oos_qualities,
+            "OOS rank": oos_ranks,
+            "OOS return": oos_returns,
+            "OOS median quality": oos_medians
+        })
+        mean_oos_qualities = QFSeries(data=oos_qualities_sum / self.num_of_combinations, index=self.strategies_names)
+        return best_strategies, mean_oos_qualities, is_qualities_range
+
+    def calculate_oos_ranks(self, strategies_names: Sequence[str]) -> QFSeries:
+        """
+        Computes the Out-Of-Sample ranks of the given strategies (the worst strategy has rank 1).
+
+        Parameters
+        ----------
+        strategies_names: Sequence[str]
+            names of strategies, one for each combination of slices
+
+        Returns
+        -------
+        QFSeries
+            OOS ranks of the strategies indexed by the numbers of combinations
+        """
+        assert len(strategies_names) == self.num_of_combinations, "One strategy should be given for each combination"
+        strategies_indices = self.strategies_names.get_indexer(strategies_names)
+        assert (strategies_indices >= 0).all(), "Unknown strategies names"
+
+        chunks_ranks = self._run(_evaluate_oos_ranks, strategies_indices)
+        return QFSeries(data=np.concatenate(chunks_ranks))
+
+    def calculate_qualities(self, strategies_names: Sequence[str]) -> Tuple[QFDataFrame, QFDataFrame]:
+        """
+        Computes the In-Sample and Out-Of-Sample qualities of the given strategies for all combinations of slices.
+
+        Returns
+        -------
+        is_qualities, oos_qualities: QFDataFrame
+            qualities of the strategies (columns) indexed by the numbers of combinations
+        """
+        strategies_indices = self.strategies_names.get_indexer(strategies_names)
+        assert (strategies_indices >= 0).all(), "Unknown strategies names"
+
+        is_masks = _is_masks(self.num_of_slices, 0, self.num_of_combinations)
+        statistics = self.statistics[..., strategies_indices]
+        is_qualities = _qualities(self.ranking_function, is_masks, statistics, self.dates)
+        oos_qualities = _qualities(self.ranking_function, 1.0 - is_masks, statistics, self.dates)
+
+        columns = self.strategies_names[strategies_indices]
+        return QFDataFrame(data=is_qualities, columns=columns), QFDataFrame(data=oos_qualities, columns=columns)
+
+    def _run(self, function, *args) -> list:
+        chunks = [(start, min(start + self.chunk_size, self.num_of_combinations))
+                  for start in range(0, self.num_of_combinations, self.chunk_size)]
+        self.logger.info("Evaluating {} combinations of slices in {} chunks".format(
+            self.num_of_combinations, len(chunks)))
+
+        if self.n_jobs == 1:
+            return [function(self, start, stop, *args) for start, stop in chunks]
+
+        # Only the statistics are sent to the processes, the returns themselves are not needed there
+        engine_data = _EngineData(self)
+        return Parallel(n_jobs=self.n_jobs)(
+            delayed(function)(engine_data, start, stop, *args) for start, stop in chunks)
+
+
+class _EngineData:
+    """ Picklable subset of the CSCVEngine attributes needed to evaluate the chunks of combinations. """
+
+    def __init__(self, engine: CSCVEngine):
+        self.ranking_function = engine.ranking_function
+        self.num_of_slices = engine.num_of_slices
+        self.statistics = engine.statistics
+        self.log_returns_sums = engine.log_returns_sums
+        self.dates = engine.dates
+
+
+def _is_masks(num_of_slices: int, start: int, stop: int) -> np.ndarray:
+    """ Returns the 0/1 matrix of shape (stop - start, num_of_slices) marking the In-Sample slices of combinations. """
+    combinations = itertools.islice(itertools.combinations(range(num_of_slices), num_of_slices // 2), start, stop)
+    is_slices = np.array(list(combinations))
+
+    masks = np.zeros((stop - start, num_of_slices))
+    masks[np.arange(stop - start)[:, np.newaxis], is_slices] = 1.0
+    return masks
+
+
+def _qualities(ranking_function: RankingFunction, masks: np.ndarray, statistics: np.ndarray,
+               dates: DatetimeIndex) -> np.ndarray:
+    """ Computes the qualities of strategies for sets of slices marked by the masks (one row per combination). """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        qualities = ranking_function.calculate_quality(np.tensordot(masks, statistics, axes=(1, 0)), dates)
+
+    if not np.isfinite(qualities).all():
+        raise ValueError("There exist nan or infinite values in the qualities of strategies")
+    return qualities
+
+
+def _evaluate_best_strategies(engine, start: int, stop: int, years: float) -> tuple:
+    is_masks = _is_masks(engine.num_of_slices, start, stop)
+    oos_masks = 1.0 - is_masks
+    is_qualities = _qualities(engine.ranking_function, is_masks, engine.statistics, engine.dates)
+    oos_qualities = _qualities(engine.ranking_function, oos_masks, engine.statistics, engine.dates)
+
+    # If multiple strategies have the best quality, the first one is chosen
+    rows = np.arange(stop - start)
+    best_indices = np.argmax(is_qualities, axis=1)
+    best_oos_qualities = oos_qualities[rows, best_indices]
+    oos_ranks = (oos_qualities < best_oos_qualities[:, np.newaxis]).sum(axis=1) + 1.0
+    oos_returns = np.exp(oos_masks.dot(engine.log_returns_sums)[rows, best_indices] / years) - 1
+
+    return (best_indices, is_qualities[rows, best_indices], best_oos_qualities, oos_ranks, oos_returns,
+            np.median(oos_qualities, axis=1), oos_qualities.sum(axis=0), is_qualities.min(), is_qualities.max())
+
+
+def _evaluate_oos_ranks(engine, start: int, stop: int, strategies_indices: np.ndarray) -> np.ndarray:
+    oos_qualities = _qualities(
+        engine.ranking_function, 1.0 - _is_masks(engine.num_of_slices, start, stop), engine.statistics, engine.dates)
+    selected_oos_qualities = oos_qualities[np.arange(stop - start), strategies_indices[start:stop]]
+    return (oos_qualities < selected_oos_qualities[:, np.newaxis]).sum(axis=1) + 1.0
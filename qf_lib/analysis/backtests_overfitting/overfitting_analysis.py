@@ -16,6 +16,8 @@ from typing import List, Tuple, Callable, Optional
 import pandas as pd
 import numpy as np
 
+from qf_lib.analysis.backtests_overfitting.cscv_engine import CSCVEngine
+from qf_lib.analysis.backtests_overfitting.ranking_functions import RankingFunction
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.utils.returns.cagr import cagr
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
@@ -28,10 +30,29 @@ class OverfittingAnalysis:
     Class providing statistics and analysis for checking if backtest is overfitted.
     It is based on the algorithms described in "The probability of backtest overfitting" by Bailey,
     Borwein, Lopez de Prado and Jim Zhu.
+
+    If the ranking_function is a RankingFunction (e.g. SharpeRatioRankingFunction), the analysis is performed with
+    the CSCVEngine, which computes the qualities of strategies for all combinations of slices from the statistics of
+    the slices, processing the combinations in chunks (optionally in parallel). In that case only the results for
+    the best In-Sample strategies are kept and the is_ranking and oos_ranking lists are not computed (they remain
+    None). Any other callable is evaluated on the In-Sample and Out-Of-Sample data frames of each combination.
+
+    Parameters
+    ----------
+    multiple_returns_timeseries: SimpleReturnsDataFrame
+        dataframe containing different strategies returns in the columns
+    ranking_function: Callable
+        function computing the quality of a strategy given its timeseries of returns (e.g. sharpe ratio)
+    num_of_slices: int
+        number of slices, into which the returns are split (should be an even number)
+    chunk_size: int
+        number of combinations of slices processed at once by the CSCVEngine
+    n_jobs: int
+        number of processes used by the CSCVEngine
     """
 
     def __init__(self, multiple_returns_timeseries: SimpleReturnsDataFrame, ranking_function: Callable,
-                 num_of_slices: int = 14):
+                 num_of_slices: int = 14, chunk_size: int = 1000, n_jobs: int = 1):
 
         self.num_of_slices = num_of_slices
         assert self.num_of_slices % 2 == 0, "Number of slices should be an even number"
@@ -59,12 +80,20 @@ class OverfittingAnalysis:
         """ List of strategies with the maximum rank. If multiple values equal the maximum, the first strategy with
         that rank is returned. """
 
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+
+        self._engine = None  # type: Optional[CSCVEngine]
+
+        self._best_strategies = None  # type: Optional[QFDataFrame]
+        self._mean_oos_qualities = None  # type: Optional[QFSeries]
+        self._is_qualities_range = None  # type: Optional[Tuple[float, float]]
+
         self._rankings_computed = False
 
     def calculate_overfitting_probability(self):
         """ Returns the probability of backtest overfitting. """
-        if not all([self.best_is_strategies_names, self.oos_ranking, self.is_ranking]):
-            self.create_is_oos_rankings()
+        self.create_is_oos_rankings()
 
         logits = self.calculate_relative_rank_logits(self.best_is_strategies_names)
         logits_distribution = self._calculate_distribution(logits)
@@ -96,6 +125,10 @@ class OverfittingAnalysis:
             combination set, the best one in the in-sample period).
         """
         self.create_is_oos_rankings()
+        if self._engine is not None:
+            return QFDataFrame(data={"OOS": self._best_strategies["OOS quality"].values,
+                                     "IS": self._best_strategies["IS quality"].values})
+
         oos_qualities = [oos_ranking["quality"].loc[best_is_strategy] for oos_ranking, best_is_strategy
                          in zip(self.oos_ranking, self.best_is_strategies_names)]
         is_qualities = [is_ranking["quality"].loc[best_is_strategy] for is_ranking, best_is_strategy
@@ -110,13 +143,27 @@ class OverfittingAnalysis:
         """
         self.create_is_oos_rankings()
         num_of_strategies = len(self.multiple_returns_timeseries.columns)
-        relative_ranks = QFSeries(data=[oos_ranking["rank"].loc[best_is_strategy] / (num_of_strategies + 1)
-                                        for oos_ranking, best_is_strategy in zip(self.oos_ranking, strategies_names)])
+        if self._engine is None:
+            oos_ranks = [oos_ranking["rank"].loc[strategy_name]
+                         for oos_ranking, strategy_name in zip(self.oos_ranking, strategies_names)]
+        elif list(strategies_names) == self.best_is_strategies_names:
+            oos_ranks = self._best_strategies["OOS rank"].values
+        else:
+            oos_ranks = self._engine.calculate_oos_ranks(strategies_names).values
+
+        relative_ranks = QFSeries(data=np.asarray(oos_ranks, dtype=float) / (num_of_strategies + 1))
         logits = np.log(relative_ranks.divide(1.0 - relative_ranks))
         return logits
 
     def create_is_oos_rankings(self):
-        if not self._rankings_computed:
+        if not self._rankings_computed and isinstance(self.ranking_function, RankingFunction):
+            self._engine = CSCVEngine(self.multiple_returns_timeseries, self.ranking_function, self.num_of_slices,
+                                      self.chunk_size, self.n_jobs)
+            self._best_strategies, self._mean_oos_qualities, self._is_qualities_range = \
+                self._engine.calculate_best_strategies()
+            self.best_is_strategies_names = self._best_strategies["strategy"].tolist()
+            self._rankings_computed = True
+        elif not self._rankings_computed:
             self._is_set, self._oos_set = self.form_different_is_and_oos_sets(self.multiple_returns_timeseries)
             self.is_ranking = [self.rank_strategies(is_element) for is_element in self._is_set]
             self.oos_ranking = [self.rank_strategies(oos_element) for oos_element in self._oos_set]
@@ -124,6 +171,46 @@ class OverfittingAnalysis:
             self.best_is_strategies_names = [is_element["rank"].idxmax() for is_element in self.is_ranking]
             self._rankings_computed = True
 
+    def get_oos_median_qualities(self) -> QFSeries:
+        """ Returns the median of the Out-Of-Sample qualities of all strategies for each combination. """
+        self.create_is_oos_rankings()
+        if self._engine is not None:
+            return QFSeries(data=self._best_strategies["OOS median quality"].values)
+        return QFSeries(data=[oos_ranking["quality"].median() for oos_ranking in self.oos_ranking])
+
+    def get_mean_oos_qualities(self) -> QFSeries:
+        """ Returns the mean Out-Of-Sample quality of each strategy over all combinations. """
+        self.create_is_oos_rankings()
+        if self._engine is not None:
+            return self._mean_oos_qualities
+        return pd.concat([oos_ranking["quality"] for oos_ranking in self.oos_ranking], axis=1).mean(axis=1)
+
+    def get_is_qualities_range(self) -> Tuple[float, float]:
+        """ Returns the minimum and maximum In-Sample quality over all strategies and combinations. """
+        self.create_is_oos_rankings()
+        if self._engine is not None:
+            return self._is_qualities_range
+        return (min(is_ranking["quality"].min() for is_ranking in self.is_ranking),
+                max(is_ranking["quality"].max() for is_ranking in self.is_ranking))
+
+    def get_is_oos_qualities(self, strategy_name: str) -> QFDataFrame:
+        """
+        Returns
+        -------
+        QFDataFrame
+            dataframe with two columns: IS and OOS, containing the In-Sample and Out-Of-Sample qualities of the given
+            strategy for each combination
+        """
+        self.create_is_oos_rankings()
+        if self._engine is not None:
+            is_qualities, oos_qualities = self._engine.calculate_qualities([strategy_name])
+            return QFDataFrame(data={"IS": is_qualities.iloc[:, 0].values, "OOS": oos_qualities.iloc[:, 0].values})
+
+        return QFDataFrame(data={
+            "IS": [is_ranking["quality"].loc[strategy_name] for is_ranking in self.is_ranking],
+            "OOS": [oos_ranking["quality"].loc[strategy_name] for oos_ranking in self.oos_ranking]
+        })
+
     def form_different_is_and_oos_sets(self, multiple_returns_timeseries: QFDataFrame) -> Tuple:
         """
         Splits slices into two groups of equal sizes for all possible combinations.
@@ -185,6 +272,9 @@ class OverfittingAnalysis:
 
     def _get_best_strategies_returns(self) -> List[float]:
         """ Returns the annual returns of the best IS strategies """
+        if self._engine is not None:
+            return self._best_strategies["OOS return"].tolist()
+
         annual_returns = []
         for oos_set, best_strategy_name in zip(self._oos_set, self.best_is_strategies_names):
             best_strategy_tms = oos_set.loc[:, best_strategy_name]
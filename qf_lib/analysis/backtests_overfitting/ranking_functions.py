@@ -0,0 +1,214 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from abc import ABCMeta, abstractmethod
+
+import numpy as np
+from pandas import DatetimeIndex
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.dateutils.to_days import to_days
+from qf_lib.common.utils.miscellaneous.constants import DAYS_PER_YEAR_AVG
+from qf_lib.common.utils.ratios.omega_ratio import omega_ratio
+from qf_lib.common.utils.ratios.sharpe_ratio import sharpe_ratio
+from qf_lib.common.utils.ratios.sorino_ratio import sorino_ratio
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
+
+
+class RankingFunction(metaclass=ABCMeta):
+    """
+    Quality measure of a strategy used to rank the strategies in the OverfittingAnalysis. Contrary to a plain
+    function, the measure can be computed from statistics (e.g. sums of returns and sums of squared returns), which
+    are additive over disjoint parts of the timeseries. Thanks to that the statistics may be computed once for each
+    slice of the returns and the quality of any In-Sample or Out-Of-Sample set is obtained by summing up
+    the statistics of its slices.
+
+    Calling the object on a timeseries of returns gives the same value as the corresponding plain function.
+    """
+
+    @abstractmethod
+    def __call__(self, returns_tms: QFSeries) -> float:
+        """ Computes the quality measure for the given timeseries of simple returns. """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def calculate_statistics(self, returns: np.ndarray) -> np.ndarray:
+        """
+        Computes the additive statistics of returns for each slice.
+
+        Parameters
+        ----------
+        returns: np.ndarray
+            simple returns of shape (num_of_slices, slice_length, num_of_strategies)
+
+        Returns
+        -------
+        np.ndarray
+            statistics of shape (num_of_slices, num_of_statistics, num_of_strategies)
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def calculate_quality(self, statistics: np.ndarray, dates: DatetimeIndex) -> np.ndarray:
+        """
+        Computes the quality measure from the statistics summed up over the slices.
+
+        Parameters
+        ----------
+        statistics: np.ndarray
+            statistics of shape (..., num_of_statistics, num_of_strategies)
+        dates: DatetimeIndex
+            dates of the set of returns, for which the statistics were computed
+
+        Returns
+        -------
+        np.ndarray
+            quality measures of shape (..., num_of_strategies)
+        """
+        raise NotImplementedError()
+
+
+class SharpeRatioRankingFunction(RankingFunction):
+    """
+    Sharpe ratio of the strategy (see: qf_lib.common.utils.ratios.sharpe_ratio).
+
+    Parameters
+    ----------
+    frequency: Frequency
+        frequency of the returns
+    risk_free: float
+        risk free rate
+    """
+
+    def __init__(self, frequency: Frequency, risk_free: float = 0):
+        self.frequency = frequency
+        self.risk_free = risk_free
+
+    def __call__(self, returns_tms: QFSeries) -> float:
+        return sharpe_ratio(returns_tms, self.frequency, self.risk_free)
+
+    def calculate_statistics(self, returns: np.ndarray) -> np.ndarray:
+        log_returns = np.log1p(returns)
+        count = np.full(log_returns.shape[::2], log_returns.shape[1], dtype=float)
+        return np.stack([count, log_returns.sum(axis=1)] + _centered_sums(log_returns), axis=1)
+
+    def calculate_quality(self, statistics: np.ndarray, dates: DatetimeIndex) -> np.ndarray:
+        count, log_returns_sum, centered_sum, centered_squares_sum = np.moveaxis(statistics, -2, 0)
+        annual_log_return = log_returns_sum / period_length_in_years(dates, self.frequency)
+        annual_vol = _std(count, centered_sum, centered_squares_sum) * np.sqrt(self.frequency.occurrences_in_year)
+        return (annual_log_return - self.risk_free) / annual_vol
+
+
+class SortinoRatioRankingFunction(RankingFunction):
+    """
+    Sortino ratio of the strategy (see: qf_lib.common.utils.ratios.sorino_ratio).
+
+    Parameters
+    ----------
+    frequency: Frequency
+        frequency of the returns
+    risk_free: float
+        risk free rate
+    """
+
+    def __init__(self, frequency: Frequency, risk_free: float = 0):
+        self.frequency = frequency
+        self.risk_free = risk_free
+
+    def __call__(self, returns_tms: QFSeries) -> float:
+        return sorino_ratio(returns_tms, self.frequency, self.risk_free)
+
+    def calculate_statistics(self, returns: np.ndarray) -> np.ndarray:
+        log_returns = np.log1p(returns)
+        is_negative = returns < 0
+        negative_log_returns = np.where(is_negative, log_returns, np.nan)
+        return np.stack([log_returns.sum(axis=1), is_negative.sum(axis=1).astype(float)] +
+                        _centered_sums(negative_log_returns), axis=1)
+
+    def calculate_quality(self, statistics: np.ndarray, dates: DatetimeIndex) -> np.ndarray:
+        log_returns_sum, count, centered_sum, centered_squares_sum = np.moveaxis(statistics, -2, 0)
+        annualised_growth_rate = np.exp(log_returns_sum / period_length_in_years(dates, self.frequency)) - 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = _std(count, centered_sum, centered_squares_sum)
+            annualised_downside_vol = np.where(count >= 2, std, np.nan) * np.sqrt(self.frequency.occurrences_in_year)
+        return (annualised_growth_rate - self.risk_free) / annualised_downside_vol
+
+
+class OmegaRatioRankingFunction(RankingFunction):
+    """
+    Omega ratio of the strategy (see: qf_lib.common.utils.ratios.omega_ratio).
+
+    Parameters
+    ----------
+    threshold: float
+        threshold (e.g. benchmark return or target return) for the portfolio
+    """
+
+    def __init__(self, threshold: float = 0):
+        self.threshold = threshold
+
+    def __call__(self, returns_tms: QFSeries) -> float:
+        return omega_ratio(returns_tms, self.threshold)
+
+    def calculate_statistics(self, returns: np.ndarray) -> np.ndarray:
+        excess_returns = returns - self.threshold
+        upside = np.where(excess_returns >= 0, excess_returns, 0.0).sum(axis=1)
+        downside = np.where(excess_returns < 0, -excess_returns, 0.0).sum(axis=1)
+        return np.stack([upside, downside], axis=1)
+
+    def calculate_quality(self, statistics: np.ndarray, dates: DatetimeIndex) -> np.ndarray:
+        upside, downside = np.moveaxis(statistics, -2, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return upside / downside
+
+
+class TotalReturnRankingFunction(RankingFunction):
+    """
+    Total cumulative return of the strategy.
+    """
+
+    def __call__(self, returns_tms: QFSeries) -> float:
+        return SimpleReturnsSeries(returns_tms).to_prices().total_cumulative_return()
+
+    def calculate_statistics(self, returns: np.ndarray) -> np.ndarray:
+        return np.log1p(returns).sum(axis=1)[:, np.newaxis, :]
+
+    def calculate_quality(self, statistics: np.ndarray, dates: DatetimeIndex) -> np.ndarray:
+        return np.expm1(statistics[..., 0, :])
+
+
+def period_length_in_years(dates: DatetimeIndex, frequency: Frequency) -> float:
+    """
+    Returns the length of the period covered by the returns with the given dates, as computed by the cagr function
+    (which includes one period of the given frequency before the first date).
+    """
+    prices_dates = SimpleReturnsSeries(index=dates, data=0.0).to_prices(frequency=frequency).index
+    return to_days(prices_dates[-1] - prices_dates[0]) / DAYS_PER_YEAR_AVG
+
+
+def _centered_sums(values: np.ndarray):
+    """
+    Returns the sums of values and the sums of squared values of each slice. The values are centered using the mean
+    of each strategy to avoid the loss of precision in the variance computed from the sums. Nan values are skipped.
+    """
+    is_valid = ~np.isnan(values)
+    mean = np.where(is_valid, values, 0.0).sum(axis=(0, 1)) / np.maximum(is_valid.sum(axis=(0, 1)), 1)
+    centered_values = np.where(is_valid, values - mean, 0.0)
+    return [centered_values.sum(axis=1), (centered_values ** 2).sum(axis=1)]
+
+
+def _std(count: np.ndarray, centered_sum: np.ndarray, centered_squares_sum: np.ndarray) -> np.ndarray:
+    """ Sample standard deviation (with 1 degree of freedom) computed from the sums of values. """
+    variance = (centered_squares_sum - centered_sum ** 2 / count) / (count - 1)
+    return np.sqrt(np.maximum(variance, 0.0))
@@ -21,7 +21,7 @@ import pandas as pd
 from qf_lib.analysis.timeseries_analysis.timeseries_analysis import TimeseriesAnalysis
 from qf_lib.common.enums.plotting_mode import PlottingMode
 from qf_lib.common.utils.returns.drawdown_tms import drawdown_tms
-from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.common.utils.returns.rolling_metrics import TotalCumulativeReturnMetric, VolatilityMetric
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.documents_utils.document_exporting.document import Document
@@ -164,11 +164,8 @@ class AbstractDocument(metaclass=ABCMeta):
 
         legend = LegendDecorator()
 
-        def tot_return(window):
-            return PricesSeries(window).total_cumulative_return()
-
-        def volatility(window):
-            return get_volatility(PricesSeries(window), freq)
+        tot_return = TotalCumulativeReturnMetric(series_type=PricesSeries)
+        volatility = VolatilityMetric(freq, series_type=PricesSeries)
 
         functions = [tot_return, volatility]
         names = ['Rolling Return', 'Rolling Volatility']
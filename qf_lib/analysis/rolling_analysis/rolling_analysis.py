@@ -12,6 +12,7 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from qf_lib.common.utils.returns.rolling_metrics import TotalCumulativeReturnMetric
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.series.qf_series import QFSeries
 
@@ -43,8 +44,8 @@ class RollingAnalysisFactory:
 
             step = int(window * 0.2)
 
-            strategy_rolling = df[strategy_name].rolling_window(window, lambda x: x.total_cumulative_return(), step)
-            benchmark_rolling = df[benchmark_name].rolling_window(window, lambda x: x.total_cumulative_return(), step)
+            strategy_rolling = df[strategy_name].rolling_window(window, TotalCumulativeReturnMetric(), step)
+            benchmark_rolling = df[benchmark_name].rolling_window(window, TotalCumulativeReturnMetric(), step)
 
             outperforming = strategy_rolling > benchmark_rolling
             percentage_outperforming = len(strategy_rolling[outperforming]) / len(strategy_rolling)
@@ -21,7 +21,7 @@ import matplotlib as plt
 from qf_lib.analysis.common.abstract_document import AbstractDocument
 from qf_lib.analysis.timeseries_analysis.timeseries_analysis import TimeseriesAnalysis
 from qf_lib.common.enums.plotting_mode import PlottingMode
-from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.common.utils.returns.rolling_metrics import VolatilityMetric, TotalCumulativeReturnMetric
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.documents_utils.document_exporting.element.chart import ChartElement
@@ -107,16 +107,12 @@ class AbstractTearsheet(AbstractDocument, metaclass=ABCMeta):
         self.document.add_element(ChartElement(chart, figsize=self.full_image_size, dpi=self.dpi))
 
     def _add_rolling_vol_chart(self, timeseries_list):
-        def volatility(window):
-            return get_volatility(PricesSeries(window), self.frequency, annualise=True)
-
+        volatility = VolatilityMetric(self.frequency, annualise=True, series_type=PricesSeries)
         chart = self._get_rolling_chart(timeseries_list, volatility, "Volatility")
         self.document.add_element(ChartElement(chart, figsize=self.full_image_size, dpi=self.dpi))
 
     def _add_rolling_return_chart(self, timeseries_list):
-        def tot_return(window):
-            return PricesSeries(window).total_cumulative_return()
-
+        tot_return = TotalCumulativeReturnMetric(series_type=PricesSeries)
         chart = self._get_rolling_chart(timeseries_list, tot_return, "Return")
         self.document.add_element(ChartElement(chart, figsize=self.full_image_size, dpi=self.dpi))
 
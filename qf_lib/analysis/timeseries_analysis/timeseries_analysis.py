@@ -15,23 +15,9 @@
 from typing import List, Tuple, Sequence, Union
 
 from qf_lib.analysis.timeseries_analysis.timeseries_analysis_dto import TimeseriesAnalysisDTO
+from qf_lib.analysis.timeseries_analysis.timeseries_statistics_engine import TimeseriesStatisticsEngine
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.utils.dateutils.date_to_string import date_to_str
-from qf_lib.common.utils.miscellaneous.annualise_with_sqrt import annualise_with_sqrt
-from qf_lib.common.utils.miscellaneous.kelly import kelly
-from qf_lib.common.utils.ratios.calmar_ratio import calmar_ratio
-from qf_lib.common.utils.ratios.gain_to_pain_ratio import gain_to_pain_ratio
-from qf_lib.common.utils.ratios.omega_ratio import omega_ratio
-from qf_lib.common.utils.ratios.sharpe_ratio import sharpe_ratio
-from qf_lib.common.utils.ratios.sorino_ratio import sorino_ratio
-from qf_lib.common.utils.returns.avg_drawdown import avg_drawdown
-from qf_lib.common.utils.returns.avg_drawdown_duration import avg_drawdown_duration
-from qf_lib.common.utils.returns.cagr import cagr
-from qf_lib.common.utils.returns.cvar import cvar
-from qf_lib.common.utils.returns.log_to_simple_return import log_to_simple_return
-from qf_lib.common.utils.returns.max_drawdown import max_drawdown
-from qf_lib.common.utils.returns.simple_to_log_return import simple_to_log_return
-from qf_lib.common.utils.volatility.get_volatility import get_volatility
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
@@ -81,22 +67,52 @@ class TimeseriesAnalysis(TimeseriesAnalysisDTO):
         Analysed timeseries. It should be PriceSeries, SimpleReturnSeries or LogReturnSeries
     frequency: Frequency
         Corresponds to the frequency od data samples in the seres.
+    statistics: QFSeries
+        statistics of the timeseries computed in advance (row of the TimeseriesStatisticsEngine.get_statistics
+        result, e.g. when many timeseries are analysed at once, see: analyse_dataframe). If None, the statistics are
+        computed for the given timeseries
     """
 
-    def __init__(self, returns_timeseries: QFSeries, frequency: Frequency):
+    def __init__(self, returns_timeseries: QFSeries, frequency: Frequency, statistics: QFSeries = None):
         super().__init__()
 
         self.returns_tms = returns_timeseries.to_simple_returns()  # type: SimpleReturnsSeries
         self.frequency = frequency
-        self.start_date = self.returns_tms.first_valid_index()
-        self.end_date = self.returns_tms.index[-1]
 
         # calculate statistics
-        self._calculate_return()
-        self._calculate_volatility()
-        self._calculate_ratios()
-        self._calculate_risk_stats()
-        self._calculate_returns_stats()
+        if statistics is None:
+            engine = TimeseriesStatisticsEngine(frequency)
+            engine.update(self.returns_tms)
+            statistics = engine.get_statistics().iloc[0]
+
+        for name in TimeseriesStatisticsEngine.STATISTICS:
+            setattr(self, name, statistics[name])
+
+    @classmethod
+    def analyse_dataframe(cls, df: QFDataFrame, frequency: Frequency) -> List['TimeseriesAnalysis']:
+        """
+        Analyses all the timeseries (columns) of the data frame at once. The statistics of all the timeseries are
+        computed with the vectorized TimeseriesStatisticsEngine, which is much faster than analysing the timeseries
+        one by one.
+
+        Parameters
+        ----------
+        df
+            DataFrame of returns or prices of assets to be analysed
+        frequency
+            frequency of the returns or price sampling in the DataFrame
+
+        Returns
+        -------
+        List[TimeseriesAnalysis]
+            analyses of the columns of the data frame
+        """
+        returns_df = df.to_simple_returns()
+        engine = TimeseriesStatisticsEngine(frequency)
+        engine.update(returns_df)
+        statistics = engine.get_statistics()
+
+        return [cls(returns_df.iloc[:, i], frequency, statistics.iloc[i]) for i in range(returns_df.num_of_columns)]
 
     # ========= Methods presenting and aggregating results =========
 
@@ -210,7 +226,7 @@ class TimeseriesAnalysis(TimeseriesAnalysisDTO):
             (optional) frequency of the returns or price sampling in the DataFrame. By default daily frequency is used
 
         """
-        name_ta_list = [(name, TimeseriesAnalysis(asset_tms, frequency)) for name, asset_tms in df.iteritems()]
+        name_ta_list = list(zip(df.columns, TimeseriesAnalysis.analyse_dataframe(df, frequency)))
         first_ta = name_ta_list[0][1]
 
         result = "Analysed period: {} - {}, using {} data\n".format(
@@ -325,54 +341,3 @@ class TimeseriesAnalysis(TimeseriesAnalysisDTO):
         result_list.append(('#observ', 'No. of {} samples'.format(freq_str), len(self.returns_tms), ''))
 
         return result_list
-
-    # ========= Methods calculating statistics of the timeseries =========
-
-    def _calculate_return(self):
-        self.total_return = self.returns_tms.total_cumulative_return()
-        self.cagr = cagr(self.returns_tms, self.frequency)
-
-    def _calculate_volatility(self):
-        self.annualised_vol = get_volatility(self.returns_tms, self.frequency, annualise=True)
-
-        positive_returns_tms = self.returns_tms[self.returns_tms > 0]
-        negative_returns_tms = self.returns_tms[self.returns_tms < 0]
-
-        self.annualised_upside_vol = get_volatility(positive_returns_tms, self.frequency, annualise=True)
-        self.annualised_downside_vol = get_volatility(negative_returns_tms, self.frequency, annualise=True)
-
-    def _calculate_ratios(self):
-        self.sharpe_ratio = sharpe_ratio(self.returns_tms, self.frequency)
-        self.omega_ratio = omega_ratio(self.returns_tms)
-        self.calmar_ratio = calmar_ratio(self.returns_tms, self.frequency)
-        self.gain_to_pain_ratio = gain_to_pain_ratio(self.returns_tms)
-        self.sorino_ratio = sorino_ratio(self.returns_tms, self.frequency)
-
-    def _calculate_risk_stats(self):
-        self.cvar = cvar(self.returns_tms, 0.05)  # default is the 5% CVaR
-        log_cvar = simple_to_log_return(self.cvar)
-        annualised_log_cvar = annualise_with_sqrt(log_cvar, self.frequency)
-        self.annualised_cvar = log_to_simple_return(annualised_log_cvar)
-
-        prices_tms = self.returns_tms.to_prices()
-        self.max_drawdown = max_drawdown(prices_tms)
-        self.avg_drawdown = avg_drawdown(prices_tms)
-        self.avg_drawdown_duration = avg_drawdown_duration(prices_tms)
-
-    def _calculate_returns_stats(self):
-        self.best_return = max(self.returns_tms)
-        self.worst_return = min(self.returns_tms)
-
-        positive_returns = self.returns_tms[self.returns_tms > 0]
-        negative_returns = self.returns_tms[self.returns_tms < 0]
-
-        self.percentage_of_positive_returns = positive_returns.count() / self.returns_tms.count()
-        self.percentage_of_negative_returns = negative_returns.count() / self.returns_tms.count()
-
-        self.avg_positive_return = positive_returns.mean()
-        self.avg_negative_return = negative_returns.mean()
-
-        self.kelly = kelly(self.returns_tms)
-
-        self.skewness = self.returns_tms.skew()
-        self.kurtosis = self.returns_tms.kurt()
@@ -0,0 +1,348 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from typing import Union
+
+import numpy as np
+from pandas import DatetimeIndex, Index, Series, Timedelta
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.miscellaneous.constants import DAYS_PER_YEAR_AVG
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dataframe.simple_returns_dataframe import SimpleReturnsDataFrame
+from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
+
+
+class TimeseriesStatisticsEngine:
+    """
+    Computes the statistics of the TimeseriesAnalysis for one or many timeseries of simple returns in a single pass
+    over the returns. Instead of deriving the prices, drawdowns and aggregated returns separately for each statistic,
+    the engine keeps the running state of each timeseries: the last price and its running peak (drawdowns and
+    drawdown episodes), the accumulators of moments of returns (volatilities, skewness, kurtosis, kelly) and the sums
+    of monthly returns (gain to pain ratio).
+
+    The returns may be given all at once (e.g. a SimpleReturnsDataFrame of many strategies, which are processed
+    column-wise with vectorized operations) or in consecutive parts as new returns arrive (update may be called many
+    times, each time with the returns for the dates following the previously given ones). The statistics may be
+    obtained at any moment with get_statistics.
+
+    The CVaR is the only statistic which requires the returns themselves to be stored (the length of its tail grows
+    with the number of returns). Nan values are treated as missing returns: the price stays the same and the value
+    is excluded from all the statistics.
+
+    Parameters
+    ----------
+    frequency: Frequency
+        frequency of the returns
+    cvar_percentage: float
+        percentage defining the CVaR (e.g. 0.05 corresponds to the 5% CVaR)
+    """
+
+    STATISTICS = [
+        "start_date", "end_date", "total_return", "cagr", "annualised_vol", "annualised_upside_vol",
+        "annualised_downside_vol", "sharpe_ratio", "omega_ratio", "calmar_ratio", "gain_to_pain_ratio", "sorino_ratio",
+        "cvar", "annualised_cvar", "max_drawdown", "avg_drawdown", "avg_drawdown_duration", "best_return",
+        "worst_return", "percentage_of_positive_returns", "percentage_of_negative_returns", "avg_positive_return",
+        "avg_negative_return", "kelly", "skewness", "kurtosis"
+    ]
+
+    def __init__(self, frequency: Frequency, cvar_percentage: float = 0.05):
+        self.frequency = frequency
+        self.cvar_percentage = cvar_percentage
+        self.names = None  # type: Index
+        self.last_date = None
+
+    def update(self, returns: Union[SimpleReturnsSeries, SimpleReturnsDataFrame]):
+        """
+        Updates the statistics with the new simple returns.
+
+        Parameters
+        ----------
+        returns: SimpleReturnsSeries, SimpleReturnsDataFrame
+            simple returns of the timeseries (columns) for the dates following the previously given ones. The columns
+            should be the same in all the calls
+        """
+        if isinstance(returns, Series):
+            names = Index([returns.name])
+            values = returns.values.astype(float)[:, np.newaxis]
+        else:
+            names = returns.columns
+            values = returns.values.astype(float)
+        dates = DatetimeIndex(returns.index)
+
+        if len(dates) == 0:
+            return
+
+        if self.names is None:
+            self._initialise(names, dates[0])
+        elif not names.equals(self.names):
+            raise ValueError("The returns should be given for the same timeseries in all the updates")
+        elif dates[0] <= self.last_date:
+            raise ValueError("The returns should be given for the dates after {}".format(self.last_date))
+
+        is_valid = ~np.isnan(values)
+        returns_values = np.where(is_valid, values, 0.0)
+        log_returns = np.log1p(returns_values)
+
+        self._update_returns_statistics(dates, returns_values, log_returns, is_valid)
+        self._update_drawdowns(dates, returns_values, is_valid)
+        self._update_monthly_returns(dates, log_returns)
+
+        self._returns.append(values)
+        self.last_date = dates[-1]
+
+    def get_statistics(self) -> QFDataFrame:
+        """
+        Returns the statistics of all the timeseries given so far.
+
+        Returns
+        -------
+        QFDataFrame
+            statistics (columns, see: STATISTICS) of the timeseries (index). The statistics have the same meaning as
+            the corresponding fields of the TimeseriesAnalysis
+        """
+        assert self.names is not None, "No returns were given"
+
+        years = ((self.last_date - self._initial_date) / Timedelta("1 days")) / DAYS_PER_YEAR_AVG
+        total_return = self._price - 1.0
+        cagr = np.power(self._price, 1.0 / years) - 1.0
+        sqrt_occurrences_in_year = np.sqrt(self.frequency.occurrences_in_year)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annualised_vol = self._log_returns_moments.std() * sqrt_occurrences_in_year
+            annualised_upside_vol = self._positive_log_returns_moments.std() * sqrt_occurrences_in_year
+            annualised_downside_vol = self._negative_log_returns_moments.std() * sqrt_occurrences_in_year
+
+            # The drawdown which has not been recovered yet lasts until the last date
+            in_drawdown = ~self._is_at_peak
+            num_of_drawdowns = self._num_of_drawdowns + in_drawdown
+            open_drawdown_duration = (self.last_date.value - self._last_peak_time) / Timedelta("1 days").value
+            drawdowns_durations_sum = self._drawdowns_durations_sum + np.where(in_drawdown, open_drawdown_duration, 0)
+            avg_drawdown_duration = np.where(num_of_drawdowns > 0, drawdowns_durations_sum / num_of_drawdowns, 0.0)
+
+            # The current month is included in the gain to pain ratio even though it is not completed
+            last_monthly_return = np.expm1(self._month_log_return)
+            monthly_returns_sum = self._monthly_returns_sum + last_monthly_return
+            negative_monthly_returns_sum = np.abs(
+                self._negative_monthly_returns_sum + np.minimum(last_monthly_return, 0.0))
+            gain_to_pain_ratio = np.where(
+                negative_monthly_returns_sum != 0, monthly_returns_sum / negative_monthly_returns_sum, float("inf"))
+
+            cvar = self._cvar()
+            num_of_returns = self._simple_returns_moments.count
+            positive_count = self._positive_log_returns_moments.count
+            negative_count = self._negative_log_returns_moments.count
+
+            statistics = {
+                "start_date": self._first_valid_dates,
+                "end_date": self.last_date,
+                "total_return": total_return,
+                "cagr": cagr,
+                "annualised_vol": annualised_vol,
+                "annualised_upside_vol": annualised_upside_vol,
+                "annualised_downside_vol": annualised_downside_vol,
+                "sharpe_ratio": np.log(cagr + 1) / annualised_vol,
+                "omega_ratio": self._positive_returns_sum / -self._negative_returns_sum,
+                "calmar_ratio": cagr / self._max_drawdown,
+                "gain_to_pain_ratio": gain_to_pain_ratio,
+                "sorino_ratio": cagr / annualised_downside_vol,
+                "cvar": cvar,
+                "annualised_cvar": np.expm1(np.log1p(cvar) * sqrt_occurrences_in_year),
+                "max_drawdown": self._max_drawdown,
+                "avg_drawdown": self._drawdowns_sum / self._num_of_prices,
+                "avg_drawdown_duration": avg_drawdown_duration,
+                "best_return": self._best_return,
+                "worst_return": self._worst_return,
+                "percentage_of_positive_returns": positive_count / num_of_returns,
+                "percentage_of_negative_returns": negative_count / num_of_returns,
+                "avg_positive_return": self._positive_returns_sum / positive_count,
+                "avg_negative_return": self._negative_returns_sum / negative_count,
+                "kelly": self._simple_returns_moments.mean / self._simple_returns_moments.variance(),
+                "skewness": self._simple_returns_moments.skewness(),
+                "kurtosis": self._simple_returns_moments.kurtosis()
+            }
+
+        return QFDataFrame(data=statistics, index=self.names, columns=self.STATISTICS)
+
+    def _initialise(self, names: Index, first_date):
+        num_of_series = len(names)
+        self.names = names
+
+        # The prices start one period before the first return (see: ReturnsSeries.to_prices)
+        self._initial_date = first_date - Timedelta(self.frequency.nr_of_calendar_days(), unit="D")
+        self._first_valid_dates = np.full(num_of_series, np.datetime64("NaT"), dtype="datetime64[ns]")
+        self._returns = []  # type: List[np.ndarray]
+
+        self._simple_returns_moments = _Moments(num_of_series)
+        self._log_returns_moments = _Moments(num_of_series)
+        self._positive_log_returns_moments = _Moments(num_of_series)
+        self._negative_log_returns_moments = _Moments(num_of_series)
+        self._positive_returns_sum = np.zeros(num_of_series)
+        self._negative_returns_sum = np.zeros(num_of_series)
+        self._best_return = np.full(num_of_series, np.nan)
+        self._worst_return = np.full(num_of_series, np.nan)
+
+        self._price = np.ones(num_of_series)
+        self._peak = np.ones(num_of_series)
+        self._max_drawdown = np.zeros(num_of_series)
+        self._drawdowns_sum = np.zeros(num_of_series)
+        self._num_of_prices = np.ones(num_of_series)
+        self._is_at_peak = np.ones(num_of_series, dtype=bool)
+        self._last_peak_time = np.full(num_of_series, self._initial_date.value, dtype=np.int64)
+        self._num_of_drawdowns = np.zeros(num_of_series)
+        self._drawdowns_durations_sum = np.zeros(num_of_series)
+
+        self._month = None
+        self._month_log_return = np.zeros(num_of_series)
+        self._monthly_returns_sum = np.zeros(num_of_series)
+        self._negative_monthly_returns_sum = np.zeros(num_of_series)
+
+    def _update_returns_statistics(self, dates: DatetimeIndex, returns: np.ndarray, log_returns: np.ndarray,
+                                   is_valid: np.ndarray):
+        has_valid_returns = is_valid.any(axis=0)
+        first_valid_dates = dates.values[np.argmax(is_valid, axis=0)]
+        self._first_valid_dates = np.where(
+            np.isnat(self._first_valid_dates) & has_valid_returns, first_valid_dates, self._first_valid_dates)
+
+        is_positive = is_valid & (returns > 0)
+        is_negative = is_valid & (returns < 0)
+        self._simple_returns_moments.update(returns, is_valid)
+        self._log_returns_moments.update(log_returns, is_valid)
+        self._positive_log_returns_moments.update(log_returns, is_positive)
+        self._negative_log_returns_moments.update(log_returns, is_negative)
+        self._positive_returns_sum += np.where(is_positive, returns, 0.0).sum(axis=0)
+        self._negative_returns_sum += np.where(is_negative, returns, 0.0).sum(axis=0)
+
+        best_return = np.where(has_valid_returns, np.where(is_valid, returns, -np.inf).max(axis=0), np.nan)
+        worst_return = np.where(has_valid_returns, np.where(is_valid, returns, np.inf).min(axis=0), np.nan)
+        self._best_return = np.fmax(self._best_return, best_return)
+        self._worst_return = np.fmin(self._worst_return, worst_return)
+
+    def _update_drawdowns(self, dates: DatetimeIndex, returns: np.ndarray, is_valid: np.ndarray):
+        prices = self._price * np.cumprod(1.0 + returns, axis=0)
+        peaks = np.maximum(self._peak, np.maximum.accumulate(prices, axis=0))
+        drawdowns = np.where(is_valid, 1.0 - prices / peaks, 0.0)
+
+        self._max_drawdown = np.maximum(self._max_drawdown, drawdowns.max(axis=0))
+        self._drawdowns_sum += drawdowns.sum(axis=0)
+        self._num_of_prices += is_valid.sum(axis=0)
+
+        # A drawdown starts at the last peak and ends at the first date, on which the price reaches the peak again
+        # (see: list_of_max_drawdowns)
+        times = dates.values.astype("datetime64[ns]").astype(np.int64)
+        rows = np.arange(len(dates))[:, np.newaxis]
+        is_at_peak = is_valid & (drawdowns == 0)
+        last_peak_rows = np.maximum.accumulate(np.where(is_at_peak, rows, -1), axis=0)
+
+        previous_peak_rows = np.vstack([np.full((1, len(self.names)), -1), last_peak_rows[:-1]])
+        previous_peak_times = np.where(previous_peak_rows >= 0, times[previous_peak_rows], self._last_peak_time)
+        was_at_peak = np.vstack([self._is_at_peak[np.newaxis, :], is_at_peak[:-1]])
+        drawdowns_ends = is_at_peak & ~was_at_peak
+
+        self._num_of_drawdowns += drawdowns_ends.sum(axis=0)
+        self._drawdowns_durations_sum += np.where(
+            drawdowns_ends, times[:, np.newaxis] - previous_peak_times, 0).sum(axis=0) / Timedelta("1 days").value
+
+        self._last_peak_time = np.where(last_peak_rows[-1] >= 0, times[last_peak_rows[-1]], self._last_peak_time)
+        self._is_at_peak = is_at_peak[-1]
+        self._price = prices[-1]
+        self._peak = peaks[-1]
+
+    def _update_monthly_returns(self, dates: DatetimeIndex, log_returns: np.ndarray):
+        months = np.asarray(dates.year * 12 + dates.month)
+        if self._month is not None and self._month != months[0]:
+            self._add_monthly_returns(self._month_log_return[np.newaxis, :])
+            self._month_log_return = np.zeros(len(self.names))
+
+        months_starts = np.concatenate([[0], np.flatnonzero(np.diff(months)) + 1])
+        monthly_log_returns = np.add.reduceat(log_returns, months_starts, axis=0)
+        monthly_log_returns[0] += self._month_log_return
+
+        # The last month may be continued in the next update
+        self._add_monthly_returns(monthly_log_returns[:-1])
+        self._month_log_return = monthly_log_returns[-1]
+        self._month = months[-1]
+
+    def _add_monthly_returns(self, monthly_log_returns: np.ndarray):
+        monthly_returns = np.expm1(monthly_log_returns)
+        self._monthly_returns_sum += monthly_returns.sum(axis=0)
+        self._negative_monthly_returns_sum += np.minimum(monthly_returns, 0.0).sum(axis=0)
+
+    def _cvar(self) -> np.ndarray:
+        if len(self._returns) > 1:
+            self._returns = [np.concatenate(self._returns)]
+
+        sorted_returns = np.sort(self._returns[0], axis=0)  # nans are placed at the end
+        num_of_returns = (~np.isnan(sorted_returns)).sum(axis=0)
+        tail_lengths = np.round(num_of_returns * self.cvar_percentage).astype(int)
+
+        tail_sums = np.cumsum(np.nan_to_num(sorted_returns), axis=0)
+        tail_sums = tail_sums[np.maximum(tail_lengths - 1, 0), np.arange(len(self.names))]
+        return np.where(tail_lengths > 0, tail_sums / tail_lengths, np.nan)
+
+
+class _Moments:
+    """
+    Accumulator of the count, mean and central moments (up to the 4th one) of values in each column. The moments of
+    consecutive parts of values are merged with the pairwise formulas of Chan et al., which are numerically stable.
+    """
+
+    def __init__(self, num_of_columns: int):
+        self.count = np.zeros(num_of_columns)
+        self.mean = np.zeros(num_of_columns)
+        self.m2 = np.zeros(num_of_columns)
+        self.m3 = np.zeros(num_of_columns)
+        self.m4 = np.zeros(num_of_columns)
+
+    def update(self, values: np.ndarray, mask: np.ndarray):
+        count_b = mask.sum(axis=0).astype(float)
+        mean_b = np.where(mask, values, 0.0).sum(axis=0) / np.maximum(count_b, 1.0)
+        centered = np.where(mask, values - mean_b, 0.0)
+        m2_b = (centered ** 2).sum(axis=0)
+        m3_b = (centered ** 3).sum(axis=0)
+        m4_b = (centered ** 4).sum(axis=0)
+
+        count_a = self.count
+        count = count_a + count_b
+        n = np.maximum(count, 1.0)
+        delta = mean_b - self.mean
+
+        self.m4 = self.m4 + m4_b + delta ** 4 * count_a * count_b * (count_a ** 2 - count_a * count_b + count_b ** 2) \
+            / n ** 3 + 6 * delta ** 2 * (count_a ** 2 * m2_b + count_b ** 2 * self.m2) / n ** 2 \
+            + 4 * delta * (count_a * m3_b - count_b * self.m3) / n
+        self.m3 = self.m3 + m3_b + delta ** 3 * count_a * count_b * (count_a - count_b) / n ** 2 \
+            + 3 * delta * (count_a * m2_b - count_b * self.m2) / n
+        self.m2 = self.m2 + m2_b + delta ** 2 * count_a * count_b / n
+        self.mean = self.mean + delta * count_b / n
+        self.count = count
+
+    def variance(self) -> np.ndarray:
+        """ Sample variance (with 1 degree of freedom). """
+        return np.where(self.count >= 2, self.m2 / (self.count - 1), np.nan)
+
+    def std(self) -> np.ndarray:
+        """ Sample standard deviation (with 1 degree of freedom). """
+        return np.sqrt(self.variance())
+
+    def skewness(self) -> np.ndarray:
+        """ Bias-corrected sample skewness (as computed by pandas). """
+        n = self.count
+        skewness = n * np.sqrt(n - 1) / (n - 2) * self.m3 / self.m2 ** 1.5
+        return np.where(n >= 3, np.where(self.m2 == 0, 0.0, skewness), np.nan)
+
+    def kurtosis(self) -> np.ndarray:
+        """ Bias-corrected sample excess kurtosis (as computed by pandas). """
+        n = self.count
+        kurtosis = n * (n + 1) * (n - 1) * self.m4 / ((n - 2) * (n - 3) * self.m2 ** 2) \
+            - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        return np.where(n >= 4, np.where(self.m2 == 0, 0.0, kurtosis), np.nan)
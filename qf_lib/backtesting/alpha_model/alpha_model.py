@@ -12,18 +12,23 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import math
 from abc import abstractmethod, ABCMeta
 from datetime import datetime
+from typing import Sequence, Dict, List
 
-from numpy import nan
+from numpy import nan, isnan, ndarray
+from pandas import DatetimeIndex
 
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
 from qf_lib.backtesting.signals.signal import Signal
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
-from qf_lib.common.utils.miscellaneous.average_true_range import average_true_range
+from qf_lib.common.utils.miscellaneous.average_true_range import average_true_range, average_true_range_per_ticker
+from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.data_providers.data_provider import DataProvider
 
 
@@ -77,6 +82,46 @@ class AlphaModel(metaclass=ABCMeta):
                         alpha_model=self)
         return signal
 
+    def get_signals(self, tickers: Sequence[Ticker], current_exposures: Dict[Ticker, Exposure], current_time: datetime,
+                    frequency: Frequency) -> List[Signal]:
+        """
+        Returns the Signals calculated for all the given tickers at once. Uses calculate_exposures, so it can be used
+        only by the models, which implement it (see supports_batched_signals). The fractions at risk and the last
+        available prices are also requested for all the tickers at once.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            tickers of assets for which the Signals should be generated
+        current_exposures: Dict[Ticker, Exposure]
+            dictionary mapping each of the tickers onto its actual exposure
+        current_time: datetime
+            current time, which is afterwards recorded inside each of the Signals
+        frequency: Frequency
+            frequency of data obtained by the data provider for signals calculation
+
+        Returns
+        -------
+        List[Signal]
+            Signals being the suggestions for the next trading period (in the order of the tickers)
+        """
+        if not tickers:
+            return []
+
+        suggested_exposures = self.calculate_exposures(tickers, current_exposures, current_time, frequency)
+        fractions_at_risk = self.calculate_fractions_at_risk(tickers, current_time, frequency)
+        last_available_prices = self.data_provider.get_last_available_price(tickers, frequency, current_time)
+
+        return [Signal(ticker, suggested_exposures[ticker], fractions_at_risk[ticker], last_available_prices[ticker],
+                       current_time, alpha_model=self) for ticker in tickers]
+
+    def supports_batched_signals(self) -> bool:
+        """
+        Returns True if the model implements calculate_exposures and thus all its signals may be generated at once
+        using get_signals.
+        """
+        return type(self).calculate_exposures is not AlphaModel.calculate_exposures
+
     @abstractmethod
     def calculate_exposure(self, ticker: Ticker, current_exposure: Exposure, current_time: datetime,
                            frequency: Frequency) -> Exposure:
@@ -100,6 +145,69 @@ class AlphaModel(metaclass=ABCMeta):
         """
         pass
 
+    def calculate_exposures(self, tickers: Sequence[Ticker], current_exposures: Dict[Ticker, Exposure],
+                            current_time: datetime, frequency: Frequency) -> Dict[Ticker, Exposure]:
+        """
+        Optional, vectorized version of calculate_exposure, which returns the expected Exposures of all the given
+        tickers at once (e.g. computed using one QFDataArray of prices for the whole universe). If a model implements
+        this function, the AlphaModelStrategy generates all its signals at once using get_signals.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            Tickers for which suggested signal exposures are calculated.
+        current_exposures: Dict[Ticker, Exposure]
+            dictionary mapping each of the tickers onto its actual exposure
+        current_time: datetime
+            The time of the exposures calculation
+        frequency: Frequency
+            frequency of data obtained by the data provider for signals calculation
+
+        Returns
+        -------
+        Dict[Ticker, Exposure]
+            dictionary mapping each of the tickers onto its expected exposure
+        """
+        raise NotImplementedError("{} does not support the batched exposures calculation".format(self))
+
+    @classmethod
+    def supports_exposures_history(cls) -> bool:
+        """
+        Returns True if the model implements calculate_exposures_history and thus all its exposures over the whole
+        backtest may be computed at once (e.g. by the FastAlphaModelTester).
+        """
+        return cls.calculate_exposures_history is not AlphaModel.calculate_exposures_history
+
+    def calculate_exposures_history(self, tickers: Sequence[Ticker], dates: DatetimeIndex, prices: QFDataArray,
+                                    frequency: Frequency) -> ndarray:
+        """
+        Optional, vectorized version of calculate_exposure used by the FastAlphaModelTester, which returns the expected
+        Exposures of all the given tickers for all the given dates at once, computed using the preloaded prices.
+
+        The exposure at dates[i] should be computed only using the prices, which are available at dates[i] (in the
+        same way as the DataHandler would return them at that time), and assuming that the exposures suggested at the
+        previous date are the current exposures.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            Tickers for which suggested exposures are calculated.
+        dates: DatetimeIndex
+            all the times of the exposures calculation
+        prices: QFDataArray
+            OHLCV prices of all the tickers, starting before the first of the dates (to allow the computation of the
+            first exposures) and ending at the end of the backtest
+        frequency: Frequency
+            frequency of the prices
+
+        Returns
+        -------
+        ndarray
+            array of shape (len(dates), len(tickers)) containing the values of the expected Exposures (e.g.
+            Exposure.LONG.value)
+        """
+        raise NotImplementedError("{} does not support the calculation of the exposures history".format(self))
+
     def calculate_fraction_at_risk(self, ticker: Ticker, current_time: datetime, frequency: Frequency) -> float:
         """
         Returns the float value which determines the risk factor for an AlphaModel and a specified Ticker,
@@ -128,6 +236,35 @@ class AlphaModel(metaclass=ABCMeta):
         time_period = 20
         return self._atr_fraction_at_risk(ticker, time_period, current_time, frequency)
 
+    def calculate_fractions_at_risk(self, tickers: Sequence[Ticker], current_time: datetime, frequency: Frequency) \
+            -> Dict[Ticker, float]:
+        """
+        Returns the fractions at risk of all the given tickers (see calculate_fraction_at_risk). In case if the model
+        uses the default, ATR based fraction at risk, the prices of all the tickers are requested at once and the ATR
+        values are computed in a vectorized way. Otherwise calculate_fraction_at_risk is called for each ticker.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            Tickers for which the calculation should be made
+        current_time: datetime
+            The time of the fraction at risk calculation
+        frequency: Frequency
+            frequency of data obtained by the data provider for calculation
+
+        Returns
+        -------
+        Dict[Ticker, float]
+            dictionary mapping each of the tickers onto its fraction at risk
+        """
+        model_type = type(self)
+        if model_type.calculate_fraction_at_risk is AlphaModel.calculate_fraction_at_risk and \
+                model_type._atr_fraction_at_risk is AlphaModel._atr_fraction_at_risk:
+            time_period = 20
+            return self._atr_fractions_at_risk(tickers, time_period, current_time, frequency)
+
+        return {ticker: self.calculate_fraction_at_risk(ticker, current_time, frequency) for ticker in tickers}
+
     def _atr_fraction_at_risk(self, ticker, time_period, current_time, frequency):
         """
         Parameters
@@ -158,6 +295,47 @@ class AlphaModel(metaclass=ABCMeta):
             self.logger.error(f"Could not calculate the fraction_at_risk for the ticker {ticker.name}", exc_info=True)
             return nan
 
+    def _atr_fractions_at_risk(self, tickers: Sequence[Ticker], time_period: int, current_time: datetime,
+                               frequency: Frequency) -> Dict[Ticker, float]:
+        """
+        Vectorized version of _atr_fraction_at_risk. The prices of all tickers are downloaded at once, over a period
+        which should contain the time_period + 1 bars. For the tickers, for which the ATR could not be computed using
+        these prices (e.g. not enough bars were available), _atr_fraction_at_risk is used.
+        """
+        num_of_bars_needed = time_period + 1
+        fields = [PriceField.High, PriceField.Low, PriceField.Close]
+
+        if frequency == Frequency.IRREGULAR:
+            # The period containing the needed bars can't be estimated
+            atr_values = {}
+        else:
+            if frequency <= Frequency.DAILY:
+                # Number of calendar days per bar, e.g. 365 / 252 for daily or 365 / 52 for weekly bars
+                days_per_bar = 365 / frequency.occurrences_in_year
+                nr_of_days_to_go_back = math.ceil(num_of_bars_needed * days_per_bar + 10)
+            else:
+                bars_per_day = frequency.occurrences_in_year / Frequency.DAILY.occurrences_in_year
+                nr_of_days_to_go_back = math.ceil(num_of_bars_needed / bars_per_day + 7)
+            start_date = current_time - RelativeDelta(days=nr_of_days_to_go_back, hour=0, minute=0, second=0,
+                                                      microsecond=0)
+
+            try:
+                prices_data_array = self.data_provider.get_price(list(tickers), fields, start_date, current_time,
+                                                                 frequency)
+                atr_values = average_true_range_per_ticker(prices_data_array, num_of_bars_needed, normalized=True)
+            except ValueError:
+                self.logger.warning("Could not calculate the fractions_at_risk for all tickers at once. They will be "
+                                    "calculated for each ticker separately.", exc_info=True)
+                atr_values = {}
+
+        fractions_at_risk = {}
+        for ticker in tickers:
+            atr_value = atr_values.get(ticker, nan)
+            fractions_at_risk[ticker] = atr_value * self.risk_estimation_factor if not isnan(atr_value) else \
+                self._atr_fraction_at_risk(ticker, time_period, current_time, frequency)
+
+        return fractions_at_risk
+
     def __str__(self):
         return self.__class__.__name__
 
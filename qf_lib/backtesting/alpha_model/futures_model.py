@@ -34,6 +34,7 @@ from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
 from qf_lib.containers.futures.futures_adjustment_method import FuturesAdjustmentMethod
 from qf_lib.containers.futures.futures_chain import FuturesChain
+from qf_lib.containers.futures.incremental_futures_chain import IncrementalFuturesChain
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.data_providers.data_provider import DataProvider
 
@@ -56,15 +57,19 @@ class FuturesModel(AlphaModel, metaclass=abc.ABCMeta):
     cache_path: Optional[str]
         path to a directory, which could be used by the model for caching purposes. If provided, the model will cache
         the outputs of get_data function.
+    use_incremental_futures_chain: bool
+        if True, the IncrementalFuturesChain is used to build the futures chains, so that the chains are not regenerated
+        on each expiration of a contract. Default: False
     """
 
     def __init__(self, num_of_bars_needed: int, risk_estimation_factor: float, data_provider: DataProvider,
-                 cache_path: Optional[str] = None):
+                 cache_path: Optional[str] = None, use_incremental_futures_chain: bool = False):
 
         super().__init__(risk_estimation_factor, data_provider)
 
         # Precomputed futures chains
         self.futures_data: Dict[Ticker, FuturesChain] = {}
+        self._futures_chain_type = IncrementalFuturesChain if use_incremental_futures_chain else FuturesChain
         if cache_path is not None:
             memory = Memory(cache_path, verbose=0)
             self.get_data = memory.cache(self.get_data, ignore=['self'])
@@ -114,8 +119,8 @@ class FuturesModel(AlphaModel, metaclass=abc.ABCMeta):
                 data_frame = self.futures_data[ticker].get_price(PriceField.ohlcv(), start_date, end_date, frequency)
             except KeyError:
                 # Ticker was not preloaded or the FutureChain has expired
-                self.futures_data[ticker] = FuturesChain(ticker, self.data_provider,
-                                                         FuturesAdjustmentMethod.BACK_ADJUSTED)
+                self.futures_data[ticker] = self._futures_chain_type(ticker, self.data_provider,
+                                                                     FuturesAdjustmentMethod.BACK_ADJUSTED)
 
                 data_frame = self.futures_data[ticker].get_price(PriceField.ohlcv(), start_date, end_date, frequency)
             if aggregate_volume:
@@ -15,8 +15,10 @@ from abc import abstractmethod
 from datetime import datetime
 from typing import Union, Sequence, Optional, Dict
 
+import numpy as np
 from pandas import date_range
 
+from qf_lib.backtesting.data_handler.historical_price_cache import HistoricalPriceCache, RollingWindow
 from qf_lib.common.enums.expiration_date_field import ExpirationDateField
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
@@ -32,6 +34,7 @@ from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.data_providers.data_provider import DataProvider
 from qf_lib.data_providers.helpers import normalize_data_array
 from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 
 
 class DataHandler(DataProvider):
@@ -41,6 +44,11 @@ class DataHandler(DataProvider):
 
     DataHandler should be used by all the Backtester's components (even in the live trading setup).
 
+    After the data bundle is preloaded (see use_data_bundle), the results of historical_price are cached as rolling
+    windows of bars. Consecutive calls with the same tickers, fields, number of bars and frequency only append the
+    bars which were closed since the previous call, instead of slicing the whole window again. The cache is indexed
+    by the end date without look-ahead, so it never contains any data from the future.
+
     The goal of a DataHandler is to provide backtester's components with financial data. It makes sure that
     no data from the future (relative to a "current" time of a backtester) is being accessed, that is: that there
     is no look-ahead bias.
@@ -62,9 +70,11 @@ class DataHandler(DataProvider):
 
         self.timer = timer
         self.is_optimised = False
+        self._historical_price_cache = HistoricalPriceCache()
 
     def use_data_bundle(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
-                        start_date: datetime, end_date: datetime, frequency: Frequency = Frequency.DAILY):
+                        start_date: datetime, end_date: datetime, frequency: Frequency = Frequency.DAILY,
+                        use_array_storage: bool = False):
         """
         Optimises running of the backtest. All the data will be downloaded before the backtest.
         Note that requesting during the backtest any other ticker or price field than the ones in the params
@@ -82,6 +92,9 @@ class DataHandler(DataProvider):
             last date that should be downloaded
         frequency
             frequency of the data
+        use_array_storage
+            if True, the data bundle is kept in a contiguous numpy array, which speeds up slicing of the data
+            (see PrefetchingDataProvider)
         """
         assert not self.is_optimised, "Multiple calls on use_data_bundle() are forbidden"
 
@@ -92,7 +105,28 @@ class DataHandler(DataProvider):
         self.default_frequency = frequency
 
         self.data_provider = PrefetchingDataProvider(self.data_provider, tickers, fields, start_date, end_date,
-                                                     frequency)
+                                                     frequency, use_array_storage)
+        self._historical_price_cache.clear()
+        self.is_optimised = True
+
+    def use_preset_data_provider(self, data_provider: PresetDataProvider):
+        """
+        Optimises running of the backtest using data, which was already preloaded into a PresetDataProvider (e.g. a
+        data bundle shared between multiple backtests). Contrary to use_data_bundle, no data is downloaded. Requesting
+        during the backtest any data, which is not available in the data_provider, will result in an Exception.
+
+        Parameters
+        ----------
+        data_provider: PresetDataProvider
+            data provider containing the preloaded data bundle
+        """
+        assert not self.is_optimised, "Multiple calls on use_data_bundle() or use_preset_data_provider() are forbidden"
+
+        self._check_frequency(data_provider.frequency)
+        self.default_frequency = data_provider.frequency
+
+        self.data_provider = data_provider
+        self._historical_price_cache.clear()
         self.is_optimised = True
 
     def historical_price(self, tickers: Union[Ticker, Sequence[Ticker]],
@@ -102,7 +136,28 @@ class DataHandler(DataProvider):
 
         frequency = frequency or self.default_frequency
         end_date = self._get_end_date_without_look_ahead(end_date, frequency)
-        return self.data_provider.historical_price(tickers, fields, nr_of_bars, end_date, frequency)
+
+        if not self._is_historical_price_cacheable(tickers, nr_of_bars, frequency):
+            return self.data_provider.historical_price(tickers, fields, nr_of_bars, end_date, frequency)
+
+        tickers_list, got_single_ticker = convert_to_list(tickers, Ticker)
+        fields_list, got_single_field = convert_to_list(fields, PriceField)
+        key = HistoricalPriceCache.create_key(tickers_list, got_single_ticker, fields_list, got_single_field,
+                                              nr_of_bars, frequency)
+        window = self._historical_price_cache.get(key)
+
+        if window is None or end_date < window.end_date:
+            result = self.data_provider.historical_price(tickers, fields, nr_of_bars, end_date, frequency)
+            if window is None:
+                self._historical_price_cache.add(key, RollingWindow(result, tickers_list, fields_list, end_date))
+            return result
+
+        if end_date > window.end_date:
+            dates, values = self._get_new_bars(tickers_list, fields_list, window.end_date + frequency.time_delta(),
+                                               end_date, frequency)
+            window.append(dates, values, end_date)
+
+        return window.to_container()
 
     def get_price(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
                   start_date: datetime, end_date: datetime = None, frequency: Frequency = None) -> \
@@ -206,6 +261,32 @@ class DataHandler(DataProvider):
         """ Verify if the provided frequency is compliant with the type of Data Handler used. """
         pass
 
+    def _is_historical_price_cacheable(self, tickers: Union[Ticker, Sequence[Ticker]], nr_of_bars: int,
+                                       frequency: Frequency) -> bool:
+        """ The cache is used only for the preloaded data (which does not change during the backtest), for requests
+        of more than one bar (single bar results do not contain the date) and for the frequency of the preloaded data
+        (aggregated bars could differ depending on the range of the request). FutureTickers are not cached, as the
+        specific ticker they point to changes on every roll. """
+        tickers, _ = convert_to_list(tickers, Ticker)
+        return self.is_optimised and nr_of_bars > 1 and frequency == self.data_provider.frequency and \
+            not any(isinstance(ticker, FutureTicker) for ticker in tickers)
+
+    def _get_new_bars(self, tickers: Sequence[Ticker], fields: Sequence[PriceField], start_date: datetime,
+                      end_date: datetime, frequency: Frequency):
+        """ Returns dates and values (of shape [dates, tickers, fields]) of the bars between start_date and end_date,
+        skipping the bars for which no data is available. """
+        if self._got_single_date(start_date, end_date, frequency):
+            prices = self.data_provider.get_price(tickers, fields, start_date, start_date, frequency)
+            dates = np.array([start_date], dtype="datetime64[ns]")
+            values = np.asarray(prices.values, dtype=np.float64).reshape((1, len(tickers), len(fields)))
+        else:
+            prices = self.data_provider.get_price(tickers, fields, start_date, end_date, frequency)
+            dates = prices.dates.values
+            values = np.asarray(prices.values, dtype=np.float64)
+
+        is_bar_available = ~np.isnan(values).all(axis=(1, 2))
+        return dates[is_bar_available], values[is_bar_available]
+
     def _empty_container(self, tickers, fields, start_date, end_date, frequency):
         tickers, got_single_ticker = convert_to_list(tickers, Ticker)
         fields, got_single_field = convert_to_list(fields, (str, PriceField))
@@ -0,0 +1,110 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Sequence, Union, Tuple, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.prices_series import PricesSeries
+
+
+class RollingWindow:
+    """
+    Ring buffer keeping the last nr_of_bars bars of prices of the given tickers and fields, together with the
+    layout of the container returned by DataProvider.historical_price, so that the same container can be rebuilt
+    after appending new bars.
+
+    Parameters
+    ----------
+    container: PricesSeries, PricesDataFrame, QFDataArray
+        result of the DataProvider.historical_price function (with nr_of_bars > 1), used to fill the buffer
+    tickers: Sequence[Ticker]
+        list of tickers which were requested
+    fields: Sequence[PriceField]
+        list of fields which were requested
+    end_date: datetime
+        end date of the historical_price request, which returned the container
+    """
+
+    def __init__(self, container: Union[PricesSeries, PricesDataFrame, QFDataArray], tickers: Sequence[Ticker],
+                 fields: Sequence[PriceField], end_date: datetime):
+        self._template = container
+        self.end_date = end_date
+
+        nr_of_bars = container.shape[0]
+        values = np.asarray(container.values, dtype=np.float64).reshape((nr_of_bars, len(tickers), len(fields)))
+        dates = pd.DatetimeIndex(container.dates.values if isinstance(container, QFDataArray) else container.index)
+
+        self._values = values.copy()
+        self._dates = dates.values.astype("datetime64[ns]")
+        self._head = 0  # position of the oldest bar, at which the next bar will be written
+
+    def append(self, dates: np.ndarray, values: np.ndarray, end_date: datetime):
+        """ Appends the new bars (values of shape [dates, tickers, fields]), overwriting the oldest ones. """
+        nr_of_bars = self._values.shape[0]
+        for date, bar in zip(dates[-nr_of_bars:], values[-nr_of_bars:]):
+            self._values[self._head] = bar
+            self._dates[self._head] = date
+            self._head = (self._head + 1) % nr_of_bars
+        self.end_date = end_date
+
+    def to_container(self) -> Union[PricesSeries, PricesDataFrame, QFDataArray]:
+        """ Returns the buffered bars (in chronological order) in the same form as the initial container. """
+        order = np.roll(np.arange(self._values.shape[0]), -self._head)
+        values = self._values[order]
+        dates = pd.DatetimeIndex(self._dates[order], name=DATES)
+
+        template = self._template
+        if isinstance(template, QFDataArray):
+            return QFDataArray.create(dates, template.tickers.values, template.fields.values, values,
+                                      name=template.name)
+        elif isinstance(template, PricesDataFrame):
+            return PricesDataFrame(data=values.reshape((len(dates), -1)), index=dates, columns=template.columns)
+        else:
+            return PricesSeries(data=values.reshape(-1), index=dates, name=template.name)
+
+
+class HistoricalPriceCache:
+    """
+    Cache of the rolling windows of bars returned by the historical_price function. Each window is identified by the
+    requested tickers, fields, number of bars and frequency (together with the information whether a single ticker /
+    field was requested, as it determines the type of the returned container).
+    """
+
+    def __init__(self):
+        self._windows = dict()  # type: Dict[Tuple[Hashable, ...], RollingWindow]
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[RollingWindow]:
+        return self._windows.get(key)
+
+    def add(self, key: Tuple[Hashable, ...], window: RollingWindow):
+        self._windows[key] = window
+
+    def clear(self):
+        self._windows.clear()
+
+    @staticmethod
+    def create_key(tickers: Sequence[Ticker], got_single_ticker: bool, fields: Sequence[PriceField],
+                   got_single_field: bool, nr_of_bars: int, frequency: Frequency) -> Tuple[Hashable, ...]:
+        return tuple(tickers), got_single_ticker, tuple(fields), got_single_field, nr_of_bars, frequency
+
+    def __len__(self):
+        return len(self._windows)
@@ -0,0 +1,140 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Sequence, Callable, Iterable, List, Hashable, Any, Union
+
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.timer import Timer
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.containers.series.qf_series import QFSeries
+
+
+class MarketSnapshot:
+    """
+    Cache of the market data used by the simulated execution components (executors, slippage models, orders filters
+    and the portfolio) during one timer tick. Each kind of data (the current bars, the history of prices within a
+    certain range and the last available prices) is requested at most once per timer tick for all tickers of open
+    orders and open positions, together with the tickers requested by the component. Subsequent requests for any
+    subset of these tickers are served from the cache. The cache is cleared as soon as the time of the timer changes.
+
+    The tickers of open orders and open positions are provided by the tickers sources (see add_tickers_source).
+
+    Parameters
+    ----------
+    data_handler: DataHandler
+        data handler used to get the last available prices. Its data provider is used to get the current bars and
+        the history of prices (which may look into the future, e.g. to get the volume traded on the current day)
+    timer: Timer
+        timer used to detect the beginning of a new tick
+    """
+
+    def __init__(self, data_handler: DataHandler, timer: Timer):
+        self._data_handler = data_handler
+        self._timer = timer
+
+        self._tickers_sources = []  # type: List[Callable[[], Iterable[Ticker]]]
+        self._snapshot_time = None  # type: datetime
+        self._cache = {}  # type: Dict[Hashable, Tuple[FrozenSet[Ticker], Any]]
+
+    def add_tickers_source(self, tickers_source: Callable[[], Iterable[Ticker]]):
+        """
+        Adds a function returning tickers (e.g. tickers of open orders or open positions), for which the data should
+        be downloaded whenever any data is requested from the snapshot.
+        """
+        self._tickers_sources.append(tickers_source)
+
+    def get_bars(self, tickers: Sequence[Ticker], start_date: datetime, frequency: Frequency) -> PricesDataFrame:
+        """
+        Returns the OHLCV bar starting at start_date for each of the tickers, as a PricesDataFrame with tickers as an
+        index and PriceFields as columns. The bars are taken from the data provider, without any look-ahead checks.
+        """
+        def get_bars(all_tickers: List[Ticker]):
+            return self._data_handler.data_provider.get_price(all_tickers, PriceField.ohlcv(), start_date, start_date,
+                                                              frequency)
+
+        bars = self._get(("bars", start_date, frequency), tickers, get_bars)
+        return bars.reindex(index=tickers)
+
+    def get_history(self, tickers: Sequence[Ticker], fields: Sequence[PriceField], start_date: datetime,
+                    end_date: datetime, frequency: Frequency) -> QFDataArray:
+        """
+        Returns the prices of the tickers between start_date and end_date (the range should span more than one bar),
+        as a QFDataArray. The prices are taken from the data provider, without any look-ahead checks.
+        """
+        fields = list(fields)
+
+        def get_history(all_tickers: List[Ticker]):
+            return self._data_handler.data_provider.get_price(all_tickers, fields, start_date, end_date, frequency)
+
+        data_array = self._get(("history", tuple(fields), start_date, end_date, frequency), tickers, get_history)
+        return data_array.reindex(tickers=tickers)
+
+    def get_last_available_prices(self, tickers: Sequence[Ticker]) -> QFSeries:
+        """
+        Returns the last available prices of the tickers (see DataHandler.get_last_available_price) as a QFSeries
+        indexed by tickers.
+        """
+        if not tickers:
+            return QFSeries()
+
+        def get_last_available_prices(all_tickers: List[Ticker]):
+            return self._data_handler.get_last_available_price(all_tickers)
+
+        prices = self._get(("last_available_prices", ), tickers, get_last_available_prices)
+        return prices.reindex(tickers)
+
+    def historical_price(self, tickers: Sequence[Ticker], fields: Union[PriceField, Sequence[PriceField]],
+                         nr_of_bars: int, frequency: Frequency = None) -> \
+            Union[PricesSeries, PricesDataFrame, QFDataArray]:
+        """
+        Returns the result of DataHandler.historical_price. As the bars returned by the historical_price depend on the
+        set of requested tickers, the result is cached only for exactly the same tickers and is not extended with
+        the tickers of open orders and open positions.
+        """
+        self._refresh()
+        fields_key = tuple(fields) if isinstance(fields, Sequence) else fields
+        key = ("historical_price", tuple(tickers), fields_key, nr_of_bars, frequency)
+        try:
+            _, container = self._cache[key]
+        except KeyError:
+            container = self._data_handler.historical_price(tickers, fields, nr_of_bars, frequency=frequency)
+            self._cache[key] = (frozenset(tickers), container)
+        return container
+
+    def _get(self, key: Hashable, tickers: Sequence[Ticker], fetch: Callable[[List[Ticker]], Any]):
+        """
+        Returns the cached container for the key. If any of the tickers was not downloaded yet, the data is downloaded
+        again for all the tickers from the cache, the requested tickers and the tickers from the tickers sources.
+        """
+        self._refresh()
+        cached_tickers, container = self._cache.get(key, (frozenset(), None))
+
+        if container is None or not cached_tickers.issuperset(tickers):
+            all_tickers = cached_tickers.union(tickers, *(source() for source in self._tickers_sources))
+            container = fetch(list(all_tickers))
+            self._cache[key] = (all_tickers, container)
+
+        return container
+
+    def _refresh(self):
+        """ Clears the cache if the time of the timer changed since the last request. """
+        current_time = self._timer.now()
+        if current_time != self._snapshot_time:
+            self._cache.clear()
+            self._snapshot_time = current_time
@@ -12,6 +12,8 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from typing import Optional
+
 from qf_lib.backtesting.events.empty_queue_event.empty_queue_event_notifier import EmptyQueueEventNotifier
 from qf_lib.backtesting.events.end_trading_event.end_trading_event_notifier import EndTradingEventNotifier
 from qf_lib.backtesting.events.event_base import AllEventNotifier
@@ -24,7 +26,7 @@ class Notifiers:
     Convenience class grouping all notifiers together.
     """
 
-    def __init__(self, timer: Timer):
+    def __init__(self, timer: Timer, scheduler: Optional[Scheduler] = None):
         """
         When an Event of certain type is being dispatched by EventManager then what EventManger
         does is it finds the EventNotifier which corresponds to this type of Event. Then the EventNotifier
@@ -41,8 +43,11 @@ class Notifiers:
         Because of the fact that each EventNotifier also calls the EventNotifier for Events of more general type,
         each EventNotifier must have a reference to this "more general" EventNotifier. Most of Events inherit
         directly from the Event type. That's why most of notifiers will need a reference to AllEventNotifier.
+
+        The scheduler parameter allows to use a custom Scheduler (e.g. HeapScheduler). By default a new Scheduler,
+        which uses the given timer, is created.
         """
         self.all_event_notifier = AllEventNotifier()
         self.empty_queue_event_notifier = EmptyQueueEventNotifier(self.all_event_notifier)
         self.end_trading_event_notifier = EndTradingEventNotifier(self.all_event_notifier)
-        self.scheduler = Scheduler(timer)
+        self.scheduler = scheduler if scheduler is not None else Scheduler(timer)
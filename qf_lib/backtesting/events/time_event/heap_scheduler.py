@@ -0,0 +1,166 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import heapq
+from datetime import datetime, timedelta
+from itertools import count
+from typing import List, Tuple, Optional
+
+import numpy as np
+from pandas import DatetimeIndex
+
+from qf_lib.backtesting.events.time_event.periodic_event.periodic_event import PeriodicEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.regular_time_event import RegularTimeEvent
+from qf_lib.backtesting.events.time_event.scheduler import Scheduler, TypeOfEvent, ConcreteTimeEvent
+from qf_lib.backtesting.events.time_event.time_event import TimeEvent
+from qf_lib.common.utils.dateutils.timer import Timer
+from qf_lib.containers.dimension_names import DATES
+
+
+class HeapScheduler(Scheduler):
+    """
+    Scheduler, which keeps the next trigger times of the regular events (RegularTimeEvents and PeriodicEvents) in a
+    priority queue. As the schedule of these events does not depend on the moment at which it is computed, the next
+    trigger time of each of them is recomputed only after the event was triggered (or the time was moved backwards).
+    The trigger times of all other events (e.g. SingleTimeEvents, which may be scheduled at any moment) are computed
+    on every call, exactly as in the Scheduler.
+
+    Additionally, if the end_date is provided, the whole calendar of trigger times of each regular event (until the
+    end_date) is computed only once, at the moment of the first usage of the event. Afterwards the next trigger times
+    are found using binary search on the calendar instead of the RelativeDelta arithmetic.
+
+    The trigger times of the regular events (e.g. MarketOpenEvent.set_trigger_time) should be configured before the
+    events are used by the scheduler.
+
+    Parameters
+    ----------
+    timer: Timer
+        timer used to get the current time
+    end_date: Optional[datetime]
+        the last date, until which the calendars of regular events should be precomputed. If None, the calendars are
+        not precomputed.
+    """
+
+    def __init__(self, timer: Timer, end_date: Optional[datetime] = None):
+        super().__init__(timer)
+        self._end_date = None if end_date is None else \
+            datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, 999999)
+
+        self._queue = []  # type: List[Tuple[datetime, int, ConcreteTimeEvent]]
+        self._counter = count()  # used to break ties between events with the same trigger time in the queue
+        self._subscription_order = {}  # type: Dict[TypeOfEvent, int]
+        self._events_to_enqueue = []  # type: List[ConcreteTimeEvent]
+        self._other_events = []  # type: List[ConcreteTimeEvent]
+        self._calendars = {}  # type: Dict[ConcreteTimeEvent, Tuple[datetime, np.ndarray]]
+        self._last_time = None  # type: Optional[datetime]
+
+    def subscribe(self, type_of_time_event: TypeOfEvent, listener) -> None:
+        is_new_event_type = type_of_time_event not in self._time_event_type_to_object.keys()
+        super().subscribe(type_of_time_event, listener)
+
+        if is_new_event_type:
+            self._subscription_order[type_of_time_event] = len(self._subscription_order)
+            time_event = self._time_event_type_to_object[type_of_time_event]
+            if self._is_regular(time_event):
+                self._events_to_enqueue.append(time_event)
+            else:
+                self._other_events.append(time_event)
+
+    def get_next_time_events(self) -> Tuple[List[ConcreteTimeEvent], datetime]:
+        """
+        Finds the TimeEvents which should be triggered soonest and returns a list of them (see
+        Scheduler.get_next_time_events).
+        """
+        now = self.timer.now()
+
+        if self._last_time is not None and now < self._last_time:
+            # The time was moved backwards - all the cached trigger times need to be computed again
+            self._events_to_enqueue.extend(event for _, _, event in self._queue)
+            self._queue = []
+        self._last_time = now
+
+        for time_event in self._events_to_enqueue:
+            self._enqueue(time_event, now)
+        self._events_to_enqueue = []
+
+        # Recompute the next trigger times of all the events, which were already triggered
+        while self._queue and self._queue[0][0] <= now:
+            _, _, time_event = heapq.heappop(self._queue)
+            self._enqueue(time_event, now)
+
+        times_and_events = [(time, event) for time, _, event in self._queue if time == self._queue[0][0]]
+        times_and_events.extend(
+            (time, event) for time, event in ((event.next_trigger_time(now), event) for event in self._other_events)
+            if time is not None
+        )
+
+        next_trigger_time = min(time for time, _ in times_and_events)
+        next_time_events = [event for time, event in times_and_events if time == next_trigger_time]
+        # Keep the order of subscriptions among the events of the same priority, consistently with the Scheduler
+        next_time_events.sort(key=lambda ev: (
+            self._time_events_priority.get(type(ev), float('inf')), self._subscription_order[type(ev)]))
+
+        return next_time_events, next_trigger_time
+
+    def trigger_calendar(self, start_date: datetime, end_date: datetime) -> DatetimeIndex:
+        """
+        Returns all the trigger times of the subscribed regular events (RegularTimeEvents and PeriodicEvents) within
+        the [start_date, end_date] range, as a sorted DatetimeIndex. SingleTimeEvents and other custom events are not
+        included, as they may be scheduled at any moment.
+        """
+        regular_events = [event for event in self._time_event_type_to_object.values() if self._is_regular(event)]
+        calendars = [self._compute_calendar(event, start_date, end_date) for event in regular_events]
+
+        # The calendars contain only the trigger times after the start_date, which should be included only if any of
+        # the events is triggered exactly at that time
+        if start_date <= end_date and any(
+                event.next_trigger_time(start_date - timedelta(microseconds=1)) == start_date
+                for event in regular_events):
+            calendars.append(np.array([start_date], dtype="datetime64[us]"))
+
+        trigger_times = np.unique(np.concatenate(calendars)) if calendars else np.array([], dtype="datetime64[us]")
+        return DatetimeIndex(trigger_times, name=DATES)
+
+    def _enqueue(self, time_event: ConcreteTimeEvent, now: datetime):
+        heapq.heappush(self._queue, (self._next_trigger_time(time_event, now), next(self._counter), time_event))
+
+    def _next_trigger_time(self, time_event: ConcreteTimeEvent, now: datetime) -> datetime:
+        if self._end_date is None or now >= self._end_date:
+            return time_event.next_trigger_time(now)
+
+        calendar_start_date, calendar = self._calendars.get(time_event, (None, None))
+        if calendar is None or now < calendar_start_date:
+            calendar_start_date, calendar = now, self._compute_calendar(time_event, now, self._end_date)
+            self._calendars[time_event] = calendar_start_date, calendar
+
+        position = np.searchsorted(calendar, np.datetime64(now, "us"), side="right")
+        if position < len(calendar):
+            return calendar[position].item()
+
+        # The calendar is exhausted - the next trigger time is after the end date
+        return time_event.next_trigger_time(now)
+
+    @staticmethod
+    def _compute_calendar(time_event: TimeEvent, start_date: datetime, end_date: datetime) -> np.ndarray:
+        """ Returns all trigger times of the event after start_date and not later than the end_date. """
+        trigger_times = []
+        trigger_time = time_event.next_trigger_time(start_date)
+        while trigger_time <= end_date:
+            trigger_times.append(trigger_time)
+            trigger_time = time_event.next_trigger_time(trigger_time)
+
+        return np.array(trigger_times, dtype="datetime64[us]")
+
+    @staticmethod
+    def _is_regular(time_event: TimeEvent) -> bool:
+        return isinstance(time_event, (RegularTimeEvent, PeriodicEvent))
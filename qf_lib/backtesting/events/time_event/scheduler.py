@@ -37,6 +37,14 @@ class Scheduler:
     by TimeFlowController.
     """
 
+    # Order in which the events triggered at the same time are returned (the events of other types are returned last)
+    _time_events_priority = {
+        ScheduleOrderExecutionEvent: 0,
+        IntradayBarEvent: 1,
+        MarketOpenEvent: 1,
+        MarketCloseEvent: 1
+    }
+
     def __init__(self, timer: Timer):
         self.timer = timer
         self.logger = qf_logger.getChild(self.__class__.__name__)
@@ -96,14 +104,7 @@ class Scheduler:
         next_time_events = [event for time, event in times_and_events if time == next_trigger_time]
         # type: List[ConcreteTimeEvent]
 
-        time_events_priority = {
-            ScheduleOrderExecutionEvent: 0,
-            IntradayBarEvent: 1,
-            MarketOpenEvent: 1,
-            MarketCloseEvent: 1
-        }
-
-        next_time_events.sort(key=lambda ev: time_events_priority.get(type(ev), float('inf')))
+        next_time_events.sort(key=lambda ev: self._time_events_priority.get(type(ev), float('inf')))
         return next_time_events, next_trigger_time
 
     def notify_all(self, time_event: ConcreteTimeEvent):
@@ -104,6 +104,9 @@ class MarketOrdersExecutor(SimulatedExecutor):
             start_time_range = current_datetime
 
         price_field = PriceField.Close if market_close_time else PriceField.Open
+        if self._market_snapshot is not None:
+            return self._market_snapshot.get_bars(tickers, start_time_range, self._frequency)[price_field]
+
         prices = self._data_provider.get_price(tickers, price_field, start_time_range, start_time_range, self._frequency)
         return prices
 
@@ -17,6 +17,7 @@ from itertools import count, groupby
 from typing import List, Sequence, Dict
 
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.events.time_event.periodic_event.intraday_bar_event import IntradayBarEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
@@ -93,6 +94,17 @@ class SimulatedExecutionHandler(ExecutionHandler):
                                                                           order_id_generator, commission_model,
                                                                           slippage_model, frequency)
 
+    def set_market_snapshot(self, market_snapshot: MarketSnapshot):
+        """
+        Sets the MarketSnapshot used by all executors to get the current prices. The tickers of all open orders are
+        added to the tickers downloaded by the snapshot.
+        """
+        for executor in (self._market_orders_executor, self._stop_orders_executor,
+                         self._market_on_close_orders_executor, self._market_on_open_orders_executor):
+            executor.set_market_snapshot(market_snapshot)
+
+        market_snapshot.add_tickers_source(lambda: (order.ticker for order in self.get_open_orders()))
+
     def on_market_close(self, _: MarketCloseEvent):
         self._stop_orders_executor.execute_orders(market_close=True)
         self._market_orders_executor.execute_orders(market_close=True)
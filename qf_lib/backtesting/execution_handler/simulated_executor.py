@@ -17,6 +17,7 @@ from itertools import count
 from typing import List, Sequence, Optional, Dict, Tuple
 
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
 from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
@@ -44,10 +45,17 @@ class SimulatedExecutor(metaclass=abc.ABCMeta):
         self._order_id_generator = order_id_generator
         self._commission_model = commission_model
         self._slippage_model = slippage_model
+        self._market_snapshot = None  # type: Optional[MarketSnapshot]
 
         # mappings: order_id -> order
         self._awaiting_orders = {}  # type: Dict[int, Order]
 
+    def set_market_snapshot(self, market_snapshot: MarketSnapshot):
+        """
+        Sets the MarketSnapshot, which will be used to get the current prices instead of the data provider
+        """
+        self._market_snapshot = market_snapshot
+
     @abc.abstractmethod
     def assign_order_ids(self, orders: Sequence[Order]) -> List[int]:
         """
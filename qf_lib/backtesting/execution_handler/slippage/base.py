@@ -20,6 +20,7 @@ from datetime import datetime
 from itertools import groupby
 from typing import Sequence, Tuple, Optional
 
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.order.order import Order
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
@@ -28,6 +29,7 @@ from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.data_providers.data_provider import DataProvider
+from qf_lib.data_providers.helpers import cast_data_array_to_proper_type
 
 
 class Slippage(metaclass=ABCMeta):
@@ -49,9 +51,16 @@ class Slippage(metaclass=ABCMeta):
     def __init__(self, data_provider: DataProvider, max_volume_share_limit: Optional[float] = None):
         self.max_volume_share_limit = max_volume_share_limit
         self._data_provider = data_provider
+        self._market_snapshot = None  # type: Optional[MarketSnapshot]
 
         self._logger = qf_logger.getChild(self.__class__.__name__)
 
+    def set_market_snapshot(self, market_snapshot: MarketSnapshot):
+        """
+        Sets the MarketSnapshot, which will be used to get the volume and prices data instead of the data provider.
+        """
+        self._market_snapshot = market_snapshot
+
     def process_orders(self, date: datetime, orders: Sequence[Order], no_slippage_fill_prices: Sequence[float]) -> \
             Tuple[Sequence[float], Sequence[float]]:
         """
@@ -98,7 +107,14 @@ class Slippage(metaclass=ABCMeta):
         end_date = start_date + RelativeDelta(days=1)
 
         # Look into the future in order to see the total volume traded today
-        volume_df = self._data_provider.get_price(tickers, PriceField.Volume, start_date, end_date, Frequency.DAILY)
+        if self._market_snapshot is not None:
+            volume_data_array = self._market_snapshot.get_history(tickers, [PriceField.Volume], start_date, end_date,
+                                                                  Frequency.DAILY)
+            volume_df = cast_data_array_to_proper_type(volume_data_array.loc[:, :, PriceField.Volume],
+                                                       use_prices_types=True)
+        else:
+            volume_df = self._data_provider.get_price(tickers, PriceField.Volume, start_date, end_date,
+                                                      Frequency.DAILY)
         volume_df = volume_df.fillna(0.0)
         try:
             volumes = volume_df.loc[start_date, tickers].values
@@ -76,8 +76,12 @@ class SquareRootMarketImpactSlippage(Slippage):
         end_date = date - RelativeDelta(days=1)
 
         # Download close price and volume values
-        data_array = self._data_provider.get_price(tickers, [PriceField.Close, PriceField.Volume],
-                                                   start_date, end_date, Frequency.DAILY)
+        if self._market_snapshot is not None:
+            data_array = self._market_snapshot.get_history(tickers, [PriceField.Close, PriceField.Volume],
+                                                           start_date, end_date, Frequency.DAILY)
+        else:
+            data_array = self._data_provider.get_price(tickers, [PriceField.Close, PriceField.Volume],
+                                                       start_date, end_date, Frequency.DAILY)
 
         close_prices = cast_data_array_to_proper_type(data_array.loc[:, tickers, PriceField.Close])
         volumes = cast_data_array_to_proper_type(data_array.loc[:, tickers, PriceField.Volume])
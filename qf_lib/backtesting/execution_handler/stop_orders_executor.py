@@ -31,7 +31,10 @@ class StopOrdersExecutor(SimulatedExecutor):
         tickers = [order.ticker for order in orders]
 
         unique_tickers_list = list(set(tickers))
-        prices_at_acceptance_time = self._data_handler.get_last_available_price(unique_tickers_list)
+        if self._market_snapshot is not None:
+            prices_at_acceptance_time = self._market_snapshot.get_last_available_prices(unique_tickers_list)
+        else:
+            prices_at_acceptance_time = self._data_handler.get_last_available_price(unique_tickers_list)
 
         order_id_list = []
         for order, ticker in zip(orders, tickers):
@@ -129,6 +132,10 @@ class StopOrdersExecutor(SimulatedExecutor):
             # In case of intraday trading the current full bar is always indexed by the left side of the time range
             start_date = current_datetime - self._frequency.time_delta()
 
+        if self._market_snapshot is not None:
+            # Only the full bars are requested, thus the bars do not need to be checked against the look-ahead
+            return self._market_snapshot.get_bars(tickers, start_date, self._frequency)
+
         return self._data_handler.get_price(tickers, PriceField.ohlcv(), start_date, start_date, self._frequency)
 
     def _calculate_no_slippage_fill_price(self, current_bar, order):
@@ -14,7 +14,7 @@
 import traceback
 from datetime import datetime
 from itertools import count
-from typing import Sequence, Type, List, Union, Dict, Any
+from typing import Sequence, Type, List, Union, Dict, Any, Optional
 
 import numpy as np
 import pandas as pd
@@ -88,7 +88,7 @@ class FastAlphaModelTester:
                  tickers: Sequence[Ticker], start_date: datetime, end_date: datetime,
                  data_provider: DataProvider, timer: Timer = None, n_jobs: int = 1,
                  frequency: Frequency = Frequency.DAILY, start_time: Dict = None, end_time: Dict = None,
-                 close_position_at_the_end_of_day: bool = False):
+                 close_position_at_the_end_of_day: bool = False, data_preloading_time_delta: RelativeDelta = None):
         """
         Parameters
         ----------
@@ -124,6 +124,10 @@ class FastAlphaModelTester:
             If True, the last signal of the day will always be set to close the existing position.
             This is to avoid overnight exposure.
             If False (default), position might be carried overnight, and will not be forced to be closed.
+        data_preloading_time_delta: RelativeDelta
+            it is only used if the tested alpha model implements calculate_exposures_history. Defines how much
+            data before the start date is passed to the model, together with the prices of the backtest, to compute
+            all the exposures at once. By default 1 year.
         """
         self.timer = timer
         self.logger = qf_logger.getChild(self.__class__.__name__)
@@ -139,6 +143,8 @@ class FastAlphaModelTester:
         self._start_time = start_time
         self._end_time = end_time
         self._close_position_at_the_end_of_day = close_position_at_the_end_of_day
+        self._data_preloading_time_delta = RelativeDelta(years=1) if data_preloading_time_delta is None \
+            else data_preloading_time_delta
 
         # use 1min data frequency for data if signal generation is intra-day.
         # use Daily frequency for any other time frame
@@ -184,21 +190,23 @@ class FastAlphaModelTester:
 
         return tickers
 
-    def _get_data_for_backtest(self) -> QFDataArray:
+    def _get_data_for_backtest(self, start_date: Optional[datetime] = None) -> QFDataArray:
         """
-        Creates a QFDataArray containing OHLCV values for all tickers passes to Fast Alpha Models Tester.
+        Creates a QFDataArray containing OHLCV values for all tickers passes to Fast Alpha Models Tester. By default
+        the data starts at the start date of the backtest.
         """
         self.logger.info("\nLoading all price values of tickers:")
         self._timer.set_current_time(self._end_date)
+        start_date = start_date or self._start_date
         tickers_dict = {}
 
         for ticker in self._tickers:
             if isinstance(ticker, FutureTicker):
                 fc = FuturesChain(ticker, self._data_provider)
-                tickers_dict[ticker] = fc.get_price(PriceField.ohlcv(), self._start_date, self._end_date,
+                tickers_dict[ticker] = fc.get_price(PriceField.ohlcv(), start_date, self._end_date,
                                                     self._data_frequency)
             else:
-                tickers_dict[ticker] = self._data_provider.get_price(ticker, PriceField.ohlcv(), self._start_date,
+                tickers_dict[ticker] = self._data_provider.get_price(ticker, PriceField.ohlcv(), start_date,
                                                                      self._end_date, self._data_frequency)
 
         prices_data_array = tickers_dict_to_data_array(tickers_dict, self._tickers, PriceField.ohlcv())
@@ -206,8 +214,14 @@ class FastAlphaModelTester:
 
     def _generate_exposures_for_all_params_sets(self) -> List[QFDataFrame]:
         self.logger.info("\nGenerating exposures:")
+        # Models, which implement calculate_exposures_history, compute all their exposures at once using the
+        # preloaded prices
+        prices_data_array = self._get_data_for_backtest(self._start_date - self._data_preloading_time_delta) \
+            if self._model_type.supports_exposures_history() else None
+
         exposure_values_df_list = Parallel(n_jobs=self._n_jobs)(delayed(self._generate_exposure_values)
-                                                                (config, self._data_provider, self._tickers)
+                                                                (config, self._data_provider, self._tickers,
+                                                                 prices_data_array)
                                                                 for config in self._alpha_model_configs)
         print("\nFinished generation of exposures.")
         return exposure_values_df_list
@@ -335,6 +349,22 @@ class FastAlphaModelTester:
     def generate_trades_for_ticker(self, prices_array: QFDataArray, exposures_tms: pd.Series, ticker: Ticker) \
             -> List[Trade]:
 
+        trades_data = self.generate_trades_data_for_ticker(prices_array, exposures_tms, ticker)
+        return [
+            Trade(start_time=start_time.to_pydatetime(), end_time=end_time.to_pydatetime(), ticker=ticker, pnl=pnl,
+                  commission=0.0, direction=int(direction))
+            for start_time, end_time, pnl, direction in zip(
+                trades_data["start_time"], trades_data["end_time"], trades_data["pnl"], trades_data["direction"])
+        ]
+
+    def generate_trades_data_for_ticker(self, prices_array: QFDataArray, exposures_tms: pd.Series, ticker: Ticker) \
+            -> QFDataFrame:
+        """
+        Returns the QFDataFrame describing all the trades of the given ticker (with the start_time, end_time, pnl and
+        direction columns). A trade is opened at the Open price whenever the exposure changes from Exposure.OUT and it
+        is closed at the Open price whenever the exposure changes again (if the exposure changes to the opposite
+        direction, a new trade is opened at the same time). Bars with the missing Open price are skipped.
+        """
         open_prices_tms = cast_data_array_to_proper_type(prices_array.loc[:, ticker, PriceField.Open],
                                                          use_prices_types=True)
 
@@ -343,98 +373,86 @@ class FastAlphaModelTester:
         open_prices_tms = open_prices_tms[exposures_tms.index]
 
         # historical data cropped to the time frame of the backtest (from start date till end date)
-        historical_data = pd.concat((exposures_tms, open_prices_tms), axis=1).loc[self._start_date:]
+        exposures_tms = exposures_tms.loc[self._start_date:]
+        open_prices_tms = open_prices_tms.loc[self._start_date:]
 
-        prev_exposure = 0.0
-        trades_list = []
-
-        trade_start_date = None
-        trade_exposure = None
-        trade_start_price = None
+        dates = exposures_tms.index.values
+        exposures = exposures_tms.values.astype(np.float64)
+        prices = open_prices_tms.values.astype(np.float64)
 
         # If the first exposure is nan - skip it
-        first_exposure = historical_data.iloc[0, 0]
-        if np.isnan(first_exposure):
-            historical_data = historical_data.iloc[1:]
-
-        for curr_date, row in historical_data.iterrows():
-            curr_date = curr_date.to_pydatetime()
-            curr_exposure, curr_price = row.values
-
-            # skipping the nan Open prices
-            if np.isnan(curr_price):
-                self.logger.warning("Open price is None, cannot create trade on {} for {}".format(
-                    curr_date, str(ticker)))
-                continue
-
-            out_of_the_market = trade_exposure is None
-            if out_of_the_market:
-                assert prev_exposure == 0.0
-
-                if curr_exposure != 0.0:
-                    trade_start_date = curr_date
-                    trade_exposure = curr_exposure
-                    trade_start_price = curr_price
-            else:
-                assert prev_exposure != 0.0
-
-                exposure_change = int(curr_exposure - prev_exposure)
-                should_close_position = exposure_change != 0.0
-
-                if should_close_position:
-                    trades_list.append(Trade(
-                        start_time=trade_start_date,
-                        end_time=curr_date,
-                        ticker=ticker,
-                        pnl=(curr_price / trade_start_price - 1) * trade_exposure,
-                        commission=0.0,
-                        direction=int(trade_exposure)
-                    ))
-                    trade_start_date = None
-                    trade_exposure = None
-                    trade_start_price = None
-
-                    going_into_opposite_direction = curr_exposure != 0.0
-                    if going_into_opposite_direction:
-                        trade_start_date = curr_date
-                        trade_exposure = curr_exposure
-                        trade_start_price = curr_price
-
-            prev_exposure = curr_exposure
-
-        return trades_list
+        if len(exposures) > 0 and np.isnan(exposures[0]):
+            dates, exposures, prices = dates[1:], exposures[1:], prices[1:]
+
+        # skipping the nan Open prices
+        nan_prices = np.isnan(prices)
+        for curr_date in dates[nan_prices]:
+            self.logger.warning("Open price is None, cannot create trade on {} for {}".format(
+                pd.Timestamp(curr_date).to_pydatetime(), str(ticker)))
+        dates, exposures, prices = dates[~nan_prices], exposures[~nan_prices], prices[~nan_prices]
+
+        if np.isnan(exposures).any():
+            raise ValueError("The exposures of {} contain nan values".format(str(ticker)))
+
+        # The exposure changes at all the points at which the trades are closed and / or opened. Each trade is
+        # opened at a change point with a non-zero exposure and it is closed at the following change point.
+        previous_exposures = np.concatenate(([0.0], exposures[:-1]))
+        change_points = np.flatnonzero(np.trunc(exposures - previous_exposures) != 0.0)
+        entries = change_points[:-1][exposures[change_points[:-1]] != 0.0]
+        exits = change_points[1:][exposures[change_points[:-1]] != 0.0]
+
+        trade_exposures = exposures[entries]
+        return QFDataFrame({
+            "start_time": pd.DatetimeIndex(dates[entries]),
+            "end_time": pd.DatetimeIndex(dates[exits]),
+            "pnl": (prices[exits] / prices[entries] - 1) * trade_exposures,
+            "direction": trade_exposures.astype(np.int64)
+        })
 
     def _generate_exposure_values(self, config: FastAlphaModelTesterConfig, data_provider: DataProvider,
-                                  tickers: Sequence[Ticker]):
+                                  tickers: Sequence[Ticker], prices_data_array: Optional[QFDataArray] = None):
         """
         For the given Alpha model and its parameters, generates the dataframe containing all exposure values, that
         will be returned by the model through signals.
         In case of an exception or error in the processing Exposure.OUT is returned.
+
+        If the prices_data_array is provided, all the exposures are computed at once using the
+        calculate_exposures_history function of the model.
         """
 
         model = config.generate_model(data_provider)
-
-        current_exposures_values = QFSeries(index=pd.Index(tickers, name=TICKERS))
-        current_exposures_values[:] = 0.0
-
         backtest_dates = self._get_backtest_dates()
 
-        exposure_values_df = QFDataFrame(
-            index=backtest_dates.index,
-            columns=pd.Index(tickers, name=TICKERS)
-        )
-
         for ticker in tickers:
             if isinstance(ticker, FutureTicker):
                 # Even if the tickers were already initialized, during pickling process, the data provider and timer
                 # information is lost
                 ticker.initialize_data_provider(self._timer, data_provider)
 
-        for i, curr_datetime in enumerate(backtest_dates.index):
+        if prices_data_array is not None:
+            exposure_values = self._generate_exposures_history(model, tickers, backtest_dates.index, prices_data_array)
+        else:
+            exposure_values = self._generate_exposures_for_each_date(model, tickers, backtest_dates.index)
+
+        if self._close_position_at_the_end_of_day:
+            exposure_values[backtest_dates.values == 1, :] = Exposure.OUT.value
+
+        exposure_values_df = QFDataFrame(data=exposure_values, index=backtest_dates.index,
+                                         columns=pd.Index(tickers, name=TICKERS))
+        exposure_values_df = exposure_values_df.dropna(axis=1, how="all")
+        return exposure_values_df
+
+    def _generate_exposures_for_each_date(self, model: AlphaModel, tickers: Sequence[Ticker],
+                                          dates: pd.DatetimeIndex) -> np.ndarray:
+        """ Computes the exposures by calling calculate_exposure for each date and ticker. """
+        exposure_values = np.full((len(dates), len(tickers)), np.nan)
+        current_exposures_values = np.zeros(len(tickers))
+
+        for i, curr_datetime in enumerate(dates):
             if i % 1000 == 0:
-                self.logger.info('{} / {} of Exposure dates processed'.format(i, len(backtest_dates)))
+                self.logger.info('{} / {} of Exposure dates processed'.format(i, len(dates)))
 
-            new_exposures = QFSeries(index=tickers)
+            new_exposures = exposure_values[i]
             self._timer.set_current_time(curr_datetime)
 
             for j, ticker, curr_exp_value in zip(count(), tickers, current_exposures_values):
@@ -446,19 +464,28 @@ class FastAlphaModelTester:
                     self.logger.warning(traceback.format_exc())
 
                     new_exp = Exposure.OUT
-                new_exposures.iloc[j] = new_exp.value if new_exp is not None else Exposure.OUT
+                new_exposures[j] = new_exp.value if new_exp is not None else Exposure.OUT.value
 
             # assuming that we always follow the new_exposures from strategy, disregarding confidence levels
             # and expected moves, looking only at the suggested exposure
             current_exposures_values = new_exposures
-            exposure_values_df.iloc[i, :] = current_exposures_values
 
-        if self._close_position_at_the_end_of_day:
-            exposure_out = backtest_dates[backtest_dates == 1]
-            exposure_values_df.loc[exposure_out.index, :] = Exposure.OUT.value
+        return exposure_values
 
-        exposure_values_df = exposure_values_df.dropna(axis=1, how="all")
-        return exposure_values_df
+    def _generate_exposures_history(self, model: AlphaModel, tickers: Sequence[Ticker], dates: pd.DatetimeIndex,
+                                    prices_data_array: QFDataArray) -> np.ndarray:
+        """ Computes all the exposures at once using calculate_exposures_history function of the model. """
+        self._timer.set_current_time(self._end_date)
+        exposure_values = np.array(
+            model.calculate_exposures_history(tickers, dates, prices_data_array, self._data_frequency),
+            dtype=np.float64)
+
+        expected_shape = (len(dates), len(tickers))
+        if exposure_values.shape != expected_shape:
+            raise ValueError("The exposures history returned by {} has shape {}, while {} was expected".format(
+                model, exposure_values.shape, expected_shape))
+
+        return exposure_values
 
     def _get_backtest_dates(self) -> QFSeries:
         """
@@ -325,10 +325,10 @@ class BacktestMonitor(AbstractMonitor):
                     "Fraction at risk": lambda s: s.fraction_at_risk if isinstance(s, Signal) else s
                 }
 
-                for sheet_name, fun in sheet_names_to_functions.items():
-                    df = signals_df.applymap(fun)
-                    self._excel_exporter.export_container(df, file_path, sheet_name=sheet_name,
-                                                          starting_cell='A1', include_column_names=True)
+                containers = {sheet_name: signals_df.applymap(fun)
+                              for sheet_name, fun in sheet_names_to_functions.items()}
+                self._excel_exporter.export_containers(containers, file_path, starting_cell='A1',
+                                                       include_column_names=True)
 
     @ErrorHandling.error_logging
     def _live_chart_update(self):
@@ -14,6 +14,7 @@
 import abc
 from typing import List
 
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.order.order import Order
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.data_providers.data_provider import DataProvider
@@ -23,9 +24,16 @@ class OrdersFilter(metaclass=abc.ABCMeta):
     """Adjusts final orders list to meet various requirements e.g. volume limitations."""
     def __init__(self, data_provider: DataProvider):
         self._data_provider = data_provider
+        self._market_snapshot = None  # type: Optional[MarketSnapshot]
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
+    def set_market_snapshot(self, market_snapshot: MarketSnapshot):
+        """
+        Sets the MarketSnapshot, which may be used by the filter to get the market data instead of the data provider.
+        """
+        self._market_snapshot = market_snapshot
+
     @abc.abstractmethod
     def adjust_orders(self, orders: List[Order]) -> List[Order]:
         """
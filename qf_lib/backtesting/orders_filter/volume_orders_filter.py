@@ -58,7 +58,12 @@ class VolumeOrdersFilter(OrdersFilter):
         """
         tickers = [order.ticker for order in orders]
         try:
-            volume_df = self._data_provider.historical_price(tickers, PriceField.Volume, 5, frequency=Frequency.DAILY)
+            if self._market_snapshot is not None:
+                volume_df = self._market_snapshot.historical_price(tickers, PriceField.Volume, 5,
+                                                                   frequency=Frequency.DAILY)
+            else:
+                volume_df = self._data_provider.historical_price(tickers, PriceField.Volume, 5,
+                                                                 frequency=Frequency.DAILY)
 
             # The stop orders will be adjusted only along with corresponding market orders
             stop_orders_dict = {order.ticker: order for order in orders if isinstance(order.execution_style, StopOrder)}
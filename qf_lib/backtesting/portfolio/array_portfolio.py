@@ -0,0 +1,264 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from itertools import compress
+
+import numpy as np
+
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.portfolio.backtest_future_position import BacktestFuturePosition
+from qf_lib.backtesting.portfolio.backtest_position import BacktestPositionSummary
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.timer import Timer
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class ArrayPortfolio(Portfolio):
+    """
+    Portfolio, which keeps the state of all positions in aligned numpy arrays (quantities, average prices,
+    multipliers, last prices, realised pnl and commissions), indexed by the slot assigned to each ticker at the moment
+    of its first transaction. The mark-to-market in the update function is performed as one vectorized operation on
+    all open positions instead of calling the methods of each of the positions.
+
+    The history of positions is recorded into preallocated columnar buffers (one row per recorded update, one column
+    per ticker slot) instead of per-day dictionaries of BacktestPositionSummary objects. The BacktestPositionSummary
+    objects are created only when the positions_history function is called.
+
+    The BacktestPosition objects are still used to transact the transactions and are available in the
+    open_positions_dict. Their current prices are kept in sync with the prices used by the ArrayPortfolio, so the
+    ArrayPortfolio may be used in place of the Portfolio.
+
+    Parameters
+    ----------
+    data_handler: DataHandler
+        data handler used to get the most recent prices of the assets
+    initial_cash: float
+        initial cash of the portfolio
+    timer: Timer
+        timer used to get the current time
+    initial_capacity: int
+        number of records (usually equal to the number of days in the backtest), for which the buffers of the
+        positions history are preallocated. The buffers are extended if necessary. Default: 1024
+    """
+
+    _INITIAL_NUMBER_OF_SLOTS = 16
+
+    def __init__(self, data_handler: DataHandler, initial_cash: float, timer: Timer, initial_capacity: int = 1024):
+        super().__init__(data_handler, initial_cash, timer)
+
+        self._ticker_to_slot = {}  # type: Dict[Ticker, int]
+        self._slot_tickers = []  # type: List[Ticker]
+        self._slot_positions = []  # type: List[Optional[BacktestPosition]]
+
+        number_of_slots = self._INITIAL_NUMBER_OF_SLOTS
+        self._quantities = np.zeros(number_of_slots)
+        self._avg_prices = np.zeros(number_of_slots)
+        self._multipliers = np.ones(number_of_slots)
+        self._is_margin = np.zeros(number_of_slots, dtype=bool)
+        self._last_prices = np.full(number_of_slots, np.nan)  # NaN corresponds to the position without any price
+        self._realised_pnl = np.zeros(number_of_slots)
+        self._commissions = np.zeros(number_of_slots)
+        self._directions = np.zeros(number_of_slots)
+
+        # Slots, tickers and positions of all open positions in the order of the open_positions_dict. Computed again
+        # only if the set of open positions changes.
+        self._open_slots = None  # type: Optional[np.ndarray]
+        self._open_tickers = []  # type: List[Ticker]
+        self._open_positions = []  # type: List[BacktestPosition]
+
+        history_shape = (max(initial_capacity, 1), number_of_slots)
+        self._history_total_exposure = np.zeros(history_shape)
+        self._history_market_value = np.zeros(history_shape)
+        self._history_total_pnl = np.zeros(history_shape)
+        self._history_direction = np.zeros(history_shape)
+        self._history_is_open = np.zeros(history_shape, dtype=bool)
+
+    def transact_transaction(self, transaction: Transaction):
+        super().transact_transaction(transaction)
+        self._update_slot(transaction.ticker)
+
+    def update(self, record=False):
+        """
+        Updates the value of all positions that are currently open by getting the most recent price (see
+        Portfolio.update). All open positions are valued at once, using the numpy arrays of the portfolio.
+        """
+        self.net_liquidation = self.current_cash
+        self.gross_exposure_of_positions = 0
+
+        open_slots = self._get_open_slots()
+        if len(open_slots) > 0:
+            current_prices_series = self._get_last_available_prices(self._open_tickers)
+            current_prices = np.asarray(current_prices_series.reindex(self._open_tickers).values, dtype=np.float64)
+
+            # Update the prices only if they are finite, consistently with the BacktestPosition.update_price
+            is_price_finite = np.isfinite(current_prices)
+            last_prices = np.where(is_price_finite, current_prices, self._last_prices[open_slots])
+            self._last_prices[open_slots] = last_prices
+            for position, price in zip(compress(self._open_positions, is_price_finite),
+                                       current_prices[is_price_finite].tolist()):
+                position._current_price = price
+
+            quantities = self._quantities[open_slots]
+            has_price = ~np.isnan(last_prices)
+            prices = np.where(has_price, last_prices, 0.0)
+            scaled_quantities = quantities * self._multipliers[open_slots]
+
+            total_exposure = scaled_quantities * prices
+            unrealised_pnl = np.where(has_price, (prices - self._avg_prices[open_slots]) * scaled_quantities, 0.0)
+            market_value = np.where(self._is_margin[open_slots], unrealised_pnl, quantities * prices)
+
+            # Cumulative sums add the values sequentially, in the order of the open positions, exactly as the Portfolio
+            self.net_liquidation = np.cumsum(np.concatenate(([self.current_cash], market_value)))[-1].item()
+            self.gross_exposure_of_positions = np.cumsum(np.abs(total_exposure))[-1].item()
+
+        if record:
+            row = len(self._dates)
+            self._ensure_history_capacity(row + 1)
+            if len(open_slots) > 0:
+                total_pnl = self._realised_pnl[open_slots] + unrealised_pnl - self._commissions[open_slots]
+
+                self._history_total_exposure[row, open_slots] = total_exposure
+                self._history_market_value[row, open_slots] = market_value
+                self._history_total_pnl[row, open_slots] = total_pnl
+                self._history_direction[row, open_slots] = self._directions[open_slots]
+                self._history_is_open[row, open_slots] = True
+
+            self._dates.append(self.timer.now())
+            self._portfolio_values.append(self.net_liquidation)
+            self._leverage_list.append(self.gross_exposure_of_positions / self.net_liquidation)
+
+    def positions_history(self) -> QFDataFrame:
+        """
+        Returns a QFDataFrame containing summary of the positions in the portfolio for each day (see
+        Portfolio.positions_history). The BacktestPositionSummary objects are created out of the recorded buffers.
+        """
+        slots, is_open = self._recorded_slots()
+        summaries = np.full(is_open.shape, np.nan, dtype=object)
+        for row, column in zip(*np.nonzero(is_open)):
+            slot = slots[column]
+            summaries[row, column] = BacktestPositionSummary.from_values(
+                self._slot_tickers[slot], self._history_total_exposure[row, slot].item(),
+                self._history_market_value[row, slot].item(), self._history_total_pnl[row, slot].item(),
+                int(self._history_direction[row, slot]))
+
+        return QFDataFrame(data=summaries, index=self._dates, columns=[self._slot_tickers[s] for s in slots])
+
+    def positions_values_history(self, value: str = "total_exposure") -> QFDataFrame:
+        """
+        Returns a QFDataFrame containing the recorded values of positions in the portfolio for each day (NaN
+        corresponds to no open position). Contrary to positions_history, it does not create any objects.
+
+        Parameters
+        ----------
+        value: str
+            one of the values recorded for each position: "total_exposure", "market_value", "total_pnl" or
+            "direction". Default: "total_exposure"
+        """
+        buffers = {
+            "total_exposure": self._history_total_exposure,
+            "market_value": self._history_market_value,
+            "total_pnl": self._history_total_pnl,
+            "direction": self._history_direction
+        }
+        if value not in buffers:
+            raise ValueError("Unknown value '{}'. Available values: {}".format(value, ", ".join(buffers.keys())))
+
+        slots, is_open = self._recorded_slots()
+        values = np.where(is_open, buffers[value][:len(self._dates), slots], np.nan)
+        return QFDataFrame(data=values, index=self._dates, columns=[self._slot_tickers[s] for s in slots])
+
+    def _recorded_slots(self):
+        """ Returns the slots, which were recorded at least once (ordered by the first record), and the mask of open
+        positions for these slots. """
+        is_open = self._history_is_open[:len(self._dates), :len(self._slot_tickers)]
+        was_recorded = is_open.any(axis=0)
+        first_record = np.argmax(is_open, axis=0)
+        slots = np.flatnonzero(was_recorded)
+        slots = slots[np.argsort(first_record[slots], kind="stable")]
+        return slots, is_open[:, slots]
+
+    def _get_open_slots(self) -> np.ndarray:
+        if self._open_slots is None:
+            self._open_tickers = list(self.open_positions_dict.keys())
+            self._open_positions = list(self.open_positions_dict.values())
+            self._open_slots = np.array([self._ticker_to_slot[t] for t in self._open_tickers], dtype=np.intp)
+        return self._open_slots
+
+    def _update_slot(self, ticker: Ticker):
+        """ Copies the state of the position of the given ticker into the numpy arrays. """
+        slot = self._ticker_to_slot.get(ticker)
+        if slot is None:
+            slot = self._add_slot(ticker)
+
+        position = self.open_positions_dict.get(ticker, None)
+        if position is not self._slot_positions[slot]:
+            # The position was opened or closed - the list of open positions needs to be computed again
+            self._slot_positions[slot] = position
+            self._open_slots = None
+
+        if position is not None:
+            is_margin = isinstance(position, BacktestFuturePosition)
+            self._is_margin[slot] = is_margin
+            self._multipliers[slot] = ticker.point_value if is_margin else 1.0
+            self._quantities[slot] = position.quantity()
+            self._avg_prices[slot] = position._avg_price_per_unit
+            self._realised_pnl[slot] = position._realised_pnl_without_commissions
+            self._commissions[slot] = position.total_commission()
+            self._directions[slot] = position.direction()
+            self._last_prices[slot] = np.nan if position._current_price is None else position._current_price
+
+    def _add_slot(self, ticker: Ticker) -> int:
+        slot = len(self._slot_tickers)
+        self._ticker_to_slot[ticker] = slot
+        self._slot_tickers.append(ticker)
+        self._slot_positions.append(None)
+
+        number_of_slots = len(self._quantities)
+        if slot >= number_of_slots:
+            self._quantities = self._extend(self._quantities, 0.0)
+            self._avg_prices = self._extend(self._avg_prices, 0.0)
+            self._multipliers = self._extend(self._multipliers, 1.0)
+            self._is_margin = self._extend(self._is_margin, False)
+            self._last_prices = self._extend(self._last_prices, np.nan)
+            self._realised_pnl = self._extend(self._realised_pnl, 0.0)
+            self._commissions = self._extend(self._commissions, 0.0)
+            self._directions = self._extend(self._directions, 0.0)
+
+        self._ensure_history_capacity(len(self._history_is_open))
+        return slot
+
+    def _ensure_history_capacity(self, number_of_rows: int):
+        """ Extends the buffers of the positions history (by doubling their size), so that they have at least the
+        given number of rows and a column for each of the slots. """
+        rows, columns = self._history_is_open.shape
+        new_rows = rows if number_of_rows <= rows else max(number_of_rows, 2 * rows)
+        new_columns = len(self._quantities)
+        if (new_rows, new_columns) == (rows, columns):
+            return
+
+        def extend(buffer: np.ndarray) -> np.ndarray:
+            extended_buffer = np.zeros((new_rows, new_columns), dtype=buffer.dtype)
+            extended_buffer[:rows, :columns] = buffer
+            return extended_buffer
+
+        self._history_total_exposure = extend(self._history_total_exposure)
+        self._history_market_value = extend(self._history_market_value)
+        self._history_total_pnl = extend(self._history_total_pnl)
+        self._history_direction = extend(self._history_direction)
+        self._history_is_open = extend(self._history_is_open)
+
+    @staticmethod
+    def _extend(array: np.ndarray, fill_value) -> np.ndarray:
+        return np.concatenate((array, np.full(len(array), fill_value, dtype=array.dtype)))
@@ -12,9 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Sequence
 
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition, BacktestPositionSummary
 from qf_lib.backtesting.portfolio.position_factory import BacktestPositionFactory
 from qf_lib.backtesting.portfolio.transaction import Transaction
@@ -36,6 +37,7 @@ class Portfolio:
         self.initial_cash = initial_cash
         self.data_handler = data_handler
         self.timer = timer
+        self._market_snapshot = None  # type: Optional[MarketSnapshot]
 
         self.net_liquidation = initial_cash
         """ Cash value includes futures P&L + stock value + securities options value + bond value + fund value. """
@@ -103,7 +105,7 @@ class Portfolio:
         self.gross_exposure_of_positions = 0
 
         tickers = list(self.open_positions_dict.keys())
-        current_prices_series = self.data_handler.get_last_available_price(tickers=tickers)
+        current_prices_series = self._get_last_available_prices(tickers)
 
         current_positions = {}
         for ticker, position in self.open_positions_dict.items():
@@ -122,6 +124,14 @@ class Portfolio:
             self._leverage_list.append(self.gross_exposure_of_positions / self.net_liquidation)
             self._positions_history.append(current_positions)
 
+    def set_market_snapshot(self, market_snapshot: MarketSnapshot):
+        """
+        Sets the MarketSnapshot, which will be used to get the most recent prices instead of the data handler. The
+        tickers of all open positions are added to the tickers downloaded by the snapshot.
+        """
+        self._market_snapshot = market_snapshot
+        market_snapshot.add_tickers_source(lambda: self.open_positions_dict.keys())
+
     def portfolio_eod_series(self) -> PricesSeries:
         """
         Returns a timeseries of value of the portfolio expressed in currency units
@@ -149,3 +159,8 @@ class Portfolio:
         new_position = BacktestPositionFactory.create_position(transaction.ticker)
         self.open_positions_dict[transaction.ticker] = new_position
         return new_position
+
+    def _get_last_available_prices(self, tickers: Sequence[Ticker]) -> QFSeries:
+        if self._market_snapshot is not None:
+            return self._market_snapshot.get_last_available_prices(tickers)
+        return self.data_handler.get_last_available_price(tickers=tickers)
@@ -163,6 +163,10 @@ class AlphaModelStrategy(AbstractStrategy):
         signals = []
 
         for model, tickers in self._model_tickers_dict.items():
+            if self._supports_batched_signals(model):
+                signals.extend(self._calculate_signals_in_batch(model, tickers, current_positions))
+                continue
+
             for ticker in set(tickers):
                 try:
                     current_exposure = self._get_current_exposure(ticker, current_positions)
@@ -173,6 +177,22 @@ class AlphaModelStrategy(AbstractStrategy):
 
         return signals
 
+    def _calculate_signals_in_batch(self, model: AlphaModel, tickers: Sequence[Ticker],
+                                    current_positions: List[Position]) -> List[Signal]:
+        """ Generates the signals for all the tickers of the model at once, using the vectorized AlphaModel API. """
+        current_exposures = {}
+        for ticker in dict.fromkeys(tickers):
+            try:
+                current_exposures[ticker] = self._get_current_exposure(ticker, current_positions)
+            except NoValidTickerException:
+                pass
+
+        return model.get_signals(list(current_exposures.keys()), current_exposures, self.timer.now(), self._frequency)
+
+    @staticmethod
+    def _supports_batched_signals(model) -> bool:
+        return isinstance(model, AlphaModel) and model.supports_batched_signals()
+
     def _place_orders(self, signals):
         self.logger.info("Converting Signals to Orders using: {}".format(self._position_sizer.__class__.__name__))
         orders = self._position_sizer.size_signals(signals, self._use_stop_losses, self._time_in_force, self._frequency)
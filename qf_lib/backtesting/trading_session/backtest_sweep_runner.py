@@ -0,0 +1,177 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from itertools import product
+from typing import Callable, Dict, Any, Sequence, Union, List, Optional
+
+from joblib import Parallel, delayed
+
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.backtesting.trading_session.backtest_trading_session import BacktestTradingSession
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.data_providers.data_provider import DataProvider
+from qf_lib.data_providers.memory_mapped_data_provider import MemoryMappedDataProvider
+from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class BacktestSweepElement:
+    """
+    Result of a single backtest performed by the BacktestSweepRunner.
+
+    Parameters
+    ----------
+    parameters: Dict[str, Any]
+        parameters, which were used to create the backtest trading session
+    portfolio_tms: PricesSeries
+        end of day values of the portfolio
+    transactions: List[Transaction]
+        all transactions, which were recorded during the backtest
+    result: Any
+        result of the result_function (None if no result_function was provided)
+    """
+
+    def __init__(self, parameters: Dict[str, Any], portfolio_tms: PricesSeries, transactions: List[Transaction],
+                 result: Any = None):
+        self.parameters = parameters
+        self.portfolio_tms = portfolio_tms
+        self.transactions = transactions
+        self.result = result
+
+
+class BacktestSweepRunner:
+    """
+    Runs full event-driven backtests (created with the BacktestTradingSessionBuilder) for many sets of parameters.
+    The data for all the backtests is downloaded only once, into a shared data bundle (PrefetchingDataProvider), and
+    the backtests are distributed across n_jobs processes. The numpy arrays of the data bundle are passed to the
+    worker processes as read-only memory maps, so the workers attach to the same preloaded data instead of
+    downloading or copying it. If the data_provider is a MemoryMappedDataProvider, it is used directly as the data
+    bundle and the worker processes reopen the same memory-mapped files.
+
+    The trading sessions are created in the worker processes by the session_factory, which is called with the shared
+    data provider and one set of parameters as keyword arguments. It should create the BacktestTradingSessionBuilder
+    (using the given data provider), build the session and subscribe the strategy to the necessary events. As the
+    session_factory is sent to the worker processes, it should be defined on the module level. As many backtests are
+    run, it is recommended to use BacktestMonitorSettings.no_stats() in the builder.
+
+    Parameters
+    ----------
+    session_factory: Callable[..., BacktestTradingSession]
+        function, which creates the backtest trading session with the strategy for the given data provider and
+        parameters, e.g. session_factory(data_provider, **parameters)
+    data_provider: DataProvider
+        data provider used to download the data bundle
+    tickers: Ticker, Sequence[Ticker]
+        tickers, which should be included in the data bundle
+    start_date: datetime
+        start date of the backtests
+    end_date: datetime
+        end date of the backtests
+    frequency: Frequency
+        frequency of the data. Default: Frequency.DAILY
+    n_jobs: int
+        number of processes used to run the backtests. Default: 1
+    data_preloading_time_delta: RelativeDelta
+        time delta, by which the data bundle starts before the start_date (necessary to compute the signals at the
+        beginning of the backtests). By default 1 year, consistently with BacktestTradingSession.use_data_preloading
+    """
+
+    def __init__(self, session_factory: Callable[..., BacktestTradingSession], data_provider: DataProvider,
+                 tickers: Union[Ticker, Sequence[Ticker]], start_date: datetime, end_date: datetime,
+                 frequency: Frequency = Frequency.DAILY, n_jobs: int = 1,
+                 data_preloading_time_delta: Optional[RelativeDelta] = None):
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        self._session_factory = session_factory
+        self._data_provider = data_provider
+        self._tickers, _ = convert_to_list(tickers, Ticker)
+        self._start_date = start_date
+        self._end_date = end_date
+        self._frequency = frequency
+        self._n_jobs = n_jobs
+        self._data_preloading_time_delta = RelativeDelta(years=1) if data_preloading_time_delta is None \
+            else data_preloading_time_delta
+
+        self._data_bundle = None  # type: Optional[PresetDataProvider]
+
+    def run(self, parameters_grid: Union[Dict[str, Sequence[Any]], Sequence[Dict[str, Any]]],
+            result_function: Optional[Callable[[BacktestTradingSession], Any]] = None) -> List[BacktestSweepElement]:
+        """
+        Runs a backtest for each set of parameters.
+
+        Parameters
+        ----------
+        parameters_grid: Dict[str, Sequence[Any]], Sequence[Dict[str, Any]]
+            either a dictionary mapping parameters names onto the sequences of tested values (in which case all
+            combinations of the values are tested), or a sequence of dictionaries, each of which defines one set of
+            parameters
+        result_function: Optional[Callable[[BacktestTradingSession], Any]]
+            function, which is called in the worker process on the trading session after the backtest is finished, to
+            compute any summary of the backtest (e.g. statistics of the portfolio). It should return a picklable
+            object
+
+        Returns
+        -------
+        List[BacktestSweepElement]
+            results of the backtests in the order of the parameters sets
+        """
+        parameters_sets = self._parameters_sets(parameters_grid)
+        self.logger.info("{} parameters sets to be tested".format(len(parameters_sets)))
+
+        data_bundle = self._get_data_bundle()
+        sweep_elements = Parallel(n_jobs=self._n_jobs)(
+            delayed(_run_backtest)(self._session_factory, data_bundle, parameters, result_function)
+            for parameters in parameters_sets)
+
+        self.logger.info("Finished running {} backtests".format(len(sweep_elements)))
+        return sweep_elements
+
+    def _get_data_bundle(self) -> PresetDataProvider:
+        if self._data_bundle is None and isinstance(self._data_provider, MemoryMappedDataProvider):
+            # The bundle is already persisted on disk - each worker process reopens the same memory-mapped files
+            self._data_bundle = self._data_provider
+        elif self._data_bundle is None:
+            self.logger.info("Preloading the data bundle")
+            self._data_bundle = PrefetchingDataProvider(
+                self._data_provider, sorted(self._tickers), sorted(PriceField.ohlcv()),
+                self._start_date - self._data_preloading_time_delta, self._end_date, self._frequency)
+        return self._data_bundle
+
+    @staticmethod
+    def _parameters_sets(parameters_grid: Union[Dict[str, Sequence[Any]], Sequence[Dict[str, Any]]]) \
+            -> List[Dict[str, Any]]:
+        if isinstance(parameters_grid, dict):
+            names = list(parameters_grid.keys())
+            return [dict(zip(names, values)) for values in product(*(parameters_grid[name] for name in names))]
+        return [dict(parameters) for parameters in parameters_grid]
+
+
+def _run_backtest(session_factory: Callable[..., BacktestTradingSession], data_bundle: PresetDataProvider,
+                  parameters: Dict[str, Any], result_function: Optional[Callable[[BacktestTradingSession], Any]]) \
+        -> BacktestSweepElement:
+    ts = session_factory(data_bundle, **parameters)
+    if not ts.data_handler.is_optimised:
+        ts.data_handler.use_preset_data_provider(data_bundle)
+
+    ts.start_trading()
+
+    result = result_function(ts) if result_function is not None else None
+    return BacktestSweepElement(parameters, ts.portfolio.portfolio_eod_series(), ts.backtest_result.transactions,
+                                result)
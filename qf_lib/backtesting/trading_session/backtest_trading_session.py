@@ -11,11 +11,12 @@
 #     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
-from typing import Union, Sequence
+from typing import Union, Sequence, Optional
 
 from qf_lib.backtesting.broker.backtest_broker import BacktestBroker
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.events.event_manager import EventManager
 from qf_lib.backtesting.events.notifiers import Notifiers
 from qf_lib.backtesting.monitoring.backtest_monitor import BacktestMonitor
@@ -44,7 +45,7 @@ class BacktestTradingSession(TradingSession):
                  position_sizer: PositionSizer, orders_filters: Sequence[OrdersFilter], data_handler: DataHandler,
                  timer: SettableTimer, notifiers: Notifiers, portfolio: Portfolio, events_manager: EventManager,
                  monitor: BacktestMonitor, broker: BacktestBroker, order_factory: OrderFactory, frequency: Frequency,
-                 backtest_result: BacktestResult):
+                 backtest_result: BacktestResult, market_snapshot: Optional[MarketSnapshot] = None):
         """
         Set up the backtest variables according to what has been passed in.
         The data_provider parameter of the BacktestTradingSession points to a Data Handler object.
@@ -71,6 +72,7 @@ class BacktestTradingSession(TradingSession):
         self.broker = broker
         self.frequency = frequency
         self.backtest_result = backtest_result
+        self.market_snapshot = market_snapshot
 
         self._hash_of_data_bundle = None
 
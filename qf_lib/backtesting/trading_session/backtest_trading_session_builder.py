@@ -13,17 +13,20 @@
 #     limitations under the License.
 import inspect
 from datetime import datetime
-from typing import List, Tuple, Type, Dict
+from typing import List, Tuple, Type, Dict, Optional
 
 from qf_lib.backtesting.broker.backtest_broker import BacktestBroker
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.simulated_contract_ticker_mapper import \
     SimulatedContractTickerMapper
 from qf_lib.backtesting.data_handler.daily_data_handler import DailyDataHandler
 from qf_lib.backtesting.data_handler.intraday_data_handler import IntradayDataHandler
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.events.event_manager import EventManager
 from qf_lib.backtesting.events.notifiers import Notifiers
+from qf_lib.backtesting.events.time_event.heap_scheduler import HeapScheduler
 from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.scheduler import Scheduler
 from qf_lib.backtesting.events.time_flow_controller import BacktestTimeFlowController
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.execution_handler.commission_models.fixed_commission_model import FixedCommissionModel
@@ -35,6 +38,7 @@ from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
 from qf_lib.backtesting.order.order_rounder import OrderRounder
 from qf_lib.backtesting.order.order_factory import OrderFactory
 from qf_lib.backtesting.orders_filter.orders_filter import OrdersFilter
+from qf_lib.backtesting.portfolio.array_portfolio import ArrayPortfolio
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
 from qf_lib.backtesting.position_sizer.position_sizer import PositionSizer
 from qf_lib.backtesting.position_sizer.simple_position_sizer import SimplePositionSizer
@@ -110,6 +114,9 @@ class BacktestTradingSessionBuilder:
 
         self._frequency = None
         self._scheduling_time_delay = RelativeDelta(minutes=1)
+        self._use_heap_scheduler = False
+        self._use_array_portfolio = False
+        self._use_market_snapshot = False
 
         self._default_daily_market_open_time = {"hour": 13, "minute": 30, "second": 0, "microsecond": 0}
         self._default_daily_market_close_time = {"hour": 20, "minute": 0, "second": 0, "microsecond": 0}
@@ -190,6 +197,47 @@ class BacktestTradingSessionBuilder:
         """
         self._scheduling_time_delay = time_delay
 
+    @ConfigExporter.update_config
+    def use_heap_scheduler(self, use_heap_scheduler: bool = True):
+        """Enables the HeapScheduler, which caches the trigger times of the regular time events (e.g. MarketOpenEvent,
+        IntradayBarEvent) and precomputes their calendars for the whole backtest, instead of recomputing the next
+        trigger time of each event after every event. The trigger times of the events need to be set before the
+        backtest is started.
+
+        Parameters
+        -----------
+        use_heap_scheduler: bool
+            if True, the HeapScheduler will be used in the backtest, otherwise the default Scheduler is used
+        """
+        self._use_heap_scheduler = use_heap_scheduler
+
+    @ConfigExporter.update_config
+    def use_array_portfolio(self, use_array_portfolio: bool = True):
+        """Enables the ArrayPortfolio, which keeps the state of all positions in numpy arrays and values all of them
+        with one vectorized operation. The history of positions is recorded into columnar buffers instead of
+        dictionaries of BacktestPositionSummary objects, which decreases the memory usage of long backtests with many
+        positions.
+
+        Parameters
+        -----------
+        use_array_portfolio: bool
+            if True, the ArrayPortfolio will be used in the backtest, otherwise the default Portfolio is used
+        """
+        self._use_array_portfolio = use_array_portfolio
+
+    @ConfigExporter.update_config
+    def use_market_snapshot(self, use_market_snapshot: bool = True):
+        """Enables the MarketSnapshot, which downloads the market data used by the executors, slippage model, orders
+        filters and portfolio at most once per timer tick, for all tickers of open orders and open positions at once,
+        instead of letting each of the components query the data provider on its own.
+
+        Parameters
+        -----------
+        use_market_snapshot: bool
+            if True, the MarketSnapshot will be used in the backtest
+        """
+        self._use_market_snapshot = use_market_snapshot
+
     @ConfigExporter.update_config
     def set_initial_cash(self, initial_cash: int):
         """Sets the initial cash value.
@@ -404,13 +452,18 @@ class BacktestTradingSessionBuilder:
             trading session containing all the necessary parameters
         """
         self._timer = SettableTimer(start_date)
-        self._notifiers = Notifiers(self._timer)
+        scheduler = HeapScheduler(self._timer, end_date) if self._use_heap_scheduler else Scheduler(self._timer)
+        self._notifiers = Notifiers(self._timer, scheduler)
         self._events_manager = self._create_event_manager(self._timer, self._notifiers)
 
         self._data_handler = self._create_data_handler(self._data_provider, self._timer)
         signals_register = self._signals_register if self._signals_register else BacktestSignalsRegister()
 
-        self._portfolio = Portfolio(self._data_handler, self._initial_cash, self._timer)
+        if self._use_array_portfolio:
+            self._portfolio = ArrayPortfolio(self._data_handler, self._initial_cash, self._timer,
+                                             initial_capacity=(end_date - start_date).days + 1)
+        else:
+            self._portfolio = Portfolio(self._data_handler, self._initial_cash, self._timer)
 
         self._backtest_result = BacktestResult(self._portfolio, signals_register, self._backtest_name, start_date,
                                                end_date, self._initial_risk)
@@ -431,6 +484,7 @@ class BacktestTradingSessionBuilder:
         self._order_factory = OrderFactory(self._broker, self._data_handler)
         self._position_sizer = self._position_sizer_setup(signals_register)
         self._orders_filters = self._orders_filter_setup()
+        self._market_snapshot = self._market_snapshot_setup()
 
         self._logger.info(
             "\n".join([
@@ -483,7 +537,8 @@ class BacktestTradingSessionBuilder:
             broker=self._broker,
             order_factory=self._order_factory,
             frequency=self._frequency,
-            backtest_result=self._backtest_result
+            backtest_result=self._backtest_result,
+            market_snapshot=self._market_snapshot
         )
 
         return ts
@@ -504,6 +559,18 @@ class BacktestTradingSessionBuilder:
             orders_filters.append(orders_filter)
         return orders_filters
 
+    def _market_snapshot_setup(self) -> Optional[MarketSnapshot]:
+        if not self._use_market_snapshot:
+            return None
+
+        market_snapshot = MarketSnapshot(self._data_handler, self._timer)
+        self._portfolio.set_market_snapshot(market_snapshot)
+        self._execution_handler.set_market_snapshot(market_snapshot)
+        self._slippage_model.set_market_snapshot(market_snapshot)
+        for orders_filter in self._orders_filters:
+            orders_filter.set_market_snapshot(market_snapshot)
+        return market_snapshot
+
     def _slippage_model_setup(self):
         return self._slippage_model_type(data_provider=self._data_provider, **self._slippage_model_kwargs)
 
@@ -11,6 +11,10 @@
 #     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
 
 from qf_lib.common.utils.factorization.data_models.data_model import DataModel
 from qf_lib.common.utils.factorization.data_models.data_model_input import DataModelInput
@@ -26,10 +30,14 @@ class RollingDataModel:
     ----------
     data_model_input
         data from which the model is built
+    n_jobs
+        number of processes used to build the models for different windows. The windows are split into n_jobs
+        contiguous groups and each process receives only the part of the data covered by its group of windows
     """
 
-    def __init__(self, data_model_input: DataModelInput):
+    def __init__(self, data_model_input: DataModelInput, n_jobs: int = 1):
         self.input_data = data_model_input
+        self.n_jobs = n_jobs
 
         self.window_size_ = None
         self.step_ = None
@@ -86,17 +94,27 @@ class RollingDataModel:
         end_of_window_idx = len(self.input_data.analysed_tms) - 1
         beginning_of_window_idx = end_of_window_idx - window_size
 
-        ref_dates = []
-        models = []
-
+        windows = []
         while beginning_of_window_idx >= 0:
-            data_model, ref_date = self._get_model_for_window(beginning_of_window_idx, end_of_window_idx)
-            models.append(data_model)
-            ref_dates.append(ref_date)
+            windows.append((beginning_of_window_idx, end_of_window_idx))
 
             end_of_window_idx -= step
             beginning_of_window_idx -= step
 
+        if self.n_jobs == 1 or len(windows) <= 1:
+            models_and_ref_dates = [self._get_model_for_window(beginning_idx, end_idx)
+                                    for beginning_idx, end_idx in windows]
+        else:
+            windows_groups = [group for group in np.array_split(np.arange(len(windows)), self.n_jobs) if len(group) > 0]
+            models_groups = Parallel(n_jobs=self.n_jobs)(
+                delayed(_get_models_for_windows)(*self._get_input_data_for_windows([windows[i] for i in group]))
+                for group in windows_groups)
+            # the groups are returned in the order of windows
+            models_and_ref_dates = [model_and_ref_date for group in models_groups for model_and_ref_date in group]
+
+        models = [data_model for data_model, _ in models_and_ref_dates]
+        ref_dates = [ref_date for _, ref_date in models_and_ref_dates]
+
         models_series_ = QFSeries(data=models, index=ref_dates)
 
         self.coefficients_df = models_series_.apply(lambda model: model.coefficients)
@@ -114,17 +132,40 @@ class RollingDataModel:
         self.correlations_df = models_series_.apply(lambda model: model.correlation_matrix.iloc[-1, :-1])
 
     def _get_model_for_window(self, beginning_of_window_idx, end_of_window_idx):
-        frequency = self.input_data.frequency
-        is_fit_intercept = self.input_data.is_fit_intercept
+        return _get_model_for_window(self.input_data, beginning_of_window_idx, end_of_window_idx)
+
+    def _get_input_data_for_windows(self, windows: Sequence[Tuple[int, int]]) \
+            -> Tuple[DataModelInput, List[Tuple[int, int]]]:
+        """
+        Returns the part of the input data covered by the given windows (so that only that part needs to be sent
+        to another process) together with the windows' indices shifted accordingly.
+        """
+        first_idx = min(beginning_idx for beginning_idx, _ in windows)
+        last_idx = max(end_idx for _, end_idx in windows)
+
+        input_data = DataModelInput(self.input_data.regressors_df.iloc[first_idx:last_idx + 1, :],
+                                    self.input_data.analysed_tms.iloc[first_idx:last_idx + 1],
+                                    self.input_data.frequency, self.input_data.is_fit_intercept)
+        shifted_windows = [(beginning_idx - first_idx, end_idx - first_idx) for beginning_idx, end_idx in windows]
+        return input_data, shifted_windows
+
+
+def _get_models_for_windows(input_data: DataModelInput, windows: Sequence[Tuple[int, int]]) -> list:
+    return [_get_model_for_window(input_data, beginning_idx, end_idx) for beginning_idx, end_idx in windows]
+
+
+def _get_model_for_window(input_data: DataModelInput, beginning_of_window_idx: int, end_of_window_idx: int):
+    frequency = input_data.frequency
+    is_fit_intercept = input_data.is_fit_intercept
 
-        ref_date = self.input_data.analysed_tms.index[end_of_window_idx]
+    ref_date = input_data.analysed_tms.index[end_of_window_idx]
 
-        regressors_df = self.input_data.regressors_df.iloc[beginning_of_window_idx:end_of_window_idx + 1, :]
-        fund_tms = self.input_data.analysed_tms.iloc[beginning_of_window_idx:end_of_window_idx + 1]
+    regressors_df = input_data.regressors_df.iloc[beginning_of_window_idx:end_of_window_idx + 1, :]
+    fund_tms = input_data.analysed_tms.iloc[beginning_of_window_idx:end_of_window_idx + 1]
 
-        input_data = DataModelInput(regressors_df, fund_tms, frequency, is_fit_intercept)
+    window_input_data = DataModelInput(regressors_df, fund_tms, frequency, is_fit_intercept)
 
-        data_model = DataModel(input_data)
-        data_model.setup()
+    data_model = DataModel(window_input_data)
+    data_model.setup()
 
-        return data_model, ref_date
+    return data_model, ref_date
@@ -75,51 +75,87 @@ class StepwiseFactorsIdentifier(FactorsIdentifier):
 
         return regressors_df.iloc[:, selected_columns_inds]
 
-    def _select_with_forward_selection(self, regressors_df, analysed_tms) -> List[str]:
+    def _select_with_forward_selection(self, regressors_df, analysed_tms) -> List[int]:
         """
         Used stepwise forward selection algorithm for selecting significant factors for the model.
 
+        Instead of fitting a new regression for every candidate in every step, the parts of all regressors orthogonal
+        to the already selected ones are kept (and updated with a single Gram-Schmidt step after each selection).
+        The R^2 score of the model extended by any of the candidates can then be computed for all candidates at once.
+
         Returns
         -------
-        List[str]
+        List[int]
             indices of columns selected for the model
         """
-        total_columns_number = len(regressors_df.columns)
-        remaining_columns = list(range(total_columns_number))
+        regressors = np.asarray(regressors_df.values, dtype=float)
+        residuals = np.asarray(analysed_tms.values, dtype=float)
+        total_sum_of_squares = np.sum((residuals - residuals.mean()) ** 2)
+
+        if self.intercept:
+            # fitting the intercept is equivalent to fitting the model to the centered data
+            regressors = regressors - regressors.mean(axis=0)
+            residuals = residuals - residuals.mean()
+
+        orthogonal_regressors = regressors.copy()
+        regressors_norms = np.sum(regressors ** 2, axis=0)
+        orthonormal_basis = np.empty((regressors.shape[0], 0))
+
+        remaining_columns = np.ones(regressors.shape[1], dtype=bool)
         selected_columns_inds = []
 
         current_score = 0.0
         made_improvement = True
 
-        while made_improvement and remaining_columns:
-            new_score, best_candidates_idx = \
-                self._get_next_factor(analysed_tms, regressors_df, selected_columns_inds, remaining_columns)
+        while made_improvement and remaining_columns.any():
+            new_score, best_candidates_idx = self._get_next_factor(
+                orthogonal_regressors, regressors_norms, residuals, total_sum_of_squares, remaining_columns)
 
             # check if adding a new factor improves the model at least by self.epsilon
             if new_score - current_score >= self.epsilon:
-                remaining_columns.remove(best_candidates_idx)
+                remaining_columns[best_candidates_idx] = False
                 selected_columns_inds.append(best_candidates_idx)
                 current_score = new_score
+
+                # extend the orthonormal basis (re-orthogonalizing the new vector for numerical stability) and update
+                # the residuals and the orthogonal parts of regressors
+                new_vector = orthogonal_regressors[:, best_candidates_idx].copy()
+                new_vector -= orthonormal_basis.dot(orthonormal_basis.T.dot(new_vector))
+                new_vector /= np.linalg.norm(new_vector)
+
+                orthonormal_basis = np.column_stack([orthonormal_basis, new_vector])
+                residuals = residuals - new_vector * new_vector.dot(residuals)
+                orthogonal_regressors -= np.outer(new_vector, new_vector.dot(orthogonal_regressors))
             else:
                 made_improvement = False
 
         return selected_columns_inds
 
-    def _get_next_factor(self, analysed_tms, regressors_df, selected_columns_inds, unused_columns_inds):
-        scores_of_candidates = []
+    def _get_next_factor(self, orthogonal_regressors, regressors_norms, residuals, total_sum_of_squares,
+                         remaining_columns):
+        """
+        Computes the R^2 scores of models extended by each of the remaining candidates and returns the best score
+        together with the index of the best candidate. Adding the candidate x decreases the residual sum of squares
+        by (x'r)^2 / x'x, where x is the part of the candidate orthogonal to the selected regressors and r are
+        the current residuals.
+        """
+        orthogonal_norms = np.sum(orthogonal_regressors ** 2, axis=0)
 
-        for candidate in unused_columns_inds:
-            columns_to_pick_inds = [candidate] + selected_columns_inds
-            used_regressors = regressors_df.iloc[:, columns_to_pick_inds]
-            self.linear_regression.fit(used_regressors, analysed_tms)
-            r_squared = self.linear_regression.score(used_regressors, analysed_tms)
-            scores_of_candidates.append(r_squared)
+        # candidates linearly dependent on the selected regressors don't improve the model
+        is_independent = remaining_columns & (orthogonal_norms > 1e-10 * regressors_norms)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            improvements = np.where(
+                is_independent, orthogonal_regressors.T.dot(residuals) ** 2 / orthogonal_norms, 0.0)
+        residual_sums_of_squares = np.maximum(residuals.dot(residuals) - improvements, 0.0)
 
-        # index of best candidate in the candidates_array
-        best_candidate = np.argmax(scores_of_candidates)
-        best_candidates_score = scores_of_candidates[best_candidate]
+        if total_sum_of_squares > 0:
+            scores_of_candidates = 1.0 - residual_sums_of_squares / total_sum_of_squares
+        else:
+            scores_of_candidates = np.where(np.isclose(residual_sums_of_squares, 0.0), 1.0, 0.0)
+        scores_of_candidates = np.where(remaining_columns, scores_of_candidates, -np.inf)
 
         # index of best candidate in the regressors_df.columns array
-        best_candidates_idx = unused_columns_inds[best_candidate]
+        best_candidates_idx = int(np.argmax(scores_of_candidates))
+        best_candidates_score = scores_of_candidates[best_candidates_idx]
 
         return best_candidates_score, best_candidates_idx
@@ -91,14 +91,19 @@ class FactorizationManager:
         data_model.setup()
         return data_model
 
-    def get_rolling_factorization_data_model(self) -> RollingDataModel:
+    def get_rolling_factorization_data_model(self, n_jobs: int = 1) -> RollingDataModel:
         """
         Creates multiple models explaining fund's timeseries (one model for each time window).
+
+        Parameters
+        ----------
+        n_jobs: int
+            number of processes used to build the models for different time windows
         """
         model_input = DataModelInput(self.used_regressors_, self.used_fund_returns_, self.frequency,
                                      self.is_fit_intercept)
 
-        data_model = RollingDataModel(model_input)
+        data_model = RollingDataModel(model_input, n_jobs)
         data_model.setup()
         return data_model
 
@@ -12,10 +12,15 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import warnings
+
+import numpy as np
 from pandas import concat
 
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.qf_series import QFSeries
 
 
 def average_true_range(prices_df: PricesDataFrame, normalized: bool = False) -> float:
@@ -48,3 +53,56 @@ def average_true_range(prices_df: PricesDataFrame, normalized: bool = False) ->
         true_range = true_range / prev_close_tms.iloc[-1]
 
     return true_range.mean()
+
+
+def average_true_range_per_ticker(prices_data_array: QFDataArray, nr_of_bars: int, normalized: bool = False) \
+        -> QFSeries:
+    """Calculates the average true range for all tickers of the data array at once.
+
+    For each ticker only the last nr_of_bars bars, for which any of High, Low, Close prices is available, are used
+    (which corresponds to the result of calling average_true_range on the prices returned by
+    DataProvider.historical_price(ticker, [High, Low, Close], nr_of_bars) for each ticker separately).
+
+    Parameters
+    ----------
+    prices_data_array: QFDataArray
+        QFDataArray containing High, Low, Close PriceFields
+    nr_of_bars: int
+        number of bars used to compute the ATR of each ticker (equal to window_length + 1)
+    normalized: bool
+        if True, each true_range is normalized to the closing price for the same day; NATR is returned
+    Returns
+    -------
+    QFSeries
+        Average True Range indexed by tickers. Tickers for which less than nr_of_bars bars are available get NaN.
+    """
+    tickers = prices_data_array.tickers.values
+    prices = prices_data_array.loc[:, :, [PriceField.High, PriceField.Low, PriceField.Close]].values.astype(np.float64)
+    if prices.shape[0] < max(nr_of_bars, 2):
+        return QFSeries(data=np.nan, index=tickers)
+
+    # Select for each ticker the positions of its last nr_of_bars bars with any price available (in chronological
+    # order). Tickers which do not have enough bars are marked as NaN at the end.
+    is_bar_available = ~np.isnan(prices).all(axis=2)
+    bars_from_the_end = np.cumsum(is_bar_available[::-1], axis=0)[::-1]
+    is_bar_selected = is_bar_available & (bars_from_the_end <= nr_of_bars)
+    has_enough_bars = is_bar_selected.sum(axis=0) == nr_of_bars
+
+    positions = np.argsort(~is_bar_selected, axis=0, kind="stable")[:nr_of_bars]
+    prices = np.take_along_axis(prices, positions[:, :, np.newaxis], axis=0)
+    high, low, close = prices[:, :, 0], prices[:, :, 1], prices[:, :, 2]
+    prev_close = close[:-1]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)  # ranges consisting only of NaN values
+        true_range = np.nanmax(np.stack([
+            high[1:] - low[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)
+        ]), axis=0)
+
+        if normalized:
+            true_range = true_range / prev_close[-1]
+
+        atr = np.nanmean(true_range, axis=0)
+
+    atr[~has_enough_bars] = np.nan
+    return QFSeries(data=atr, index=tickers)
@@ -15,6 +15,8 @@
 from datetime import datetime
 from typing import Tuple, List
 
+import numpy as np
+
 from qf_lib.common.utils.returns.drawdown_tms import drawdown_tms
 from qf_lib.containers.series.qf_series import QFSeries
 
@@ -29,23 +31,18 @@ def list_longest_drawdowns(prices_tms: QFSeries, count: int) -> List[Tuple[datet
         A list of 2-item tuples. The first tuple item contains the start date and the second the end date of the drawdown
         period.
     """
-    result = []
-
     drawdown_timeseries = drawdown_tms(prices_tms)
+    dates = drawdown_timeseries.index
+    in_drawdown = drawdown_timeseries.values != 0
 
-    start_date = None
-
-    for date, value in drawdown_timeseries.iteritems():
-        if value == 0:
-            if start_date is not None:
-                result.append((start_date, date))
-                start_date = None
-        else:
-            if start_date is None:
-                start_date = date
+    # Each drawdown lasts from the first date with a non-zero value until the next date with the zero value
+    was_in_drawdown = np.concatenate([[False], in_drawdown[:-1]])
+    start_indices = np.flatnonzero(in_drawdown & ~was_in_drawdown)
+    end_indices = np.flatnonzero(~in_drawdown & was_in_drawdown)
+    if len(end_indices) < len(start_indices):
+        end_indices = np.append(end_indices, len(dates) - 1)
 
-    if start_date is not None:
-        result.append((start_date, drawdown_timeseries.index[-1]))
+    result = list(zip(dates[start_indices], dates[end_indices]))
 
     # Sort according to drawdown length.
     result.sort(key=lambda val: val[0] - val[1])
@@ -14,6 +14,8 @@
 
 from typing import List
 
+import numpy as np
+
 from qf_lib.common.utils.dateutils.to_days import to_days
 from qf_lib.common.utils.returns.drawdown_tms import drawdown_tms
 from qf_lib.containers.series.qf_series import QFSeries
@@ -36,29 +38,21 @@ def list_of_max_drawdowns(prices_tms: QFSeries) -> (List[float], List[float]):
     """
 
     drawdown_timeseries = drawdown_tms(prices_tms)
-
-    max_drawdowns = []
-    duration_of_drawdowns = []
-
-    dd_start_date = None
-    series_sample = []
-
-    for date, value in drawdown_timeseries.iteritems():
-        if value == 0:
-            if series_sample:  # empty sequence returns false
-                max_drawdowns.append(max(series_sample))
-                duration_of_drawdowns.append(date - dd_start_date)
-
-            series_sample = []  # reset the sample series
-            dd_start_date = date
-        else:
-            series_sample.append(value)
-
-    if series_sample:  # the last element was not added if the drawdown did not recovered
-        max_drawdowns.append(max(series_sample))
-        duration_of_drawdowns.append(drawdown_timeseries.index[-1] - dd_start_date)
-
-    # convert the duration of drawdown to float value expressed in days
-    duration_of_drawdowns = list(map(to_days, duration_of_drawdowns))
+    dates = drawdown_timeseries.index
+    values = drawdown_timeseries.values
+    in_drawdown = values != 0
+
+    # Each drawdown lasts from the last date with the zero value until the next date with the zero value
+    was_in_drawdown = np.concatenate([[False], in_drawdown[:-1]])
+    first_indices = np.flatnonzero(in_drawdown & ~was_in_drawdown)
+    end_indices = np.flatnonzero(~in_drawdown & was_in_drawdown)
+    if len(end_indices) < len(first_indices):
+        # the drawdown did not recover until the end of the series
+        end_indices = np.append(end_indices, len(dates))
+
+    max_drawdowns = [values[first:end].max() for first, end in zip(first_indices, end_indices)]
+    end_dates = dates[np.minimum(end_indices, len(dates) - 1)]
+    duration_of_drawdowns = [to_days(end_date - start_date)
+                             for start_date, end_date in zip(dates[first_indices - 1], end_dates)]
 
     return max_drawdowns, duration_of_drawdowns
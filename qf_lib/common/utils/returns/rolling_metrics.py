@@ -0,0 +1,431 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from abc import ABCMeta, abstractmethod
+from typing import Optional, Type, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.miscellaneous.constants import DAYS_PER_YEAR_AVG
+from qf_lib.common.utils.returns.beta_and_alpha import beta_and_alpha
+from qf_lib.common.utils.returns.max_drawdown import max_drawdown
+from qf_lib.common.utils.ratios.sharpe_ratio import sharpe_ratio
+from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.containers.series.cast_series import cast_series
+from qf_lib.containers.series.log_returns_series import LogReturnsSeries
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
+
+
+class _PricesPath:
+    """
+    Logarithms of the prices corresponding to a series of prices or returns. For a PricesSeries of length n the path
+    consists of n points (one for each date). For a ReturnsSeries it consists of n + 1 points, as the initial price
+    (equal to 1) is added before the first return, the same way as in ReturnsSeries.to_prices.
+
+    The window of the series, which starts at the index i and ends at the index j (inclusive), corresponds to the points
+    i, ..., j + offset of the path, where offset is equal to 0 for prices and 1 for returns. The k-th return (k >= 1)
+    of the path is the return between the points k - 1 and k.
+    """
+
+    def __init__(self, log_prices: np.ndarray, simple_returns: np.ndarray, offset: int, dates: np.ndarray):
+        self.log_prices = log_prices
+        self.simple_returns = simple_returns
+        self.offset = offset
+        self.dates = dates
+
+    @property
+    def log_returns(self) -> np.ndarray:
+        return np.diff(self.log_prices)
+
+    @classmethod
+    def create(cls, qf_series: QFSeries) -> Optional["_PricesPath"]:
+        """
+        Creates the path for the given series. Returns None if the series is neither a PricesSeries nor a ReturnsSeries
+        or if it contains NaNs, infinite values or non-positive prices, in which case the vectorized computations would
+        not be equivalent to the ones performed on each window separately.
+        """
+        values = np.asarray(qf_series.values, dtype=np.float64)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if isinstance(qf_series, PricesSeries):
+                log_prices = np.log(values)
+                simple_returns = values[1:] / values[:-1] - 1.0
+                offset = 0
+            elif isinstance(qf_series, SimpleReturnsSeries):
+                log_prices = np.concatenate(([0.0], np.cumsum(np.log1p(values))))
+                simple_returns = values
+                offset = 1
+            elif isinstance(qf_series, LogReturnsSeries):
+                log_prices = np.concatenate(([0.0], np.cumsum(values)))
+                simple_returns = np.expm1(values)
+                offset = 1
+            else:
+                return None
+
+        if not (np.isfinite(log_prices).all() and np.isfinite(simple_returns).all()):
+            return None
+
+        return cls(log_prices, simple_returns, offset, qf_series.index.values)
+
+
+def _windows_sums(values: np.ndarray, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """ Sums of values[first[i]:last[i]] for each window i, computed using the cumulative sums of values. """
+    cumulative_sums = np.concatenate(([0.0], np.cumsum(values)))
+    return cumulative_sums[last] - cumulative_sums[first]
+
+
+def _rolling_volatility(path: _PricesPath, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+    """ Standard deviations (ddof = 1) of the log returns in each window. All windows have the same length. """
+    log_returns = path.log_returns
+    # Centering the returns before computing the sums of squares improves the numerical stability of the results
+    centered_returns = log_returns - log_returns.mean()
+    nr_of_returns = last - first
+
+    sums = _windows_sums(centered_returns, first, last)
+    sums_of_squares = _windows_sums(centered_returns ** 2, first, last)
+    variances = (sums_of_squares - sums ** 2 / nr_of_returns) / (nr_of_returns - 1)
+    return np.sqrt(np.maximum(variances, 0.0))
+
+
+class RollingMetric(metaclass=ABCMeta):
+    """
+    Statistic of a window of prices or returns, which can be used as the ``func`` of QFSeries.rolling_window and
+    QFDataFrame.rolling_window. Instead of calling the function for each window separately, rolling_window dispatches
+    to the vectorized RollingMetric.rolling_window, which computes the statistic for all windows at once using
+    cumulative sums (or a strided view of the series).
+
+    If the series is neither a PricesSeries nor a ReturnsSeries or if it contains NaNs or non-positive prices,
+    the statistic is computed for each window separately.
+
+    Parameters
+    ----------
+    series_type: Type[QFSeries]
+        type of the series (e.g. PricesSeries or SimpleReturnsSeries), to which the windows should be cast before
+        computing the statistic. By default the type of the rolled series is used
+    """
+
+    def __init__(self, series_type: Type[QFSeries] = None):
+        self.series_type = series_type
+
+    def __call__(self, window: QFSeries) -> float:
+        return self._calculate_single_value(self._cast(window))
+
+    def rolling_window(self, qf_series: QFSeries, window_size: int, step: int = 1) -> QFSeries:
+        """
+        Computes the statistic for the windows of size ``window_size`` moved by ``step`` data points. The result is
+        the same as the one of QFSeries.rolling_window called with the ``func`` computing the statistic.
+
+        Parameters
+        ----------
+        qf_series: QFSeries
+            series of prices or returns
+        window_size: int
+            the size of the window specified as the number of data points
+        step: int
+            the amount of data points to move the window by in each iteration
+
+        Returns
+        -------
+        QFSeries
+            series indexed by the last date of each window
+        """
+        qf_series = self._cast(qf_series)
+        window_starts = np.arange(0, len(qf_series) - window_size + 1, step)
+        window_ends = window_starts + window_size - 1
+
+        path = _PricesPath.create(qf_series)
+        values = None
+        if path is not None and len(window_starts) > 0:
+            values = self._calculate_rolling_values(path, window_starts, window_ends + path.offset, step)
+
+        if values is None:
+            return qf_series.rolling_window(window_size, self._calculate_single_value, step)
+        return QFSeries(data=values, index=qf_series.index[window_ends])
+
+    def _cast(self, qf_series: QFSeries) -> QFSeries:
+        if self.series_type is None or type(qf_series) is self.series_type:
+            return qf_series
+        return cast_series(qf_series, self.series_type)
+
+    @abstractmethod
+    def _calculate_single_value(self, window: QFSeries) -> float:
+        """ Computes the statistic for a single window. """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _calculate_rolling_values(self, path: _PricesPath, first: np.ndarray, last: np.ndarray,
+                                  step: int) -> Optional[np.ndarray]:
+        """
+        Computes the statistic for all windows, given the first and the last point of the path for each window.
+        Returns None if the statistic cannot be computed in a vectorized way.
+        """
+        raise NotImplementedError()
+
+
+class TotalCumulativeReturnMetric(RollingMetric):
+    """
+    Total cumulative return of the window (see QFSeries.total_cumulative_return).
+    """
+
+    def _calculate_single_value(self, window: QFSeries) -> float:
+        return window.total_cumulative_return()
+
+    def _calculate_rolling_values(self, path, first, last, step):
+        return np.expm1(path.log_prices[last] - path.log_prices[first])
+
+
+class VolatilityMetric(RollingMetric):
+    """
+    Volatility of the window (see get_volatility).
+
+    Parameters
+    ----------
+    frequency: Frequency
+        frequency of the series; obligatory if annualise is set to True
+    annualise: bool
+        True if the volatility should be annualised; False otherwise
+    series_type: Type[QFSeries]
+        type to which the windows should be cast; by default the type of the rolled series is used
+    """
+
+    def __init__(self, frequency: Frequency = None, annualise: bool = True, series_type: Type[QFSeries] = None):
+        super().__init__(series_type)
+        assert not annualise or frequency is not None
+        self.frequency = frequency
+        self.annualise = annualise
+
+    def _calculate_single_value(self, window: QFSeries) -> float:
+        return get_volatility(window, self.frequency, self.annualise)
+
+    def _calculate_rolling_values(self, path, first, last, step):
+        if last[0] - first[0] < 2:
+            # get_volatility requires at least 2 returns in the window
+            return None
+
+        volatility = _rolling_volatility(path, first, last)
+        if self.annualise:
+            volatility = volatility * np.sqrt(self.frequency.occurrences_in_year)
+        return volatility
+
+
+class SharpeRatioMetric(RollingMetric):
+    """
+    Sharpe Ratio of the window (see sharpe_ratio).
+
+    Parameters
+    ----------
+    frequency: Frequency
+        frequency of the series
+    risk_free: float
+        risk free rate
+    series_type: Type[QFSeries]
+        type to which the windows should be cast; by default the type of the rolled series is used
+    """
+
+    def __init__(self, frequency: Frequency, risk_free: float = 0, series_type: Type[QFSeries] = None):
+        super().__init__(series_type)
+        self.frequency = frequency
+        self.risk_free = risk_free
+
+    def _calculate_single_value(self, window: QFSeries) -> float:
+        return sharpe_ratio(window, self.frequency, self.risk_free)
+
+    def _calculate_rolling_values(self, path, first, last, step):
+        if last[0] - first[0] < 2:
+            return None
+
+        # The period is measured between the first and the last price of the window. In case of returns the first
+        # price is placed one period (as defined by the frequency) before the first return, as in ReturnsSeries.to_prices
+        period_length_in_days = (path.dates[last - path.offset] - path.dates[first]) / np.timedelta64(1, "D")
+        if path.offset:
+            period_length_in_days = period_length_in_days + self.frequency.nr_of_calendar_days()
+        period_length_in_years = period_length_in_days / DAYS_PER_YEAR_AVG
+
+        annual_log_return = (path.log_prices[last] - path.log_prices[first]) / period_length_in_years
+        annual_vol = _rolling_volatility(path, first, last) * np.sqrt(self.frequency.occurrences_in_year)
+        return (annual_log_return - self.risk_free) / annual_vol
+
+
+class MaxDrawdownMetric(RollingMetric):
+    """
+    Maximal drawdown of the window (see max_drawdown).
+    """
+
+    def _calculate_single_value(self, window: QFSeries) -> float:
+        return max_drawdown(window)
+
+    def _calculate_rolling_values(self, path, first, last, step):
+        # Strided view of the path, in which each row contains the log prices of one window
+        log_prices = path.log_prices[first[0]:]
+        stride = log_prices.strides[0]
+        windows = as_strided(log_prices, shape=(len(first), last[0] - first[0] + 1), strides=(step * stride, stride),
+                             writeable=False)
+
+        running_max = np.maximum.accumulate(windows, axis=1)
+        drawdowns = -np.expm1(windows - running_max)
+        return drawdowns.max(axis=1)
+
+
+class RollingBenchmarkMetric(metaclass=ABCMeta):
+    """
+    Statistic of a window of prices or returns computed versus the window of a benchmark, which can be used as the
+    ``func`` of QFSeries.rolling_window_with_benchmark. Instead of calling the function for each window separately,
+    rolling_window_with_benchmark dispatches to the vectorized RollingBenchmarkMetric.rolling_window_with_benchmark.
+
+    If any of the series is neither a PricesSeries nor a ReturnsSeries or if it contains NaNs or non-positive prices,
+    the statistic is computed for each window separately.
+
+    Parameters
+    ----------
+    series_type: Type[QFSeries]
+        type of the series (e.g. PricesSeries or SimpleReturnsSeries), to which the windows of both series should be
+        cast before computing the statistic. By default the types of the rolled series and the benchmark are used
+    """
+
+    def __init__(self, series_type: Type[QFSeries] = None):
+        self.series_type = series_type
+
+    def __call__(self, window: QFSeries, benchmark_window: QFSeries) -> float:
+        return self._calculate_single_value(self._cast(window), self._cast(benchmark_window))
+
+    def rolling_window_with_benchmark(self, qf_series: QFSeries, benchmark: QFSeries, window_size: int,
+                                      step: int = 1) -> QFSeries:
+        """
+        Computes the statistic for the windows of size ``window_size`` (+ 1 data point) moved by ``step`` data points.
+        The result is the same as the one of QFSeries.rolling_window_with_benchmark called with the ``func`` computing
+        the statistic.
+
+        Parameters
+        ----------
+        qf_series: QFSeries
+            series of prices or returns
+        benchmark: QFSeries
+            series of prices or returns of the benchmark, indexed by the same dates as qf_series
+            (see QFSeries.rolling_window_with_benchmark)
+        window_size: int
+            the size of the window specified as the number of data points
+        step: int
+            the amount of data points to move the window by in each iteration
+
+        Returns
+        -------
+        QFSeries
+            series indexed by the last date of each window
+        """
+        qf_series = self._cast(qf_series)
+        benchmark = self._cast(benchmark)
+        assert qf_series.index.equals(benchmark.index), "The series and the benchmark should be aligned"
+
+        window_starts = np.arange(0, len(qf_series) - window_size, step)
+        window_ends = window_starts + window_size
+
+        path = _PricesPath.create(qf_series)
+        benchmark_path = _PricesPath.create(benchmark)
+        values = None
+        if path is not None and benchmark_path is not None and len(window_starts) > 0:
+            values = self._calculate_rolling_values(path, benchmark_path, window_starts, window_ends)
+
+        if values is None:
+            def func(window, benchmark_window):
+                return self._calculate_single_value(cast_series(window, type(qf_series)),
+                                                    cast_series(benchmark_window, type(benchmark)))
+
+            return qf_series.rolling_window_with_benchmark(benchmark, window_size, func, step)
+        return QFSeries(data=values, index=qf_series.index[window_ends])
+
+    def _cast(self, qf_series: QFSeries) -> QFSeries:
+        if self.series_type is None or type(qf_series) is self.series_type:
+            return qf_series
+        return cast_series(qf_series, self.series_type)
+
+    @abstractmethod
+    def _calculate_single_value(self, window: QFSeries, benchmark_window: QFSeries) -> float:
+        """ Computes the statistic for a single window. """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _calculate_rolling_values(self, path: _PricesPath, benchmark_path: _PricesPath, window_starts: np.ndarray,
+                                  window_ends: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Computes the statistic for all windows, given the first and the last index of each window.
+        Returns None if the statistic cannot be computed in a vectorized way.
+        """
+        raise NotImplementedError()
+
+
+def _rolling_beta_and_alpha(path: _PricesPath, benchmark_path: _PricesPath, window_starts: np.ndarray,
+                            window_ends: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Computes the coefficients of the linear regression of the simple returns of the series on the simple returns of
+    the benchmark for each window (see beta_and_alpha).
+    """
+    # beta_and_alpha regresses the returns of the common dates. The returns computed from prices are not available
+    # for the first date of the window, while the returns of a ReturnsSeries are available for all dates
+    first_date_offset = 0 if path.offset and benchmark_path.offset else 1
+    first_dates = window_starts + first_date_offset
+    nr_of_returns = window_ends - first_dates + 1
+    if nr_of_returns[0] < 2:
+        return None
+
+    # Centering the returns before computing the sums of products improves the numerical stability of the results.
+    # Then the returns of both series are aligned by dates, so that x[k] and y[k] correspond to the k-th date. The
+    # return for the first date of a PricesSeries is not available and is excluded from all windows.
+    x = np.concatenate((np.zeros(1 - benchmark_path.offset),
+                        benchmark_path.simple_returns - benchmark_path.simple_returns.mean()))
+    y = np.concatenate((np.zeros(1 - path.offset), path.simple_returns - path.simple_returns.mean()))
+
+    sum_x = _windows_sums(x, first_dates, window_ends + 1)
+    sum_y = _windows_sums(y, first_dates, window_ends + 1)
+    sum_xx = _windows_sums(x ** 2, first_dates, window_ends + 1)
+    sum_xy = _windows_sums(x * y, first_dates, window_ends + 1)
+
+    mean_x = sum_x / nr_of_returns
+    mean_y = sum_y / nr_of_returns
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = (sum_xy - nr_of_returns * mean_x * mean_y) / (sum_xx - nr_of_returns * mean_x ** 2)
+
+    # Add back the means, which were subtracted from the returns
+    alpha = (mean_y + path.simple_returns.mean()) - beta * (mean_x + benchmark_path.simple_returns.mean())
+    return beta, alpha
+
+
+class BetaMetric(RollingBenchmarkMetric):
+    """
+    Beta of the window versus the window of the benchmark (see beta_and_alpha).
+    """
+
+    def _calculate_single_value(self, window: QFSeries, benchmark_window: QFSeries) -> float:
+        beta, _ = beta_and_alpha(window, benchmark_window)
+        return beta
+
+    def _calculate_rolling_values(self, path, benchmark_path, window_starts, window_ends):
+        beta_and_alpha_values = _rolling_beta_and_alpha(path, benchmark_path, window_starts, window_ends)
+        return beta_and_alpha_values[0] if beta_and_alpha_values is not None else None
+
+
+class AlphaMetric(RollingBenchmarkMetric):
+    """
+    Alpha of the window versus the window of the benchmark (see beta_and_alpha).
+    """
+
+    def _calculate_single_value(self, window: QFSeries, benchmark_window: QFSeries) -> float:
+        _, alpha = beta_and_alpha(window, benchmark_window)
+        return alpha
+
+    def _calculate_rolling_values(self, path, benchmark_path, window_starts, window_ends):
+        beta_and_alpha_values = _rolling_beta_and_alpha(path, benchmark_path, window_starts, window_ends)
+        return beta_and_alpha_values[1] if beta_and_alpha_values is not None else None
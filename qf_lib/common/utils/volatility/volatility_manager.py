@@ -13,7 +13,7 @@
 #     limitations under the License.
 
 from qf_lib.common.enums.frequency import Frequency
-from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.common.utils.returns.rolling_metrics import VolatilityMetric
 from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
 
@@ -59,10 +59,8 @@ class VolatilityManager:
             that is volatility managed according to the above parameters
         """
 
-        def volatility_fun(window):
-            return get_volatility(SimpleReturnsSeries(window), self.frequency)
-
-        rolling_vol_tms = self.returns_tms.rolling_window(window_size=window_size, func=volatility_fun)
+        volatility_metric = VolatilityMetric(self.frequency, series_type=SimpleReturnsSeries)
+        rolling_vol_tms = self.returns_tms.rolling_window(window_size=window_size, func=volatility_metric)
 
         # weights that we would need to make the series have constant volatility
         target_weights_tms = vol_level / rolling_vol_tms
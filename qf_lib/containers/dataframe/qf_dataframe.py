@@ -254,7 +254,8 @@ class QFDataFrame(pd.DataFrame, TimeIndexedContainer):
         func
             The function to call during each iteration. When ``other`` is ``None`` this function should take one
             ``QFSeries`` and return a value (Usually a number such as a ``float``). Otherwise, this function should take
-            two ``QFSeries`` arguments and return a value.
+            two ``QFSeries`` arguments and return a value. If it is a RollingMetric (e.g. VolatilityMetric), the values
+            for all windows are computed at once in a vectorized way (for any ``step``).
         step
             The amount of data points to step through after each iteration, i.e. how much to move the window by in
             each iteration.
@@ -268,7 +269,8 @@ class QFDataFrame(pd.DataFrame, TimeIndexedContainer):
         QFDataFrame
             data frame containing the transformed data
         """
-        if optimised:
+        from qf_lib.common.utils.returns.rolling_metrics import RollingMetric
+        if optimised and not isinstance(func, RollingMetric):
             assert step == 1, "Optimised rolling is only possible with a step of 1."
             return self.rolling(window=window_size, center=False).apply(func=func)
 
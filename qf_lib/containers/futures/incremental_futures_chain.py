@@ -0,0 +1,325 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Union, Sequence, List
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.dimension_names import DATES, FIELDS
+from qf_lib.containers.futures.future_contract import FutureContract
+from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
+from qf_lib.containers.futures.futures_adjustment_method import FuturesAdjustmentMethod
+from qf_lib.containers.futures.futures_chain import FuturesChain
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.helpers import cast_data_array_to_proper_type
+
+
+class IncrementalFuturesChain(FuturesChain):
+    """
+    FuturesChain, which after the first generation of the chain does not regenerate it on each expiration of a
+    contract. The chain is kept as a list of per-contract segments, delimited by the roll dates (expiration dates
+    shifted by the days_before_exp_date - 1 number of days), together with a growable buffer of raw (not adjusted)
+    prices of all bars in the chain.
+
+    On the expiration of a contract only the current segment and the segments of the new contracts are downloaded and
+    appended to the buffer. In case of the BACK_ADJUSTED method, the historical prices are never rewritten - each
+    segment has an offset equal to the cumulated differences between consecutive contracts on all later roll dates and
+    the offsets are added to the Open, High, Low and Close prices only when the prices are returned by get_price.
+
+    The chain is regenerated from scratch only if prices before the first cached date or fields, which were not cached
+    yet, are requested.
+
+    Parameters
+    ------------
+    future_ticker: FutureTicker
+        The FutureTicker used to download the futures contracts, further chained and joined in order to obtain the
+         result of get_price function.
+    data_provider: DataProvider
+        Reference to the data provider, necessary to download latest prices, returned by the get_price function.
+        In case of backtests, the DataHandler wrapper should be used to avoid looking into the future.
+    method: FuturesAdjustmentMethod
+        FuturesAdjustmentMethod corresponding to one of two available methods of chaining the futures contracts.
+    """
+
+    _INITIAL_CAPACITY = 512
+
+    def __init__(self, future_ticker: FutureTicker, data_provider: "DataProvider", method: FuturesAdjustmentMethod =
+                 FuturesAdjustmentMethod.NTH_NEAREST):
+        super().__init__(future_ticker, data_provider, method)
+
+        # Growable buffer of raw prices (one row per bar, one column per cached field). Only the first _buffer_size
+        # rows contain valid data.
+        self._buffer_fields = []  # type: List[PriceField]
+        self._buffer_dates = np.empty(0, dtype="datetime64[ns]")
+        self._buffer_values = np.empty((0, 0))
+        self._buffer_size = 0
+        self._chain_frequency = None  # type: Frequency
+
+        # Segments of the chain. The i-th segment contains the bars of the i-th contract within the time range
+        # [_segment_start_dates[i], _segment_start_dates[i+1]). The offsets are added to the prices of each segment in
+        # case of the BACK_ADJUSTED method.
+        self._segment_tickers = []  # type: List[Ticker]
+        self._segment_start_dates = []  # type: List[pd.Timestamp]
+        self._segment_offsets = np.empty(0)
+
+    @property
+    def segments(self) -> QFSeries:
+        """
+        Series of specific tickers of the contracts used to build the chain, indexed by the IntervalIndex of time
+        ranges (closed on the left side) in which the prices of each contract are used.
+        """
+        start_dates = pd.DatetimeIndex(self._segment_start_dates)
+        end_dates = pd.DatetimeIndex(self._segment_start_dates[1:] + [pd.Timestamp.max])
+        index = pd.IntervalIndex.from_arrays(start_dates, end_dates, closed="left")
+        return QFSeries(data=self._segment_tickers, index=index)
+
+    def get_price(self, fields: Union[PriceField, Sequence[PriceField]], start_date: datetime, end_date: datetime,
+                  frequency: Frequency = Frequency.DAILY) -> Union[PricesDataFrame, PricesSeries]:
+        if not self._future_ticker.initialized:
+            raise ValueError(f"The future ticker {self._future_ticker} is not initialized with Data Provider and "
+                             f"Timer. At first you need to setup them using initialize_data_provider() function.")
+
+        fields_list, _ = convert_to_list(fields, PriceField)
+
+        # 1 - Generate the chain if it was not generated yet or if the cached data does not include all necessary
+        # dates and fields
+        uncached_fields = set(fields_list).difference(self._buffer_fields)
+        if self._buffer_size == 0 or start_date < self._first_cached_date or uncached_fields:
+            return self._preload_data_and_generate_chain(fields_list, start_date, end_date, frequency)
+
+        # 2 - Download the prices of the current contract since the last date available in the chain
+        last_date_in_chain = pd.Timestamp(self._buffer_dates[self._buffer_size - 1])
+        if last_date_in_chain >= end_date:
+            return self._get_chain_slice(fields_list, start_date, end_date)
+
+        prices_df = self._data_provider.get_price(self._future_ticker.get_current_specific_ticker(),
+                                                  self._buffer_fields, last_date_in_chain, end_date,
+                                                  self._chain_frequency)
+        assert isinstance(prices_df, PricesDataFrame)
+
+        if prices_df.empty:
+            return self._get_chain_slice(fields_list, start_date, end_date)
+
+        prices_after_last_date_in_chain = prices_df.iloc[1:] if prices_df.index[0] == last_date_in_chain else prices_df
+        if prices_after_last_date_in_chain.empty:
+            return self._get_chain_slice(fields_list, start_date, end_date)
+
+        # 3 - In case of an expiration only the last segment is rebuilt and the segments of new contracts are appended
+        # to the chain (see FuturesChain.get_price for the details on detecting the expiration), otherwise the new
+        # prices are appended to the buffer
+        if self._expiration_day_occurred(prices_df, last_date_in_chain):
+            self._roll_chain(end_date)
+        else:
+            self._append_bars(prices_after_last_date_in_chain.index.values,
+                              prices_after_last_date_in_chain[self._buffer_fields].values)
+            self._specific_ticker = self._future_ticker.ticker
+
+        return self._get_chain_slice(fields_list, start_date, end_date)
+
+    def _preload_data_and_generate_chain(self, fields: Union[PriceField, Sequence[PriceField]], start_date: datetime,
+                                         end_date: datetime, frequency: Frequency) -> \
+            Union[PricesDataFrame, PricesSeries]:
+        """
+        Downloads the prices of all contracts since the start_date and generates all segments of the chain. The Open
+        and Close prices, as well as all previously cached fields, are always cached, as they are necessary to compute
+        the back adjustment.
+        """
+        fields_list, _ = convert_to_list(fields, PriceField)
+
+        necessary_fields = set(fields_list).union({PriceField.Open, PriceField.Close}, self._buffer_fields)
+        self._buffer_fields = sorted(necessary_fields)
+        self._chain_frequency = frequency
+
+        self._initialize_futures_chain(self._buffer_fields, start_date, end_date, frequency)
+        self._generate_segments(start_date, end_date)
+        self._specific_ticker = self._future_ticker.ticker
+
+        return self._get_chain_slice(fields_list, start_date, end_date)
+
+    def _generate_segments(self, start_time: datetime, end_time: datetime):
+        """ Fills the buffer with prices of all contracts, using the same time ranges as FuturesChain._generate_chain. """
+        N = self._future_ticker.get_N()
+        days_before_exp_date = self._future_ticker.get_days_before_exp_date()
+
+        if N < 1 or days_before_exp_date < 1:
+            raise ValueError("The number of the contract and the number of days before expiration date should be "
+                             "greater than 0.")
+
+        self._buffer_dates = np.empty(self._INITIAL_CAPACITY, dtype="datetime64[ns]")
+        self._buffer_values = np.full((self._INITIAL_CAPACITY, len(self._buffer_fields)), np.nan)
+        self._buffer_size = 0
+        self._segment_tickers = []
+        self._segment_start_dates = []
+        self._segment_offsets = np.empty(0)
+
+        shifted_index = pd.DatetimeIndex(self.index) - pd.Timedelta(days=(days_before_exp_date - 1))
+        start_time_index_position = shifted_index.searchsorted(start_time, side="left")
+        roll_dates = shifted_index[start_time_index_position:]
+        contracts = list(self.iloc[start_time_index_position:].iloc[(N - 1):])
+
+        number_of_segments = min(len(roll_dates), len(contracts))
+        if number_of_segments == 0:
+            return
+
+        contracts = contracts[:number_of_segments]
+        start_dates = [pd.Timestamp(start_time)] + list(roll_dates[:number_of_segments - 1])
+        prices = [contract.data.loc[:end_time] for contract in contracts]
+        self._add_segments(contracts, start_dates, prices)
+
+    def _roll_chain(self, end_date: datetime):
+        """
+        Downloads the prices of the contract of the last segment (since the beginning of the segment) and of all
+        contracts, which became the current contract since the last update of the chain, and replaces the last segment
+        of the chain with their segments.
+        """
+        N = self._future_ticker.get_N()
+        days_before_exp_date = self._future_ticker.get_days_before_exp_date()
+
+        exp_dates = self._future_ticker.get_expiration_dates()
+        exp_dates = exp_dates[exp_dates.index >= self._first_cached_date]
+        tickers = pd.Index(exp_dates)
+        shifted_index = pd.DatetimeIndex(exp_dates.index) - pd.Timedelta(days=(days_before_exp_date - 1))
+
+        last_segment_ticker = self._segment_tickers[-1]
+        current_ticker = self._future_ticker.get_current_specific_ticker()
+        if last_segment_ticker not in tickers or current_ticker not in tickers:
+            self._preload_data_and_generate_chain(self._buffer_fields, self._first_cached_date, end_date,
+                                                  self._chain_frequency)
+            return
+
+        last_segment_position = tickers.get_loc(last_segment_ticker)
+        current_position = tickers.get_loc(current_ticker)
+        new_positions = range(last_segment_position + 1, current_position + 1)
+        if any(position < N for position in new_positions):
+            self._preload_data_and_generate_chain(self._buffer_fields, self._first_cached_date, end_date,
+                                                  self._chain_frequency)
+            return
+
+        last_segment_start_date = self._segment_start_dates[-1]
+        contracts_tickers = [last_segment_ticker] + [tickers[position] for position in new_positions]
+        start_dates = [last_segment_start_date] + [shifted_index[position - N] for position in new_positions]
+
+        futures_data = self._data_provider.get_price(contracts_tickers, self._buffer_fields, last_segment_start_date,
+                                                     end_date, self._chain_frequency)
+        contracts = []
+        prices = []
+        for position, ticker in zip([last_segment_position] + list(new_positions), contracts_tickers):
+            data = cast_data_array_to_proper_type(futures_data.loc[:, ticker, :], use_prices_types=True)
+            contract = FutureContract(ticker=ticker, exp_date=exp_dates.index[position], data=data)
+            if position != last_segment_position and not data.empty:
+                self.loc[contract.exp_date] = contract
+            contracts.append(contract)
+            prices.append(data)
+
+        # Remove the last segment together with its prices from the chain and add it again
+        self._buffer_size = int(np.searchsorted(self._buffer_dates[:self._buffer_size],
+                                                last_segment_start_date.to_datetime64(), side="left"))
+        self._segment_tickers.pop()
+        self._segment_start_dates.pop()
+        self._segment_offsets = self._segment_offsets[:-1]
+
+        self._add_segments(contracts, start_dates, prices)
+        self.sort_index(inplace=True)
+        self._specific_ticker = self._future_ticker.ticker
+
+    def _add_segments(self, contracts: List[FutureContract], start_dates: List[pd.Timestamp],
+                      prices: List[PricesDataFrame]):
+        """
+        Appends consecutive segments to the chain. The bars of each contract are taken from its prices data frame
+        within [start_dates[i], start_dates[i+1]) range (the bars of the last contract are not limited on the right
+        side). The back adjustment differences on the roll dates are added to the offsets of all older segments.
+        """
+        is_back_adjusted = self._futures_adjustment_method == FuturesAdjustmentMethod.BACK_ADJUSTED
+        number_of_old_segments = len(self._segment_tickers)
+        offsets = np.concatenate([self._segment_offsets, np.zeros(len(contracts))])
+
+        for i, (contract, start_date, data) in enumerate(zip(contracts, start_dates, prices)):
+            is_last_segment = i == len(contracts) - 1
+            segment_data = data.loc[start_date:]
+            if not is_last_segment:
+                segment_data = segment_data[segment_data.index < start_dates[i + 1]]
+            segment_data = segment_data.reindex(columns=self._buffer_fields)
+            self._append_bars(segment_data.index.values, segment_data.values)
+
+            # Difference between the Open price of the new contract and Close price of the old contract on the roll
+            # date is added to the offsets of all older segments
+            if is_back_adjusted and i > 0:
+                delta = self._get_first_available_price(data, start_date) - \
+                    self._get_last_available_price(prices[i - 1], start_date)
+                if not np.isnan(delta):
+                    offsets[:number_of_old_segments + i] += delta
+
+            self._segment_tickers.append(contract.ticker)
+            self._segment_start_dates.append(pd.Timestamp(start_date))
+
+        self._segment_offsets = offsets
+
+    def _append_bars(self, dates: np.ndarray, values: np.ndarray):
+        """ Appends the bars at the end of the buffer. The buffer is doubled in size if necessary. """
+        number_of_bars = len(dates)
+        if number_of_bars == 0:
+            return
+
+        new_size = self._buffer_size + number_of_bars
+        capacity = self._buffer_dates.shape[0]
+        if new_size > capacity:
+            new_capacity = max(new_size, 2 * capacity, self._INITIAL_CAPACITY)
+            buffer_dates = np.empty(new_capacity, dtype="datetime64[ns]")
+            buffer_values = np.full((new_capacity, len(self._buffer_fields)), np.nan)
+            buffer_dates[:self._buffer_size] = self._buffer_dates[:self._buffer_size]
+            buffer_values[:self._buffer_size] = self._buffer_values[:self._buffer_size]
+            self._buffer_dates = buffer_dates
+            self._buffer_values = buffer_values
+
+        self._buffer_dates[self._buffer_size:new_size] = dates
+        self._buffer_values[self._buffer_size:new_size] = np.asarray(values, dtype=np.float64)
+        self._buffer_size = new_size
+
+    def _expiration_day_occurred(self, prices_df: PricesDataFrame, last_date_in_chain: pd.Timestamp) -> bool:
+        """
+        Returns True if the specific ticker changed since the last update of the chain or if the prices of the current
+        contract on the last_date_in_chain differ from the prices in the chain (see FuturesChain.get_price).
+        """
+        if self._specific_ticker != self._future_ticker.ticker or last_date_in_chain not in prices_df.index:
+            return True
+
+        last_prices = np.asarray(prices_df.loc[last_date_in_chain, self._buffer_fields].values, dtype=np.float64)
+        return not np.array_equal(last_prices, self._buffer_values[self._buffer_size - 1], equal_nan=True)
+
+    def _get_chain_slice(self, fields: Sequence[PriceField], start_date: datetime, end_date: datetime) -> \
+            Union[PricesDataFrame, PricesSeries]:
+        """ Returns the (adjusted) prices of the chain within the [start_date, end_date] range. """
+        dates = self._buffer_dates[:self._buffer_size]
+        start_position = np.searchsorted(dates, pd.Timestamp(start_date).to_datetime64(), side="left")
+        end_position = np.searchsorted(dates, pd.Timestamp(end_date).to_datetime64(), side="right")
+        dates = dates[start_position:end_position]
+
+        columns = [self._buffer_fields.index(field) for field in fields]
+        values = self._buffer_values[start_position:end_position, columns]
+
+        is_back_adjusted = self._futures_adjustment_method == FuturesAdjustmentMethod.BACK_ADJUSTED
+        if is_back_adjusted and len(self._segment_start_dates) > 1:
+            roll_dates = pd.DatetimeIndex(self._segment_start_dates[1:]).values
+            offsets = self._segment_offsets[np.searchsorted(roll_dates, dates, side="right")]
+            adjusted_columns = [i for i, field in enumerate(fields) if field in PriceField.ohlc()]
+            values[:, adjusted_columns] += offsets[:, np.newaxis]
+
+        return PricesDataFrame(data=values, index=pd.DatetimeIndex(dates, name=DATES),
+                               columns=pd.Index(fields, name=FIELDS)).squeeze()
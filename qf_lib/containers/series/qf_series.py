@@ -170,6 +170,8 @@ class QFSeries(pd.Series, TimeIndexedContainer):
         func
             The function to call during each iteration. When ``other`` is ``None`` this function should take
             two ``QFSeries`` arguments and return a value. (Usually a number such as a ``float``).
+            If it is a RollingBenchmarkMetric (e.g. BetaMetric), the values for all windows are computed at once
+            in a vectorized way.
         step
             The amount of data points to step through after each iteration, i.e. how much to move the window by in
             each iteration.
@@ -190,6 +192,13 @@ class QFSeries(pd.Series, TimeIndexedContainer):
         intersected = pd.concat([self_series, benchmark_series], axis=1, join="inner")
         assert isinstance(intersected, pd.DataFrame)  # Just to make PyCharm silent.
 
+        from qf_lib.common.utils.returns.rolling_metrics import RollingBenchmarkMetric
+        if isinstance(func, RollingBenchmarkMetric):
+            from qf_lib.containers.series.cast_series import cast_series
+            return func.rolling_window_with_benchmark(
+                cast_series(intersected.iloc[:, 0], type(self)), cast_series(intersected.iloc[:, 1], type(benchmark)),
+                window_size, step)
+
         # Apply a rolling window transformation on the QFSeries.
         # Based on https://github.com/quantopian/pyfolio/blob/master/pyfolio/timeseries.py#L616.
         window_start = 0
@@ -224,7 +233,8 @@ class QFSeries(pd.Series, TimeIndexedContainer):
         func
             The function to call during each iteration. When ``other`` is ``None`` this function should take one
             ``QFSeries`` and return a value (Usually a number such as a ``float``). Otherwise, this function should take
-            two ``QFSeries`` arguments and return a value.
+            two ``QFSeries`` arguments and return a value. If it is a RollingMetric (e.g. VolatilityMetric), the values
+            for all windows are computed at once in a vectorized way (for any ``step``).
         step
             The amount of data points to step through after each iteration, i.e. how much to move the window by in
             each iteration.
@@ -238,6 +248,10 @@ class QFSeries(pd.Series, TimeIndexedContainer):
         QFSeries
             A ``QFSeries`` containing the transformed data.
         """
+        from qf_lib.common.utils.returns.rolling_metrics import RollingMetric
+        if isinstance(func, RollingMetric):
+            return func.rolling_window(self, window_size, step)
+
         if optimised:
             from qf_lib.containers.series.cast_series import cast_series
             assert step == 1, "Optimised rolling is only possible with a step of 1."
@@ -0,0 +1,120 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Sequence, Union, Optional, Tuple, Hashable
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+
+
+class ArrayDataBundle:
+    """
+    Columnar storage of a data bundle, which keeps all the values in one contiguous float64 numpy array of shape
+    [dates, tickers, fields]. Positions of tickers and fields are precomputed and the dates are kept as a sorted int64
+    index, so that selecting a range of dates is done using binary search (O(log n)) and results in a view on the
+    underlying array. The QFDataArray is created only for the final, already sliced, values.
+
+    Parameters
+    ----------
+    data: QFDataArray
+        data to be stored, indexed by dates (sorted in ascending order), tickers and fields. All the values need to be
+        convertible to float64.
+    """
+
+    def __init__(self, data: QFDataArray):
+        dates = pd.DatetimeIndex(data.dates.values, name=DATES)
+        if not dates.is_monotonic_increasing:
+            raise ValueError("The dates of the data bundle need to be sorted in ascending order")
+
+        self._dates = dates
+        self._dates_int = dates.values.astype("datetime64[ns]").view(np.int64)
+        self._tickers = data.tickers.values
+        self._fields = data.fields.values
+        self._ticker_positions = {ticker: i for i, ticker in enumerate(self._tickers)}
+        self._field_positions = {field: i for i, field in enumerate(self._fields)}
+        self._values = np.ascontiguousarray(data.values, dtype=np.float64)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return self._dates
+
+    def dates_positions(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) \
+            -> Tuple[int, int]:
+        """
+        Returns the positions [start, stop) of the dates, which belong to the [start_date, end_date] range (both ends
+        inclusive, consistently with the label based slicing of pandas and xarray).
+        """
+        start = 0 if start_date is None else \
+            int(np.searchsorted(self._dates_int, self._to_int(start_date), side="left"))
+        stop = len(self._dates_int) if end_date is None else \
+            int(np.searchsorted(self._dates_int, self._to_int(end_date), side="right"))
+        return start, max(start, stop)
+
+    def get_values(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                   tickers: Sequence[Ticker], fields: Sequence[Union[PriceField, str]]) -> np.ndarray:
+        """
+        Returns the values for the given range of dates, tickers and fields as a numpy array of shape
+        [dates, tickers, fields]. Raises KeyError if any of the tickers or fields is not available in the bundle.
+        """
+        start, stop = self.dates_positions(start_date, end_date)
+        return self._select(self._values[start:stop], tickers, fields)
+
+    def get_data_array(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                       tickers: Sequence[Ticker], fields: Sequence[Union[PriceField, str]]) -> QFDataArray:
+        """
+        Equivalent of data_array.loc[start_date:end_date, tickers, fields].
+        """
+        start, stop = self.dates_positions(start_date, end_date)
+        values = self._select(self._values[start:stop], tickers, fields)
+        return QFDataArray.create(self._dates[start:stop], tickers, fields, values)
+
+    def get_last_valid_data_array(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                                  tickers: Sequence[Ticker], fields: Sequence[Union[PriceField, str]],
+                                  nr_of_bars: int) -> QFDataArray:
+        """
+        Equivalent of data_array.loc[start_date:end_date, tickers, fields].dropna(DATES, how='all') limited to the
+        last nr_of_bars dates.
+        """
+        start, stop = self.dates_positions(start_date, end_date)
+        values = self._select(self._values[start:stop], tickers, fields)
+
+        valid_dates_positions = np.flatnonzero(~np.isnan(values).all(axis=(1, 2)))[-nr_of_bars:]
+        return QFDataArray.create(self._dates[start:stop][valid_dates_positions], tickers, fields,
+                                  values[valid_dates_positions])
+
+    def _select(self, values: np.ndarray, tickers: Sequence[Ticker], fields: Sequence[Union[PriceField, str]]):
+        tickers_positions = self._positions(self._ticker_positions, tickers)
+        fields_positions = self._positions(self._field_positions, fields)
+        return values[:, tickers_positions][:, :, fields_positions]
+
+    @staticmethod
+    def _positions(positions_dict, labels: Sequence[Hashable]) -> Union[slice, np.ndarray]:
+        positions = np.fromiter((positions_dict[label] for label in labels), dtype=np.intp, count=len(labels))
+        # Contiguous selections are expressed as slices, which results in views instead of copies
+        if len(positions) > 0 and np.array_equal(positions, np.arange(positions[0], positions[0] + len(positions))):
+            return slice(positions[0], positions[0] + len(positions))
+        return positions
+
+    @staticmethod
+    def _to_int(date) -> int:
+        return pd.Timestamp(date).to_datetime64().astype("datetime64[ns]").view(np.int64)
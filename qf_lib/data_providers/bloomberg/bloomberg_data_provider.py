@@ -54,9 +54,17 @@ except ImportError:
 class BloombergDataProvider(AbstractPriceDataProvider, TickersUniverseProvider):
     """
     Data Provider which provides financial data from Bloomberg.
+
+    Parameters
+    ----------
+    settings: Settings
+        settings containing the host and the port of the Bloomberg server
+    max_intraday_requests_in_flight: int
+        maximal number of Intraday Bar Requests (one for each ticker and each chunk of the date range) processed by
+        Bloomberg at the same time
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, max_intraday_requests_in_flight: int = 1):
         super().__init__()
         self.settings = settings
 
@@ -71,7 +79,7 @@ class BloombergDataProvider(AbstractPriceDataProvider, TickersUniverseProvider):
             session_options.setAutoRestartOnDisconnection(True)
             self.session = blpapi.Session(session_options)
 
-            self._historical_data_provider = HistoricalDataProvider(self.session)
+            self._historical_data_provider = HistoricalDataProvider(self.session, max_intraday_requests_in_flight)
             self._reference_data_provider = ReferenceDataProvider(self.session)
             self._tabular_data_provider = TabularDataProvider(self.session)
             self._futures_data_provider = FuturesDataProvider(self.session)
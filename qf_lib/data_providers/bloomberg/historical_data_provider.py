@@ -11,10 +11,11 @@
 #     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
-from collections import defaultdict
-from datetime import datetime
-from typing import Any, Sequence, Dict
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Any, Sequence, Dict, Optional, List, Tuple
 
+import blpapi
 import numpy as np
 from pandas import to_datetime
 
@@ -25,23 +26,53 @@ from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.data_providers.bloomberg.bloomberg_names import REF_DATA_SERVICE_URI, CURRENCY, START_DATE, END_DATE, \
     PERIODICITY_SELECTION, PERIODICITY_ADJUSTMENT, SECURITY, FIELD_DATA, DATE, \
-    START_DATE_TIME, END_DATE_TIME, INTERVAL, BAR_TICK_DATA
+    START_DATE_TIME, END_DATE_TIME, INTERVAL, BAR_DATA, BAR_TICK_DATA, TIME, RESPONSE_ERROR
 from qf_lib.data_providers.bloomberg.exceptions import BloombergError
 from qf_lib.data_providers.bloomberg.helpers import set_tickers, set_fields, convert_to_bloomberg_date, \
     convert_to_bloomberg_freq, get_response_events, check_event_for_errors, check_security_data_for_errors, \
-    extract_security_data, set_ticker, extract_bar_data
+    extract_security_data, set_ticker
 from qf_lib.data_providers.helpers import tickers_dict_to_data_array
 
 
 class HistoricalDataProvider:
-    """ Used for providing historical data from Bloomberg. """
+    """
+    Used for providing historical data from Bloomberg.
+
+    Intraday data is requested with one Intraday Bar Request for each ticker and each chunk of the requested date
+    range. Up to max_requests_in_flight of these requests are sent to Bloomberg at the same time, each one with its own
+    correlation id, and the responses are matched with the requests as they arrive.
+
+    Parameters
+    ----------
+    session
+        Bloomberg session used to send the requests
+    max_requests_in_flight: int
+        maximal number of Intraday Bar Requests processed by Bloomberg at the same time
+    intraday_chunk_days: Optional[int]
+        maximal number of days covered by a single Intraday Bar Request. Longer date ranges are split into chunks.
+        If None, the whole date range is requested at once
+    """
 
     # These revert to the actual date from today (if the end date is left blank) or from the End Date
     # (see PERIODICITY_ADJUSTMENT in blpapi-developers-guide for more)
     PERIODICITY_ADJUSTMENT = "ACTUAL"
 
-    def __init__(self, session):
+    # Names of the elements of intraday bars corresponding to the requested fields
+    INTRADAY_FIELDS_MAPPING = {
+        "PX_LAST": "close",
+        "PX_OPEN": "open",
+        "PX_LOW": "low",
+        "PX_HIGH": "high",
+        "PX_VOLUME": "volume"
+    }
+
+    def __init__(self, session, max_requests_in_flight: int = 1, intraday_chunk_days: Optional[int] = 30):
+        assert max_requests_in_flight >= 1, "At least one request needs to be processed at a time"
+        assert intraday_chunk_days is None or intraday_chunk_days >= 1, "The chunks need to cover at least one day"
+
         self._session = session
+        self.max_requests_in_flight = max_requests_in_flight
+        self.intraday_chunk_days = intraday_chunk_days
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
     def get(self, tickers: Sequence[BloombergTicker], fields: Sequence[str], start_date: datetime, end_date: datetime,
@@ -81,19 +112,44 @@ class HistoricalDataProvider:
 
     def _get_intraday_data(self, ref_data_service, tickers: Sequence[BloombergTicker], fields, start_date, end_date,
                            frequency):
-        """ Sends requests for each ticker and combines the outputs together. """
+        """ Sends requests for each ticker and each chunk of the date range and combines the outputs together. """
+        requests = [(ticker, chunk_start, chunk_end) for ticker in tickers
+                    for chunk_start, chunk_end in self._split_date_range(start_date, end_date)]
+        bars = self._process_intraday_requests(ref_data_service, requests, fields, frequency)
+
+        tickers_bars = {ticker: [] for ticker in tickers}
+        for request_number, (ticker, _, _) in enumerate(requests):
+            tickers_bars[ticker].extend(bars[request_number])
 
         tickers_data_dict = dict()
+        for ticker, ticker_bars in tickers_bars.items():
+            if not ticker_bars:
+                tickers_data_dict[ticker] = QFDataFrame(columns=fields)
+                continue
 
-        for ticker in tickers:
-            request = ref_data_service.createRequest("IntradayBarRequest")
-            set_ticker(request, ticker.as_string())
-            self._set_intraday_time_period(request, start_date, end_date, frequency)
-            self._session.sendRequest(request)
-            tickers_data_dict[ticker] = self._receive_intraday_response(ticker, fields)
+            dates = to_datetime(np.concatenate([bars_dates for bars_dates, _ in ticker_bars]))
+            values = np.concatenate([bars_values for _, bars_values in ticker_bars])
+            dates_fields_values = QFDataFrame(values, index=dates, columns=fields)
+
+            # Bars at the boundaries of the chunks of the date range may be returned twice
+            tickers_data_dict[ticker] = dates_fields_values[~dates_fields_values.index.duplicated(keep="first")]
 
         return tickers_dict_to_data_array(tickers_data_dict, list(tickers_data_dict.keys()), fields)
 
+    def _split_date_range(self, start_date: datetime, end_date: datetime) -> List[Tuple[datetime, datetime]]:
+        if self.intraday_chunk_days is None:
+            return [(start_date, end_date)]
+
+        chunk_length = timedelta(days=self.intraday_chunk_days)
+        chunks = []
+        chunk_start = start_date
+        while True:
+            chunk_end = min(chunk_start + chunk_length, end_date)
+            chunks.append((chunk_start, chunk_end))
+            if chunk_end >= end_date:
+                return chunks
+            chunk_start = chunk_end
+
     @classmethod
     def _set_currency(cls, currency, request):
         if currency is not None:
@@ -125,28 +181,6 @@ class HistoricalDataProvider:
         override.setElement("fieldId", override_name)
         override.setElement("value", override_value)
 
-    @staticmethod
-    def _get_float_or_nan_intraday(element, field_name):
-        fields_mapping = {
-            "PX_LAST": "close",
-            "PX_OPEN": "open",
-            "PX_LOW": "low",
-            "PX_HIGH": "high",
-            "PX_VOLUME": "volume"
-        }
-        if element.hasElement(field_name):
-            result = element.getElementAsFloat(field_name)
-            if result == '#N/A History':
-                result = float('nan')
-        elif element.hasElement(fields_mapping[field_name]):
-            result = element.getElementAsFloat(fields_mapping[field_name])
-            if result == '#N/A History':
-                result = float('nan')
-        else:
-            result = float("nan")
-
-        return result
-
     @staticmethod
     def _get_float_or_nan(element, field_name):
         if element.hasElement(field_name):
@@ -194,29 +228,75 @@ class HistoricalDataProvider:
 
         return tickers_dict_to_data_array(tickers_data_dict, list(tickers_data_dict.keys()), requested_fields)
 
-    def _receive_intraday_response(self, requested_ticker: BloombergTicker, requested_fields):
-        """ The response for intraday bar is related to a single ticker. """
-        response_events = get_response_events(self._session)
-        tickers_data_dict = defaultdict(lambda: QFDataFrame(columns=requested_fields))
-
-        for event in response_events:
-            try:
-                check_event_for_errors(event)
-                bar_data = extract_bar_data(event)
-
-                bar_tick_data_array = bar_data.getElement(BAR_TICK_DATA)
-                dates = [to_datetime(e.getElementAsDatetime("time")) for e in bar_tick_data_array.values()]
-                dates_fields_values = QFDataFrame(np.nan, index=dates, columns=requested_fields)
-
-                for field_name in requested_fields:
-                    dates_fields_values.loc[:, field_name] = [
-                        self._get_float_or_nan_intraday(data_of_date_elem, field_name)
-                        for data_of_date_elem in bar_tick_data_array.values()
-                    ]
-
-                df = tickers_data_dict[requested_ticker]
-                tickers_data_dict[requested_ticker] = df.append(dates_fields_values)
-            except BloombergError as e:
-                self.logger.error(e)
+    def _process_intraday_requests(self, ref_data_service,
+                                   requests: Sequence[Tuple[BloombergTicker, datetime, datetime]],
+                                   requested_fields, frequency) -> Dict[int, List[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Sends the Intraday Bar Requests, keeping up to max_requests_in_flight of them processed at the same time, and
+        demultiplexes the responses using the correlation ids (equal to the numbers of requests). Returns the
+        dictionary mapping the number of request onto the list of parsed bars (dates and values of fields),
+        one element of the list for each partial response.
+        """
+        bars = {request_number: [] for request_number in range(len(requests))}
+        requests_to_send = deque(enumerate(requests))
+        requests_in_flight = set()
+
+        while requests_to_send or requests_in_flight:
+            while requests_to_send and len(requests_in_flight) < self.max_requests_in_flight:
+                request_number, (ticker, start_date, end_date) = requests_to_send.popleft()
+                request = ref_data_service.createRequest("IntradayBarRequest")
+                set_ticker(request, ticker.as_string())
+                self._set_intraday_time_period(request, start_date, end_date, frequency)
+                self._session.sendRequest(request, correlationId=blpapi.CorrelationId(request_number))
+                requests_in_flight.add(request_number)
+
+            event = self._session.nextEvent()
+            event_type = event.eventType()
+            if event_type not in (blpapi.event.Event.PARTIAL_RESPONSE, blpapi.event.Event.RESPONSE):
+                continue
+
+            for message in event:
+                request_number = message.correlationIds()[0].value()
+                if request_number not in requests_in_flight:
+                    self.logger.warning(f"Received a message with an unknown correlation id: {request_number}. "
+                                        f"The message will be excluded from parsing.")
+                    continue
+
+                if event_type == blpapi.event.Event.RESPONSE:
+                    requests_in_flight.remove(request_number)
+
+                if message.asElement().hasElement(RESPONSE_ERROR):
+                    self.logger.error(f"Response error for {requests[request_number][0].as_string()}: "
+                                      f"{message.asElement()}")
+                    continue
+
+                bar_tick_data_array = message.getElement(BAR_DATA).getElement(BAR_TICK_DATA)
+                bars[request_number].append(self._parse_intraday_bars(bar_tick_data_array, requested_fields))
+
+        return bars
 
-        return tickers_data_dict[requested_ticker]
+    @classmethod
+    def _parse_intraday_bars(cls, bar_tick_data_array, requested_fields) -> Tuple[np.ndarray, np.ndarray]:
+        """ Parses the bars into the preallocated arrays of dates and of values of the requested fields. """
+        num_of_bars = bar_tick_data_array.numValues()
+        dates = np.empty(num_of_bars, dtype=object)
+        values = np.full((num_of_bars, len(requested_fields)), np.nan)
+        if num_of_bars == 0:
+            return dates, values
+
+        # All bars of the response consist of the same elements
+        first_bar = bar_tick_data_array.getValueAsElement(0)
+        fields_indices_and_names = []
+        for field_index, field_name in enumerate(requested_fields):
+            if first_bar.hasElement(field_name):
+                fields_indices_and_names.append((field_index, field_name))
+            elif field_name in cls.INTRADAY_FIELDS_MAPPING and first_bar.hasElement(
+                    cls.INTRADAY_FIELDS_MAPPING[field_name]):
+                fields_indices_and_names.append((field_index, cls.INTRADAY_FIELDS_MAPPING[field_name]))
+
+        for bar_index, bar in enumerate(bar_tick_data_array.values()):
+            dates[bar_index] = bar.getElementAsDatetime(TIME)
+            for field_index, element_name in fields_indices_and_names:
+                values[bar_index, field_index] = bar.getElementAsFloat(element_name)
+
+        return dates, values
@@ -13,16 +13,17 @@
 #     limitations under the License.
 import gzip
 import re
-from io import StringIO
+from io import TextIOWrapper
 from typing import Tuple, List, Optional, Dict
-from pandas import to_datetime
+
+import numpy as np
+from pandas import to_datetime, read_csv, to_numeric, Index, DatetimeIndex
 from pandas._libs.tslibs.nattype import NaT
+from pandas.errors import EmptyDataError
+
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.qf_data_array import QFDataArray
-from qf_lib.data_providers.helpers import tickers_dict_to_data_array
-import numpy as np
-import csv
 
 
 class BloombergBeapHapiParser:
@@ -47,9 +48,18 @@ class BloombergBeapHapiParser:
     TIMEFINISHED=Mon Jan 01 00:00:00 GMT 2020
 
     END-OF-FILE
+
+    The response is decompressed and parsed in chunks: the markers of sections are located incrementally and the data
+    section is streamed directly to the pandas C parser, so that the whole response never has to be kept in memory.
+
+    Parameters
+    ----------
+    chunk_size: int
+        number of characters of the decompressed response read at once
     """
 
-    def __init__(self):
+    def __init__(self, chunk_size: int = 2 ** 20):
+        self.chunk_size = chunk_size
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
     def get_chain(self, filepath: str) -> Dict[str, List[str]]:
@@ -67,14 +77,11 @@ class BloombergBeapHapiParser:
             Dictionary with data, in the format [str] -> List[str]
             where the key - active future ticker (str), values - tickers from chain
         """
-        _, content = self._get_fields_and_data_content(filepath, column_names=["Active ticker"])
-
-        content = content.set_index('Active ticker')
-        active_tickers = content.index.unique()
-        content = content.squeeze()
+        fields, content = self._get_fields_and_data_content(filepath, column_names=["Active ticker"])
+        chain_tickers = content.groupby("Active ticker", sort=False)[fields[0]]
 
         data = {
-            active_ticker: content.loc[active_ticker].values.tolist() for active_ticker in active_tickers
+            active_ticker: tickers.values.tolist() for active_ticker, tickers in chain_tickers
         }
 
         return data
@@ -124,22 +131,25 @@ class BloombergBeapHapiParser:
         fields, content = self._get_fields_and_data_content(filepath, column_names=["Ticker", "Error code", "Num flds",
                                                                                     "Pricing Source", "Dates"])
         tickers = content["Ticker"].unique().tolist()
+
+        # Numeric fields are converted to floats, all other fields are left as strings
+        for field in fields:
+            content[field] = to_numeric(content[field], errors="ignore")
         content["Dates"] = to_datetime(content["Dates"], format="%Y%m%d")
-        content = content.drop(columns=["Error code", "Num flds", "Pricing Source"])
+        content = content.dropna(subset=["Dates"])
 
-        def extract_tickers_df(data_array, ticker: str):
-            df = data_array[data_array["Ticker"] == ticker].drop(columns="Ticker")
-            df = df.dropna(subset=["Dates"]).set_index("Dates")
-            return df
+        values = content[fields].values
+        dtype = float if np.issubdtype(values.dtype, np.number) else object
 
-        tickers_dict = {
-            t: extract_tickers_df(content, t) for t in tickers
-        }
+        # Pivot the (ticker, date) rows onto the dates x tickers x fields array in one go
+        dates = DatetimeIndex(content["Dates"].unique()).sort_values()
+        data = np.full((len(dates), len(tickers), len(fields)), np.nan, dtype=dtype)
+        data[dates.get_indexer(content["Dates"]), Index(tickers).get_indexer(content["Ticker"])] = values
 
-        return tickers_dict_to_data_array(tickers_dict, tickers, fields)
+        return QFDataArray.create(dates, tickers, fields, data)
 
     def _get_fields_and_data_content(self, filepath: str, column_names: Optional[List] = None,
-                                     replace_header: bool = False, expect_data_array: bool = False) -> Tuple:
+                                     replace_header: bool = False) -> Tuple:
         """
         Helper function to extract fields and content of the hapi response between following (including headers):
         fields: START-OF-FIELDS - END-OF-FIELDS
@@ -158,31 +168,117 @@ class BloombergBeapHapiParser:
         Returns
         -------
         fields, content: Tuple[List[str], QFDataFrame]
-            Extracted fields and content from the response, each item in the list represent one value
+            Extracted fields and content from the response
             Fields contains all fields
-            Content contains the list of all rows separated by "|", which need to be proceed further
+            Content contains the rows of the data section (all values as strings, the whitespace-only values
+            replaced with nan), with columns named after the column_names followed by fields
+        """
+        with TextIOWrapper(gzip.open(filepath, 'rb'), encoding="utf-8") as file:
+            response = _ResponseReader(file, self.chunk_size)
+
+            response.skip_until(_START_OF_FIELDS)
+            fields = response.read_until(_END_OF_FIELDS).splitlines()
+
+            column_names = column_names + fields if column_names is not None else None
+            response.skip_until(_START_OF_DATA)
+            try:
+                content = read_csv(_DataSectionReader(response), sep="|", header=0 if replace_header else None,
+                                   names=column_names, dtype=str, engine="c", skipinitialspace=True,
+                                   keep_default_na=False, na_values=[""], error_bad_lines=False, warn_bad_lines=False)
+            except EmptyDataError:
+                content = QFDataFrame(columns=column_names, dtype=str)
+
+        # Leading whitespaces are already skipped by the parser
+        for column in content.columns:
+            content[column] = content[column].str.rstrip()
+
+        return fields, QFDataFrame(content)
+
+
+_START_OF_FIELDS = re.compile(r"^START-OF-FIELDS[ \t]*\n", re.MULTILINE)
+_END_OF_FIELDS = re.compile(r"^END-OF-FIELDS[ \t]*$", re.MULTILINE)
+_START_OF_DATA = re.compile(r"^START-OF-DATA[ \t]*\n", re.MULTILINE)
+_END_OF_DATA = re.compile(r"^END-OF-DATA[ \t]*$", re.MULTILINE)
+_TRAILING_DELIMITERS = re.compile(r"\|+$", re.MULTILINE)
+
+
+class _ResponseReader:
+    """ Reads the decompressed response in chunks, keeping in memory only the part which is not consumed yet. """
+
+    def __init__(self, file, chunk_size: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._is_eof = False
+
+    def fill(self) -> bool:
+        """ Reads the next chunk of the response. Returns False if the whole response was already read. """
+        if self._is_eof:
+            return False
+
+        chunk = self._file.read(self._chunk_size)
+        self._is_eof = not chunk
+        self._buffer += chunk
+        return not self._is_eof
+
+    def contains(self, marker) -> bool:
+        return marker.search(self._buffer) is not None
+
+    def skip_until(self, marker):
+        """ Consumes the response up to the end of the marker. """
+        self.read_until(marker)
+
+    def read_until(self, marker) -> str:
+        """ Consumes the response up to the end of the marker and returns the text preceding the marker. """
+        match = marker.search(self._buffer)
+        while match is None:
+            if not self.fill():
+                raise ValueError("The response does not contain the {} marker".format(marker.pattern))
+            match = marker.search(self._buffer)
+
+        text = self._buffer[:match.start()]
+        self._buffer = self._buffer[match.end():]
+        return text
+
+    def read_lines(self, size: int) -> Optional[str]:
         """
-        f = gzip.open(filepath, 'rb')
-        data = f.read().decode("utf-8")
-        # Without re.DOTALL, each line of the input text matches the pattern separately
-        fields = re.search(r'START-OF-FIELDS\n(.*?)\nEND-OF-FIELDS', data, re.DOTALL).group(1).split('\n')
-        content = re.search(r'START-OF-DATA\n(.*?)\nEND-OF-DATA', data, re.DOTALL).group(1)
-
-        column_names = column_names + fields if column_names is not None else None
-        content = self._read_csv(content, column_names, replace_header)
-
-        content = content.replace(r'^\s+$', np.nan, regex=True)
-        str_columns = content.select_dtypes(['object']).columns
-        content.loc[:, str_columns] = content.loc[:, str_columns].apply(lambda x: x.str.strip())
-        content = QFDataFrame(content)
-
-        return fields, content
-
-    def _read_csv(self, content: str, column_names: List[str], replace_header: bool, delimiter: str = "|"):
-        # Remove trailing delimiters
-        content = "\n".join(line.rstrip("|") for line in content.split("\n"))
-        lines = csv.reader(StringIO(content), delimiter=delimiter)
-        records = list(lines) if not replace_header else list(lines)[1:]
-        records = [line for line in records if len(line) == len(column_names)]
-        df = QFDataFrame.from_records(records, columns=column_names)
-        return df
+        Consumes and returns the complete lines read so far, provided that they consist of at least size characters.
+        Otherwise returns None.
+        """
+        end_of_lines = self._buffer.rfind("\n") + 1
+        if end_of_lines >= size > 0:
+            text = self._buffer[:end_of_lines]
+            self._buffer = self._buffer[end_of_lines:]
+            return text
+        return None
+
+
+class _DataSectionReader:
+    """
+    File-like object passed to the pandas parser. Gives the lines of the data section (up to the END-OF-DATA marker)
+    with the trailing delimiters removed.
+    """
+
+    def __init__(self, response: _ResponseReader):
+        self._response = response
+        self._is_finished = False
+
+    def read(self, size: int = -1) -> str:
+        if self._is_finished:
+            return ""
+
+        text = None
+        while text is None:
+            if self._response.contains(_END_OF_DATA):
+                text = self._response.read_until(_END_OF_DATA)
+                self._is_finished = True
+            else:
+                text = self._response.read_lines(size)
+                if text is None and not self._response.fill():
+                    raise ValueError("The response does not contain the {} marker".format(_END_OF_DATA.pattern))
+
+        return _TRAILING_DELIMITERS.sub("", text)
+
+    def __iter__(self):
+        for text in iter(lambda: self.read(2 ** 16), ""):
+            yield from text.splitlines(keepends=True)
@@ -0,0 +1,388 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import os
+import pickle
+import uuid
+from datetime import datetime, timedelta
+from typing import Union, Sequence, Dict, Type, Set, List, Tuple, Optional, Hashable
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.expiration_date_field import ExpirationDateField
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.data_provider import DataProvider
+from qf_lib.data_providers.helpers import normalize_data_array
+
+Period = Tuple[datetime, datetime]
+
+
+class CachingDataProvider(DataProvider):
+    """
+    Wrapper of any DataProvider (e.g. BloombergDataProvider, QuandlDataProvider or HaverDataProvider), which stores
+    the results of get_price and get_history in a local on-disk cache, so that the data downloaded once does not need
+    to be downloaded again in the next runs. Contrary to the PrefetchingDataProvider, the data outlives the process.
+
+    The cache is partitioned by ticker, field and frequency: each partition keeps the dates and values of one ticker and
+    field in a separate file, along with the periods for which the data was already requested from the wrapped data
+    provider. Only the missing periods are requested from the wrapped data provider (with one request for all the
+    tickers and fields missing the same period) and merged into the cache. The data for the current day is never
+    marked as available in the cache, as it may still change.
+
+    The cached partitions are evicted when they are older than max_age (counting from the last download of their data)
+    or, if the size of the cache exceeds max_size, starting from the least recently used ones. Eviction may be also
+    triggered manually with the evict function.
+
+    Futures chains, prices of FutureTickers and the get_history calls with additional kwargs (or without the fields)
+    are passed directly to the wrapped data provider. The cache directory should not be used by multiple processes
+    at the same time. To speed up the backtests even further, the CachingDataProvider may be wrapped with
+    the PrefetchingDataProvider.
+
+    Parameters
+    ----------
+    data_provider: DataProvider
+        data provider, which is used to download the data missing in the cache
+    cache_dir: str
+        directory in which the cache is stored. It is created if it does not exist
+    max_size: Optional[int]
+        maximum size of the cached data in bytes. By default the size is not limited
+    max_age: Optional[timedelta]
+        maximum age of the cached data. By default the data does not expire
+    """
+
+    _INDEX_FILE = "index.pickle"
+
+    def __init__(self, data_provider: DataProvider, cache_dir: str, max_size: Optional[int] = None,
+                 max_age: Optional[timedelta] = None):
+        super().__init__()
+        self._data_provider = data_provider
+        self.frequency = data_provider.frequency
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.max_age = max_age
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._partitions = self._load_index()  # type: Dict[Hashable, _Partition]
+        self._loaded_partitions = {}  # type: Dict[Hashable, Tuple[np.ndarray, np.ndarray]]
+        self._statistics = {"hits": 0, "misses": 0, "requests": 0}
+
+        self.evict()
+
+    def get_price(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
+                  start_date: datetime, end_date: datetime = None, frequency: Frequency = None) -> \
+            Union[None, PricesSeries, PricesDataFrame, QFDataArray]:
+        frequency = frequency or self.frequency or Frequency.DAILY
+        tickers_list, _ = convert_to_list(tickers, Ticker)
+        if any(isinstance(ticker, FutureTicker) for ticker in tickers_list):
+            return self._data_provider.get_price(tickers, fields, start_date, end_date, frequency)
+
+        return self._get_data("price", tickers, fields, PriceField, start_date, end_date, frequency,
+                              use_prices_types=True)
+
+    def get_history(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[None, str, Sequence[str]],
+                    start_date: datetime, end_date: datetime = None, frequency: Frequency = None, **kwargs) -> \
+            Union[QFSeries, QFDataFrame, QFDataArray]:
+        frequency = frequency or self.frequency or Frequency.DAILY
+        tickers_list, _ = convert_to_list(tickers, Ticker)
+        if fields is None or kwargs or any(isinstance(ticker, FutureTicker) for ticker in tickers_list):
+            return self._data_provider.get_history(tickers, fields, start_date, end_date, frequency, **kwargs)
+
+        return self._get_data("history", tickers, fields, str, start_date, end_date, frequency,
+                              use_prices_types=False)
+
+    def supported_ticker_types(self) -> Set[Type[Ticker]]:
+        return self._data_provider.supported_ticker_types()
+
+    def get_futures_chain_tickers(self, tickers: Union[FutureTicker, Sequence[FutureTicker]],
+                                  expiration_date_fields: Union[ExpirationDateField, Sequence[ExpirationDateField]]) \
+            -> Dict[FutureTicker, Union[QFSeries, QFDataFrame]]:
+        return self._data_provider.get_futures_chain_tickers(tickers, expiration_date_fields)
+
+    def cache_statistics(self) -> Dict[str, int]:
+        """
+        Returns the statistics of the cache: number of partitions ("partitions"), size of the cached data in bytes
+        ("size") and, since the creation of the data provider, the number of requested partitions, which were fully
+        available in the cache ("hits"), the number of requested partitions, which missed some data ("misses"),
+        and the number of requests sent to the wrapped data provider ("requests").
+        """
+        statistics = {
+            "partitions": len(self._partitions),
+            "size": sum(partition.size for partition in self._partitions.values())
+        }
+        statistics.update(self._statistics)
+        return statistics
+
+    def evict(self, max_size: Optional[int] = None, max_age: Optional[timedelta] = None):
+        """
+        Removes the partitions older than max_age (counting from the last download of their data) and then, until
+        the size of the cache does not exceed max_size, the least recently used partitions.
+
+        Parameters
+        ----------
+        max_size: Optional[int]
+            maximum size of the cached data in bytes. By default the max_size of the data provider is used
+        max_age: Optional[timedelta]
+            maximum age of the cached data. By default the max_age of the data provider is used
+        """
+        max_size = max_size if max_size is not None else self.max_size
+        max_age = max_age if max_age is not None else self.max_age
+
+        keys_to_remove = []
+        if max_age is not None:
+            now = datetime.now()
+            keys_to_remove = [key for key, partition in self._partitions.items()
+                              if now - partition.update_time > max_age]
+
+        if max_size is not None:
+            remaining_keys = sorted((key for key in self._partitions.keys() if key not in keys_to_remove),
+                                    key=lambda key: self._partitions[key].access_time)
+            size = sum(self._partitions[key].size for key in remaining_keys)
+            for key in remaining_keys:
+                if size <= max_size:
+                    break
+                keys_to_remove.append(key)
+                size -= self._partitions[key].size
+
+        for key in keys_to_remove:
+            partition = self._partitions.pop(key)
+            self._loaded_partitions.pop(key, None)
+            file_path = os.path.join(self.cache_dir, partition.file_name)
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+
+        if keys_to_remove:
+            self.logger.info("Evicted {} partitions from the cache".format(len(keys_to_remove)))
+            self._save_index()
+
+    def _get_data(self, kind: str, tickers, fields, field_type: type, start_date: datetime, end_date: datetime,
+                  frequency: Frequency, use_prices_types: bool):
+        end_date = datetime.now() if end_date is None else end_date
+        got_single_date = self._got_single_date(start_date, end_date, frequency)
+        tickers, got_single_ticker = convert_to_list(tickers, Ticker)
+        fields, got_single_field = convert_to_list(fields, field_type)
+        tickers = list(dict.fromkeys(tickers))
+        fields = list(dict.fromkeys(fields))
+
+        period = self._get_period(start_date, end_date, frequency)
+        self._download_missing_data(kind, tickers, fields, period, frequency)
+
+        # Build the result out of the cached partitions
+        columns = {}
+        for ticker in tickers:
+            for field in fields:
+                dates, values = self._read_partition((kind, ticker, field, frequency))
+                in_period = (dates >= np.datetime64(period[0])) & (dates < np.datetime64(period[1]))
+                columns[(ticker, field)] = (dates[in_period], values[in_period])
+
+        all_dates = pd.DatetimeIndex(np.unique(np.concatenate(
+            [dates for dates, _ in columns.values()] + [np.array([], dtype="datetime64[ns]")])))
+        is_numeric = all(values.dtype.kind in "fiub" for _, values in columns.values())
+        data = np.full((len(all_dates), len(tickers), len(fields)), np.nan, dtype=float if is_numeric else object)
+        for (ticker, field), (dates, values) in columns.items():
+            data[all_dates.get_indexer(dates), tickers.index(ticker), fields.index(field)] = values
+
+        self.evict()
+        self._save_index()
+
+        data_array = QFDataArray.create(all_dates, tickers, fields, data)
+        return normalize_data_array(data_array, tickers, fields, got_single_date, got_single_ticker, got_single_field,
+                                    use_prices_types=use_prices_types)
+
+    def _download_missing_data(self, kind: str, tickers: Sequence[Ticker], fields: Sequence, period: Period,
+                               frequency: Frequency):
+        # Group the tickers and fields, which miss the same periods, to download them with common requests
+        missing_periods_to_partitions = {}  # type: Dict[Tuple[Period, ...], List[Tuple[Ticker, object]]]
+        now = datetime.now()
+        for ticker in tickers:
+            for field in fields:
+                key = (kind, ticker, field, frequency)
+                partition = self._partitions.get(key)
+                if partition is None:
+                    partition = self._partitions[key] = _Partition("{}.npz".format(uuid.uuid4().hex))
+                partition.access_time = now
+
+                missing_periods = tuple(partition.get_missing_periods(period))
+                if missing_periods:
+                    missing_periods_to_partitions.setdefault(missing_periods, []).append((ticker, field))
+                    self._statistics["misses"] += 1
+                else:
+                    self._statistics["hits"] += 1
+
+        for missing_periods, tickers_and_fields in missing_periods_to_partitions.items():
+            group_tickers = list(dict.fromkeys(ticker for ticker, _ in tickers_and_fields))
+            group_fields = list(dict.fromkeys(field for _, field in tickers_and_fields))
+            for missing_period in missing_periods:
+                self._download(kind, group_tickers, group_fields, tickers_and_fields, missing_period, frequency)
+
+    def _download(self, kind: str, tickers: List[Ticker], fields: List, tickers_and_fields: List[Tuple[Ticker, object]],
+                  period: Period, frequency: Frequency):
+        start_date, end_date = self._get_request_dates(period, frequency)
+        self.logger.info("Downloading {} tickers and {} fields from {} to {}".format(
+            len(tickers), len(fields), start_date, end_date))
+        self._statistics["requests"] += 1
+
+        if kind == "price":
+            data_array = self._data_provider.get_price(tickers, fields, start_date, end_date, frequency)
+        else:
+            data_array = self._data_provider.get_history(tickers, fields, start_date, end_date, frequency)
+        assert isinstance(data_array, QFDataArray), "The wrapped data provider should return a QFDataArray"
+
+        # The request may cover a longer period than the missing one. All the downloaded data is stored, but the data
+        # for the current day is not marked as covered, so that it is downloaded again in the next requests
+        downloaded_period = (period[0], self._get_period(start_date, end_date, frequency)[1])
+        covered_period = (period[0], min(downloaded_period[1], self._today()))
+        dates = data_array.dates.values.astype("datetime64[ns]")
+        in_period = (dates >= np.datetime64(downloaded_period[0])) & (dates < np.datetime64(downloaded_period[1]))
+
+        available_tickers = set(data_array.tickers.values)
+        available_fields = set(data_array.fields.values)
+        for ticker, field in tickers_and_fields:
+            if ticker in available_tickers and field in available_fields:
+                values = data_array.loc[:, ticker, field].values[in_period]
+                is_valid = ~pd.isna(values)
+                new_dates, new_values = dates[in_period][is_valid], values[is_valid]
+            else:
+                new_dates, new_values = np.array([], dtype="datetime64[ns]"), np.array([], dtype=float)
+
+            self._write_partition((kind, ticker, field, frequency), downloaded_period, covered_period, new_dates,
+                                  new_values)
+
+    def _read_partition(self, key: Hashable) -> Tuple[np.ndarray, np.ndarray]:
+        if key not in self._loaded_partitions:
+            file_path = os.path.join(self.cache_dir, self._partitions[key].file_name)
+            if os.path.isfile(file_path):
+                with np.load(file_path, allow_pickle=True) as partition_file:
+                    self._loaded_partitions[key] = (partition_file["dates"], partition_file["values"])
+            else:
+                self._loaded_partitions[key] = (np.array([], dtype="datetime64[ns]"), np.array([], dtype=float))
+        return self._loaded_partitions[key]
+
+    def _write_partition(self, key: Hashable, downloaded_period: Period, covered_period: Period, new_dates: np.ndarray,
+                         new_values: np.ndarray):
+        partition = self._partitions[key]
+        dates, values = self._read_partition(key)
+
+        # Replace the previously cached data from the downloaded period
+        outside_period = (dates < np.datetime64(downloaded_period[0])) | (dates >= np.datetime64(downloaded_period[1]))
+        dates = np.concatenate([dates[outside_period], new_dates])
+        if values.dtype.kind in "fiub" and new_values.dtype.kind in "fiub":
+            values = np.concatenate([values[outside_period], new_values]).astype(float)
+        else:
+            values = np.concatenate([values[outside_period].astype(object), new_values.astype(object)])
+        order = np.argsort(dates, kind="stable")
+        dates, values = dates[order], values[order]
+
+        file_path = os.path.join(self.cache_dir, partition.file_name)
+        with open(file_path, "wb") as file:
+            np.savez(file, dates=dates, values=values)
+
+        self._loaded_partitions[key] = (dates, values)
+        partition.add_covered_period(covered_period)
+        partition.size = os.path.getsize(file_path)
+        partition.update_time = datetime.now()
+
+    def _load_index(self) -> Dict[Hashable, "_Partition"]:
+        index_path = os.path.join(self.cache_dir, self._INDEX_FILE)
+        if not os.path.isfile(index_path):
+            return {}
+        with open(index_path, "rb") as file:
+            return pickle.load(file)
+
+    def _save_index(self):
+        # Write the index to a temporary file first, so that the index is never left incomplete
+        index_path = os.path.join(self.cache_dir, self._INDEX_FILE)
+        temporary_path = index_path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            pickle.dump(self._partitions, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, index_path)
+
+    @staticmethod
+    def _get_period(start_date: datetime, end_date: datetime, frequency: Frequency) -> Period:
+        """ Returns the half-open period [start, end) of dates corresponding to the requested dates. """
+        if frequency <= Frequency.DAILY:
+            start_date = start_date + RelativeDelta(hour=0, minute=0, second=0, microsecond=0)
+            end_date = end_date + RelativeDelta(days=1, hour=0, minute=0, second=0, microsecond=0)
+        else:
+            end_date = end_date + RelativeDelta(microseconds=1)
+        return start_date, end_date
+
+    def _get_request_dates(self, period: Period, frequency: Frequency) -> Tuple[datetime, datetime]:
+        """ Returns the start and end dates of the request to the wrapped data provider, which downloads the period. """
+        if frequency <= Frequency.DAILY:
+            start_date, end_date = period[0], period[1] - RelativeDelta(days=1)
+            min_end_date = start_date + RelativeDelta(days=1)
+        else:
+            start_date, end_date = period[0], period[1] - RelativeDelta(microseconds=1)
+            min_end_date = start_date + frequency.time_delta()
+
+        # The request should not be interpreted as the request for a single date, as the result would be squeezed
+        return start_date, max(end_date, min_end_date)
+
+    @staticmethod
+    def _today() -> datetime:
+        return datetime.now() + RelativeDelta(hour=0, minute=0, second=0, microsecond=0)
+
+    def __str__(self):
+        return "{}({})".format(self.__class__.__name__, self._data_provider)
+
+
+class _Partition:
+    """ Metadata of the cached data of one ticker and field. """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.covered_periods = []  # type: List[Period]
+        self.size = 0
+        self.update_time = datetime.now()
+        self.access_time = datetime.now()
+
+    def get_missing_periods(self, period: Period) -> List[Period]:
+        missing_periods = []
+        start_date, end_date = period
+        for covered_start_date, covered_end_date in self.covered_periods:
+            if covered_end_date <= start_date:
+                continue
+            if covered_start_date >= end_date:
+                break
+            if covered_start_date > start_date:
+                missing_periods.append((start_date, covered_start_date))
+            start_date = max(start_date, covered_end_date)
+
+        if start_date < end_date:
+            missing_periods.append((start_date, end_date))
+        return missing_periods
+
+    def add_covered_period(self, period: Period):
+        if period[0] >= period[1]:
+            return
+
+        merged_periods = []
+        start_date, end_date = period
+        for covered_start_date, covered_end_date in self.covered_periods:
+            if covered_end_date < start_date or covered_start_date > end_date:
+                merged_periods.append((covered_start_date, covered_end_date))
+            else:
+                start_date, end_date = min(start_date, covered_start_date), max(end_date, covered_end_date)
+        merged_periods.append((start_date, end_date))
+        self.covered_periods = sorted(merged_periods)
@@ -15,15 +15,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Sequence, Union, List, Dict, Optional
 
-import pandas as pd
-
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
-from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
+from qf_lib.data_providers.csv.csv_files_loader import CSVFilesLoader
 from qf_lib.data_providers.helpers import normalize_data_array, tickers_dict_to_data_array
 from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 
@@ -65,6 +63,10 @@ class CSVDataProvider(PresetDataProvider):
         try to infer the dates format from the data. By default None.
     ticker_col: Optional[str]
         column name with the tickers
+    n_jobs: int
+        number of processes used to parse the csv files
+    cache_dir: Optional[str]
+        directory in which the parsed csv files are cached (see CSVFilesLoader). If None, the files are not cached
 
     Notes
     -----
@@ -103,9 +105,11 @@ class CSVDataProvider(PresetDataProvider):
                  field_to_price_field_dict: Optional[Dict[str, PriceField]] = None,
                  fields: Optional[Union[str, List[str]]] = None, start_date: Optional[datetime] = None,
                  end_date: Optional[datetime] = None, frequency: Optional[Frequency] = Frequency.DAILY,
-                 dateformat: Optional[str] = None, ticker_col: Optional[str] = None):
+                 dateformat: Optional[str] = None, ticker_col: Optional[str] = None, n_jobs: int = 1,
+                 cache_dir: Optional[str] = None):
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
+        self._files_loader = CSVFilesLoader(n_jobs, cache_dir)
 
         if fields:
             fields, _ = convert_to_list(fields, str)
@@ -135,13 +139,12 @@ class CSVDataProvider(PresetDataProvider):
         tickers_prices_dict = {}
         available_fields = set()
 
-        def _process_df(df, ticker_str):
-            df.index = pd.to_datetime(df[index_col], format=dateformat)
+        def _process_df(df, ticker_str, file_path):
             df = df[~df.index.duplicated(keep='first')]
             df = df.drop(index_col, axis=1)
             if Frequency.infer_freq(df.index) != frequency:
-                self.logger.info(f"Inferred frequency for the file {path} is different than requested. "
-                                 f"Skipping {path}.")
+                self.logger.info(f"Inferred frequency for the file {file_path} is different than requested. "
+                                 f"Skipping {file_path}.")
             else:
 
                 start_time = start_date or df.index[0]
@@ -151,7 +154,7 @@ class CSVDataProvider(PresetDataProvider):
                     df = df.loc[start_time:end_time, df.columns.isin(fields)]
                     fields_diff = set(fields).difference(df.columns)
                     if fields_diff:
-                        self.logger.info(f"Not all fields are available for {path}. Difference: {fields_diff}")
+                        self.logger.info(f"Not all fields are available for {file_path}. Difference: {fields_diff}")
                 else:
                     df = df.loc[start_time:end_time, :]
                     available_fields.update(df.columns.tolist())
@@ -166,21 +169,26 @@ class CSVDataProvider(PresetDataProvider):
                     self.logger.info(f'Ticker {ticker_str} was not requested in the list of tickers. Skipping.')
 
         if ticker_col:
-            df = QFDataFrame(pd.read_csv(path, dtype={index_col: str}))
-            available_tickers = df[ticker_col].dropna().unique().tolist()
+            df, = self._files_loader.load([Path(path)], [index_col], dateformat, dtype={ticker_col: str})
+            if df is None:
+                raise ImportError(f"The file {path} does not contain the {index_col} column")
 
-            for ticker_str in available_tickers:
-                sliced_df = df[df[ticker_col] == ticker_str]
-                _process_df(sliced_df, ticker_str)
+            # Split the data into tickers at once (the rows with no ticker are skipped)
+            for ticker_str, sliced_df in df.groupby(ticker_col, sort=False):
+                _process_df(sliced_df, ticker_str, path)
 
         else:
-            tickers_paths = [list(Path(path).glob('**/{}.csv'.format(ticker.as_string()))) for ticker in tickers]
-            joined_tickers_paths = [item for sublist in tickers_paths for item in sublist]
+            files_paths = self._files_loader.index_files(path)
+            tickers_paths = [file_path for ticker in tickers for file_path in files_paths.get(ticker.as_string(), [])]
+
+            for file_path, df in zip(tickers_paths, self._files_loader.load(tickers_paths, [index_col], dateformat)):
+                if df is None:
+                    self.logger.info(f"The file {file_path} does not contain the {index_col} column. "
+                                     f"Skipping {file_path}.")
+                    continue
 
-            for path in joined_tickers_paths:
-                ticker_str = path.resolve().name.replace('.csv', '')
-                df = QFDataFrame(pd.read_csv(path, dtype={index_col: str}))
-                _process_df(df, ticker_str)
+                ticker_str = file_path.name.replace('.csv', '')
+                _process_df(df, ticker_str, file_path)
 
         if not tickers_prices_dict.values():
             raise ImportError("No data was found. Check the correctness of all data")
@@ -0,0 +1,165 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, List, Sequence, Optional, Any
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class CSVFilesLoader:
+    """
+    Loads csv files into data frames indexed by dates. Used by the data providers which load data from directories
+    containing many csv files (e.g. CSVDataProvider, PortaraDataProvider).
+
+    The files are parsed with the explicitly given dtypes and dates format (if the dates don't match the format,
+    the format is inferred), optionally in n_jobs processes. If the cache_dir is given, each parsed file is stored
+    in the cache directory as a binary (pickle) sidecar file, together with the modification time and the size of the
+    csv file. Later loads of the unchanged files read the sidecar files and skip the csv parsing entirely.
+
+    Parameters
+    ----------
+    n_jobs: int
+        number of processes used to parse the files
+    cache_dir: Optional[str]
+        directory in which the parsed files are stored. If None, the parsed files are not cached
+    """
+
+    def __init__(self, n_jobs: int = 1, cache_dir: Optional[str] = None):
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def index_files(path: str, extension: str = ".csv") -> Dict[str, List[Path]]:
+        """
+        Walks the directory (and all its subdirectories) once and maps the names of all files with the given extension
+        (without the extension, e.g. the ticker strings) onto the paths of the files.
+        """
+        files = {}
+        for dir_path, dir_names, file_names in os.walk(path):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if file_name.endswith(extension):
+                    files.setdefault(file_name[:-len(extension)], []).append(Path(dir_path, file_name).resolve())
+        return files
+
+    def load(self, paths: Sequence[Path], dates_columns: Sequence[str], dates_format: Optional[str] = None,
+             dtype: Optional[Dict[str, Any]] = None) -> List[Optional[QFDataFrame]]:
+        """
+        Loads the csv files.
+
+        Parameters
+        ----------
+        paths: Sequence[Path]
+            paths to the csv files
+        dates_columns: Sequence[str]
+            columns containing the dates (e.g. ["Date", "Time"]). The values of the columns, joined with spaces,
+            are used as the index of the data frame. The columns themselves are kept in the data frame (as strings)
+        dates_format: Optional[str]
+            the strftime to parse the dates, e.g. "%Y-%m-%d %H:%M:%S". If None, the format is inferred
+        dtype: Optional[Dict[str, Any]]
+            dtypes of the columns (only the columns present in the file are taken into account)
+
+        Returns
+        -------
+        List[Optional[QFDataFrame]]
+            data frames corresponding to the paths. None is returned for the files, which don't contain all
+            the dates columns
+        """
+        file_format = (list(dates_columns), dates_format, dtype or {})
+        if self.n_jobs == 1 or len(paths) <= 1:
+            return _load_files(paths, file_format, self.cache_dir)
+
+        chunks = [chunk for chunk in np.array_split(np.arange(len(paths)), self.n_jobs) if len(chunk) > 0]
+        chunks_data_frames = Parallel(n_jobs=self.n_jobs)(
+            delayed(_load_files)([paths[i] for i in chunk], file_format, self.cache_dir) for chunk in chunks)
+        return [data_frame for chunk_data_frames in chunks_data_frames for data_frame in chunk_data_frames]
+
+
+_NOT_CACHED = object()
+
+
+def _load_files(paths: Sequence[Path], file_format: tuple, cache_dir: Optional[str]) -> List[Optional[QFDataFrame]]:
+    data_frames = []
+    for path in paths:
+        file_stat = os.stat(path)
+        file_key = (file_stat.st_mtime_ns, file_stat.st_size)
+
+        sidecar_path = _get_sidecar_path(path, file_format, cache_dir) if cache_dir is not None else None
+        data_frame = _read_sidecar(sidecar_path, file_key) if sidecar_path is not None else _NOT_CACHED
+        if data_frame is _NOT_CACHED:
+            data_frame = _parse_file(path, *file_format)
+            if sidecar_path is not None:
+                _write_sidecar(sidecar_path, file_key, data_frame)
+
+        data_frames.append(data_frame)
+    return data_frames
+
+
+def _parse_file(path: Path, dates_columns: List[str], dates_format: Optional[str],
+                dtype: Dict[str, Any]) -> Optional[QFDataFrame]:
+    header = pd.read_csv(path, nrows=0).columns
+    if not all(column in header for column in dates_columns):
+        return None
+
+    columns_dtypes = {column: column_dtype for column, column_dtype in dtype.items() if column in header}
+    columns_dtypes.update({column: str for column in dates_columns})
+    data_frame = QFDataFrame(pd.read_csv(path, dtype=columns_dtypes))
+
+    dates = data_frame[dates_columns[0]]
+    for column in dates_columns[1:]:
+        dates = dates + " " + data_frame[column]
+
+    try:
+        data_frame.index = pd.to_datetime(dates, format=dates_format)
+    except ValueError:
+        if dates_format is None:
+            raise
+        data_frame.index = pd.to_datetime(dates)
+
+    return data_frame
+
+
+def _get_sidecar_path(path: Path, file_format: tuple, cache_dir: str) -> str:
+    key = hashlib.sha1(repr((str(path), file_format)).encode()).hexdigest()
+    return os.path.join(cache_dir, "{}.pickle".format(key))
+
+
+def _read_sidecar(sidecar_path: str, file_key: tuple):
+    """ Returns the cached data frame (None for the files without the dates columns) or _NOT_CACHED. """
+    try:
+        with open(sidecar_path, "rb") as file:
+            cached_file_key, data_frame = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return _NOT_CACHED
+    return data_frame if cached_file_key == file_key else _NOT_CACHED
+
+
+def _write_sidecar(sidecar_path: str, file_key: tuple, data_frame: Optional[QFDataFrame]):
+    # Write the sidecar file to a temporary file first, so that the sidecar file is never left incomplete
+    temporary_path = "{}.{}.tmp".format(sidecar_path, os.getpid())
+    with open(temporary_path, "wb") as file:
+        pickle.dump((file_key, data_frame), file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, sidecar_path)
@@ -12,9 +12,9 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from itertools import groupby
-from typing import Sequence, Union, Dict, Type
+from typing import Sequence, Union, Dict, Type, Callable, List, Any
 
 import pandas as pd
 
@@ -40,11 +40,29 @@ from qf_lib.data_providers.bloomberg.bloomberg_data_provider import BloombergDat
 class GeneralPriceProvider(DataProvider):
     """
     The main class that should be used in order to access prices of financial instruments.
+
+    The tickers are grouped by the data providers supporting them, so that each data provider receives a single
+    request. As the requests are I/O bound, they may be sent to the data providers concurrently, using a pool of
+    max_workers threads (each data provider is used by a single thread at a time). In that case the time needed to
+    get the data is the time of the slowest data provider instead of the sum of the times of all of them.
+
+    Parameters
+    ----------
+    bloomberg: BloombergDataProvider
+        data provider used for the BloombergTickers
+    quandl: QuandlDataProvider
+        data provider used for the QuandlTickers
+    haver: HaverDataProvider
+        data provider used for the HaverTickers
+    max_workers: int
+        maximum number of data providers requested concurrently. By default the data providers are requested
+        one after another
     """
 
     def __init__(self, bloomberg: BloombergDataProvider = None, quandl: QuandlDataProvider = None,
-                 haver: HaverDataProvider = None):
+                 haver: HaverDataProvider = None, max_workers: int = 1):
         super().__init__()
+        self.max_workers = max_workers
         self._ticker_type_to_data_provider_dict = {}  # type: Dict[Type[Ticker], DataProvider]
 
         for provider in [bloomberg, quandl, haver]:
@@ -145,9 +163,7 @@ class GeneralPriceProvider(DataProvider):
         def get_data_func(data_prov: DataProvider, tickers_for_single_data_provider) -> Dict[FutureTicker, QFSeries]:
             return data_prov.get_futures_chain_tickers(tickers_for_single_data_provider, ExpirationDateField.all_dates())
 
-        for ticker_class, ticker_group in groupby(tickers, lambda t: type(t)):
-            data_provider = self._identify_data_provider(ticker_class)
-            partial_result = get_data_func(data_provider, list(ticker_group))
+        for partial_result in self._get_data_from_data_providers(tickers, get_data_func):
             if partial_result is not None:
                 results.update(partial_result)
 
@@ -175,13 +191,8 @@ class GeneralPriceProvider(DataProvider):
         tickers, got_single_ticker = convert_to_list(tickers, Ticker)
         fields, got_single_field = convert_to_list(fields, type_of_field)
         got_single_date = self._got_single_date(start_date, end_date, frequency)
-        partial_results = []
-
-        for ticker_class, ticker_group in groupby(tickers, lambda t: type(t)):
-            data_provider = self._identify_data_provider(ticker_class)
-            partial_result = get_data_func(data_provider, list(ticker_group))
-            if partial_result is not None:
-                partial_results.append(partial_result)
+        partial_results = [partial_result for partial_result in self._get_data_from_data_providers(
+            tickers, get_data_func) if partial_result is not None]
 
         if not all(isinstance(partial_result, type(partial_results[0])) for partial_result in partial_results):
             raise ValueError('Not all partial result are the same type')
@@ -195,6 +206,26 @@ class GeneralPriceProvider(DataProvider):
 
         return result
 
+    def _get_data_from_data_providers(self, tickers: Sequence[Ticker],
+                                      get_data_func: Callable[[DataProvider, List[Ticker]], Any]) -> List[Any]:
+        """
+        Groups the tickers by the data providers supporting them and calls the get_data_func once for each data
+        provider (concurrently if max_workers > 1). Returns the partial results in the order of data providers.
+        """
+        data_provider_to_tickers = {}  # type: Dict[DataProvider, List[Ticker]]
+        for ticker in tickers:
+            data_provider = self._identify_data_provider(type(ticker))
+            data_provider_to_tickers.setdefault(data_provider, []).append(ticker)
+
+        if self.max_workers == 1 or len(data_provider_to_tickers) == 1:
+            return [get_data_func(data_provider, tickers_for_single_data_provider)
+                    for data_provider, tickers_for_single_data_provider in data_provider_to_tickers.items()]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(data_provider_to_tickers))) as executor:
+            futures = [executor.submit(get_data_func, data_provider, tickers_for_single_data_provider)
+                       for data_provider, tickers_for_single_data_provider in data_provider_to_tickers.items()]
+            return [future.result() for future in futures]
+
     def _register_data_provider(self, price_provider: DataProvider):
         for ticker_class in price_provider.supported_ticker_types():
             self._ticker_type_to_data_provider_dict[ticker_class] = price_provider
@@ -0,0 +1,100 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import os
+import pickle
+
+import numpy as np
+
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class MemoryMappedDataProvider(PresetDataProvider):
+    """
+    Read-only PresetDataProvider, which uses a data bundle persisted on disk (see MemoryMappedDataProvider.save).
+    The values of the bundle are memory-mapped instead of being loaded into memory, so all the processes which open
+    the same bundle share one physical copy of the data (the pages of the file are kept in the page cache of the
+    operating system and are loaded only when they are accessed).
+
+    Pickling of the MemoryMappedDataProvider preserves only the path to the bundle, so the data provider may be
+    passed to other processes (e.g. by joblib or multiprocessing) at no cost - each of the processes reopens the
+    memory-mapped bundle instead of receiving a copy of the data.
+
+    Parameters
+    ----------
+    path: str
+        path to the directory containing the bundle created with MemoryMappedDataProvider.save
+    use_array_storage: bool
+        if True, the ArrayDataBundle is used to slice the data (see PresetDataProvider). As the memory-mapped values
+        are stored as contiguous float64 array, the ArrayDataBundle does not copy them. Default: False
+    """
+
+    _VALUES_FILE = "values.npy"
+    _DATES_FILE = "dates.npy"
+    _METADATA_FILE = "metadata.pickle"
+
+    def __init__(self, path: str, use_array_storage: bool = False):
+        self._path = path
+        self._use_array_storage = use_array_storage
+
+        with open(os.path.join(path, self._METADATA_FILE), "rb") as file:
+            metadata = pickle.load(file)
+
+        values = np.load(os.path.join(path, self._VALUES_FILE), mmap_mode="r")
+        dates = np.load(os.path.join(path, self._DATES_FILE))
+        data = QFDataArray.create(dates, metadata["tickers"], metadata["fields"], values, name=metadata["name"])
+
+        super().__init__(data=data, start_date=metadata["start_date"], end_date=metadata["end_date"],
+                         frequency=metadata["frequency"], exp_dates=metadata["exp_dates"],
+                         use_array_storage=use_array_storage)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @classmethod
+    def save(cls, data_provider: PresetDataProvider, path: str):
+        """
+        Persists the data bundle of the given PresetDataProvider (e.g. PrefetchingDataProvider) in the given
+        directory, so that it can be opened with the MemoryMappedDataProvider. The values of the bundle are stored as
+        float64 numpy array, while the dates, tickers, fields, expiration dates of futures contracts and all the other
+        parameters of the data provider are stored along with them.
+
+        Parameters
+        ----------
+        data_provider: PresetDataProvider
+            data provider containing the data bundle, which should be persisted
+        path: str
+            path to the directory, in which the bundle should be saved. The directory is created if it does not exist
+        """
+        os.makedirs(path, exist_ok=True)
+        data = data_provider.data_bundle
+
+        np.save(os.path.join(path, cls._VALUES_FILE), np.ascontiguousarray(data.values, dtype=np.float64))
+        np.save(os.path.join(path, cls._DATES_FILE), data.dates.values.astype("datetime64[ns]"))
+
+        metadata = {
+            "tickers": list(data.tickers.values),
+            "fields": list(data.fields.values),
+            "name": data.name,
+            "start_date": data_provider.start_date,
+            "end_date": data_provider.end_date,
+            "frequency": data_provider.frequency,
+            "exp_dates": data_provider.exp_dates
+        }
+        with open(os.path.join(path, cls._METADATA_FILE), "wb") as file:
+            pickle.dump(metadata, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __reduce__(self):
+        return self.__class__, (self._path, self._use_array_storage)
@@ -13,8 +13,7 @@
 #     limitations under the License.
 
 from datetime import datetime
-from typing import Sequence, Union, List
-from pathlib import Path
+from typing import Sequence, Union, List, Optional
 
 import pandas as pd
 
@@ -27,6 +26,7 @@ from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
 from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.csv.csv_files_loader import CSVFilesLoader
 from qf_lib.data_providers.helpers import tickers_dict_to_data_array, chain_tickers_within_range, normalize_data_array
 from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 
@@ -55,6 +55,11 @@ class PortaraDataProvider(PresetDataProvider):
         last date to be downloaded
     frequency: Frequency
         frequency of the data (1-minute bar and daily frequencies are supported)
+    n_jobs: int
+        number of processes used to parse the pricing data files
+    cache_dir: Optional[str]
+        directory in which the parsed pricing data files are cached (see CSVFilesLoader). If None, the files are not
+        cached
 
     Notes
     -----
@@ -73,10 +78,15 @@ class PortaraDataProvider(PresetDataProvider):
 
     """
 
+    # Dtypes of the string columns of the pricing data files, dtypes of the numeric columns are inferred by pandas
+    _COLUMNS_DTYPES = {"Date": str, "Time": str, "Date_Time": str, "Contract": str}
+
     def __init__(self, path: str, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, List[PriceField]],
-                 start_date: datetime, end_date: datetime, frequency: Frequency):
+                 start_date: datetime, end_date: datetime, frequency: Frequency, n_jobs: int = 1,
+                 cache_dir: Optional[str] = None):
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
+        self._files_loader = CSVFilesLoader(n_jobs, cache_dir)
 
         if frequency not in [Frequency.DAILY, Frequency.MIN_1]:
             raise NotImplementedError("{} supports only DAILY and MIN_1 bars loading".format(self.__class__.__name__))
@@ -119,11 +129,11 @@ class PortaraDataProvider(PresetDataProvider):
 
     def _get_expiration_dates(self, dir_path: str, future_tickers: Sequence[FutureTicker]):
         tickers_dates_dict = {}
+        files_paths = self._files_loader.index_files(dir_path, extension=".txt")
 
         for future_ticker in future_tickers:
-            for path in list(Path(dir_path).glob('**/{}.txt'.format(future_ticker.family_id.replace("{}", "")))):
+            for path in files_paths.get(future_ticker.family_id.replace("{}", ""), []):
                 try:
-                    path = path.resolve()
                     df = pd.read_csv(path, names=['Contract', 'Expiration Date'], parse_dates=['Expiration Date'],
                                      date_parser=lambda date: datetime.strptime(date, '%Y%m%d'), index_col="Contract")
                     df = df.rename(columns={'Expiration Date': ExpirationDateField.LastTradeableDate})
@@ -171,25 +181,25 @@ class PortaraDataProvider(PresetDataProvider):
         tickers_strings_to_tickers = {
             ticker.as_string(): ticker for ticker in tickers if not isinstance(ticker, FutureTicker)
         }
-        tickers_paths = [list(Path(path).glob('**/{}.csv'.format(ticker_str)))
-                         for ticker_str in tickers_strings_to_tickers.keys()]
-        joined_tickers_paths = [item for sublist in tickers_paths for item in sublist]
+        files_paths = self._files_loader.index_files(path)
+        tickers_paths = [file_path for ticker_str in tickers_strings_to_tickers.keys()
+                         for file_path in files_paths.get(ticker_str, [])]
+
+        # The dates are expected in the "YYYY-MM-DD" format (if they are not, the format is inferred)
+        if freq == Frequency.MIN_1:
+            dates_columns, dates_format = ["Date", "Time"], "%Y-%m-%d %H:%M:%S"
+        else:
+            dates_columns, dates_format = ["Date"], "%Y-%m-%d"
+        data_frames = self._files_loader.load(tickers_paths, dates_columns, dates_format, dtype=self._COLUMNS_DTYPES)
 
         tickers_prices_dict = {}
         contracts_data = {}
 
-        for path in joined_tickers_paths:
-            path = path.resolve()
+        for path, df in zip(tickers_paths, data_frames):
             ticker_str = path.name.replace('.csv', '')
             ticker = tickers_strings_to_tickers[ticker_str]
-            # It is important to save the Time and Date as strings, in order to correctly infer the date format
-            df = QFDataFrame(pd.read_csv(path, dtype={"Time": str, "Date": str, "Date_Time": str}))
-
-            if 'Time' in df and freq == Frequency.MIN_1:
-                df.index = pd.to_datetime(df["Date"] + ' ' + df["Time"])
-            elif 'Time' not in df and 'Date' in df and freq == Frequency.DAILY:
-                df.index = pd.to_datetime(df['Date'])
-            else:
+
+            if df is None or (freq == Frequency.DAILY and 'Time' in df):
                 self.logger.info(f"Ticker {ticker} does not satisfy timing requirements. File path: {path}")
                 continue
 
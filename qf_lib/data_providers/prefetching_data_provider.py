@@ -49,13 +49,16 @@ class PrefetchingDataProvider(PresetDataProvider):
         last date to be downloaded
     frequency: Frequency
         frequency of the data
+    use_array_storage: bool
+        if True, the prefetched data is additionally kept in a contiguous numpy array, which speeds up slicing of the
+        data by dates, tickers and fields (see PresetDataProvider). Default: False
     """
 
     def __init__(self, data_provider: DataProvider,
                  tickers: Union[Ticker, Sequence[Ticker]],
                  fields: Union[PriceField, Sequence[PriceField]],
                  start_date: datetime, end_date: datetime,
-                 frequency: Frequency):
+                 frequency: Frequency, use_array_storage: bool = False):
         # Convert fields into list in order to return a QFDataArray as the result of get_price function
         fields, _ = convert_to_list(fields, PriceField)
 
@@ -82,4 +85,5 @@ class PrefetchingDataProvider(PresetDataProvider):
                          exp_dates=exp_dates,
                          start_date=start_date,
                          end_date=end_date,
-                         frequency=frequency)
+                         frequency=frequency,
+                         use_array_storage=use_array_storage)
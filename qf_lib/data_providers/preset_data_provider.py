@@ -31,6 +31,7 @@ from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.array_data_bundle import ArrayDataBundle
 from qf_lib.data_providers.helpers import normalize_data_array
 from qf_lib.data_providers.data_provider import DataProvider
 
@@ -52,12 +53,17 @@ class PresetDataProvider(DataProvider):
     exp_dates
         dictionary mapping FutureTickers to QFDataFrame of contracts expiration dates, belonging to the certain
         future ticker family
+    use_array_storage
+        if True, the data is additionally stored in a contiguous numpy array (see ArrayDataBundle), which is used
+        to slice the data by dates, tickers and fields instead of the label based indexing of the QFDataArray.
+        The results are the same, but the data is returned as float64. Default: False
     """
 
     def __init__(self, data: QFDataArray, start_date: datetime, end_date: datetime, frequency: Frequency,
-                 exp_dates: Dict[FutureTicker, QFDataFrame] = None):
+                 exp_dates: Dict[FutureTicker, QFDataFrame] = None, use_array_storage: bool = False):
         super().__init__()
         self._data_bundle = data
+        self._array_bundle = ArrayDataBundle(data) if use_array_storage else None
         self._frequency = frequency
         self._exp_dates = exp_dates
 
@@ -125,7 +131,7 @@ class PresetDataProvider(DataProvider):
         got_single_date = self._got_single_date(start_date, end_date, frequency)
 
         self._check_if_cached_data_available(specific_tickers, fields, start_date, end_date)
-        data_array = self._data_bundle.loc[start_date:end_date, specific_tickers, fields]
+        data_array = self._get_data_array(start_date, end_date, specific_tickers, fields)
 
         # Data aggregation (allowed only for the Intraday Data and in case if more then 1 data point is found)
         if frequency < self._frequency and len(data_array[DATES]) > 0:
@@ -154,25 +160,31 @@ class PresetDataProvider(DataProvider):
         got_single_date = nr_of_bars == 1
 
         data_bundle = self._data_bundle
+        array_bundle = self._array_bundle
 
         # Data aggregation (allowed only for the Intraday Data and in case if more then 1 data point is found)
         if frequency < self._frequency and len(data_bundle[DATES]) > 0:
             data_bundle = self._aggregate_intraday_data_helper(data_bundle, frequency, fields)
+            array_bundle = None
+
+        def get_last_bars(_start_date: datetime) -> QFDataArray:
+            if array_bundle is not None:
+                return array_bundle.get_last_valid_data_array(_start_date, end_date, specific_tickers, fields,
+                                                              nr_of_bars)
+            _data_array = data_bundle.loc[_start_date:end_date, specific_tickers, fields].dropna(DATES, how='all')
+            return _data_array.isel(dates=slice(-nr_of_bars, None))
 
         if frequency == Frequency.DAILY:
             start_date = self._compute_start_date(nr_of_bars, end_date, frequency)
         else:
             start_date = end_date - RelativeDelta(days=14)  # to optimize running time for intraday data
 
-        data_array = data_bundle.loc[start_date:end_date, specific_tickers, fields].dropna(DATES, how='all')
-        data_array = data_array.isel(dates=slice(-nr_of_bars, None))
-
+        data_array = get_last_bars(start_date)
         missing_bars = nr_of_bars - data_array.shape[0]
 
         if missing_bars > 0:
             start_date = self._compute_start_date(missing_bars, start_date, frequency)
-            data_array = data_bundle.loc[start_date:end_date, specific_tickers, fields].dropna(DATES, how='all')
-            data_array = data_array.isel(dates=slice(-nr_of_bars, None))
+            data_array = get_last_bars(start_date)
 
         normalized_result = normalize_data_array(
             data_array, specific_tickers, fields, got_single_date, got_single_ticker, got_single_field,
@@ -206,7 +218,7 @@ class PresetDataProvider(DataProvider):
             return nan if got_single_ticker else PricesSeries()
 
         start_time = end_time - RelativeDelta(days=7)  # 7 days to know if an asset disappears
-        data_array = self._data_bundle.loc[start_time:end_time, specific_tickers, [PriceField.Open, PriceField.Close]]
+        data_array = self._get_data_array(start_time, end_time, specific_tickers, [PriceField.Open, PriceField.Close])
 
         # Data aggregation (allowed only for the Intraday Data and in case if more then 1 data point is found)
         if frequency < self._frequency and len(data_array[DATES]) > 0:
@@ -243,6 +255,12 @@ class PresetDataProvider(DataProvider):
         latest_available_prices_series = self._map_normalized_result(latest_available_prices_series, tickers_mapping, tickers)
         return latest_available_prices_series.iloc[0] if got_single_ticker else latest_available_prices_series
 
+    def _get_data_array(self, start_date: datetime, end_date: datetime, tickers: Sequence[Ticker],
+                        fields: Sequence[Union[str, PriceField]]) -> QFDataArray:
+        if self._array_bundle is not None:
+            return self._array_bundle.get_data_array(start_date, end_date, tickers, fields)
+        return self._data_bundle.loc[start_date:end_date, tickers, fields]
+
     def _tickers_mapping(self, tickers: Union[Ticker, Sequence[Ticker]]) -> \
             Tuple[Sequence[Ticker], Sequence[Ticker], Dict, bool]:
         """ In order to be able to return data for FutureTickers create a mapping between tickers and corresponding
@@ -301,7 +319,7 @@ class PresetDataProvider(DataProvider):
         got_single_date = self._got_single_date(start_date, end_date, frequency)
 
         self._check_if_cached_data_available(specific_tickers, fields, start_date, end_date)
-        data_array = self._data_bundle.loc[start_date:end_date, specific_tickers, fields]
+        data_array = self._get_data_array(start_date, end_date, specific_tickers, fields)
 
         normalized_result = normalize_data_array(data_array, specific_tickers, fields, got_single_date,
                                                  got_single_ticker,
@@ -0,0 +1,231 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import hashlib
+import pickle
+import types
+from enum import Enum
+from functools import partial
+from os import makedirs
+from os.path import join, isfile
+from typing import List, Optional, Dict, Tuple, Sequence
+
+import matplotlib as mpl
+import numpy as np
+from joblib import Parallel, delayed
+from pandas import Series, DataFrame, Index
+from pandas.util import hash_pandas_object
+
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.documents_utils.document_exporting.document import Document
+from qf_lib.documents_utils.document_exporting.element.chart import ChartElement
+from qf_lib.documents_utils.document_exporting.element.grid import GridElement
+from qf_lib.plotting.charts.chart import Chart
+
+
+class ChartRenderer:
+    """
+    Renders all the charts of a document in advance, before the HTML of the document is generated. The charts are
+    rendered in n_jobs processes (matplotlib is not thread-safe, so the charts can't be rendered in threads).
+    The current matplotlib settings (rcParams, e.g. set with plt.style.use) are passed to the processes.
+
+    Rendered images are cached, using the hash of the chart's data and settings together with the figsize, dpi and
+    optimise flag of the chart element and the matplotlib settings as the key. If the cache_dir is given, the images are also stored on the disk,
+    so that regenerating a report (e.g. after small changes) only re-renders the charts which have changed.
+
+    Charts which can't be sent to another process (or which fail to render) are left to be rendered by the
+    ChartElement itself, while the document is generated.
+
+    Parameters
+    ----------
+    n_jobs: int
+        number of processes used to render the charts
+    cache_dir: Optional[str]
+        directory in which the rendered images are stored. If None, the images are only cached in memory
+    """
+
+    def __init__(self, n_jobs: int = 1, cache_dir: Optional[str] = None):
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
+        self._cache = {}  # type: Dict[str, str]
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        if cache_dir is not None:
+            makedirs(cache_dir, exist_ok=True)
+
+    def render_document(self, document: Document):
+        """
+        Renders all the charts of the document (including the charts placed in grids) and sets the rendered images
+        in the chart elements.
+        """
+        elements_to_render = {}  # type: Dict[str, List[ChartElement]]
+        num_of_cached_charts = 0
+
+        for chart_element in self._get_chart_elements(document.elements):
+            try:
+                key = self._get_key(chart_element)
+            except Exception as ex:
+                self.logger.debug("The chart can't be rendered in advance: {}".format(ex))
+                continue
+
+            image = self._get_cached_image(key)
+            if image is not None:
+                chart_element.set_rendered_image(image)
+                num_of_cached_charts += 1
+            else:
+                elements_to_render.setdefault(key, []).append(chart_element)
+
+        self.logger.info("Rendering {} charts ({} charts taken from the cache)".format(
+            len(elements_to_render), num_of_cached_charts))
+
+        for key, image in self._render(elements_to_render).items():
+            self._cache_image(key, image)
+            for chart_element in elements_to_render[key]:
+                chart_element.set_rendered_image(image)
+
+    def _render(self, elements_to_render: Dict[str, List[ChartElement]]) -> Dict[str, str]:
+        tasks = [(key, chart_elements[0].chart, chart_elements[0].figsize, chart_elements[0].dpi,
+                  chart_elements[0].optimise) for key, chart_elements in elements_to_render.items()]
+        if not tasks:
+            return {}
+
+        rc_params = _get_rc_params()
+        if self.n_jobs == 1:
+            chunks_results = [_render_charts(tasks, None)]
+        else:
+            chunks = [chunk for chunk in np.array_split(np.arange(len(tasks)), self.n_jobs) if len(chunk) > 0]
+            chunks_results = Parallel(n_jobs=self.n_jobs)(
+                delayed(_render_charts)([tasks[i] for i in chunk], rc_params) for chunk in chunks)
+
+        return {key: image for chunk_results in chunks_results for key, image in chunk_results if image is not None}
+
+    def _get_chart_elements(self, elements: Sequence) -> List[ChartElement]:
+        chart_elements = []
+        for element in elements:
+            if isinstance(element, ChartElement) and element.chart is not None:
+                chart_elements.append(element)
+            elif isinstance(element, GridElement):
+                chart_elements.extend(self._get_chart_elements(element.elements))
+        return chart_elements
+
+    def _get_key(self, chart_element: ChartElement) -> str:
+        if self.n_jobs != 1:
+            # Make sure the chart can be sent to another process
+            pickle.dumps(chart_element.chart)
+
+        hash_object = hashlib.sha256()
+        _update_hash(hash_object, chart_element.chart, set())
+        _update_hash(hash_object, (chart_element.figsize, chart_element.dpi, chart_element.optimise), set())
+        # The images depend on the matplotlib settings as well (e.g. on the style set with plt.style.use)
+        _update_hash(hash_object, _get_rc_params(), set())
+        return hash_object.hexdigest()
+
+    def _get_cached_image(self, key: str) -> Optional[str]:
+        image = self._cache.get(key)
+        if image is None and self.cache_dir is not None:
+            file_path = self._get_file_path(key)
+            if isfile(file_path):
+                with open(file_path, "r") as file:
+                    image = file.read()
+                self._cache[key] = image
+        return image
+
+    def _cache_image(self, key: str, image: str):
+        self._cache[key] = image
+        if self.cache_dir is not None:
+            with open(self._get_file_path(key), "w") as file:
+                file.write(image)
+
+    def _get_file_path(self, key: str) -> str:
+        return join(self.cache_dir, "{}.png.base64".format(key))
+
+
+def _get_rc_params() -> Dict:
+    """ Returns the current matplotlib settings (except for the backend), which are used to render the charts. """
+    return {name: value for name, value in sorted(mpl.rcParams.items()) if name != "backend"}
+
+
+def _render_charts(tasks: List[Tuple[str, Chart, Tuple[float, float], int, bool]],
+                   rc_params: Optional[Dict]) -> List[Tuple[str, Optional[str]]]:
+    """ Renders the charts as base64 images (using the given matplotlib settings). """
+    results = []
+    with mpl.rc_context(rc=rc_params):
+        for key, chart, figsize, dpi, optimise in tasks:
+            try:
+                image = chart.render_as_base64_image(figsize, dpi, optimise)
+            except Exception:
+                # The chart element will render the chart itself and report the error
+                image = None
+            finally:
+                if chart.figure is not None:
+                    chart.close()
+            results.append((key, image))
+    return results
+
+
+def _update_hash(hash_object, value, visited_ids: set):
+    """
+    Updates the hash with the data of the given value. The objects (e.g. charts and decorators) are hashed
+    recursively based on their attributes, skipping the matplotlib objects created while plotting and the random
+    keys of decorators, so that the hash only depends on the data and settings of the chart.
+    """
+    if isinstance(value, (str, int, float, bool, bytes, type(None))):
+        hash_object.update(repr((type(value).__name__, value)).encode())
+    elif isinstance(value, Enum):
+        hash_object.update(repr(value).encode())
+    elif isinstance(value, (Series, DataFrame, Index)):
+        hash_object.update(type(value).__name__.encode())
+        hash_object.update(repr(getattr(value, "name", None)).encode())
+        if isinstance(value, DataFrame):
+            _update_hash(hash_object, list(value.columns), visited_ids)
+        hash_object.update(hash_pandas_object(value).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        hash_object.update(repr((value.dtype.str, value.shape)).encode())
+        hash_object.update(value.tobytes() if value.dtype != object else pickle.dumps(value))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        hash_object.update("{}:{}".format(type(value).__name__, len(value)).encode())
+        for item in (sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value):
+            _update_hash(hash_object, item, visited_ids)
+    elif isinstance(value, dict):
+        hash_object.update("dict:{}".format(len(value)).encode())
+        for item_key, item_value in value.items():
+            _update_hash(hash_object, item_key, visited_ids)
+            _update_hash(hash_object, item_value, visited_ids)
+    elif isinstance(value, type):
+        hash_object.update("{}.{}".format(value.__module__, value.__qualname__).encode())
+    elif isinstance(value, types.MethodType):
+        _update_hash(hash_object, value.__func__, visited_ids)
+        _update_hash(hash_object, value.__self__, visited_ids)
+    elif isinstance(value, partial):
+        _update_hash(hash_object, (value.func, value.args, value.keywords), visited_ids)
+    elif isinstance(value, types.FunctionType):
+        hash_object.update(value.__qualname__.encode())
+        hash_object.update(value.__code__.co_code)
+        _update_hash(hash_object, value.__code__.co_consts, visited_ids)
+        _update_hash(hash_object, value.__defaults__, visited_ids)
+        _update_hash(hash_object, [cell.cell_contents for cell in value.__closure__ or ()], visited_ids)
+    elif id(value) in visited_ids:
+        hash_object.update(b"<visited>")
+    elif hasattr(value, "__dict__"):
+        visited_ids.add(id(value))
+        hash_object.update("{}.{}".format(type(value).__module__, type(value).__qualname__).encode())
+        for attribute_name, attribute_value in sorted(vars(value).items()):
+            if attribute_name in ("_ax", "_secondary_axes", "figure", "key", "legend_artist"):
+                continue
+            if isinstance(value, Chart) and attribute_name == "_decorators":
+                # keys of decorators are random by default, only the decorators themselves are hashed
+                attribute_value = list(attribute_value.values())
+            hash_object.update(attribute_name.encode())
+            _update_hash(hash_object, attribute_value, visited_ids)
+    else:
+        hash_object.update(repr(value).encode())
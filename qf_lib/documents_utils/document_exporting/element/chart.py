@@ -59,8 +59,20 @@ class ChartElement(Element):
         self.optimise = optimise
         self.grid_proportion = grid_proportion
         self.comment = comment
+        self._rendered_image = None
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
+    @property
+    def chart(self) -> Chart:
+        return self._chart
+
+    def set_rendered_image(self, base64_image: str):
+        """
+        Sets the base64 image of the chart, rendered in advance (e.g. by the ChartRenderer). The image is used instead
+        of rendering the chart while the element is generated.
+        """
+        self._rendered_image = base64_image
+
     def get_grid_proportion_css_class(self) -> str:
         return str(self.grid_proportion)
 
@@ -74,15 +86,15 @@ class ChartElement(Element):
         A string with the base64 image (with encoding prefix) of the chart.
         """
         try:
-            result = "data:image/png;base64," + self._chart.render_as_base64_image(
-                self.figsize, self.dpi, self.optimise)
+            result = "data:image/png;base64," + self._render_as_base64_image()
         except Exception as ex:
             error_message = "{}\n{}".format(ex.__class__.__name__, traceback.format_exc())
             self.logger.exception('Chart generation error:')
             self.logger.exception(error_message)
             result = error_message
         # Close the chart's figure as we are no longer going to be using it.
-        self._chart.close()
+        if self._chart.figure is not None:
+            self._chart.close()
         return result
 
     def generate_html(self, document: Document) -> str:
@@ -91,7 +103,7 @@ class ChartElement(Element):
         memory, then encoded to base64 and embedded in the HTML
         """
         try:
-            base64 = self._chart.render_as_base64_image(self.figsize, self.dpi, self.optimise)
+            base64 = self._render_as_base64_image()
             env = templates.environment
             template = env.get_template("chart.html")
             result = template.render(data=base64, width="100%")
@@ -102,13 +114,18 @@ class ChartElement(Element):
             self.logger.exception(error_message)
             result = "<h2 class='chart-render-failure'>Failed to render chart</h1>"
         # Close the chart's figure as we are no longer going to be using it.
-        if self._chart is not None:
+        if self._chart is not None and self._chart.figure is not None:
             self._chart.close()
         # Add the optional comment.
         result += self._create_html_comment()
 
         return result
 
+    def _render_as_base64_image(self) -> str:
+        if self._rendered_image is not None:
+            return self._rendered_image
+        return self._chart.render_as_base64_image(self.figsize, self.dpi, self.optimise)
+
     def _create_html_comment(self):
         template = Template("""
             <p class="comment">{{ comment }}</p>
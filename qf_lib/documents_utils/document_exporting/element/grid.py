@@ -58,6 +58,10 @@ class GridElement(Element):
         self.dpi = dpi
         self.optimise = optimise
 
+    @property
+    def elements(self) -> List[Element]:
+        return self._elements
+
     def generate_html(self, document: Optional[Document]) -> str:
         """
         Generates the HTML necessary to display the underlying grid of charts in a PDF. Each ``ChartElement``'s
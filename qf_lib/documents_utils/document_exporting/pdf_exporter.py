@@ -14,11 +14,12 @@
 
 import os
 from os.path import join, abspath, dirname
-from typing import List
+from typing import List, Optional
 
 from weasyprint import HTML, CSS
 
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.documents_utils.document_exporting.chart_renderer import ChartRenderer
 from qf_lib.documents_utils.document_exporting.document import Document
 from qf_lib.documents_utils.document_exporting.document_exporter import DocumentExporter
 from qf_lib.settings import Settings
@@ -30,12 +31,17 @@ class PDFExporter(DocumentExporter):
     Stores elements such as the ParagraphElement and ChartElement in order to build a PDF based on them once they
     have all been added. If there is a "document_css_directory" attribute set in the Settings, then CSS files from that
     directory will be applied for styling the output page. Otherwise the default styling will be applied.
+
+    If the chart_renderer is given, all the charts of the document are rendered with it (e.g. in parallel, using
+    the cached images of the charts which have not changed) before the HTML of the document is generated.
+    Otherwise each chart is rendered by its ChartElement.
     """
 
     DEFAULT_CSS_DIR_NAME = 'default_css'
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, chart_renderer: Optional[ChartRenderer] = None):
         super().__init__(settings)
+        self._chart_renderer = chart_renderer
 
         if hasattr(settings, 'document_css_directory'):
             self._document_css_dir = join(get_starting_dir_abs_path(), settings.document_css_directory)
@@ -92,6 +98,10 @@ class PDFExporter(DocumentExporter):
             if include_table_of_contents:
                 self._add_table_of_contents(document)
 
+            if self._chart_renderer is not None:
+                self.logger.info("Rendering charts...")
+                self._chart_renderer.render_document(document)
+
             # Generate the full document HTML
             self.logger.info("Generating HTML for PDF...")
             html = document.generate_html()
@@ -15,13 +15,14 @@
 from datetime import datetime
 from os import makedirs, path, remove
 from os.path import exists, isfile, join, dirname
-from typing import Any, Union, Optional
+from typing import Any, Union, Optional, Mapping, List
 
 import numpy
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font
 from openpyxl.worksheet.worksheet import Worksheet
-from pandas import Series, DataFrame
+from pandas import Series, DataFrame, Index
+from pandas.api.types import is_float_dtype, is_integer_dtype, is_datetime64_dtype
 
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.numberutils.is_finite_number import is_finite_number
@@ -84,6 +85,48 @@ class ExcelExporter:
         work_book.save(file_path)
         return file_path
 
+    def export_containers(self, containers: Mapping[str, Union[QFSeries, QFDataFrame]], file_path: str,
+                          starting_cell: str = 'A1', include_index: bool = True,
+                          include_column_names: bool = False) -> str:
+        """
+        Exports multiple containers (QFSeries, QFDataFrame), each one to a separate sheet, to a new excel file.
+        All the containers are written in a single open / save cycle using the write-only (streaming) workbook
+        of openpyxl: the rows are appended one by one and values are converted to the types supported by excel
+        column by column, which makes the export of large containers much faster than with export_container.
+
+        The file is always created from scratch (if it already exists, it is replaced). In order to edit
+        an existing file use export_container.
+        Returns the absolute file path of the exported file.
+
+        Parameters
+        ----------
+        containers
+            mapping between the sheets' names and the containers, which should be exported to them
+        file_path
+            path (relative to the output root directory) to the file to which data should be exported
+        starting_cell
+            the address of the cell which should be the top left corner of each of the exported containers
+            default: 'A1'
+        include_index
+            determines whether the index should be written together with the data.
+        include_column_names
+            determines whether the column names should be written together with the data. For series containers the
+            column names are always "Index" and the name of the series.
+        """
+        starting_row, starting_column = row_and_column(starting_cell)
+
+        file_path = join(get_starting_dir_abs_path(), self.settings.output_directory, file_path)
+        makedirs(dirname(file_path), exist_ok=True)
+
+        work_book = Workbook(write_only=True)
+        for sheet_name, container in containers.items():
+            work_sheet = work_book.create_sheet(sheet_name)
+            self._append_container_to_worksheet(container, work_sheet, starting_row, starting_column, include_index,
+                                                include_column_names)
+
+        work_book.save(file_path)
+        return file_path
+
     def apply_font_style_to_area(self, file_path: str, specified_area: str, write_mode: WriteMode = WriteMode.CREATE_IF_DOESNT_EXIST, sheet_name: str = None, **font_setting):
         """
         Apply a font style to a certain area in excel
@@ -239,6 +282,49 @@ class ExcelExporter:
             work_sheet.cell(row=row, column=starting_column, value=self._to_supported_type(date))
             row += 1
 
+    def _append_container_to_worksheet(self, container: Union[Series, DataFrame], work_sheet, starting_row: int,
+                                       starting_column: int, include_index: bool, include_column_names: bool):
+        """ Appends the rows of the container to the (write-only) worksheet. """
+        if isinstance(container, Series):
+            columns = [container]
+            column_names = [container.name]
+            # similarly to export_container, the header is not written for series without a name
+            include_column_names = include_column_names and container.name is not None
+        else:
+            columns = [series for _, series in container.iteritems()]
+            column_names = list(container.columns)
+
+        columns_values = [self._to_supported_values(series) for series in columns]
+        if include_index:
+            columns_values.insert(0, self._to_supported_values(container.index))
+            column_names.insert(0, "Index")
+
+        for _ in range(starting_row - 1):
+            work_sheet.append([])
+
+        empty_cells = [None] * (starting_column - 1)
+        if include_column_names:
+            work_sheet.append(empty_cells + [self._to_supported_type(column_name) for column_name in column_names])
+
+        for row in zip(*columns_values):
+            work_sheet.append(empty_cells + list(row))
+
+    def _to_supported_values(self, values: Union[Series, Index]) -> List:
+        """
+        Converts all the values of the series (or index) into the types supported by excel (see _to_supported_type).
+        The dtype of the values is used to avoid checking the type of each value separately.
+        """
+        if is_float_dtype(values.dtype):
+            supported_values = values.tolist()
+            # non-finite values are exported as strings
+            for i in numpy.flatnonzero(~numpy.isfinite(numpy.asarray(values, dtype=float))):
+                supported_values[i] = str(supported_values[i])
+            return supported_values
+        elif is_integer_dtype(values.dtype) or is_datetime64_dtype(values.dtype):
+            return values.tolist()
+        else:
+            return [self._to_supported_type(value) for value in values]
+
     def _to_supported_type(self, value):
         if isinstance(value, (numpy.int64, numpy.int32)):
             return int(value)
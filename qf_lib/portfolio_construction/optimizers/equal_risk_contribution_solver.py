@@ -0,0 +1,198 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from typing import Union, Sequence, Tuple
+
+import numpy as np
+
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.portfolio_construction.optimizers.helpers.common_constraint_helpers import prepare_upper_bounds_vector
+
+
+class EqualRiskContributionSolver:
+    """
+    Dedicated solver of the Equal Risk Contribution problem, based on the log-barrier formulation
+    (see: http://www.thierry-roncalli.com/download/erc-slides.pdf):
+
+        minimise 1/2 y'Σy - sum(log(y_i)) over y > 0,
+
+    which is strictly convex and is minimised with Newton's method using the analytic gradient (Σy - 1/y) and Hessian
+    (Σ + diag(1/y^2)). The stationarity condition y_i * (Σy)_i = 1 means that all assets have the same risk
+    contribution, so the ERC weights are equal to y / sum(y).
+
+    If the upper constraints are given, the assets which would exceed their constraints get the weights equal to
+    the constraints and the remaining (free) assets are given equal risk contributions. The weights x of the free
+    assets satisfy x_i * (Σ_FF x + c)_i = const, where c = Σ_FC w_C is the covariance with the capped part of
+    the portfolio. They are found by minimising 1/2 y'Σ_FF y + t * c'y - sum(log(y_i)), with x = y / t and t chosen
+    (with the safeguarded Newton's method) so that the weights sum up to 1.
+    """
+
+    max_iter = 100
+    tolerance = 1e-14
+
+    @classmethod
+    def get_weights(cls, cov_matrix: np.ndarray, upper_constraints: Union[float, Sequence[float]] = None,
+                    initial_weights: np.ndarray = None) -> np.ndarray:
+        """
+        Computes the weights of the Equal Risk Contribution portfolio.
+
+        Parameters
+        ----------
+        cov_matrix
+            covariance matrix of assets
+        upper_constraints
+            vector of upper limits of weights (if it's a single value, the constraint will be the same for each weight)
+        initial_weights
+            weights used as the starting point of the optimization (e.g. weights of the previous rebalance). By default
+            the weights proportional to the inverse volatilities of assets are used
+
+        Returns
+        -------
+        weights
+            weights of assets, which sum up to 1
+        """
+        cov_matrix = np.asarray(cov_matrix, dtype=float)
+        num_of_assets = cov_matrix.shape[0]
+
+        upper_constraints = prepare_upper_bounds_vector(num_of_assets, upper_constraints)
+        if upper_constraints is not None:
+            upper_constraints = np.broadcast_to(np.asarray(upper_constraints, dtype=float), (num_of_assets,))
+            assert upper_constraints.sum() >= 1, "The upper constraints should sum up to at least 1"
+
+        if initial_weights is None:
+            initial_weights = 1.0 / np.sqrt(np.diag(cov_matrix))
+        initial_weights = np.asarray(initial_weights, dtype=float)
+
+        weights = np.zeros(num_of_assets)
+        capped = np.zeros(num_of_assets, dtype=bool)
+
+        # Cap the assets exceeding their upper constraints one group at a time, until no constraint is violated
+        for _ in range(num_of_assets):
+            free = ~capped
+            if not free.any():
+                break
+
+            if upper_constraints is not None:
+                weights[capped] = upper_constraints[capped]
+            budget = 1.0 - weights[capped].sum()
+            if budget <= 0:
+                weights[free] = 0.0
+                break
+
+            linear_term = cov_matrix[np.ix_(free, capped)].dot(weights[capped])
+            weights[free] = cls._get_free_weights(
+                cov_matrix[np.ix_(free, free)], linear_term, budget, initial_weights[free])
+
+            if upper_constraints is None:
+                break
+
+            exceeding = free & (weights > upper_constraints + 1e-12)
+            if not exceeding.any():
+                break
+            capped |= exceeding
+
+        return weights
+
+    @classmethod
+    def _get_free_weights(cls, cov_matrix: np.ndarray, linear_term: np.ndarray, budget: float,
+                          initial_weights: np.ndarray) -> np.ndarray:
+        """
+        Finds the weights x (summing up to the budget) for which x_i * (Σx + c)_i is the same for all assets.
+        """
+        # Start from the initial weights scaled optimally for the problem without the linear term
+        initial_weights = np.maximum(initial_weights, 1e-12 * initial_weights.max())
+        scale = np.sqrt(len(initial_weights) / initial_weights.dot(cov_matrix.dot(initial_weights)))
+        y = cls._minimise_log_barrier(cov_matrix, np.zeros(len(initial_weights)), scale * initial_weights)
+
+        if not linear_term.any():
+            # Without the linear term the problem is scale invariant
+            return budget * y / y.sum()
+
+        # Find log(t), for which sum(y(t)) / t == budget. The sum decreases with t
+        log_t = np.log(y.sum() / budget)
+        lower_log_t, upper_log_t = -np.inf, np.inf
+
+        for _ in range(cls.max_iter):
+            t = np.exp(log_t)
+            y = cls._minimise_log_barrier(cov_matrix, t * linear_term, y)
+            difference = y.sum() / t - budget
+
+            if abs(difference) <= cls.tolerance * budget:
+                break
+
+            if difference > 0:
+                lower_log_t = log_t
+            else:
+                upper_log_t = log_t
+
+            # d(sum(y) / t) / d(log t) = sum(dy/dt) - sum(y) / t, where dy/dt = -H^(-1) c
+            hessian = cov_matrix + np.diag(1.0 / y ** 2)
+            derivative = -np.linalg.solve(hessian, linear_term).sum() - y.sum() / t
+            new_log_t = log_t - difference / derivative if derivative < 0 else np.nan
+
+            if not lower_log_t < new_log_t < upper_log_t:
+                # Fall back to the bisection (or to the expansion of the bracket)
+                if np.isfinite(lower_log_t) and np.isfinite(upper_log_t):
+                    new_log_t = (lower_log_t + upper_log_t) / 2
+                elif np.isfinite(lower_log_t):
+                    new_log_t = lower_log_t + 1.0
+                else:
+                    new_log_t = upper_log_t - 1.0
+            log_t = new_log_t
+        else:
+            cls._logger().warning("The sum of weights did not converge in {} iterations".format(cls.max_iter))
+
+        return y / t
+
+    @classmethod
+    def _minimise_log_barrier(cls, cov_matrix: np.ndarray, linear_term: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Minimises f(y) = 1/2 y'Σy + c'y - sum(log(y_i)) over y > 0 with the damped Newton's method, starting from y.
+        """
+        def func(y_values: np.ndarray) -> float:
+            return 0.5 * y_values.dot(cov_matrix.dot(y_values)) + linear_term.dot(y_values) - np.log(y_values).sum()
+
+        value = func(y)
+        for _ in range(cls.max_iter):
+            gradient, hessian = cls._gradient_and_hessian(cov_matrix, linear_term, y)
+            step = -np.linalg.solve(hessian, gradient)
+            newton_decrement = -gradient.dot(step)
+            if newton_decrement <= cls.tolerance:
+                break
+
+            # Limit the step so that y stays positive and backtrack until the function decreases sufficiently
+            negative = step < 0
+            alpha = min(1.0, 0.99 * np.min(-y[negative] / step[negative])) if negative.any() else 1.0
+            while True:
+                new_y = y + alpha * step
+                new_value = func(new_y)
+                if new_value <= value - 0.25 * alpha * newton_decrement or alpha < 1e-10:
+                    break
+                alpha *= 0.5
+
+            y, value = new_y, new_value
+        else:
+            cls._logger().warning("Newton's method did not converge in {} iterations".format(cls.max_iter))
+
+        return y
+
+    @classmethod
+    def _gradient_and_hessian(cls, cov_matrix: np.ndarray, linear_term: np.ndarray, y: np.ndarray) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        gradient = cov_matrix.dot(y) + linear_term - 1.0 / y
+        hessian = cov_matrix + np.diag(1.0 / y ** 2)
+        return gradient, hessian
+
+    @classmethod
+    def _logger(cls):
+        return qf_logger.getChild(cls.__name__)
@@ -27,8 +27,15 @@ class NonlinearFunctionOptimizer:
 
     @classmethod
     def get_weights(cls, minimised_func: Callable[[Sequence[float]], float], num_of_assets: int,
-                    upper_constraints: Union[float, Sequence[float]], max_iter: int = 10000) -> np.ndarray:
-        one_over_n_weights = np.array([1 / num_of_assets] * num_of_assets)
+                    upper_constraints: Union[float, Sequence[float]], max_iter: int = 10000,
+                    initial_weights: np.ndarray = None) -> np.ndarray:
+        """
+        Finds the weights minimising the given function, such that all weights are non-negative, do not exceed
+        the upper constraints and sum up to 1. The optimization starts from the initial_weights if they are given
+        (e.g. the optimal weights found for the previous rebalance) or from the one-over-n weights otherwise.
+        """
+        if initial_weights is None:
+            initial_weights = np.array([1 / num_of_assets] * num_of_assets)
         bounds = cls._get_bounds(num_of_assets, upper_constraints)
 
         def weights_sum_to_one_fun(weights):
@@ -46,7 +53,7 @@ class NonlinearFunctionOptimizer:
         }
 
         optimization_result = scipy.optimize.minimize(
-            fun=minimised_func, method='SLSQP', x0=one_over_n_weights, bounds=bounds,
+            fun=minimised_func, method='SLSQP', x0=initial_weights, bounds=bounds,
             constraints=weights_sum_up_to_one_constr, options=options)
         logger = qf_logger.getChild(cls.__name__)
         if optimization_result.success:
@@ -12,7 +12,8 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from typing import Union, Sequence
+from functools import lru_cache
+from typing import Union, Sequence, Optional, Tuple
 
 import numpy as np
 from cvxopt import matrix
@@ -35,7 +36,8 @@ class QuadraticOptimizer:
 
     @classmethod
     def get_optimal_weights(cls, P: np.ndarray = None, q: np.ndarray = None,
-                            upper_constraints: Union[Sequence, float] = None) -> np.ndarray:
+                            upper_constraints: Union[Sequence, float] = None,
+                            initial_weights: np.ndarray = None) -> np.ndarray:
         """
         Solves the problem defined by matrix h, vector f and constraints.
 
@@ -48,6 +50,9 @@ class QuadraticOptimizer:
         upper_constraints
             vector of upper limits of weights (if it's a single value, the constraint will be the same for each weight).
             Example: 0.5 means that max allocation of some asset can be 50%.
+        initial_weights
+            weights used as the starting point of the solver (e.g. the optimal weights of a similar problem solved
+            for the previous rebalance). If None, the solver computes the starting point itself.
 
         Returns
         -------
@@ -65,16 +70,35 @@ class QuadraticOptimizer:
         else:
             q = matrix(0.0, (assets_number, 1))
 
+        if upper_constraints is not None and not isinstance(upper_constraints, float):
+            upper_constraints = tuple(upper_constraints)
+        G, h, A, b = cls._get_constraints(assets_number, upper_constraints)
+
+        if initial_weights is not None:
+            initvals = {'x': matrix(np.asarray(initial_weights, dtype=float).reshape((-1, 1)))}
+        else:
+            initvals = matrix(1.0 / assets_number, (assets_number, 1))
+
+        # minimize (1/2)x'Px + q'x
+        # subject to Gx <= h; Ax = b
+        result = solvers.qp(P, q, G, h, A, b, initvals=initvals, options=cls.options)
+        return np.array(result['x']).squeeze()
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _get_constraints(assets_number: int, upper_constraints: Optional[Union[Tuple[float, ...], float]]) \
+            -> Tuple[matrix, matrix, matrix, matrix]:
+        """
+        Creates the constraints of the problem. The constraint matrices are not modified by the solver, so they are
+        cached and reused by the subsequent optimizations of the same size (e.g. in case of rolling rebalances).
+        """
         A, b = constr.sum_weights_equal_1_constraint(assets_number)
         G, h = constr.each_weight_greater_than_0_constraint(assets_number)
 
         if upper_constraints is not None:
+            if not isinstance(upper_constraints, float):
+                upper_constraints = list(upper_constraints)
             G_2, h_2 = constr.upper_bound_constraint(assets_number, upper_constraints)
             G, h = constr.merge_constraints(G, h, G_2, h_2)
 
-        initial_weights = matrix(1.0 / assets_number, (assets_number, 1))
-
-        # minimize (1/2)x'Px + q'x
-        # subject to Gx <= h; Ax = b
-        result = solvers.qp(P, q, G, h, A, b, initvals=initial_weights, options=cls.options)
-        return np.array(result['x']).squeeze()
+        return G, h, A, b
@@ -0,0 +1,142 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Callable, Optional, Sequence, Tuple, List, Mapping, Union
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dataframe.simple_returns_dataframe import SimpleReturnsDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.portfolio_construction.portfolio_models.portfolio import Portfolio
+
+PortfolioFactory = Callable[..., Portfolio]
+
+
+class RollingPortfolioOptimizer:
+    """
+    Solves a sequence of portfolio optimization problems, e.g. one for each rebalance of a walk-forward backtest.
+    Each problem is defined by the covariance matrix of assets. The problems are solved in the order of the rebalance
+    dates and each optimization is warm-started from the weights obtained for the previous rebalance (the optimal
+    weights of consecutive rebalances are usually very close to each other). Moreover, the constraint matrices of
+    the QuadraticOptimizer are built once and reused by all the optimizations of the same size.
+
+    If n_jobs > 1, the rebalance dates are split into n_jobs contiguous chunks, which are solved in separate processes
+    (only the first optimization of each chunk is not warm-started).
+
+    Parameters
+    ----------
+    portfolio_factory: Callable[..., Portfolio]
+        function creating the portfolio for the given covariance matrix, which is passed as the first argument, and
+        the initial weights, passed as the keyword argument initial_weights (None for the first rebalance), e.g.
+        functools.partial(MinVariancePortfolio, upper_constraint=0.1). The weights of the portfolio are computed
+        with Portfolio.get_weights(). If n_jobs > 1 the function needs to be picklable
+    n_jobs: int
+        number of processes used to solve the problems
+    """
+
+    def __init__(self, portfolio_factory: PortfolioFactory, n_jobs: int = 1):
+        self.portfolio_factory = portfolio_factory
+        self.n_jobs = n_jobs
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+    def get_weights(self, cov_matrices: Union[Mapping[datetime, QFDataFrame], Sequence[Tuple[datetime, QFDataFrame]]],
+                    initial_weights: QFSeries = None) -> QFDataFrame:
+        """
+        Computes the weights of the portfolio for each of the covariance matrices.
+
+        Parameters
+        ----------
+        cov_matrices: Mapping[datetime, QFDataFrame], Sequence[Tuple[datetime, QFDataFrame]]
+            covariance matrices of assets for each rebalance date. The set of assets may differ between the rebalances
+        initial_weights: QFSeries
+            weights used as the starting point of the first optimization (e.g. the current weights of the portfolio)
+
+        Returns
+        -------
+        QFDataFrame
+            weights of assets (columns) indexed by rebalance dates. Assets which were not included in the covariance
+            matrix for some date get NaN weight for that date
+        """
+        if isinstance(cov_matrices, Mapping):
+            cov_matrices = list(cov_matrices.items())
+        cov_matrices = sorted(cov_matrices, key=lambda date_and_cov_matrix: date_and_cov_matrix[0])
+        if not cov_matrices:
+            return QFDataFrame()
+
+        if self.n_jobs == 1:
+            weights_list = _optimize_sequence(self.portfolio_factory, cov_matrices, initial_weights)
+        else:
+            chunks = [chunk for chunk in np.array_split(np.arange(len(cov_matrices)), self.n_jobs) if len(chunk) > 0]
+            self.logger.info("Solving {} optimization problems in {} chunks".format(len(cov_matrices), len(chunks)))
+
+            chunks_weights = Parallel(n_jobs=self.n_jobs)(
+                delayed(_optimize_sequence)(self.portfolio_factory, [cov_matrices[i] for i in chunk],
+                                            initial_weights if chunk[0] == 0 else None)
+                for chunk in chunks)
+            weights_list = [weights for chunk_weights in chunks_weights for weights in chunk_weights]
+
+        dates = pd.DatetimeIndex([date for date, _ in cov_matrices], name=DATES)
+        return QFDataFrame(data=weights_list, index=dates)
+
+    def get_weights_for_returns(self, assets_returns: SimpleReturnsDataFrame, window_size: int, step: int = 1,
+                                initial_weights: QFSeries = None) -> QFDataFrame:
+        """
+        Computes the weights of the portfolio using the covariance matrices of the rolling windows of assets' returns.
+        The rebalance takes place at the last date of each window.
+
+        Parameters
+        ----------
+        assets_returns: SimpleReturnsDataFrame
+            simple returns of assets (columns) indexed by dates
+        window_size: int
+            number of returns used to estimate each covariance matrix
+        step: int
+            number of dates between consecutive rebalances
+        initial_weights: QFSeries
+            weights used as the starting point of the first optimization
+
+        Returns
+        -------
+        QFDataFrame
+            weights of assets (columns) indexed by rebalance dates
+        """
+        returns_values = assets_returns.values
+        assets = assets_returns.columns
+
+        cov_matrices = []
+        for window_end in range(window_size - 1, len(assets_returns), step):
+            window_values = returns_values[window_end - window_size + 1:window_end + 1]
+            cov_matrix = QFDataFrame(data=np.cov(window_values, rowvar=False), index=assets, columns=assets)
+            cov_matrices.append((assets_returns.index[window_end], cov_matrix))
+
+        return self.get_weights(cov_matrices, initial_weights)
+
+
+def _optimize_sequence(portfolio_factory: PortfolioFactory, cov_matrices: Sequence[Tuple[datetime, QFDataFrame]],
+                       initial_weights: Optional[QFSeries]) -> List[QFSeries]:
+    """ Solves the problems one by one, starting each optimization from the weights obtained for the previous one. """
+    weights_list = []
+    previous_weights = initial_weights
+
+    for _, cov_matrix in cov_matrices:
+        portfolio = portfolio_factory(cov_matrix, initial_weights=previous_weights)
+        previous_weights = portfolio.get_weights()
+        weights_list.append(previous_weights)
+
+    return weights_list
@@ -12,34 +12,66 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from enum import Enum
 from typing import Union, Sequence
 
 from qf_lib.common.timeseries_analysis.risk_contribution_analysis import RiskContributionAnalysis
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.portfolio_construction.optimizers.equal_risk_contribution_solver import EqualRiskContributionSolver
 from qf_lib.portfolio_construction.optimizers.nonlinear_function_optimizer import NonlinearFunctionOptimizer
 from qf_lib.portfolio_construction.portfolio_models.portfolio import Portfolio
 
 
+class EqualRiskContributionMethod(Enum):
+    """
+    Methods of computing the weights of the Equal Risk Contribution portfolio.
+    """
+
+    NONLINEAR_OPTIMIZER = "nonlinear_optimizer"
+    """Minimisation of the distance to the equal risk contributions with the NonlinearFunctionOptimizer (SLSQP)"""
+    NEWTON = "newton"
+    """Newton's method applied to the log-barrier formulation of the problem (see EqualRiskContributionSolver).
+    It is several orders of magnitude faster for large numbers of assets. If any upper constraint is binding,
+    the constrained assets get the weights equal to their constraints and the remaining assets get equal
+    risk contributions."""
+
+
 class EqualRiskContributionPortfolio(Portfolio):
-    """ Class used for constructing an ERC portfolio. """
+    """
+    Class used for constructing an ERC portfolio. The initial_weights (e.g. weights of the previous rebalance)
+    are used as the starting point of the optimization. The method defines how the weights are computed
+    (see EqualRiskContributionMethod).
+    """
 
-    def __init__(self, cov_matrix: QFDataFrame, upper_constraint: Union[float, Sequence[float]] = None):
+    def __init__(self, cov_matrix: QFDataFrame, upper_constraint: Union[float, Sequence[float]] = None,
+                 initial_weights: QFSeries = None,
+                 method: EqualRiskContributionMethod = EqualRiskContributionMethod.NONLINEAR_OPTIMIZER):
         self.cov_matrix = cov_matrix
         self.upper_constraint = upper_constraint
+        self.initial_weights = initial_weights
+        self.method = method
         self.max_iter = 10000  # maximal number of iterations during finding the solution
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
     def get_weights(self) -> QFSeries:
+        initial_weights = self._initial_weights_values(self.initial_weights, self.cov_matrix.columns)
+
+        if self.method == EqualRiskContributionMethod.NEWTON:
+            weights = EqualRiskContributionSolver.get_weights(
+                self.cov_matrix.values, self.upper_constraint, initial_weights)
+            return QFSeries(data=weights, index=self.cov_matrix.columns.copy())
+
         def minimised_func(weights_values: Sequence[float]):
             weights_series = QFSeries(data=weights_values, index=self.cov_matrix.columns)
             return RiskContributionAnalysis.get_distance_to_equal_risk_contrib(self.cov_matrix, weights_series)
 
         weights = NonlinearFunctionOptimizer.get_weights(
             minimised_func, max_iter=self.max_iter, upper_constraints=self.upper_constraint,
-            num_of_assets=self.cov_matrix.shape[1])
+            num_of_assets=self.cov_matrix.shape[1],
+            initial_weights=initial_weights)
         weights = QFSeries(data=weights, index=self.cov_matrix.columns.copy())
 
         if not RiskContributionAnalysis.is_equal_risk_contribution(self.cov_matrix, weights):
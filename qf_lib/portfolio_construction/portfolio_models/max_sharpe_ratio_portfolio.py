@@ -28,27 +28,32 @@ class MaxSharpeRatioPortfolio(Portfolio):
     """
     Class used for constructing a Max Sharpe Ratio portfolio.
     See: http://people.stat.sc.edu/sshen/events/backtesting/reference/maximizing%20the%20sharpe%20ratio.pdf
+
+    The initial_weights (e.g. weights of the previous rebalance) are used as the starting point of the optimizations.
     """
 
     def __init__(self, cov_matrix: QFDataFrame, mean_returns: QFSeries,
                  upper_constraint: Union[float, Sequence[float]] = None,
-                 risk_free_rate: float = 0.0, max_iter: int = 10000):
+                 risk_free_rate: float = 0.0, max_iter: int = 10000, initial_weights: QFSeries = None):
         self.cov_matrix = cov_matrix
         self.mean_returns = mean_returns
         self.upper_constraint = upper_constraint
         self.risk_free_rate = risk_free_rate
         self.max_iter = max_iter
+        self.initial_weights = initial_weights
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
     def get_weights(self) -> QFSeries:
         cov_matrix = self.cov_matrix.values
         mean_returns = self.mean_returns.values
+        initial_weights = self._initial_weights_values(self.initial_weights, self.cov_matrix.columns)
 
         def minimised_func(k: np.ndarray) -> float:
             k = k.squeeze()
             scaled_mean_returns = -k * mean_returns  # type: np.ndarray
-            weights = QuadraticOptimizer.get_optimal_weights(cov_matrix, scaled_mean_returns, self.upper_constraint)
+            weights = QuadraticOptimizer.get_optimal_weights(
+                cov_matrix, scaled_mean_returns, self.upper_constraint, initial_weights)
             weights = weights.reshape((-1, 1))  # make it vertical
             portfolio_excess_ret = (mean_returns - self.risk_free_rate).dot(weights)
             portfolio_vol = np.sqrt((weights.T.dot(cov_matrix)).dot(weights))  # sqrt(w'*E*w)
@@ -61,7 +66,8 @@ class MaxSharpeRatioPortfolio(Portfolio):
 
         k = self._find_scaling_factor_for_returns(minimised_func)
         scaled_mean_returns = -k * mean_returns
-        weights = QuadraticOptimizer.get_optimal_weights(cov_matrix, scaled_mean_returns, self.upper_constraint)
+        weights = QuadraticOptimizer.get_optimal_weights(
+            cov_matrix, scaled_mean_returns, self.upper_constraint, initial_weights)
         weights_series = QFSeries(data=weights, index=self.cov_matrix.columns)
 
         return weights_series
@@ -23,15 +23,20 @@ from qf_lib.portfolio_construction.portfolio_models.portfolio import Portfolio
 class MinVariancePortfolio(Portfolio):
     """
     Class used for constructing a min-variance portfolio (the one which is optimized considering it variance,
-    which is minimized).
+    which is minimized). The initial_weights (e.g. weights of the previous rebalance) are used as the starting point
+    of the optimization.
     """
 
-    def __init__(self, cov_matrix: QFDataFrame, upper_constraint: Union[float, Sequence[float]] = None):
+    def __init__(self, cov_matrix: QFDataFrame, upper_constraint: Union[float, Sequence[float]] = None,
+                 initial_weights: QFSeries = None):
         self.cov_matrix = cov_matrix
         self.upper_constraint = upper_constraint
+        self.initial_weights = initial_weights
 
     def get_weights(self) -> QFSeries:
         P = self.cov_matrix.values
-        weights = QuadraticOptimizer.get_optimal_weights(P, upper_constraints=self.upper_constraint)
+        initial_weights = self._initial_weights_values(self.initial_weights, self.cov_matrix.columns)
+        weights = QuadraticOptimizer.get_optimal_weights(P, upper_constraints=self.upper_constraint,
+                                                         initial_weights=initial_weights)
 
         return QFSeries(data=weights, index=self.cov_matrix.columns)
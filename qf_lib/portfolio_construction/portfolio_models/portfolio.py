@@ -13,7 +13,7 @@
 #     limitations under the License.
 
 import abc
-from typing import Tuple, Sequence
+from typing import Tuple, Sequence, Optional
 
 import numpy as np
 import pandas as pd
@@ -176,6 +176,23 @@ class Portfolio(metaclass=abc.ABCMeta):
 
         return portfolio_rets_tms
 
+    @classmethod
+    def _initial_weights_values(cls, initial_weights: Optional[QFSeries], assets: pd.Index) -> Optional[np.ndarray]:
+        """
+        Aligns the initial weights (the starting point of the optimization) with the given assets. Assets missing in
+        the initial weights get the weight equal to 0 and the weights are rescaled so that they sum up to 1.
+        Returns None if there are no initial weights or none of the assets has a positive initial weight.
+        """
+        if initial_weights is None:
+            return None
+
+        weights_values = initial_weights.reindex(assets).fillna(0.0).values.astype(float)
+        weights_sum = weights_values.sum()
+        if weights_sum <= 0:
+            return None
+
+        return weights_values / weights_sum
+
     @classmethod
     def one_over_n_weights(cls, tickers: Sequence[Ticker]) -> QFSeries:
         """
@@ -37,7 +37,7 @@ class RiskParityPortfolio(Portfolio):
 
     def get_weights(self) -> QFSeries:
         num_of_assets = len(self.assets_returns_df.columns)
-        volatilities = np.array([np.std(asset_tms) for _, asset_tms in self.assets_returns_df.iteritems()])
+        volatilities = self.assets_returns_df.std(axis=0, ddof=0).values
 
         weights = np.ones(num_of_assets) / volatilities
         weights /= weights.sum()
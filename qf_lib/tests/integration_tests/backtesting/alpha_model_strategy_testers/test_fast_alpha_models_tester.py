@@ -15,6 +15,7 @@
 import unittest
 from datetime import datetime
 from itertools import cycle, islice
+from typing import Sequence
 from unittest import TestCase
 
 import numpy as np
@@ -32,6 +33,7 @@ from qf_lib.backtesting.fast_alpha_model_tester.fast_alpha_models_tester import
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import QuandlTicker, Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
 from qf_lib.common.utils.dateutils.string_to_date import str_to_date
 from qf_lib.common.utils.dateutils.timer import SettableTimer
 from qf_lib.containers.qf_data_array import QFDataArray
@@ -172,6 +174,55 @@ class TestFastAlphaModelsTester(TestCase):
         ])
         assert_series_equal(expected_returns, second_elem.returns_tms)
 
+    def test_generate_trades_for_ticker(self):
+        params = [FastAlphaModelTesterConfig(self.alpha_model_type,
+                                             {"period_length": 5, "first_suggested_exposure": Exposure.SHORT,
+                                              "risk_estimation_factor": None},
+                                             ("period_length", "first_suggested_exposure"))]
+        tester = FastAlphaModelTester(params, self.tickers, self.test_start_date, self.test_end_date,
+                                      self.data_handler, self.timer)
+
+        prices_array = self._mocked_prices_arr.copy()
+        prices_array.loc[str_to_date("2015-01-08"), self.apple_ticker, PriceField.Open] = np.nan
+        open_prices = prices_array.loc[:, self.apple_ticker, PriceField.Open].to_series()
+
+        dates = pd.bdate_range(str_to_date("2015-01-02"), str_to_date("2015-01-14"))
+        exposures_tms = pd.Series([np.nan, 1, 1, -1, 0, -1, -1, 1, 1], index=dates)
+        trades = tester.generate_trades_for_ticker(prices_array, exposures_tms, self.apple_ticker)
+
+        # The exposure change on 2015-01-08 is skipped, as the Open price is missing. The last trade, opened on
+        # 2015-01-13, is never closed
+        expected_trades_data = [
+            (str_to_date("2015-01-05"), str_to_date("2015-01-07"), 1),
+            (str_to_date("2015-01-07"), str_to_date("2015-01-13"), -1)
+        ]
+        self.assertEqual(expected_trades_data, [(t.start_time, t.end_time, t.direction) for t in trades])
+        self.assertAlmostEqual(open_prices[str_to_date("2015-01-07")] / open_prices[str_to_date("2015-01-05")] - 1,
+                               trades[0].pnl)
+        self.assertAlmostEqual(1 - open_prices[str_to_date("2015-01-13")] / open_prices[str_to_date("2015-01-07")],
+                               trades[1].pnl)
+
+    def test_alpha_models_tester_with_exposures_history(self):
+        params = [FastAlphaModelTesterConfig(model_type,
+                                             {"period_length": 5, "first_suggested_exposure": Exposure.SHORT,
+                                              "risk_estimation_factor": None},
+                                             ("period_length", "first_suggested_exposure"))
+                  for model_type in (DummyAlphaModel, DummyAlphaModelWithExposuresHistory)]
+
+        self.assertFalse(DummyAlphaModel.supports_exposures_history())
+        self.assertTrue(DummyAlphaModelWithExposuresHistory.supports_exposures_history())
+
+        expected_summary = FastAlphaModelTester(params[:1], self.tickers, self.test_start_date, self.test_end_date,
+                                                self.data_handler, self.timer).test_alpha_models()
+        actual_summary = FastAlphaModelTester(params[1:], self.tickers, self.test_start_date, self.test_end_date,
+                                              self.data_handler, self.timer,
+                                              data_preloading_time_delta=RelativeDelta(days=7)).test_alpha_models()
+
+        for expected_elem, actual_elem in zip(expected_summary.elements_list, actual_summary.elements_list):
+            assert_series_equal(expected_elem.returns_tms, actual_elem.returns_tms)
+            self.assertEqual([(t.ticker, t.start_time, t.end_time, t.pnl, t.direction) for t in expected_elem.trades],
+                             [(t.ticker, t.start_time, t.end_time, t.pnl, t.direction) for t in actual_elem.trades])
+
 
 class DummyAlphaModel(AlphaModel):
     def __init__(self, period_length: int, first_suggested_exposure: Exposure,
@@ -206,5 +257,15 @@ class DummyAlphaModel(AlphaModel):
         return exposure
 
 
+class DummyAlphaModelWithExposuresHistory(DummyAlphaModel):
+    def calculate_exposures_history(self, tickers: Sequence[Ticker], dates: pd.DatetimeIndex, prices: QFDataArray,
+                                    frequency: Frequency) -> np.ndarray:
+        assert prices.dates.values[0] < np.datetime64(TestFastAlphaModelsTester.test_start_date)
+
+        exposures = QFSeries([exposure.value for exposure in self._exposures], index=self._exposures.index)
+        exposures = exposures.reindex(dates).ffill().fillna(Exposure.OUT.value)
+        return np.tile(exposures.values[:, np.newaxis], (1, len(tickers)))
+
+
 if __name__ == '__main__':
     unittest.main()
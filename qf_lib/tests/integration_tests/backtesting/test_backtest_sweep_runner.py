@@ -0,0 +1,119 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
+from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
+from qf_lib.backtesting.events.time_event.regular_time_event.calculate_and_place_orders_event import \
+    CalculateAndPlaceOrdersRegularEvent
+from qf_lib.backtesting.monitoring.backtest_monitor import BacktestMonitorSettings
+from qf_lib.backtesting.position_sizer.initial_risk_position_sizer import InitialRiskPositionSizer
+from qf_lib.backtesting.strategies.alpha_model_strategy import AlphaModelStrategy
+from qf_lib.backtesting.trading_session.backtest_sweep_runner import BacktestSweepRunner
+from qf_lib.backtesting.trading_session.backtest_trading_session import BacktestTradingSession
+from qf_lib.backtesting.trading_session.backtest_trading_session_builder import BacktestTradingSessionBuilder
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker, Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib.documents_utils.document_exporting.pdf_exporter import PDFExporter
+from qf_lib.documents_utils.excel.excel_exporter import ExcelExporter
+from qf_lib.settings import Settings
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_series_equal
+
+tickers = [BloombergTicker("AAPL US Equity"), BloombergTicker("MSFT US Equity")]
+start_date = str_to_date("2015-01-01")
+end_date = str_to_date("2015-02-28")
+
+
+class _MomentumAlphaModel(AlphaModel):
+    def __init__(self, window: int, risk_estimation_factor: float, data_provider):
+        super().__init__(risk_estimation_factor, data_provider)
+        self.window = window
+
+    def calculate_exposure(self, ticker: Ticker, current_exposure: Exposure, current_time: datetime,
+                           frequency: Frequency) -> Exposure:
+        prices = self.data_provider.historical_price(ticker, PriceField.Close, self.window)
+        return Exposure.LONG if prices.iloc[-1] > prices.iloc[0] else Exposure.SHORT
+
+
+def _create_session(data_provider, window: int, initial_risk: float) -> BacktestTradingSession:
+    session_builder = BacktestTradingSessionBuilder(data_provider, Mock(spec=Settings), Mock(spec=PDFExporter),
+                                                    Mock(spec=ExcelExporter))
+    session_builder.set_frequency(Frequency.DAILY)
+    session_builder.set_monitor_settings(BacktestMonitorSettings.no_stats())
+    session_builder.set_position_sizer(InitialRiskPositionSizer, initial_risk=initial_risk)
+    ts = session_builder.build(start_date, end_date)
+
+    model = _MomentumAlphaModel(window, 0.05, ts.data_handler)
+    strategy = AlphaModelStrategy(ts, {model: tickers}, use_stop_losses=False)
+    CalculateAndPlaceOrdersRegularEvent.set_daily_default_trigger_time()
+    CalculateAndPlaceOrdersRegularEvent.exclude_weekends()
+    strategy.subscribe(CalculateAndPlaceOrdersRegularEvent)
+    return ts
+
+
+def _number_of_transactions(ts: BacktestTradingSession) -> int:
+    return len(ts.backtest_result.transactions)
+
+
+class TestBacktestSweepRunner(TestCase):
+    def setUp(self):
+        data_start_date = start_date - RelativeDelta(months=2)
+        dates = pd.bdate_range(data_start_date, end_date)
+        rng = np.random.default_rng(2015)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(dates), len(tickers))), axis=0))
+        values = np.stack([close, close * 1.01, close * 0.99, close, np.full_like(close, 1e6)], axis=-1)
+        self.data = QFDataArray.create(dates, tickers, PriceField.ohlcv(), values)
+        self.data_provider = PresetDataProvider(self.data, data_start_date, end_date, Frequency.DAILY)
+
+        self.parameters_grid = {"window": [5, 10], "initial_risk": [0.01, 0.02]}
+
+    def test_sweep_results_are_equal_to_single_backtests(self):
+        runner = BacktestSweepRunner(_create_session, self.data_provider, tickers, start_date, end_date,
+                                     data_preloading_time_delta=RelativeDelta(months=2))
+        sweep_elements = runner.run(self.parameters_grid, _number_of_transactions)
+
+        self.assertEqual([{"window": 5, "initial_risk": 0.01}, {"window": 5, "initial_risk": 0.02},
+                          {"window": 10, "initial_risk": 0.01}, {"window": 10, "initial_risk": 0.02}],
+                         [element.parameters for element in sweep_elements])
+
+        for element in sweep_elements:
+            ts = _create_session(self.data_provider, **element.parameters)
+            ts.start_trading()
+
+            assert_series_equal(ts.portfolio.portfolio_eod_series(), element.portfolio_tms)
+            self.assertEqual(len(ts.backtest_result.transactions), element.result)
+            self.assertEqual(len(ts.backtest_result.transactions), len(element.transactions))
+
+    def test_parallel_sweep(self):
+        sequential_runner = BacktestSweepRunner(_create_session, self.data_provider, tickers, start_date, end_date,
+                                                data_preloading_time_delta=RelativeDelta(months=2))
+        parallel_runner = BacktestSweepRunner(_create_session, self.data_provider, tickers, start_date, end_date,
+                                              n_jobs=2, data_preloading_time_delta=RelativeDelta(months=2))
+
+        sequential_elements = sequential_runner.run(self.parameters_grid)
+        parallel_elements = parallel_runner.run(self.parameters_grid)
+
+        for sequential_element, parallel_element in zip(sequential_elements, parallel_elements):
+            self.assertEqual(sequential_element.parameters, parallel_element.parameters)
+            assert_series_equal(sequential_element.portfolio_tms, parallel_element.portfolio_tms)
@@ -0,0 +1,89 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from unittest import TestCase
+
+import numpy as np
+from pandas import bdate_range
+
+from qf_lib.analysis.backtests_overfitting.overfitting_analysis import OverfittingAnalysis
+from qf_lib.analysis.backtests_overfitting.ranking_functions import SharpeRatioRankingFunction, \
+    SortinoRatioRankingFunction, OmegaRatioRankingFunction, TotalReturnRankingFunction
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.containers.dataframe.simple_returns_dataframe import SimpleReturnsDataFrame
+
+
+class TestOverfittingAnalysis(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        np.random.seed(7)
+        num_of_strategies = 12
+        dates = bdate_range('2015-01-01', periods=405)
+        cls.returns_df = SimpleReturnsDataFrame(
+            data=np.random.normal(0.0003, 0.01, (len(dates), num_of_strategies)) + np.linspace(-2e-4, 2e-4, 12),
+            index=dates, columns=["Strategy {}".format(i) for i in range(num_of_strategies)])
+
+        cls.ranking_functions = [SharpeRatioRankingFunction(Frequency.DAILY),
+                                 SortinoRatioRankingFunction(Frequency.DAILY),
+                                 OmegaRatioRankingFunction(),
+                                 TotalReturnRankingFunction()]
+
+    def _analyses(self, ranking_function, **kwargs):
+        # Wrapping the ranking function in a lambda makes the analysis evaluate it on the IS and OOS data frames
+        expected_analysis = OverfittingAnalysis(self.returns_df, lambda tms: ranking_function(tms), num_of_slices=8)
+        actual_analysis = OverfittingAnalysis(self.returns_df, ranking_function, num_of_slices=8, **kwargs)
+        return expected_analysis, actual_analysis
+
+    def test_cscv_engine_equals_data_frames_based_analysis(self):
+        for ranking_function in self.ranking_functions:
+            expected_analysis, actual_analysis = self._analyses(ranking_function, chunk_size=16)
+
+            self.assertAlmostEqual(expected_analysis.calculate_overfitting_probability(),
+                                   actual_analysis.calculate_overfitting_probability(), places=10)
+            self.assertAlmostEqual(expected_analysis.calculate_probability_of_loss(),
+                                   actual_analysis.calculate_probability_of_loss(), places=10)
+            self.assertAlmostEqual(expected_analysis.calculate_expected_return(),
+                                   actual_analysis.calculate_expected_return(), places=10)
+            self.assertEqual(expected_analysis.best_is_strategies_names, actual_analysis.best_is_strategies_names)
+
+            self.assertTrue(np.allclose(expected_analysis.get_best_strategies_is_oos_qualities().values,
+                                        actual_analysis.get_best_strategies_is_oos_qualities().values))
+            self.assertTrue(np.allclose(expected_analysis.get_oos_median_qualities().values,
+                                        actual_analysis.get_oos_median_qualities().values))
+            self.assertTrue(np.allclose(expected_analysis.get_mean_oos_qualities().values,
+                                        actual_analysis.get_mean_oos_qualities().values))
+            self.assertTrue(np.allclose(expected_analysis.get_is_qualities_range(),
+                                        actual_analysis.get_is_qualities_range()))
+            self.assertTrue(np.allclose(expected_analysis.get_is_oos_qualities("Strategy 3").values,
+                                        actual_analysis.get_is_oos_qualities("Strategy 3").values))
+
+            other_strategies = ["Strategy 5"] * len(expected_analysis.best_is_strategies_names)
+            self.assertTrue(np.allclose(expected_analysis.calculate_relative_rank_logits(other_strategies).values,
+                                        actual_analysis.calculate_relative_rank_logits(other_strategies).values))
+
+    def test_parallel_cscv_engine(self):
+        ranking_function = SharpeRatioRankingFunction(Frequency.DAILY)
+        analysis = OverfittingAnalysis(self.returns_df, ranking_function, num_of_slices=8, chunk_size=10)
+        parallel_analysis = OverfittingAnalysis(self.returns_df, ranking_function, num_of_slices=8, chunk_size=10,
+                                                n_jobs=2)
+
+        self.assertAlmostEqual(analysis.calculate_overfitting_probability(),
+                               parallel_analysis.calculate_overfitting_probability(), places=10)
+        self.assertEqual(analysis.best_is_strategies_names, parallel_analysis.best_is_strategies_names)
+        self.assertTrue(np.allclose(analysis.get_mean_oos_qualities().values,
+                                    parallel_analysis.get_mean_oos_qualities().values))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from unittest import TestCase
+
+import numpy as np
+from pandas import date_range
+
+from qf_lib.analysis.timeseries_analysis.timeseries_statistics_engine import TimeseriesStatisticsEngine
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.miscellaneous.kelly import kelly
+from qf_lib.common.utils.ratios.calmar_ratio import calmar_ratio
+from qf_lib.common.utils.ratios.gain_to_pain_ratio import gain_to_pain_ratio
+from qf_lib.common.utils.ratios.omega_ratio import omega_ratio
+from qf_lib.common.utils.ratios.sharpe_ratio import sharpe_ratio
+from qf_lib.common.utils.ratios.sorino_ratio import sorino_ratio
+from qf_lib.common.utils.returns.avg_drawdown import avg_drawdown
+from qf_lib.common.utils.returns.avg_drawdown_duration import avg_drawdown_duration
+from qf_lib.common.utils.returns.cagr import cagr
+from qf_lib.common.utils.returns.cvar import cvar
+from qf_lib.common.utils.returns.max_drawdown import max_drawdown
+from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.containers.dataframe.simple_returns_dataframe import SimpleReturnsDataFrame
+
+
+class TestTimeseriesStatisticsEngine(TestCase):
+    def setUp(self):
+        np.random.seed(5)
+        self.frequency = Frequency.DAILY
+        self.returns_df = SimpleReturnsDataFrame(
+            data=np.random.normal(0.0003, 0.01, (500, 3)), index=date_range('2015-01-01', periods=500, freq='D'),
+            columns=["Strategy 1", "Strategy 2", "Strategy 3"])
+
+    def test_statistics_equal_to_functions(self):
+        engine = TimeseriesStatisticsEngine(self.frequency)
+        engine.update(self.returns_df)
+        statistics = engine.get_statistics()
+
+        for name, returns_tms in self.returns_df.iteritems():
+            prices_tms = returns_tms.to_prices()
+            expected_values = {
+                "total_return": returns_tms.total_cumulative_return(),
+                "cagr": cagr(returns_tms, self.frequency),
+                "annualised_vol": get_volatility(returns_tms, self.frequency),
+                "annualised_downside_vol": get_volatility(returns_tms[returns_tms < 0], self.frequency),
+                "sharpe_ratio": sharpe_ratio(returns_tms, self.frequency),
+                "omega_ratio": omega_ratio(returns_tms),
+                "calmar_ratio": calmar_ratio(returns_tms, self.frequency),
+                "gain_to_pain_ratio": gain_to_pain_ratio(returns_tms),
+                "sorino_ratio": sorino_ratio(returns_tms, self.frequency),
+                "cvar": cvar(returns_tms, 0.05),
+                "max_drawdown": max_drawdown(prices_tms),
+                "avg_drawdown": avg_drawdown(prices_tms),
+                "avg_drawdown_duration": avg_drawdown_duration(prices_tms),
+                "best_return": returns_tms.max(),
+                "worst_return": returns_tms.min(),
+                "kelly": kelly(returns_tms),
+                "skewness": returns_tms.skew(),
+                "kurtosis": returns_tms.kurt()
+            }
+
+            for statistic, expected_value in expected_values.items():
+                self.assertAlmostEqual(expected_value, statistics.loc[name, statistic], places=10,
+                                       msg="{} of {}".format(statistic, name))
+
+            self.assertEqual(returns_tms.index[0], statistics.loc[name, "start_date"])
+            self.assertEqual(returns_tms.index[-1], statistics.loc[name, "end_date"])
+
+    def test_incremental_updates_equal_batch_update(self):
+        batch_engine = TimeseriesStatisticsEngine(self.frequency)
+        batch_engine.update(self.returns_df)
+        expected_statistics = batch_engine.get_statistics()
+
+        engine = TimeseriesStatisticsEngine(self.frequency)
+        for start, end in [(0, 1), (1, 45), (45, 46), (46, 320), (320, 500)]:
+            engine.update(self.returns_df.iloc[start:end])
+            engine.get_statistics()
+        actual_statistics = engine.get_statistics()
+
+        self.assertTrue((expected_statistics.index == actual_statistics.index).all())
+        for statistic in TimeseriesStatisticsEngine.STATISTICS[2:]:
+            self.assertTrue(np.allclose(expected_statistics[statistic].values.astype(float),
+                                        actual_statistics[statistic].values.astype(float), rtol=1e-10, atol=1e-12),
+                            msg=statistic)
+
+    def test_update_with_past_dates_raises_error(self):
+        engine = TimeseriesStatisticsEngine(self.frequency)
+        engine.update(self.returns_df.iloc[:10])
+        with self.assertRaises(ValueError):
+            engine.update(self.returns_df.iloc[5:20])
+
+
+if __name__ == '__main__':
+    unittest.main()
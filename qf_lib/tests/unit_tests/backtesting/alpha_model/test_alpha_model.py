@@ -14,7 +14,8 @@
 import unittest
 from unittest.mock import patch, MagicMock, Mock
 
-from pandas import date_range
+import numpy as np
+from pandas import date_range, bdate_range
 
 from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
@@ -25,6 +26,8 @@ from qf_lib.common.tickers.tickers import BloombergTicker
 from qf_lib.common.utils.dateutils.string_to_date import str_to_date
 from qf_lib.common.utils.miscellaneous.average_true_range import average_true_range
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 
 
 @patch.multiple(AlphaModel, __abstractmethods__=set())
@@ -60,3 +63,61 @@ class TestAlphaModel(unittest.TestCase):
 
         expected_signal = Signal(self.ticker, Exposure.LONG, 3, Mock(), Mock(), alpha_model=alpha_model)
         self.assertEqual(signal, expected_signal)
+
+    def test_alpha_model__calculate_fractions_at_risk(self):
+        tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity"), BloombergTicker("C Equity")]
+        dates = bdate_range(str_to_date('2019-10-01'), self.end_time)
+        values = np.random.default_rng(5).uniform(10, 20, (len(dates), len(tickers), 3))
+        values[-5:-2, 0, :] = np.nan  # bars missing for one ticker
+        values[-8:-6, 1, 2] = np.nan  # close price missing for one ticker
+        values[:-10, 2, :] = np.nan  # not enough bars for one ticker
+        data = QFDataArray.create(dates, tickers, [PriceField.High, PriceField.Low, PriceField.Close], values)
+        data_provider = PresetDataProvider(data, dates[0], self.end_time, self.frequency)
+
+        alpha_model = AlphaModel(risk_estimation_factor=3, data_provider=data_provider)
+        fractions_at_risk = alpha_model.calculate_fractions_at_risk(tickers, self.end_time, self.frequency)
+
+        for ticker in tickers:
+            expected_fraction_at_risk = alpha_model.calculate_fraction_at_risk(ticker, self.end_time, self.frequency)
+            np.testing.assert_almost_equal(fractions_at_risk[ticker], expected_fraction_at_risk)
+        self.assertTrue(np.isnan(fractions_at_risk[tickers[2]]))
+
+    def test_alpha_model__calculate_fractions_at_risk_falls_back_to_single_tickers(self):
+        tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity")]
+        data_provider = MagicMock()
+        data_provider.get_price.side_effect = ValueError("Data not available")
+        prices_df = PricesDataFrame.from_records(data=[(6.0, 4.0, 5.0) for _ in range(10)],
+                                                 index=date_range(self.start_time, self.end_time),
+                                                 columns=[PriceField.High, PriceField.Low, PriceField.Close])
+        data_provider.historical_price.return_value = prices_df
+
+        alpha_model = AlphaModel(risk_estimation_factor=3, data_provider=data_provider)
+        fractions_at_risk = alpha_model.calculate_fractions_at_risk(tickers, self.end_time, self.frequency)
+
+        expected_fraction_at_risk = 3 * average_true_range(prices_df, normalized=True)
+        self.assertEqual(fractions_at_risk, {ticker: expected_fraction_at_risk for ticker in tickers})
+        self.assertEqual(data_provider.historical_price.call_count, len(tickers))
+
+    @patch.object(AlphaModel, 'calculate_fractions_at_risk')
+    def test_alpha_model__get_signals(self, calculate_fractions_at_risk):
+        other_ticker = BloombergTicker("Other Ticker")
+        calculate_fractions_at_risk.return_value = {self.ticker: 3, other_ticker: 2}
+        data_provider = MagicMock()
+
+        class BatchedAlphaModel(AlphaModel):
+            def calculate_exposures(self, tickers, current_exposures, current_time, frequency):
+                return {ticker: Exposure.LONG for ticker in tickers}
+
+        alpha_model = BatchedAlphaModel(risk_estimation_factor=4, data_provider=data_provider)
+        self.assertTrue(alpha_model.supports_batched_signals())
+        self.assertFalse(AlphaModel(risk_estimation_factor=4, data_provider=data_provider).supports_batched_signals())
+
+        signals = alpha_model.get_signals([self.ticker, other_ticker], {self.ticker: Exposure.OUT,
+                                                                        other_ticker: Exposure.SHORT},
+                                          self.end_time, self.frequency)
+
+        expected_signals = [Signal(self.ticker, Exposure.LONG, 3, Mock(), Mock(), alpha_model=alpha_model),
+                            Signal(other_ticker, Exposure.LONG, 2, Mock(), Mock(), alpha_model=alpha_model)]
+        self.assertEqual(signals, expected_signals)
+        data_provider.get_last_available_price.assert_called_once_with([self.ticker, other_ticker], self.frequency,
+                                                                       self.end_time)
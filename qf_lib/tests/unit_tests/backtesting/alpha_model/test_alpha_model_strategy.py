@@ -15,6 +15,7 @@ import unittest
 from typing import List
 from unittest.mock import patch, MagicMock, Mock
 
+from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.backtesting.strategies.alpha_model_strategy import AlphaModelStrategy
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
@@ -418,3 +419,27 @@ class TestAlphaModelStrategy(unittest.TestCase):
         expected_signals = [Signal(self.future_ticker, Exposure.OUT, 1, Mock(), Mock()),
                             Signal(BloombergTicker("Example Ticker"), Exposure.OUT, 1, Mock(), Mock())]
         self.assertCountEqual(signals, expected_signals)
+
+    def test__calculate_signals__batched_model(self):
+        """
+        Test if for the alpha models supporting batched signals generation, the signals for all tickers are generated
+        with one get_signals call, using the current exposures of all the tickers.
+        """
+        batched_alpha_model = MagicMock(spec=AlphaModel)
+        batched_alpha_model.supports_batched_signals.return_value = True
+        batched_alpha_model.get_signals.return_value = []
+        other_ticker = BloombergTicker("Other Ticker")
+
+        alpha_model_strategy = AlphaModelStrategy(self.ts, {batched_alpha_model: [self.ticker, other_ticker]},
+                                                  use_stop_losses=False)
+        self.positions_in_portfolio = [Mock(spec=BacktestPosition, **{
+            'ticker.return_value': BloombergTicker("Example Ticker", SecurityType.STOCK, 1),
+            'quantity.return_value': 10,
+            'start_time': str_to_date("2000-01-01")
+        })]
+        alpha_model_strategy.calculate_and_place_orders()
+
+        batched_alpha_model.get_signal.assert_not_called()
+        batched_alpha_model.get_signals.assert_called_once_with(
+            [self.ticker, other_ticker], {self.ticker: Exposure.LONG, other_ticker: Exposure.OUT}, self.ts.timer.now(),
+            Frequency.DAILY)
@@ -0,0 +1,112 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.data_handler.daily_data_handler import DailyDataHandler
+from qf_lib.backtesting.data_handler.intraday_data_handler import IntradayDataHandler
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.data_provider import DataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_series_equal, assert_dataframes_equal
+
+
+class TestHistoricalPriceCache(TestCase):
+    tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity")]
+    fields = PriceField.ohlcv()
+
+    @classmethod
+    def setUpClass(cls):
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+
+    def test_daily_historical_price_cache(self):
+        start_date = datetime(2021, 1, 1)
+        end_date = datetime(2021, 6, 30)
+        dates = pd.bdate_range(start_date, end_date)
+        data = self._create_data(dates)
+
+        timer = SettableTimer(datetime(2021, 3, 1))
+        data_handler = DailyDataHandler(self._create_data_provider(data, Frequency.DAILY), timer)
+        data_handler.use_data_bundle(self.tickers, self.fields, start_date, end_date, Frequency.DAILY)
+        preset_data_provider = PresetDataProvider(data, start_date, end_date, Frequency.DAILY)
+
+        for current_time in pd.date_range(datetime(2021, 3, 1, 13, 30), datetime(2021, 4, 30, 13, 30), freq="9H"):
+            timer.set_current_time(current_time)
+            end_date_without_look_ahead = data_handler._get_end_date_without_look_ahead(None, Frequency.DAILY)
+
+            for tickers, fields, nr_of_bars in [(self.tickers, self.fields, 10), (self.tickers[0], PriceField.Close, 21),
+                                                (self.tickers, PriceField.Close, 5), (self.tickers[1], self.fields, 3)]:
+                actual = data_handler.historical_price(tickers, fields, nr_of_bars)
+                expected = preset_data_provider.historical_price(tickers, fields, nr_of_bars,
+                                                                 end_date_without_look_ahead, Frequency.DAILY)
+                self._assert_equal(expected, actual)
+
+        self.assertEqual(len(data_handler._historical_price_cache), 4)
+
+    def test_intraday_historical_price_cache(self):
+        start_date = datetime(2021, 1, 4)
+        end_date = datetime(2021, 1, 8)
+        dates = pd.DatetimeIndex([d for day in pd.bdate_range(start_date, end_date) for d in pd.date_range(
+            day + RelativeDelta(hour=13, minute=30), day + RelativeDelta(hour=19, minute=59), freq="1min")])
+        data = self._create_data(dates)
+
+        timer = SettableTimer(datetime(2021, 1, 5, 13, 30))
+        data_handler = IntradayDataHandler(self._create_data_provider(data, Frequency.MIN_1), timer)
+        data_handler.use_data_bundle(self.tickers, self.fields, start_date, end_date, Frequency.MIN_1)
+        preset_data_provider = PresetDataProvider(data, start_date, end_date, Frequency.MIN_1)
+
+        for current_time in pd.date_range(datetime(2021, 1, 5, 13, 30), datetime(2021, 1, 6, 15, 30), freq="7min"):
+            timer.set_current_time(current_time)
+            end_date_without_look_ahead = data_handler._get_end_date_without_look_ahead(None, Frequency.MIN_1)
+
+            actual = data_handler.historical_price(self.tickers, self.fields, 30)
+            expected = preset_data_provider.historical_price(self.tickers, self.fields, 30,
+                                                             end_date_without_look_ahead, Frequency.MIN_1)
+            self._assert_equal(expected, actual)
+
+    def _create_data(self, dates: pd.DatetimeIndex) -> QFDataArray:
+        rng = np.random.default_rng(2021)
+        values = rng.uniform(20, 50, (len(dates), len(self.tickers), len(self.fields)))
+        values[10:14, 0, :] = np.nan
+        values[40:43, :, :] = np.nan
+        values[50, 1, 3] = np.nan
+        return QFDataArray.create(dates, self.tickers, self.fields, values)
+
+    @staticmethod
+    def _create_data_provider(data: QFDataArray, frequency: Frequency) -> DataProvider:
+        data_provider = Mock(spec=DataProvider)
+        data_provider.frequency = frequency
+        data_provider.get_price.return_value = data
+        return data_provider
+
+    def _assert_equal(self, expected, actual):
+        self.assertEqual(type(expected), type(actual))
+        if isinstance(expected, QFDataArray):
+            self.assertTrue(expected.equals(actual))
+        elif isinstance(expected, pd.DataFrame):
+            assert_dataframes_equal(expected, actual)
+        else:
+            assert_series_equal(expected, actual)
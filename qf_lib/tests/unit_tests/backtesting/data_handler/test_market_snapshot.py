@@ -0,0 +1,110 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_series_equal, assert_dataframes_equal
+
+
+class TestMarketSnapshot(TestCase):
+    tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity"), BloombergTicker("C Equity")]
+
+    def setUp(self):
+        self.start_date = datetime(2021, 1, 1)
+        self.end_date = datetime(2021, 3, 31)
+        dates = pd.bdate_range(self.start_date, self.end_date)
+        values = np.arange(len(dates) * len(self.tickers) * 5, dtype=np.float64).reshape(
+            (len(dates), len(self.tickers), 5))
+        self.data_provider = PresetDataProvider(QFDataArray.create(dates, self.tickers, PriceField.ohlcv(), values),
+                                                self.start_date, self.end_date, Frequency.DAILY)
+        self.data_provider.get_price = Mock(wraps=self.data_provider.get_price)
+
+        self.timer = SettableTimer(datetime(2021, 2, 1, 13, 30))
+        self.data_handler = Mock(spec=DataHandler)
+        self.data_handler.data_provider = self.data_provider
+        self.data_handler.get_last_available_price.side_effect = \
+            lambda tickers: self.data_provider.get_last_available_price(tickers, Frequency.DAILY, self.timer.now())
+
+        self.market_snapshot = MarketSnapshot(self.data_handler, self.timer)
+        self.open_positions = [self.tickers[2]]
+        self.market_snapshot.add_tickers_source(lambda: self.open_positions)
+
+    def test_get_bars(self):
+        date = datetime(2021, 2, 1)
+        bars = self.market_snapshot.get_bars([self.tickers[0]], date, Frequency.DAILY)
+        expected_bars = self.data_provider.get_price([self.tickers[0]], PriceField.ohlcv(), date, date)
+        assert_dataframes_equal(expected_bars, bars, check_names=False)
+
+        # The bars of the tickers from tickers sources were downloaded together with the requested ticker
+        bars = self.market_snapshot.get_bars([self.tickers[2], self.tickers[0]], date, Frequency.DAILY)
+        self.assertEqual(list(bars.index), [self.tickers[2], self.tickers[0]])
+        self.assertEqual(self.data_provider.get_price.call_count, 2)  # including the call for expected_bars
+
+    def test_uses_current_data_provider_of_data_handler(self):
+        date = datetime(2021, 2, 1)
+        expected_bars = self.data_provider.get_price(self.tickers, PriceField.ohlcv(), date, date)
+        self.data_provider.get_price.reset_mock()
+
+        # e.g. use_data_preloading replaces the data provider after the snapshot was created
+        new_data_provider = Mock()
+        new_data_provider.get_price.return_value = expected_bars
+        self.data_handler.data_provider = new_data_provider
+
+        bars = self.market_snapshot.get_bars([self.tickers[0]], date, Frequency.DAILY)
+        assert_series_equal(expected_bars.loc[self.tickers[0]], bars.loc[self.tickers[0]], check_names=False)
+        new_data_provider.get_price.assert_called_once()
+        self.data_provider.get_price.assert_not_called()
+
+    def test_refetch_for_new_tickers(self):
+        date = datetime(2021, 2, 1)
+        self.market_snapshot.get_bars([self.tickers[0]], date, Frequency.DAILY)
+        self.market_snapshot.get_bars([self.tickers[1]], date, Frequency.DAILY)
+        self.market_snapshot.get_bars(self.tickers, date, Frequency.DAILY)
+
+        self.assertEqual(self.data_provider.get_price.call_count, 2)
+        self.assertCountEqual(self.data_provider.get_price.call_args[0][0], self.tickers)
+
+    def test_cache_is_cleared_on_new_tick(self):
+        start_date = datetime(2021, 1, 1)
+        end_date = datetime(2021, 1, 29)
+        self.market_snapshot.get_history(self.tickers[:2], [PriceField.Close], start_date, end_date, Frequency.DAILY)
+        self.market_snapshot.get_history(self.tickers[:1], [PriceField.Close], start_date, end_date, Frequency.DAILY)
+        self.assertEqual(self.data_provider.get_price.call_count, 1)
+
+        self.timer.set_current_time(datetime(2021, 2, 1, 20, 0))
+        history = self.market_snapshot.get_history(self.tickers[:1], [PriceField.Close], start_date, end_date,
+                                                   Frequency.DAILY)
+        self.assertEqual(self.data_provider.get_price.call_count, 2)
+        self.assertEqual(list(history.tickers.values), self.tickers[:1])
+
+    def test_get_last_available_prices(self):
+        prices = self.market_snapshot.get_last_available_prices(self.tickers[:2])
+        expected_prices = self.data_provider.get_last_available_price(self.tickers[:2], Frequency.DAILY,
+                                                                      self.timer.now())
+        assert_series_equal(expected_prices, prices, check_names=False)
+
+        self.market_snapshot.get_last_available_prices(self.tickers[1:])
+        self.assertEqual(self.data_handler.get_last_available_price.call_count, 1)
@@ -0,0 +1,128 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from unittest import TestCase
+from unittest.mock import Mock
+
+from qf_lib.backtesting.events.time_event.heap_scheduler import HeapScheduler
+from qf_lib.backtesting.events.time_event.periodic_event.intraday_bar_event import IntradayBarEvent
+from qf_lib.backtesting.events.time_event.periodic_event.periodic_event import PeriodicEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.scheduler import Scheduler
+from qf_lib.backtesting.events.time_event.single_time_event.single_time_event import SingleTimeEvent
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class TestHeapScheduler(TestCase):
+    class PeriodicEvent15Minutes(PeriodicEvent):
+        frequency = Frequency.MIN_15
+        start_time = {"hour": 9, "minute": 45, "second": 0}
+        end_time = {"hour": 11, "minute": 15, "second": 0}
+
+        def notify(self, _) -> None:
+            pass
+
+    class _CustomSingleTimeEvent(SingleTimeEvent):
+        _datetimes_to_data = {}
+
+    @classmethod
+    def setUpClass(cls):
+        MarketOpenEvent.set_trigger_time({"hour": 9, "minute": 30, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 16, "minute": 0, "second": 0, "microsecond": 0})
+
+    def setUp(self):
+        self._CustomSingleTimeEvent.clear()
+        for date_time in [datetime(2021, 3, 2, 10, 0), datetime(2021, 3, 2, 12, 17), datetime(2021, 3, 3, 16, 0)]:
+            self._CustomSingleTimeEvent.schedule_new_event(date_time, None)
+
+    def test_heap_scheduler_returns_the_same_events_as_scheduler(self):
+        start_date = datetime(2021, 3, 1, 8, 0)
+        end_date = datetime(2021, 3, 3)
+
+        for heap_scheduler_end_date in [None, end_date]:
+            self.setUp()
+            expected = self._walk(Scheduler(SettableTimer(start_date)), end_date)
+            self.setUp()
+            actual = self._walk(HeapScheduler(SettableTimer(start_date), heap_scheduler_end_date), end_date)
+            self.assertEqual(expected, actual)
+
+    def test_time_moved_backwards(self):
+        timer = SettableTimer(datetime(2021, 3, 2, 12, 0))
+        scheduler = HeapScheduler(timer, datetime(2021, 3, 5))
+        scheduler.subscribe(MarketOpenEvent, Mock())
+        scheduler.subscribe(MarketCloseEvent, Mock())
+
+        events, time = scheduler.get_next_time_events()
+        self.assertEqual(datetime(2021, 3, 2, 16, 0), time)
+        self.assertEqual([MarketCloseEvent], [type(event) for event in events])
+
+        timer.set_current_time(datetime(2021, 3, 1, 8, 0))
+        events, time = scheduler.get_next_time_events()
+        self.assertEqual(datetime(2021, 3, 1, 9, 30), time)
+        self.assertEqual([MarketOpenEvent], [type(event) for event in events])
+
+    def test_trigger_calendar(self):
+        scheduler = HeapScheduler(SettableTimer(datetime(2021, 3, 1)))
+        scheduler.subscribe(MarketOpenEvent, Mock())
+        scheduler.subscribe(self.PeriodicEvent15Minutes, Mock())
+        scheduler.subscribe(self._CustomSingleTimeEvent, Mock())
+
+        calendar = scheduler.trigger_calendar(datetime(2021, 3, 5, 9, 30), datetime(2021, 3, 6, 10, 0))
+        expected_calendar = [
+            datetime(2021, 3, 5, 9, 30), datetime(2021, 3, 5, 9, 45), datetime(2021, 3, 5, 10, 0),
+            datetime(2021, 3, 5, 10, 15), datetime(2021, 3, 5, 10, 30), datetime(2021, 3, 5, 10, 45),
+            datetime(2021, 3, 5, 11, 0), datetime(2021, 3, 5, 11, 15),
+            datetime(2021, 3, 6, 9, 30), datetime(2021, 3, 6, 9, 45), datetime(2021, 3, 6, 10, 0)
+        ]
+        self.assertEqual(expected_calendar, list(calendar.to_pydatetime()))
+
+    def test_trigger_calendar_start_date_is_not_a_trigger_time(self):
+        scheduler = HeapScheduler(SettableTimer(datetime(2021, 3, 1)))
+        scheduler.subscribe(MarketOpenEvent, Mock())
+        scheduler.subscribe(MarketCloseEvent, Mock())
+
+        calendar = scheduler.trigger_calendar(datetime(2021, 3, 4, 15, 0), datetime(2021, 3, 5, 12, 0))
+        expected_calendar = [datetime(2021, 3, 4, 16, 0), datetime(2021, 3, 5, 9, 30)]
+        self.assertEqual(expected_calendar, list(calendar.to_pydatetime()))
+
+    def test_heap_scheduler_started_between_trigger_times(self):
+        start_date = datetime(2021, 3, 1, 15, 0)
+        end_date = datetime(2021, 3, 3)
+
+        expected = self._walk(Scheduler(SettableTimer(start_date)), end_date)
+        self.setUp()
+        actual = self._walk(HeapScheduler(SettableTimer(start_date), end_date), end_date)
+        self.assertEqual(expected, actual)
+        self.assertNotIn(start_date, [time for time, _ in actual])
+
+    def _walk(self, scheduler: Scheduler, end_date: datetime):
+        for event_type in [self._CustomSingleTimeEvent, MarketCloseEvent, IntradayBarEvent, MarketOpenEvent,
+                           self.PeriodicEvent15Minutes]:
+            scheduler.subscribe(event_type, Mock())
+
+        result = []
+        time = scheduler.timer.now()
+        while time < end_date:
+            events, time = scheduler.get_next_time_events()
+            result.append((time, [type(event) for event in events]))
+            scheduler.timer.set_current_time(time)
+
+        return result
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from unittest.mock import Mock
+
+import numpy as np
+
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.portfolio.array_portfolio import ArrayPortfolio
+from qf_lib.backtesting.portfolio.backtest_position import BacktestPositionSummary
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.enums.security_type import SecurityType
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.tests.unit_tests.backtesting.portfolio import test_portfolio
+from qf_lib.tests.unit_tests.backtesting.portfolio.dummy_ticker import DummyTicker
+
+
+class TestArrayPortfolioAsPortfolio(test_portfolio.TestPortfolio):
+    """ Runs all the tests of the Portfolio using the ArrayPortfolio. """
+
+    def get_portfolio_and_data_handler(self):
+        portfolio, data_handler, timer = super().get_portfolio_and_data_handler()
+        return ArrayPortfolio(data_handler, self.initial_cash, timer, initial_capacity=2), data_handler, timer
+
+
+class TestArrayPortfolio(unittest.TestCase):
+
+    def setUp(self):
+        self.tickers = [DummyTicker("A{} Equity".format(i)) for i in range(20)] + \
+                       [DummyTicker("F{} Comdty".format(i), SecurityType.FUTURE, 50) for i in range(20)]
+        self.rng = np.random.default_rng(2021)
+        self.prices = None
+
+    def test_array_portfolio_matches_portfolio(self):
+        timer = SettableTimer(np.datetime64("2020-01-01").item())
+        data_handler = Mock(spec=DataHandler)
+        data_handler.get_last_available_price.side_effect = lambda tickers: self.prices[tickers]
+
+        portfolio = Portfolio(data_handler, 1000000, timer)
+        array_portfolio = ArrayPortfolio(data_handler, 1000000, timer, initial_capacity=3)
+
+        for _ in range(60):
+            timer.set_current_time(timer.now() + RelativeDelta(days=1))
+            values = self.rng.uniform(50, 150, len(self.tickers))
+            values[self.rng.uniform(size=len(self.tickers)) < 0.1] = np.nan
+            self.prices = QFSeries(data=values, index=self.tickers)
+
+            for ticker in self.rng.choice(self.tickers, 8, replace=False):
+                position = portfolio.open_positions_dict.get(ticker)
+                if position is not None and self.rng.uniform() < 0.3:
+                    quantity = -position.quantity()  # close the position
+                else:
+                    quantity = int(self.rng.integers(-100, 100)) or 1
+                transaction = Transaction(timer.now(), ticker, quantity, self.rng.uniform(50, 150),
+                                          self.rng.uniform(0, 5))
+                portfolio.transact_transaction(transaction)
+                array_portfolio.transact_transaction(transaction)
+
+            portfolio.update(record=True)
+            array_portfolio.update(record=True)
+
+            self.assertEqual(portfolio.net_liquidation, array_portfolio.net_liquidation)
+            self.assertEqual(portfolio.gross_exposure_of_positions, array_portfolio.gross_exposure_of_positions)
+            self.assertEqual(portfolio.current_cash, array_portfolio.current_cash)
+            for ticker, position in portfolio.open_positions_dict.items():
+                self.assertEqual(position.current_price, array_portfolio.open_positions_dict[ticker].current_price)
+
+        self.assertEqual(portfolio.portfolio_eod_series().tolist(), array_portfolio.portfolio_eod_series().tolist())
+        self.assertEqual(portfolio.leverage_series().tolist(), array_portfolio.leverage_series().tolist())
+
+        expected_history = portfolio.positions_history()
+        actual_history = array_portfolio.positions_history()
+        self.assertCountEqual(expected_history.columns, actual_history.columns)
+        self.assertTrue(expected_history.index.equals(actual_history.index))
+
+        actual_history = actual_history[expected_history.columns]
+        for attribute in ["ticker", "total_exposure", "market_values", "total_pnl", "direction"]:
+            expected_values = expected_history.applymap(
+                lambda s: getattr(s, attribute) if isinstance(s, BacktestPositionSummary) else None)
+            actual_values = actual_history.applymap(
+                lambda s: getattr(s, attribute) if isinstance(s, BacktestPositionSummary) else None)
+            self.assertTrue(expected_values.equals(actual_values), attribute)
+
+        total_exposure = array_portfolio.positions_values_history("total_exposure")[expected_history.columns]
+        expected_total_exposure = expected_history.applymap(
+            lambda s: s.total_exposure if isinstance(s, BacktestPositionSummary) else np.nan)
+        self.assertTrue(np.array_equal(expected_total_exposure.values.astype(float), total_exposure.values,
+                                       equal_nan=True))
+
+    def test_empty_positions_history(self):
+        timer = SettableTimer(np.datetime64("2020-01-01").item())
+        portfolio = ArrayPortfolio(Mock(spec=DataHandler), 1000, timer)
+        portfolio.update(record=True)
+
+        positions_history = portfolio.positions_history()
+        self.assertEqual(positions_history.shape, (1, 0))
+        self.assertEqual(portfolio.portfolio_eod_series().tolist(), [1000])
+
+        with self.assertRaises(ValueError):
+            portfolio.positions_values_history("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
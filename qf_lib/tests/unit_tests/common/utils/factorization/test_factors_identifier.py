@@ -15,6 +15,9 @@
 import unittest
 from unittest import TestCase
 
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
 from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_dataframes_equal
 from qf_lib.tests.unit_tests.common.utils.factorization.factorization_test_utils import get_analysed_tms_and_regressors
 
@@ -38,6 +41,43 @@ class TestFactorsIdentifier(TestCase):
 
         assert_dataframes_equal(expected_df, actual_df)
 
+    def test_stepwise_factors_identification_equals_refitting_regressions(self):
+        random_state = np.random.RandomState(3)
+        regressors_df = self.regressors_df.copy()
+        for i in range(30):
+            regressors_df["x{}".format(i)] = random_state.normal(0.0, 0.02, regressors_df.num_of_rows)
+        regressors_df["x30"] = regressors_df["x0"] - regressors_df["x1"]  # linearly dependent column
+        analysed_tms = self.analysed_tms + 0.3 * regressors_df["x0"] - 0.5 * regressors_df["x1"] + \
+            0.2 * regressors_df["x2"]
+
+        for is_intercept in (True, False):
+            identifier = StepwiseFactorsIdentifier(is_intercept=is_intercept, epsilon=0.002)
+            actual_df = identifier.select_best_factors(regressors_df, analysed_tms)
+            expected_columns = self._select_by_refitting_regressions(regressors_df, analysed_tms, is_intercept, 0.002)
+
+            self.assertCountEqual(expected_columns, actual_df.columns)
+
+    @staticmethod
+    def _select_by_refitting_regressions(regressors_df, analysed_tms, is_intercept, epsilon):
+        linear_regression = LinearRegression(fit_intercept=is_intercept)
+        selected_columns = []
+        current_score = 0.0
+
+        while len(selected_columns) < regressors_df.num_of_columns:
+            scores = {}
+            for candidate in regressors_df.columns.difference(selected_columns):
+                used_regressors = regressors_df.loc[:, [candidate] + selected_columns]
+                scores[candidate] = linear_regression.fit(used_regressors, analysed_tms).score(
+                    used_regressors, analysed_tms)
+
+            best_candidate = max(scores, key=scores.get)
+            if scores[best_candidate] - current_score < epsilon:
+                break
+            selected_columns.append(best_candidate)
+            current_score = scores[best_candidate]
+
+        return selected_columns
+
     def test_enet_factors_identification(self):
         enet_factors_identifier = ElasticNetFactorsIdentifier(max_number_of_regressors=10)
         actual_df = enet_factors_identifier.select_best_factors(self.regressors_df, self.analysed_tms)
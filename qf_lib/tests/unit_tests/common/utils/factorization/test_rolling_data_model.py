@@ -0,0 +1,49 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from unittest import TestCase
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.factorization.data_models.data_model_input import DataModelInput
+from qf_lib.common.utils.factorization.data_models.rolling_data_model import RollingDataModel
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_dataframes_equal, assert_series_equal
+from qf_lib.tests.unit_tests.common.utils.factorization.factorization_test_utils import get_analysed_tms_and_regressors
+
+
+class TestRollingDataModel(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        analysed_tms, regressors_df = get_analysed_tms_and_regressors()
+        cls.model_input = DataModelInput(regressors_df.loc[:, ['a', 'b']], analysed_tms, Frequency.DAILY,
+                                         is_fit_intercept=True)
+
+    def test_parallel_setup(self):
+        rolling_model = RollingDataModel(self.model_input)
+        rolling_model.setup(window_size=250, step=100)
+
+        parallel_rolling_model = RollingDataModel(self.model_input, n_jobs=3)
+        parallel_rolling_model.setup(window_size=250, step=100)
+
+        # windows are walked backwards from the end of the analysed timeseries
+        expected_ref_dates = self.model_input.analysed_tms.index[-1::-100][:8]
+        self.assertEqual(list(expected_ref_dates), list(parallel_rolling_model.coefficients_df.index))
+
+        assert_dataframes_equal(rolling_model.coefficients_df, parallel_rolling_model.coefficients_df)
+        assert_dataframes_equal(rolling_model.p_values_df, parallel_rolling_model.p_values_df)
+        assert_dataframes_equal(rolling_model.correlations_df, parallel_rolling_model.correlations_df)
+        assert_series_equal(rolling_model.r_squared_tms, parallel_rolling_model.r_squared_tms)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from unittest import TestCase
+
+import numpy as np
+from pandas import bdate_range
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.ratios.sharpe_ratio import sharpe_ratio
+from qf_lib.common.utils.returns.beta_and_alpha import beta_and_alpha
+from qf_lib.common.utils.returns.max_drawdown import max_drawdown
+from qf_lib.common.utils.returns.rolling_metrics import TotalCumulativeReturnMetric, VolatilityMetric, \
+    SharpeRatioMetric, MaxDrawdownMetric, BetaMetric, AlphaMetric
+from qf_lib.common.utils.volatility.get_volatility import get_volatility
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_series_equal, assert_dataframes_equal
+
+
+class TestRollingMetrics(TestCase):
+    def setUp(self):
+        np.random.seed(5)
+        dates = bdate_range('2015-01-01', periods=300)
+        self.simple_returns_tms = SimpleReturnsSeries(data=np.random.normal(0.0005, 0.01, 300), index=dates)
+        self.benchmark_returns_tms = SimpleReturnsSeries(
+            data=0.5 * self.simple_returns_tms.values + np.random.normal(0.0, 0.005, 300), index=dates)
+
+        self.prices_tms = self.simple_returns_tms.to_prices(initial_price=100.0)
+        self.log_returns_tms = self.simple_returns_tms.to_log_returns()
+        self.series_list = [self.prices_tms, self.simple_returns_tms, self.log_returns_tms]
+
+    def _assert_same_as_for_each_window(self, metric, func, window_size=20):
+        for tms in self.series_list:
+            for step in (1, 7):
+                expected_series = tms.rolling_window(window_size, func, step)
+                actual_series = tms.rolling_window(window_size, metric, step)
+                assert_series_equal(expected_series, actual_series, check_names=False, absolute_tolerance=1e-10)
+
+    def test_total_cumulative_return(self):
+        self._assert_same_as_for_each_window(TotalCumulativeReturnMetric(), lambda x: x.total_cumulative_return())
+
+    def test_volatility(self):
+        self._assert_same_as_for_each_window(
+            VolatilityMetric(Frequency.DAILY), lambda x: get_volatility(x, Frequency.DAILY))
+        self._assert_same_as_for_each_window(
+            VolatilityMetric(annualise=False), lambda x: get_volatility(x, annualise=False), window_size=3)
+
+    def test_sharpe_ratio(self):
+        self._assert_same_as_for_each_window(
+            SharpeRatioMetric(Frequency.DAILY, 0.01), lambda x: sharpe_ratio(x, Frequency.DAILY, 0.01))
+
+    def test_max_drawdown(self):
+        self._assert_same_as_for_each_window(MaxDrawdownMetric(), max_drawdown, window_size=60)
+
+    def test_beta_and_alpha(self):
+        benchmarks = [self.benchmark_returns_tms.to_prices(), self.benchmark_returns_tms]
+        for tms in self.series_list[:2]:
+            for benchmark_tms in benchmarks:
+                for step in (1, 7):
+                    expected_beta = tms.rolling_window_with_benchmark(
+                        benchmark_tms, 20, lambda x, y: beta_and_alpha(type(tms)(x), type(benchmark_tms)(y))[0], step)
+                    expected_alpha = tms.rolling_window_with_benchmark(
+                        benchmark_tms, 20, lambda x, y: beta_and_alpha(type(tms)(x), type(benchmark_tms)(y))[1], step)
+
+                    actual_beta = tms.rolling_window_with_benchmark(benchmark_tms, 20, BetaMetric(), step)
+                    actual_alpha = tms.rolling_window_with_benchmark(benchmark_tms, 20, AlphaMetric(), step)
+
+                    assert_series_equal(expected_beta, actual_beta, check_names=False, absolute_tolerance=1e-10)
+                    assert_series_equal(expected_alpha, actual_alpha, check_names=False, absolute_tolerance=1e-10)
+
+    def test_series_type(self):
+        qf_series = QFSeries(self.simple_returns_tms)
+        metric = TotalCumulativeReturnMetric(series_type=SimpleReturnsSeries)
+
+        expected_series = self.simple_returns_tms.rolling_window(20, lambda x: x.total_cumulative_return(), 5)
+        actual_series = qf_series.rolling_window(20, metric, 5)
+        assert_series_equal(expected_series, actual_series, check_names=False, absolute_tolerance=1e-10)
+        self.assertAlmostEqual(expected_series.iloc[0], metric(qf_series.iloc[:20]))
+
+    def test_series_with_nans(self):
+        prices_tms = self.prices_tms.copy()
+        prices_tms.iloc[50] = np.nan
+        expected_series = prices_tms.rolling_window(20, lambda x: x.total_cumulative_return(), 3)
+        actual_series = prices_tms.rolling_window(20, TotalCumulativeReturnMetric(), 3)
+        assert_series_equal(expected_series, actual_series, check_names=False)
+
+    def test_dataframe_rolling_window(self):
+        prices_df = PricesDataFrame({"A": self.prices_tms, "B": self.benchmark_returns_tms.to_prices().iloc[1:]})
+        expected_df = prices_df.rolling_window(30, lambda x: get_volatility(x, Frequency.DAILY), 4)
+        actual_df = prices_df.rolling_window(30, VolatilityMetric(Frequency.DAILY), 4)
+        assert_dataframes_equal(expected_df, actual_df, check_names=False, absolute_tolerance=1e-10)
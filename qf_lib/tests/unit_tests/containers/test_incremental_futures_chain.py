@@ -0,0 +1,110 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+
+import numpy as np
+from pandas import date_range
+
+from qf_lib.common.enums.expiration_date_field import ExpirationDateField
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.enums.security_type import SecurityType
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.futures.future_tickers.bloomberg_future_ticker import BloombergFutureTicker
+from qf_lib.containers.futures.futures_adjustment_method import FuturesAdjustmentMethod
+from qf_lib.containers.futures.futures_chain import FuturesChain
+from qf_lib.containers.futures.incremental_futures_chain import IncrementalFuturesChain
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_dataframes_equal, assert_series_equal
+
+
+class TestIncrementalFuturesChain(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.future_ticker = BloombergFutureTicker("Example", "EX{} Example", 1, 1, 10)
+        self.tickers = [BloombergTicker("EXZ1 Example", SecurityType.FUTURE, 10),
+                        BloombergTicker("EXH2 Example", SecurityType.FUTURE, 10),
+                        BloombergTicker("EXM2 Example", SecurityType.FUTURE, 10)]
+        # The contract, which expired before the start date, is necessary for the future ticker to find the valid
+        # ticker on the first dates of the tests
+        expired_ticker = BloombergTicker("EXU1 Example", SecurityType.FUTURE, 10)
+        exp_dates = {
+            self.future_ticker: QFDataFrame(index=[expired_ticker] + self.tickers,
+                                            columns=[ExpirationDateField.LastTradeableDate],
+                                            data=[str_to_date("2021-09-20"), str_to_date("2021-12-20"),
+                                                  str_to_date("2021-12-24"), str_to_date("2022-03-20")])
+        }
+        self.start_date = str_to_date("2021-12-15")
+        self.end_date = str_to_date("2021-12-28")
+
+        dates = date_range(self.start_date, self.end_date)
+        # The prices of each contract grow by 1 each day and the consecutive contracts are shifted by 100
+        prices = np.arange(len(dates))[:, np.newaxis, np.newaxis] + \
+            100.0 * np.arange(len(self.tickers))[np.newaxis, :, np.newaxis] + \
+            np.array([0.0, 0.5, -0.5, 0.2, 1000.0])[np.newaxis, np.newaxis, :]
+        self.data_array = QFDataArray.create(dates, self.tickers, PriceField.ohlcv(), data=prices)
+        self.data_provider = PresetDataProvider(self.data_array, self.start_date, self.end_date, Frequency.DAILY,
+                                                exp_dates)
+        self.timer = SettableTimer()
+        self.future_ticker.initialize_data_provider(self.timer, self.data_provider)
+
+    def test_incremental_chain_equals_futures_chain(self):
+        for method in (FuturesAdjustmentMethod.NTH_NEAREST, FuturesAdjustmentMethod.BACK_ADJUSTED):
+            incremental_chain = IncrementalFuturesChain(self.future_ticker, self.data_provider, method)
+
+            # FuturesChain computes the back adjustment only if the end date is not earlier than the first roll date
+            for end_date in date_range(str_to_date("2021-12-20"), self.end_date):
+                self.timer.set_current_time(end_date)
+                prices = incremental_chain.get_price(PriceField.ohlcv(), self.start_date, end_date)
+
+                expected_prices = FuturesChain(self.future_ticker, self.data_provider, method).get_price(
+                    PriceField.ohlcv(), self.start_date, end_date)
+                assert_dataframes_equal(expected_prices, prices, check_names=False)
+
+    def test_single_field_and_shorter_range(self):
+        incremental_chain = IncrementalFuturesChain(self.future_ticker, self.data_provider,
+                                                    FuturesAdjustmentMethod.BACK_ADJUSTED)
+        self.timer.set_current_time(str_to_date("2021-12-18"))
+        incremental_chain.get_price(PriceField.ohlcv(), self.start_date, self.timer.now())
+
+        self.timer.set_current_time(str_to_date("2021-12-26"))
+        start_date = str_to_date("2021-12-19")
+        prices = incremental_chain.get_price(PriceField.Close, start_date, self.timer.now())
+
+        expected_prices = FuturesChain(self.future_ticker, self.data_provider, FuturesAdjustmentMethod.BACK_ADJUSTED) \
+            .get_price(PriceField.Close, self.start_date, self.timer.now()).loc[start_date:]
+        assert_series_equal(expected_prices, prices, check_names=False)
+
+    def test_segments(self):
+        incremental_chain = IncrementalFuturesChain(self.future_ticker, self.data_provider,
+                                                    FuturesAdjustmentMethod.BACK_ADJUSTED)
+        self.timer.set_current_time(str_to_date("2021-12-18"))
+        incremental_chain.get_price(PriceField.ohlcv(), self.start_date, self.timer.now())
+        self.assertEqual(list(incremental_chain.segments.values), self.tickers[:1])
+
+        self.timer.set_current_time(str_to_date("2021-12-27"))
+        incremental_chain.get_price(PriceField.ohlcv(), self.start_date, self.timer.now())
+        segments = incremental_chain.segments
+        self.assertEqual(list(segments.values), self.tickers)
+        self.assertEqual(list(segments.index.left), [self.start_date, str_to_date("2021-12-20"),
+                                                     str_to_date("2021-12-24")])
+        self.assertEqual(segments.index.get_loc(str_to_date("2021-12-22")), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
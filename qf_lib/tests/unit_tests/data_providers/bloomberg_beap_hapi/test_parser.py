@@ -17,7 +17,8 @@ from io import BytesIO
 from textwrap import dedent
 from unittest.mock import patch, Mock
 
-from numpy import datetime64, datetime_as_string
+from numpy import datetime64, datetime_as_string, nan
+from numpy.testing import assert_equal
 
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.qf_data_array import QFDataArray
@@ -138,6 +139,40 @@ class TestBloombergBeapHapiParser(unittest.TestCase):
         actual_datetime_strings = [datetime_as_string(datetime64(dt), unit='D') for dt in actual_data_array.dates.values]
         self.assertCountEqual(actual_datetime_strings, expected_datetime_strings)
 
+    @patch('qf_lib.data_providers.bloomberg_beap_hapi.bloomberg_beap_hapi_parser.gzip')
+    def test_get_history_read_in_small_chunks(self, mock):
+        mock.open.return_value = BytesIO(str.encode(dedent(
+            """
+            START-OF-FILE
+            ...
+            START-OF-FIELDS
+            PX_LAST
+            PX_VOLUME
+            END-OF-FIELDS
+            ...
+            START-OF-DATA
+            CTA Comdty|0|2|EX|20210701|0.859|19881|
+            RTYA Index|0|2|EX|20210702|2310.5|1500|
+            CTA Comdty|0|2|EX|20210702|0.8697|15106|
+            RTYA Index|0|2|EX|20210706|2290.25| |
+            END-OF-DATA
+            ...
+            END-OF-FILE
+            """
+        )))
+        parser = BloombergBeapHapiParser(chunk_size=7)
+        actual_data_array = parser.get_history(Mock())
+
+        self.assertEqual(actual_data_array.shape, (3, 2, 2))
+        self.assertEqual(actual_data_array.tickers.values.tolist(), ['CTA Comdty', 'RTYA Index'])
+        self.assertEqual(actual_data_array.fields.values.tolist(), ['PX_LAST', 'PX_VOLUME'])
+
+        actual_datetime_strings = [datetime_as_string(datetime64(dt), unit='D') for dt in actual_data_array.dates.values]
+        self.assertEqual(actual_datetime_strings, ['2021-07-01', '2021-07-02', '2021-07-06'])
+
+        assert_equal(actual_data_array.loc[:, 'CTA Comdty', :].values, [[0.859, 19881], [0.8697, 15106], [nan, nan]])
+        assert_equal(actual_data_array.loc[:, 'RTYA Index', :].values, [[nan, nan], [2310.5, 1500], [2290.25, nan]])
+
     @patch('qf_lib.data_providers.bloomberg_beap_hapi.bloomberg_beap_hapi_parser.gzip')
     def test_get_chain_single_ticker_single_field_multiple_tickers(self, mock):
         mock.open.return_value = BytesIO(str.encode(dedent(
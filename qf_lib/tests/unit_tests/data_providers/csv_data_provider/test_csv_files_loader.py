@@ -0,0 +1,100 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pandas as pd
+
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.data_providers.csv import csv_files_loader
+from qf_lib.data_providers.csv.csv_files_loader import CSVFilesLoader
+
+
+class TestCSVFilesLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.data_dir = Path(self.directory.name, "data")
+        self.cache_dir = os.path.join(self.directory.name, "cache")
+
+        os.makedirs(self.data_dir / "Daily")
+        os.makedirs(self.data_dir / "Intraday")
+        self._write_file(self.data_dir / "Daily" / "AB.csv", "Date,Close,Contract\n"
+                                                             "2021-06-01,10.5,AB2021M\n"
+                                                             "2021-06-02,11,AB2021M\n")
+        self._write_file(self.data_dir / "Intraday" / "AB.csv", "Date,Time,Close\n"
+                                                                "2021-06-01,17:13:00,10.5\n")
+        self._write_file(self.data_dir / "Daily" / "CD.csv", "Date,Close\n"
+                                                             "01/06/2021,20\n")
+        self._write_file(self.data_dir / "Daily" / "notes.txt", "Not a csv file")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_index_files(self):
+        files = CSVFilesLoader.index_files(str(self.data_dir))
+
+        self.assertCountEqual(files.keys(), ["AB", "CD"])
+        self.assertEqual([path.parent.name for path in files["AB"]], ["Daily", "Intraday"])
+
+    def test_load(self):
+        loader = CSVFilesLoader()
+        paths = CSVFilesLoader.index_files(str(self.data_dir))["AB"]
+        daily_df, intraday_df = loader.load(paths, ["Date"], "%Y-%m-%d", dtype={"Close": float, "Volume": float})
+
+        self.assertEqual(type(daily_df), QFDataFrame)
+        self.assertEqual(daily_df.index.tolist(), [pd.Timestamp("2021-06-01"), pd.Timestamp("2021-06-02")])
+        self.assertEqual(daily_df["Close"].tolist(), [10.5, 11.0])
+        self.assertEqual(daily_df["Contract"].tolist(), ["AB2021M", "AB2021M"])
+        self.assertEqual(intraday_df.index.tolist(), [pd.Timestamp("2021-06-01")])
+
+        intraday_df, = loader.load(paths[1:], ["Date", "Time"], "%Y-%m-%d %H:%M:%S")
+        self.assertEqual(intraday_df.index.tolist(), [pd.Timestamp("2021-06-01 17:13")])
+
+        # The dates format is inferred if the dates don't match it, files without the dates columns are skipped
+        df, = loader.load([self.data_dir / "Daily" / "CD.csv"], ["Date"], "%Y-%m-%d")
+        self.assertEqual(df.index.tolist(), [pd.Timestamp("2021-01-06")])
+        self.assertEqual(loader.load(paths[:1], ["Date", "Time"], "%Y-%m-%d %H:%M:%S"), [None])
+
+    def test_load_from_cache(self):
+        loader = CSVFilesLoader(cache_dir=self.cache_dir)
+        path = self.data_dir / "Daily" / "AB.csv"
+        expected_df, = loader.load([path], ["Date"], "%Y-%m-%d")
+
+        with patch.object(csv_files_loader, "_parse_file") as parse_file:
+            df, = loader.load([path], ["Date"], "%Y-%m-%d")
+            parse_file.assert_not_called()
+        self.assertTrue(expected_df.equals(df))
+
+        # A different format of the file is cached separately
+        with patch.object(csv_files_loader, "_parse_file", wraps=csv_files_loader._parse_file) as parse_file:
+            loader.load([path], ["Date"], None)
+            parse_file.assert_called_once()
+
+        # Modified files are parsed again
+        self._write_file(path, "Date,Close\n2021-06-03,12\n")
+        df, = loader.load([path], ["Date"], "%Y-%m-%d")
+        self.assertEqual(df.index.tolist(), [pd.Timestamp("2021-06-03")])
+
+    @staticmethod
+    def _write_file(path: Path, content: str):
+        with open(path, "w") as file:
+            file.write(content)
+
+
+if __name__ == '__main__':
+    unittest.main()
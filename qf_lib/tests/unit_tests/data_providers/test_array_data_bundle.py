@@ -0,0 +1,113 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_array_equal
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.array_data_bundle import ArrayDataBundle
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_series_equal, assert_dataframes_equal
+
+
+class TestArrayDataBundle(unittest.TestCase):
+    tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity"), BloombergTicker("C Equity")]
+    fields = PriceField.ohlcv()
+    start_date = datetime(2021, 1, 1)
+    end_date = datetime(2021, 3, 31)
+
+    def setUp(self):
+        dates = pd.bdate_range(self.start_date, self.end_date)
+        rng = np.random.default_rng(2021)
+        values = rng.uniform(20, 50, (len(dates), len(self.tickers), len(self.fields)))
+        values[5:8, 1, :] = np.nan  # missing bars for a single ticker
+        values[20:22, :, :] = np.nan  # missing bars for all tickers
+        values[30, 2, 3] = np.nan  # missing close price
+        self.data = QFDataArray.create(dates, self.tickers, self.fields, values)
+
+        self.preset_data_provider = PresetDataProvider(self.data, self.start_date, self.end_date, Frequency.DAILY)
+        self.array_data_provider = PresetDataProvider(self.data, self.start_date, self.end_date, Frequency.DAILY,
+                                                      use_array_storage=True)
+
+    def test_get_data_array(self):
+        bundle = ArrayDataBundle(self.data)
+        tickers = [self.tickers[2], self.tickers[0]]
+        fields = [PriceField.Close, PriceField.Open]
+
+        actual = bundle.get_data_array(datetime(2021, 1, 5), datetime(2021, 2, 3), tickers, fields)
+        expected = self.data.loc[datetime(2021, 1, 5):datetime(2021, 2, 3), tickers, fields]
+
+        assert_array_equal(expected.dates.values, actual.dates.values)
+        assert_array_equal(expected.tickers.values, actual.tickers.values)
+        assert_array_equal(expected.fields.values, actual.fields.values)
+        assert_array_equal(expected.values, actual.values)
+
+    def test_get_values_contiguous_selection_is_a_view(self):
+        bundle = ArrayDataBundle(self.data)
+        values = bundle.get_values(datetime(2021, 1, 5), datetime(2021, 2, 3), self.tickers[:2], self.fields)
+        self.assertTrue(np.shares_memory(values, bundle.values))
+
+    def test_unknown_ticker(self):
+        bundle = ArrayDataBundle(self.data)
+        with self.assertRaises(KeyError):
+            bundle.get_data_array(self.start_date, self.end_date, [BloombergTicker("Unknown Equity")], self.fields)
+
+    def test_get_price(self):
+        for tickers, fields, start_date, end_date in [
+            (self.tickers, self.fields, datetime(2021, 1, 4), datetime(2021, 2, 15)),
+            (self.tickers[1], self.fields, datetime(2021, 1, 4), datetime(2021, 2, 15)),
+            (self.tickers, PriceField.Close, datetime(2021, 1, 4), datetime(2021, 2, 15)),
+            (self.tickers[2], PriceField.Close, datetime(2021, 1, 4), datetime(2021, 2, 15)),
+            (self.tickers, self.fields, datetime(2021, 2, 10), datetime(2021, 2, 10)),
+        ]:
+            expected = self.preset_data_provider.get_price(tickers, fields, start_date, end_date)
+            actual = self.array_data_provider.get_price(tickers, fields, start_date, end_date)
+            self._assert_equal(expected, actual)
+
+    def test_historical_price(self):
+        for tickers, fields, nr_of_bars, end_date in [
+            (self.tickers, self.fields, 5, datetime(2021, 2, 1)),
+            (self.tickers[1], PriceField.Close, 10, datetime(2021, 1, 22)),
+            (self.tickers, PriceField.Close, 1, datetime(2021, 3, 1)),
+            (self.tickers[0], self.fields, 30, datetime(2021, 3, 31)),
+        ]:
+            expected = self.preset_data_provider.historical_price(tickers, fields, nr_of_bars, end_date,
+                                                                  Frequency.DAILY)
+            actual = self.array_data_provider.historical_price(tickers, fields, nr_of_bars, end_date, Frequency.DAILY)
+            self._assert_equal(expected, actual)
+
+    def test_get_last_available_price(self):
+        for end_time in [datetime(2021, 1, 12), datetime(2021, 1, 29, 12), datetime(2021, 2, 12)]:
+            expected = self.preset_data_provider.get_last_available_price(self.tickers, Frequency.DAILY, end_time)
+            actual = self.array_data_provider.get_last_available_price(self.tickers, Frequency.DAILY, end_time)
+            assert_series_equal(expected, actual)
+
+    def _assert_equal(self, expected, actual):
+        self.assertEqual(type(expected), type(actual))
+        if isinstance(expected, QFDataArray):
+            self.assertTrue(expected.equals(actual))
+        elif isinstance(expected, pd.DataFrame):
+            assert_dataframes_equal(expected, actual)
+        else:
+            assert_series_equal(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from unittest import TestCase, skipIf
+from unittest.mock import Mock, MagicMock
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.tickers.tickers import BloombergTicker
+
+try:
+    import blpapi
+    from qf_lib.data_providers.bloomberg.historical_data_provider import HistoricalDataProvider
+    is_blpapi_installed = True
+except ImportError:
+    is_blpapi_installed = False
+
+
+@skipIf(not is_blpapi_installed, "No Bloomberg API installed. Tests are being skipped.")
+class TestHistoricalDataProviderIntraday(TestCase):
+    TICKERS = [BloombergTicker("Example Index"), BloombergTicker("Other Index")]
+    START_DATE = datetime(2021, 1, 1)
+    END_DATE = datetime(2021, 1, 3, 12)
+
+    def setUp(self):
+        self.sent_requests = []  # (correlation id value, ticker, start date, end date)
+        self.requests_in_flight = []
+        self.max_num_of_requests_in_flight = 0
+        self.error_tickers = set()
+
+        ref_data_service = Mock()
+        ref_data_service.createRequest.side_effect = lambda _: self._create_request()
+
+        self.session = Mock()
+        self.session.getService.return_value = ref_data_service
+        self.session.sendRequest.side_effect = self._send_request
+        self.session.nextEvent.side_effect = self._next_event
+
+    def test_intraday_requests_are_pipelined(self):
+        data_provider = HistoricalDataProvider(self.session, max_requests_in_flight=3, intraday_chunk_days=1)
+        data = data_provider.get(self.TICKERS, ["PX_LAST", "PX_VOLUME"], self.START_DATE, self.END_DATE,
+                                 Frequency.MIN_1)
+
+        # 3 chunks of the date range for each ticker
+        self.assertEqual(len(self.sent_requests), 6)
+        self.assertEqual(len({correlation_id for correlation_id, *_ in self.sent_requests}), 6)
+        self.assertEqual(self.max_num_of_requests_in_flight, 3)
+        self.assertCountEqual([(start_date, end_date) for _, ticker, start_date, end_date in self.sent_requests
+                               if ticker == "Example Index"], [
+            (datetime(2021, 1, 1), datetime(2021, 1, 2)),
+            (datetime(2021, 1, 2), datetime(2021, 1, 3)),
+            (datetime(2021, 1, 3), datetime(2021, 1, 3, 12))
+        ])
+
+        # The bars at the boundaries of the chunks are returned twice, but they are included only once
+        expected_dates = [datetime(2021, 1, 1), datetime(2021, 1, 2), datetime(2021, 1, 3), datetime(2021, 1, 3, 12)]
+        self.assertEqual(list(data.dates.to_index()), expected_dates)
+        for ticker in self.TICKERS:
+            self.assertEqual(list(data.loc[:, ticker, "PX_LAST"].values),
+                             [self._close_price(ticker.as_string(), date) for date in expected_dates])
+            self.assertEqual(list(data.loc[:, ticker, "PX_VOLUME"].values), [100.0] * 4)
+
+    def test_response_error(self):
+        self.error_tickers = {"Other Index"}
+        data_provider = HistoricalDataProvider(self.session, max_requests_in_flight=2, intraday_chunk_days=None)
+        data = data_provider.get(self.TICKERS, ["PX_LAST"], self.START_DATE, self.END_DATE, Frequency.MIN_1)
+
+        self.assertEqual(len(self.sent_requests), 2)
+        self.assertEqual(list(data.loc[:, self.TICKERS[0], "PX_LAST"].values),
+                         [self._close_price("Example Index", date) for date in (self.START_DATE, self.END_DATE)])
+        self.assertTrue(data.loc[:, self.TICKERS[1], "PX_LAST"].isnull().all())
+
+    @staticmethod
+    def _close_price(ticker_str: str, date: datetime) -> float:
+        return (1000.0 if ticker_str == "Example Index" else 2000.0) + date.day * 100 + date.hour
+
+    def _create_request(self):
+        request = Mock()
+        request.parameters = {}
+        request.set.side_effect = lambda name, value: request.parameters.update({str(name): value})
+        request.getElement.return_value.setValue.side_effect = \
+            lambda value: request.parameters.update({"security": value})
+        return request
+
+    def _send_request(self, request, correlationId):
+        parameters = request.parameters
+        self.sent_requests.append(
+            (correlationId.value(), parameters["security"], parameters["startDateTime"], parameters["endDateTime"]))
+        self.requests_in_flight.append((correlationId, parameters))
+        self.max_num_of_requests_in_flight = max(self.max_num_of_requests_in_flight, len(self.requests_in_flight))
+
+    def _next_event(self):
+        # The responses for the most recent requests arrive first
+        correlation_id, parameters = self.requests_in_flight.pop()
+        ticker_str = parameters["security"]
+
+        message = Mock()
+        message.correlationIds.return_value = [correlation_id]
+        message.asElement.return_value.hasElement.side_effect = lambda _: ticker_str in self.error_tickers
+
+        bars = [self._bar(ticker_str, date) for date in (parameters["startDateTime"], parameters["endDateTime"])]
+        bar_tick_data_array = Mock()
+        bar_tick_data_array.numValues.return_value = len(bars)
+        bar_tick_data_array.getValueAsElement.side_effect = lambda index: bars[index]
+        bar_tick_data_array.values.return_value = iter(bars)
+        message.getElement.return_value.getElement.return_value = bar_tick_data_array
+
+        event = MagicMock()
+        event.eventType.return_value = blpapi.event.Event.RESPONSE
+        event.__iter__.return_value = iter([message])
+        return event
+
+    def _bar(self, ticker_str: str, date: datetime):
+        elements = {"close": self._close_price(ticker_str, date), "volume": 100.0}
+        bar = Mock()
+        bar.hasElement.side_effect = lambda name: name in elements
+        bar.getElementAsFloat.side_effect = lambda name: elements[name]
+        bar.getElementAsDatetime.return_value = date
+        return bar
@@ -0,0 +1,120 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime, timedelta
+from tempfile import TemporaryDirectory
+from typing import Type, Set
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker, Ticker
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.caching_data_provider import CachingDataProvider
+from qf_lib.data_providers.data_provider import DataProvider
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_dataframes_equal
+
+
+class FakeDataProvider(DataProvider):
+    """ In-memory data provider, which records the requests. """
+
+    frequency = Frequency.DAILY
+
+    def __init__(self, data: QFDataArray):
+        super().__init__()
+        self.data = data
+        self.requests = []
+
+    def get_price(self, tickers, fields, start_date, end_date=None, frequency=None):
+        return self.get_history(tickers, fields, start_date, end_date, frequency)
+
+    def get_history(self, tickers, fields, start_date, end_date=None, frequency=None, **kwargs):
+        self.requests.append((list(tickers), list(fields), start_date, end_date))
+        return self.data.loc[start_date:end_date, tickers, fields]
+
+    def supported_ticker_types(self) -> Set[Type[Ticker]]:
+        return {BloombergTicker}
+
+    def get_futures_chain_tickers(self, tickers, expiration_date_fields):
+        raise NotImplementedError()
+
+
+class TestCachingDataProvider(unittest.TestCase):
+    tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity"), BloombergTicker("C Equity")]
+    fields = [PriceField.Open, PriceField.Close]
+
+    def setUp(self):
+        dates = pd.bdate_range(datetime(2021, 1, 1), datetime(2021, 6, 30))
+        values = np.random.default_rng(2021).uniform(20, 50, (len(dates), len(self.tickers), len(self.fields)))
+        values[5:8, 1, :] = np.nan
+
+        self.fake_data_provider = FakeDataProvider(QFDataArray.create(dates, self.tickers, self.fields, values))
+        self.directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_only_missing_periods_are_downloaded(self):
+        data_provider = CachingDataProvider(self.fake_data_provider, self.directory.name)
+
+        data_provider.get_price(self.tickers[:2], self.fields, datetime(2021, 2, 1), datetime(2021, 3, 31))
+        self.assertEqual(1, len(self.fake_data_provider.requests))
+
+        data_provider.get_price(self.tickers[:2], self.fields, datetime(2021, 2, 10), datetime(2021, 3, 10))
+        self.assertEqual(1, len(self.fake_data_provider.requests))
+
+        data_provider.get_price(self.tickers, self.fields, datetime(2021, 1, 15), datetime(2021, 4, 30))
+        requested_periods = [(tickers, start_date, end_date)
+                             for tickers, _, start_date, end_date in self.fake_data_provider.requests[1:]]
+        self.assertCountEqual([
+            (self.tickers[:2], datetime(2021, 1, 15), datetime(2021, 1, 31)),
+            (self.tickers[:2], datetime(2021, 4, 1), datetime(2021, 4, 30)),
+            (self.tickers[2:], datetime(2021, 1, 15), datetime(2021, 4, 30)),
+        ], requested_periods)
+
+        statistics = data_provider.cache_statistics()
+        self.assertEqual(len(self.tickers) * len(self.fields), statistics["partitions"])
+        self.assertEqual(4, statistics["requests"])
+
+    def test_cached_data_equals_downloaded_data(self):
+        start_date, end_date = datetime(2021, 1, 4), datetime(2021, 5, 14)
+        expected_close_prices = self.fake_data_provider.data.loc[start_date:end_date, :, PriceField.Close].to_pandas()
+
+        CachingDataProvider(self.fake_data_provider, self.directory.name).get_price(
+            self.tickers, self.fields, start_date, end_date)
+        num_of_requests = len(self.fake_data_provider.requests)
+
+        # The new data provider uses the data persisted by the previous one
+        data_provider = CachingDataProvider(self.fake_data_provider, self.directory.name)
+        close_prices = data_provider.get_price(self.tickers, PriceField.Close, start_date, end_date)
+        self.assertEqual(num_of_requests, len(self.fake_data_provider.requests))
+        self.assertEqual(len(self.tickers), data_provider.cache_statistics()["hits"])
+
+        assert_dataframes_equal(expected_close_prices, close_prices, check_frame_type=False, check_names=False)
+
+    def test_eviction(self):
+        data_provider = CachingDataProvider(self.fake_data_provider, self.directory.name)
+        data_provider.get_price(self.tickers, self.fields, datetime(2021, 1, 4), datetime(2021, 5, 14))
+
+        data_provider.evict(max_size=data_provider.cache_statistics()["size"] // 2)
+        self.assertLess(data_provider.cache_statistics()["partitions"], len(self.tickers) * len(self.fields))
+
+        data_provider.evict(max_age=timedelta(0))
+        self.assertEqual(0, data_provider.cache_statistics()["partitions"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -86,6 +86,7 @@ class TestGeneralPriceProviderMock(unittest.TestCase):
                                                           fields=self.PRICE_FIELDS, data=data)
         haver.supported_ticker_types.return_value = {HaverTicker}
 
+        self.bloomberg, self.quandl, self.haver = bloomberg, quandl, haver
         self.price_provider = GeneralPriceProvider(bloomberg, quandl, haver)
 
     # =========================== Test get_price method ==========================================================
@@ -106,6 +107,22 @@ class TestGeneralPriceProviderMock(unittest.TestCase):
         self.assertEqual(data.shape, (self.NUM_OF_DATES, len(tickers)))
         self.assertEqual(list(data.columns), tickers)
 
+    def test_price_multiple_providers_interleaved_tickers_concurrently(self):
+        tickers = [ticker for tickers_group in zip(self.BBG_TICKERS, self.QUANDL_TICKERS, self.HAVER_TICKERS)
+                   for ticker in tickers_group]
+        self.price_provider.max_workers = 3
+        data = self.price_provider.get_price(tickers=tickers, fields=self.SINGLE_PRICE_FIELD,
+                                             start_date=self.START_DATE, end_date=self.END_DATE)
+
+        self.assertEqual(type(data), PricesDataFrame)
+        self.assertEqual(data.shape, (self.NUM_OF_DATES, len(tickers)))
+        self.assertEqual(list(data.columns), tickers)
+
+        for data_provider, provider_tickers in [(self.bloomberg, self.BBG_TICKERS), (self.quandl, self.QUANDL_TICKERS),
+                                                (self.haver, self.HAVER_TICKERS)]:
+            data_provider.get_price.assert_called_once()
+            self.assertEqual(provider_tickers, data_provider.get_price.call_args[0][0])
+
 
 if __name__ == '__main__':
     unittest.main()
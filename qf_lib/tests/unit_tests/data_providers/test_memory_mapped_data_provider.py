@@ -0,0 +1,111 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import pickle
+import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.expiration_date_field import ExpirationDateField
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.futures.future_tickers.bloomberg_future_ticker import BloombergFutureTicker
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.memory_mapped_data_provider import MemoryMappedDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib.tests.helpers.testing_tools.containers_comparison import assert_series_equal, assert_dataframes_equal
+
+
+class TestMemoryMappedDataProvider(unittest.TestCase):
+    tickers = [BloombergTicker("A Equity"), BloombergTicker("CTH21 Comdty"), BloombergTicker("CTK21 Comdty")]
+    fields = PriceField.ohlcv()
+    start_date = datetime(2021, 1, 1)
+    end_date = datetime(2021, 3, 31)
+
+    def setUp(self):
+        dates = pd.bdate_range(self.start_date, self.end_date)
+        rng = np.random.default_rng(2021)
+        values = rng.uniform(20, 50, (len(dates), len(self.tickers), len(self.fields)))
+        values[5:8, 1, :] = np.nan
+        data = QFDataArray.create(dates, self.tickers, self.fields, values)
+
+        self.future_ticker = BloombergFutureTicker("Cotton", "CT{} Comdty", 1, 3)
+        exp_dates = {self.future_ticker: QFDataFrame(
+            {ExpirationDateField.LastTradeableDate: [datetime(2021, 3, 9), datetime(2021, 5, 6)]},
+            index=[BloombergTicker("CTH21 Comdty"), BloombergTicker("CTK21 Comdty")])}
+
+        self.preset_data_provider = PresetDataProvider(data, self.start_date, self.end_date, Frequency.DAILY,
+                                                       exp_dates)
+        self.directory = TemporaryDirectory()
+        MemoryMappedDataProvider.save(self.preset_data_provider, self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_bundle_is_memory_mapped_and_read_only(self):
+        data_provider = MemoryMappedDataProvider(self.directory.name)
+        values = data_provider.data_bundle.values
+
+        self.assertIsInstance(values.base, np.memmap)
+        self.assertFalse(values.flags.writeable)
+
+        data_provider = MemoryMappedDataProvider(self.directory.name, use_array_storage=True)
+        self.assertTrue(np.shares_memory(data_provider.data_bundle.values, data_provider._array_bundle.values))
+
+    def test_saved_parameters(self):
+        data_provider = MemoryMappedDataProvider(self.directory.name)
+
+        self.assertTrue(self.preset_data_provider.data_bundle.equals(data_provider.data_bundle))
+        self.assertEqual(self.preset_data_provider.start_date, data_provider.start_date)
+        self.assertEqual(self.preset_data_provider.end_date, data_provider.end_date)
+        self.assertEqual(self.preset_data_provider.frequency, data_provider.frequency)
+        self.assertEqual(self.preset_data_provider.cached_tickers, data_provider.cached_tickers)
+        self.assertEqual(self.preset_data_provider.cached_future_tickers, data_provider.cached_future_tickers)
+        self.assertEqual(self.preset_data_provider.cached_fields, data_provider.cached_fields)
+        assert_dataframes_equal(self.preset_data_provider.exp_dates[self.future_ticker],
+                                data_provider.exp_dates[self.future_ticker])
+
+    def test_get_price_and_historical_price(self):
+        for use_array_storage in [False, True]:
+            data_provider = MemoryMappedDataProvider(self.directory.name, use_array_storage)
+
+            expected = self.preset_data_provider.get_price(self.tickers[0], PriceField.Close, datetime(2021, 1, 4),
+                                                           datetime(2021, 2, 15))
+            actual = data_provider.get_price(self.tickers[0], PriceField.Close, datetime(2021, 1, 4),
+                                             datetime(2021, 2, 15))
+            assert_series_equal(expected, actual)
+
+            expected = self.preset_data_provider.historical_price(self.tickers, PriceField.Close, 10,
+                                                                  datetime(2021, 2, 1), Frequency.DAILY)
+            actual = data_provider.historical_price(self.tickers, PriceField.Close, 10, datetime(2021, 2, 1),
+                                                    Frequency.DAILY)
+            assert_dataframes_equal(expected, actual)
+
+    def test_pickling_preserves_only_the_path(self):
+        data_provider = MemoryMappedDataProvider(self.directory.name, use_array_storage=True)
+        pickled_data_provider = pickle.dumps(data_provider)
+
+        self.assertLess(len(pickled_data_provider), data_provider.data_bundle.values.nbytes)
+
+        unpickled_data_provider = pickle.loads(pickled_data_provider)
+        self.assertEqual(self.directory.name, unpickled_data_provider.path)
+        self.assertTrue(data_provider.data_bundle.equals(unpickled_data_provider.data_bundle))
+
+
+if __name__ == '__main__':
+    unittest.main()
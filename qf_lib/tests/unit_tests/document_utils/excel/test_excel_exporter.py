@@ -291,3 +291,38 @@ class TestExcelExporter(unittest.TestCase):
         excel_exporter.write_cell(Mock(), "B3", 17, WriteMode.CREATE_IF_DOESNT_EXIST, "New sheet")
 
         worksheet.cell.assert_called_once_with(row=3, column=2, value=17)
+
+    @patch('qf_lib.documents_utils.excel.excel_exporter.get_starting_dir_abs_path')
+    @patch('qf_lib.documents_utils.excel.excel_exporter.makedirs')
+    @patch('qf_lib.documents_utils.excel.excel_exporter.Workbook')
+    def test_export_containers(self, workbook_class, makedirs, get_starting_dir_abs_path):
+        excel_exporter = ExcelExporter(MagicMock(output_directory="output"))
+        get_starting_dir_abs_path.return_value = "root"
+
+        work_book = workbook_class.return_value
+        worksheets = {"Prices": Mock(), "Tickers": Mock()}
+        work_book.create_sheet.side_effect = lambda sheet_name: worksheets[sheet_name]
+
+        series = QFSeries(data=[12.5, float("nan")], index=[100, 101], name="Price")
+        dataframe = QFDataFrame(data={"A": [12, 34], "B": [BloombergTicker("ABC"), BloombergTicker("DEF")]},
+                                index=[100, 101])
+
+        file_path = excel_exporter.export_containers({"Prices": series, "Tickers": dataframe}, "file.xlsx",
+                                                     starting_cell='B2', include_column_names=True)
+
+        workbook_class.assert_called_once_with(write_only=True)
+        work_book.save.assert_called_once_with(file_path)
+        makedirs.assert_called_once()
+
+        worksheets["Prices"].append.assert_has_calls([
+            call([]),
+            call([None, "Index", "Price"]),
+            call([None, 100, 12.5]),
+            call([None, 101, "nan"])
+        ])
+        worksheets["Tickers"].append.assert_has_calls([
+            call([]),
+            call([None, "Index", "A", "B"]),
+            call([None, 100, 12, "ABC"]),
+            call([None, 101, 34, "DEF"])
+        ])
@@ -0,0 +1,81 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+import matplotlib as mpl
+
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.documents_utils.document_exporting.chart_renderer import ChartRenderer
+from qf_lib.documents_utils.document_exporting.document import Document
+from qf_lib.documents_utils.document_exporting.element.chart import ChartElement
+from qf_lib.plotting.charts.line_chart import LineChart
+from qf_lib.plotting.decorators.data_element_decorator import DataElementDecorator
+
+
+class TestChartRenderer(TestCase):
+    def setUp(self):
+        self.renderer = ChartRenderer()
+
+    @staticmethod
+    def _create_chart_element(values, figsize=(5, 3)) -> ChartElement:
+        chart = LineChart()
+        chart.add_decorator(DataElementDecorator(QFSeries(data=values), color="blue"))
+        return ChartElement(chart, figsize=figsize)
+
+    def test_key_depends_only_on_chart_data_and_settings(self):
+        key = self.renderer._get_key(self._create_chart_element([1.0, 2.0, 3.0]))
+
+        self.assertEqual(key, self.renderer._get_key(self._create_chart_element([1.0, 2.0, 3.0])))
+        self.assertNotEqual(key, self.renderer._get_key(self._create_chart_element([1.0, 2.0, 4.0])))
+        self.assertNotEqual(key, self.renderer._get_key(self._create_chart_element([1.0, 2.0, 3.0], figsize=(5, 4))))
+
+    def test_render_document_uses_cached_images(self):
+        first_document = Document("first")
+        first_document.add_element(self._create_chart_element([1.0, 2.0, 3.0]))
+
+        with patch.object(ChartRenderer, "_render", side_effect=lambda elements: {
+                key: "image" for key in elements}) as render_mock:
+            self.renderer.render_document(first_document)
+            self.assertEqual(1, len(render_mock.call_args[0][0]))
+
+            second_document = Document("second")
+            chart_element = self._create_chart_element([1.0, 2.0, 3.0])
+            second_document.add_element(chart_element)
+            self.renderer.render_document(second_document)
+            self.assertEqual(0, len(render_mock.call_args[0][0]))
+
+        self.assertEqual("image", chart_element._render_as_base64_image())
+
+    def test_charts_are_rendered_again_after_matplotlib_settings_change(self):
+        with patch.object(ChartRenderer, "_render", side_effect=lambda elements: {
+                key: "image" for key in elements}) as render_mock:
+            with mpl.rc_context():
+                document = Document("first")
+                document.add_element(self._create_chart_element([1.0, 2.0, 3.0]))
+                self.renderer.render_document(document)
+                self.assertEqual(1, len(render_mock.call_args[0][0]))
+
+                mpl.rcParams["lines.linewidth"] = mpl.rcParams["lines.linewidth"] + 1.0
+
+                document = Document("second")
+                document.add_element(self._create_chart_element([1.0, 2.0, 3.0]))
+                self.renderer.render_document(document)
+                self.assertEqual(1, len(render_mock.call_args[0][0]))
+                self.assertEqual(2, render_mock.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from unittest import TestCase
+
+import numpy as np
+
+from qf_lib.common.timeseries_analysis.risk_contribution_analysis import RiskContributionAnalysis
+from qf_lib.portfolio_construction.portfolio_models.equal_risk_contribution_portfolio import \
+    EqualRiskContributionPortfolio, EqualRiskContributionMethod
+from qf_lib.tests.unit_tests.portfolio_construction.utils import assets_df
+
+
+class TestEqualRiskContributionPortfolio(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cov_matrix = assets_df.cov()
+
+    def test_newton_method_equals_nonlinear_optimizer(self):
+        expected_weights = EqualRiskContributionPortfolio(self.cov_matrix).get_weights()
+        actual_weights = EqualRiskContributionPortfolio(
+            self.cov_matrix, method=EqualRiskContributionMethod.NEWTON).get_weights()
+
+        self.assertEqual(list(expected_weights.index), list(actual_weights.index))
+        self.assertTrue(np.allclose(expected_weights.values, actual_weights.values, rtol=0, atol=1e-03))
+        self.assertAlmostEqual(actual_weights.sum(), 1.0, places=10)
+
+        risk_contributions = actual_weights * self.cov_matrix.dot(actual_weights)
+        self.assertTrue(np.allclose(risk_contributions, risk_contributions.mean(), rtol=1e-08, atol=0))
+
+    def test_newton_method_with_upper_limits(self):
+        upper_constraint = 0.06
+        weights = EqualRiskContributionPortfolio(
+            self.cov_matrix, upper_constraint, method=EqualRiskContributionMethod.NEWTON).get_weights()
+
+        self.assertAlmostEqual(weights.sum(), 1.0, places=10)
+        self.assertTrue((weights <= upper_constraint + 1e-10).all())
+
+        capped = np.isclose(weights.values, upper_constraint, rtol=0, atol=1e-10)
+        self.assertTrue(capped.any())
+
+        # The assets, which are not capped, have equal risk contributions, greater than the ones of the capped assets
+        risk_contributions = (weights * self.cov_matrix.dot(weights)).values
+        free_risk_contributions = risk_contributions[~capped]
+        self.assertTrue(np.allclose(free_risk_contributions, free_risk_contributions.mean(), rtol=1e-08, atol=0))
+        self.assertTrue((risk_contributions[capped] < free_risk_contributions.mean()).all())
+
+    def test_newton_method_with_initial_weights(self):
+        weights = EqualRiskContributionPortfolio(
+            self.cov_matrix, method=EqualRiskContributionMethod.NEWTON).get_weights()
+        initial_weights = weights.copy()
+        initial_weights.iloc[:5] = 0.0
+
+        warm_started_weights = EqualRiskContributionPortfolio(
+            self.cov_matrix, initial_weights=initial_weights, method=EqualRiskContributionMethod.NEWTON).get_weights()
+        self.assertTrue(np.allclose(weights.values, warm_started_weights.values, rtol=0, atol=1e-10))
+        self.assertTrue(RiskContributionAnalysis.is_equal_risk_contribution(self.cov_matrix, warm_started_weights))
+
+
+if __name__ == '__main__':
+    unittest.main()
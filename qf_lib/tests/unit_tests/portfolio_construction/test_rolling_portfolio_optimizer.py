@@ -0,0 +1,72 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from functools import partial
+from unittest import TestCase
+
+import numpy as np
+
+from qf_lib.portfolio_construction.optimizers.rolling_portfolio_optimizer import RollingPortfolioOptimizer
+from qf_lib.portfolio_construction.portfolio_models.equal_risk_contribution_portfolio import \
+    EqualRiskContributionPortfolio
+from qf_lib.portfolio_construction.portfolio_models.min_variance_portfolio import MinVariancePortfolio
+from qf_lib.tests.unit_tests.portfolio_construction.utils import assets_df
+
+
+class TestRollingPortfolioOptimizer(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.assets_df = assets_df
+        cls.window_size = 250
+        cls.step = 100
+
+    def _expected_weights(self, portfolio_type, **kwargs):
+        expected_weights = []
+        for window_end in range(self.window_size - 1, len(self.assets_df), self.step):
+            window = self.assets_df.iloc[window_end - self.window_size + 1:window_end + 1]
+            expected_weights.append(portfolio_type(window.cov(), **kwargs).get_weights().values)
+        return np.array(expected_weights)
+
+    def test_min_variance_weights(self):
+        optimizer = RollingPortfolioOptimizer(partial(MinVariancePortfolio, upper_constraint=0.1))
+        actual_weights = optimizer.get_weights_for_returns(self.assets_df, self.window_size, self.step)
+
+        self.assertEqual(list(actual_weights.columns), list(self.assets_df.columns))
+        self.assertEqual(actual_weights.index[0], self.assets_df.index[self.window_size - 1])
+        expected_weights = self._expected_weights(MinVariancePortfolio, upper_constraint=0.1)
+        self.assertTrue(np.allclose(expected_weights, actual_weights.values, rtol=0, atol=1e-04))
+
+    def test_equal_risk_contribution_weights(self):
+        optimizer = RollingPortfolioOptimizer(EqualRiskContributionPortfolio)
+        actual_weights = optimizer.get_weights_for_returns(self.assets_df, self.window_size, self.step)
+
+        expected_weights = self._expected_weights(EqualRiskContributionPortfolio)
+        self.assertTrue(np.allclose(expected_weights, actual_weights.values, rtol=0, atol=5e-03))
+
+    def test_parallel_optimization(self):
+        portfolio_factory = partial(MinVariancePortfolio, upper_constraint=0.1)
+        cov_matrices = {
+            self.assets_df.index[window_end]: self.assets_df.iloc[window_end - self.window_size + 1:window_end + 1].cov()
+            for window_end in range(self.window_size - 1, len(self.assets_df), self.step)
+        }
+
+        weights = RollingPortfolioOptimizer(portfolio_factory).get_weights(cov_matrices)
+        parallel_weights = RollingPortfolioOptimizer(portfolio_factory, n_jobs=2).get_weights(cov_matrices)
+
+        self.assertEqual(list(weights.index), sorted(cov_matrices.keys()))
+        self.assertTrue(np.allclose(weights.values, parallel_weights.values, rtol=0, atol=1e-04))
+
+
+if __name__ == '__main__':
+    unittest.main()